@@ -2,6 +2,23 @@ import { Injectable, NotFoundException } from '@nestjs/common';
 import * as fs from 'fs/promises';
 import * as path from 'path';
 
+interface ManifestArtifact {
+  file: string;
+  bytes: number;
+  sha256: string;
+  features: number;
+  records: number;
+  source_items: string[];
+}
+
+interface TradeManifest {
+  version: number;
+  generated_at: string;
+  items: string[];
+  years: number[];
+  artifacts: Record<string, Record<string, ManifestArtifact>>;
+}
+
 @Injectable()
 export class TradeDataService {
   // scripts 폴더의 data/output 경로
@@ -10,6 +27,37 @@ export class TradeDataService {
     '../scripts/data/output',
   );
 
+  // publish_artifacts.py가 만든 (품목, 연도)별 병합 산출물과 manifest.json 경로
+  private readonly publishedPath = path.join(
+    process.cwd(),
+    '../scripts/data/published',
+  );
+
+  // manifest는 파일이 바뀔 때만 다시 읽습니다 (mtime 비교)
+  private manifestCache: { mtimeMs: number; manifest: TradeManifest } | null =
+    null;
+
+  /**
+   * manifest.json을 읽습니다 (없으면 null → 기존 디렉터리 스캔 방식 사용)
+   */
+  private async loadManifest(): Promise<TradeManifest | null> {
+    const manifestPath = path.join(this.publishedPath, 'manifest.json');
+    try {
+      const stat = await fs.stat(manifestPath);
+      if (this.manifestCache && this.manifestCache.mtimeMs === stat.mtimeMs) {
+        return this.manifestCache.manifest;
+      }
+
+      const content = await fs.readFile(manifestPath, 'utf-8');
+      const manifest = JSON.parse(content) as TradeManifest;
+      this.manifestCache = { mtimeMs: stat.mtimeMs, manifest };
+      return manifest;
+    } catch {
+      this.manifestCache = null;
+      return null;
+    }
+  }
+
   /**
    * 특정 상품과 연도에 대한 모든 무역 플로우 데이터를 가져옵니다
    * @param item 상품 (copper, oil, plastic_3901, semiconductor)
@@ -17,6 +65,49 @@ export class TradeDataService {
    * @returns GeoJSON 형태의 무역 플로우 데이터 배열
    */
   async getTradeFlow(item: string, year: number): Promise<any> {
+    const manifest = await this.loadManifest();
+    if (!manifest) {
+      return this.scanTradeFlow(item, year);
+    }
+
+    const artifact = manifest.artifacts[item]?.[String(year)];
+    if (!artifact) {
+      throw new NotFoundException(
+        `${item} 상품의 ${year}년 데이터를 찾을 수 없습니다.`,
+      );
+    }
+
+    try {
+      // 병합된 산출물 파일 하나만 읽습니다
+      const filePath = path.join(this.publishedPath, artifact.file);
+      const fileContent = await fs.readFile(filePath, 'utf-8');
+      const geoData = JSON.parse(fileContent);
+      const features: any[] = Array.isArray(geoData.features)
+        ? geoData.features
+        : [];
+
+      return {
+        type: 'FeatureCollection',
+        features: features,
+        metadata: {
+          item: item,
+          year: year,
+          totalFlows: features.length,
+          sourceFiles: [artifact.file],
+        },
+      };
+    } catch (error) {
+      console.error(`데이터 조회 중 오류 발생:`, error);
+      throw new NotFoundException(
+        `${item} 상품의 ${year}년 데이터 처리 중 오류가 발생했습니다.`,
+      );
+    }
+  }
+
+  /**
+   * manifest가 없을 때: data/output의 무역 관계별 파일을 찾아 합칩니다
+   */
+  private async scanTradeFlow(item: string, year: number): Promise<any> {
     try {
       // 해당 item과 year로 시작하는 모든 파일을 찾습니다
       const files = await fs.readdir(this.dataPath);
@@ -84,6 +175,11 @@ export class TradeDataService {
    * 사용 가능한 상품 목록을 반환합니다
    */
   async getAvailableItems(): Promise<string[]> {
+    const manifest = await this.loadManifest();
+    if (manifest) {
+      return [...manifest.items].sort();
+    }
+
     try {
       const files = await fs.readdir(this.dataPath);
       const items = new Set<string>();
@@ -120,6 +216,11 @@ export class TradeDataService {
    * 사용 가능한 연도 목록을 반환합니다
    */
   async getAvailableYears(): Promise<number[]> {
+    const manifest = await this.loadManifest();
+    if (manifest) {
+      return [...manifest.years].sort((a, b) => b - a); // 최신 연도부터
+    }
+
     try {
       const files = await fs.readdir(this.dataPath);
       const years = new Set<number>();
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+API 응답에 맞춰 동시 요청 수를 조절하는 AIMD 제어기
+
+고정된 요청 간 지연(--delay)이나 동시 요청 수 대신, 관측한 응답 지연과 오류로
+동시에 진행할 요청 수(limit)를 정합니다. TCP 혼잡 제어와 같은 AIMD 방식입니다.
+
+    가산 증가(additive increase)      - 응답 지연이 기준 지연의 latency_tolerance배 이내이고 최근 오류율이
+                                       error_threshold 이하이면 limit개의 요청이 끝날 때마다 limit을 1 늘림
+    곱셈 감소(multiplicative decrease) - 429(요청 한도 초과)나 시간 초과가 나면 limit을 decrease_factor배로 줄임
+
+한도가 1보다 작아지면 요청을 하나씩만 보내고, 요청 시작 간격을 지연 이동평균/limit초로 벌립니다.
+(limit 0.25 → 응답 시간의 4배 간격) 응답이 빨라도 분당 할당량에 걸리는 경우 동시 요청 수를 1로 줄인 뒤에도
+요청 속도를 계속 낮출 수 있고, 1 미만에서는 정상 응답마다 min_limit씩 다시 늘립니다.
+
+기준 지연은 지금까지 관측한 지연 이동평균(EWMA)의 최소값이며, 서버 상태가 바뀌어도 따라가도록
+샘플마다 조금씩 올라갑니다. 감소 직전에 보낸 요청들이 같은 429를 연달아 받아 limit이 한 번에
+여러 번 줄지 않도록, 감소 후 응답 지연 이동평균만큼(최소 cooldown초)은 다시 줄이지 않습니다.
+캐시 적중은 API를 호출하지 않으므로 조절에 반영하지 않습니다.
+
+현재 limit, 진행 중인 요청 수, 최근 초당 요청 수, 지연 이동평균은 metrics 게이지로 내보냅니다.
+    concurrency_limit, requests_in_flight, request_rate, api_latency_ewma_seconds
+    concurrency_changes{direction="increase|decrease", reason="healthy|rate_limited|timeout"}
+
+사용법:
+    controller = AIMDController(max_limit=8)
+    await controller.acquire()
+    try:
+        results = await loop.run_in_executor(executor, collect, batch)
+    finally:
+        controller.release(latency, signal_for(error_kind, timed_out, from_cache))
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from metrics import get_metrics
+from retry_policy import ERROR_EMPTY, ERROR_RATE_LIMITED
+
+# 요청 결과를 제어기 입장에서 나눈 신호
+SIGNAL_OK = "ok"                # 응답을 받음 (데이터 없음 포함)
+SIGNAL_ERROR = "error"          # 429/시간 초과가 아닌 오류 (오류율에만 반영)
+SIGNAL_RATE_LIMITED = "rate_limited"
+SIGNAL_TIMEOUT = "timeout"
+SIGNAL_SKIPPED = "skipped"      # 캐시 적중 등 API를 호출하지 않음
+
+CONGESTION_SIGNALS = (SIGNAL_RATE_LIMITED, SIGNAL_TIMEOUT)
+
+DEFAULT_MIN_LIMIT = 0.05
+DEFAULT_MAX_LIMIT = 8
+DEFAULT_DECREASE_FACTOR = 0.5
+DEFAULT_LATENCY_TOLERANCE = 2.0
+DEFAULT_ERROR_THRESHOLD = 0.2
+DEFAULT_COOLDOWN = 1.0
+
+# 지연 이동평균 가중치, 기준 지연이 샘플마다 올라가는 비율, 오류율/요청 속도 계산 구간
+LATENCY_ALPHA = 0.2
+BASELINE_DRIFT = 1.01
+ERROR_WINDOW = 20
+RATE_WINDOW_SECONDS = 10.0
+ACQUIRE_POLL_SECONDS = 0.05
+
+
+def signal_for(error_kind: Optional[str] = None, timed_out: bool = False, from_cache: bool = False) -> str:
+    """수집 결과(오류 종류, 시간 초과 여부, 캐시 적중)를 제어기 신호로 변환"""
+    if from_cache:
+        return SIGNAL_SKIPPED
+    if timed_out:
+        return SIGNAL_TIMEOUT
+    if error_kind == ERROR_RATE_LIMITED:
+        return SIGNAL_RATE_LIMITED
+    if error_kind is None or error_kind == ERROR_EMPTY:
+        return SIGNAL_OK
+    return SIGNAL_ERROR
+
+
+class AIMDController:
+    """관측한 지연/오류로 동시 요청 수를 조절하는 AIMD 제어기 (스레드/코루틴 모두에서 공유 가능)"""
+
+    def __init__(self, min_limit: float = DEFAULT_MIN_LIMIT, max_limit: int = DEFAULT_MAX_LIMIT,
+                 initial_limit: Optional[float] = None, decrease_factor: float = DEFAULT_DECREASE_FACTOR,
+                 latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE,
+                 error_threshold: float = DEFAULT_ERROR_THRESHOLD, cooldown: float = DEFAULT_COOLDOWN,
+                 metrics=None, **labels):
+        if min_limit <= 0 or max_limit < max(1, min_limit):
+            raise ValueError("min_limit은 0보다 크고, max_limit은 1과 min_limit 이상이어야 합니다.")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor는 0과 1 사이여야 합니다.")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = max(1.0, latency_tolerance)
+        self.error_threshold = error_threshold
+        self.cooldown = cooldown
+        self.metrics = metrics or get_metrics()
+        self.labels = labels
+
+        self._lock = threading.Lock()
+        self._limit = float(min(max(initial_limit or 1, min_limit), max_limit))
+        self._credit = 0.0
+        self._in_flight = 0
+        self._latency = None
+        self._baseline = None
+        self._last_decrease = float('-inf')
+        self._last_start = float('-inf')
+        self._errors = deque(maxlen=ERROR_WINDOW)
+        self._completed = deque()
+        self._started = time.monotonic()
+        self._publish(time.monotonic())
+
+    @property
+    def limit(self) -> float:
+        """현재 동시 요청 수 한도 (1 미만이면 요청 시작 간격으로 적용)"""
+        return self._limit
+
+    def _slots(self) -> int:
+        return max(1, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        """진행 중인 요청 수"""
+        return self._in_flight
+
+    def try_acquire(self) -> bool:
+        """한도 안이면 요청 자리를 하나 차지하고 True를 반환"""
+        now = time.monotonic()
+        with self._lock:
+            if self._in_flight >= self._slots():
+                return False
+            if self._limit < 1 and self._latency is not None and now - self._last_start < self._latency / self._limit:
+                return False
+            self._in_flight += 1
+            self._last_start = now
+            self._publish(now)
+            return True
+
+    async def acquire(self):
+        """요청 자리가 날 때까지 이벤트 루프를 막지 않고 대기"""
+        while not self.try_acquire():
+            await asyncio.sleep(ACQUIRE_POLL_SECONDS)
+
+    def release(self, latency: Optional[float] = None, signal: str = SIGNAL_OK):
+        """요청 하나가 끝나면 자리를 돌려주고 결과 신호로 한도를 조절"""
+        now = time.monotonic()
+        with self._lock:
+            # 한도를 다 쓰고 있을 때만 늘림 (일이 적어 한도를 못 채우면 한도만 커지지 않도록)
+            saturated = self._in_flight >= self._slots()
+            self._in_flight = max(0, self._in_flight - 1)
+
+            if signal != SIGNAL_SKIPPED:
+                self._completed.append(now)
+                self._errors.append(signal != SIGNAL_OK)
+                if signal == SIGNAL_OK and latency is not None:
+                    self._observe_latency(latency)
+
+                if signal in CONGESTION_SIGNALS:
+                    self._decrease(now, signal)
+                elif signal == SIGNAL_OK and saturated and self._healthy():
+                    self._increase()
+
+            self._publish(now)
+
+    def _observe_latency(self, latency: float):
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency += LATENCY_ALPHA * (latency - self._latency)
+        self._baseline = (self._latency if self._baseline is None
+                          else min(self._latency, self._baseline * BASELINE_DRIFT))
+
+    def _healthy(self) -> bool:
+        if self._latency is None or self._latency > self._baseline * self.latency_tolerance:
+            return False
+        return sum(self._errors) / len(self._errors) <= self.error_threshold
+
+    def _increase(self):
+        if self._limit >= self.max_limit:
+            return
+        if self._limit < 1:
+            self._limit = min(1.0, self._limit + self.min_limit)
+            return
+        # limit개의 요청이 끝날 때마다(응답 한 번 왕복마다) 1씩 증가
+        self._credit += 1.0 / self._limit
+        if self._credit >= 1.0:
+            self._credit = 0.0
+            self._limit = min(self.max_limit, self._limit + 1)
+            self.metrics.inc('concurrency_changes', direction='increase', reason='healthy', **self.labels)
+
+    def _decrease(self, now: float, signal: str):
+        if now - self._last_decrease < max(self.cooldown, self._latency or 0.0):
+            return
+        self._last_decrease = now
+        self._credit = 0.0
+        previous = self._limit
+        self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+        if self._limit != previous:
+            self.metrics.inc('concurrency_changes', direction='decrease', reason=signal, **self.labels)
+
+    def _request_rate(self, now: float) -> float:
+        # 최근 RATE_WINDOW_SECONDS초 동안 끝난 API 요청의 초당 개수
+        while self._completed and self._completed[0] < now - RATE_WINDOW_SECONDS:
+            self._completed.popleft()
+        window = min(RATE_WINDOW_SECONDS, max(now - self._started, 1e-9))
+        return len(self._completed) / window
+
+    def _publish(self, now: float):
+        self.metrics.set_gauge('concurrency_limit', round(self._limit, 3), **self.labels)
+        self.metrics.set_gauge('requests_in_flight', self._in_flight, **self.labels)
+        self.metrics.set_gauge('request_rate', round(self._request_rate(now), 4), **self.labels)
+        if self._latency is not None:
+            self.metrics.set_gauge('api_latency_ewma_seconds', round(self._latency, 4), **self.labels)
+
+    def state(self) -> Dict:
+        """현재 한도, 진행 중인 요청 수, 초당 요청 수, 지연 이동평균/기준 지연"""
+        with self._lock:
+            return {
+                'limit': self._limit,
+                'in_flight': self._in_flight,
+                'request_rate': self._request_rate(time.monotonic()),
+                'latency_ewma': self._latency,
+                'baseline_latency': self._baseline
+            }
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+GeoJSON 생성기/저장기 벤치마크
+
+임의로 만든 Comtrade 형식 DataFrame(기본 100,000행)을 geojson_builder로 변환하는 데
+걸리는 시간과, geojson_writer의 형식별 저장 시간·파일 크기를 측정합니다.
+API 호출 없이 실행됩니다.
+
+사용법:
+    python benchmarks/bench_geojson_builder.py
+    python benchmarks/bench_geojson_builder.py --rows 100000 250000 --repeat 5
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from country_centroids import load_centroid_index  # noqa: E402
+from geojson_builder import build_trade_flow_features, iter_trade_flow_features  # noqa: E402
+from geojson_writer import GEOJSON_FORMATS, geojson_extension, write_geojson  # noqa: E402
+from synthetic_data import make_trade_frame  # noqa: E402
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="GeoJSON 생성기 벤치마크")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000],
+                       help="측정할 행 수 목록 (기본값: 1000 10000 100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (기본값: 3, 최소값 사용)")
+
+    args = parser.parse_args()
+
+    index = load_centroid_index()
+    print("📊 GeoJSON 생성기 벤치마크")
+    for rows in args.rows:
+        df = make_trade_frame(rows, cmd_code='7403')
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            features, matched = build_trade_flow_features(df, index, 'copper', 2023)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        print(f"   - {rows:>9,}행: {best * 1000:8.1f} ms ({len(features):,}개 Feature, "
+              f"{rows / best:,.0f} 행/초)")
+
+        # 형식별 스트리밍 저장 (변환 포함)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for fmt in GEOJSON_FORMATS:
+                path = os.path.join(tmp_dir, f"bench{geojson_extension(fmt)}")
+                start = time.perf_counter()
+                features, matched = iter_trade_flow_features(df, index, 'copper', 2023)
+                write_geojson(path, {'type': 'FeatureCollection', 'features': features,
+                                     'metadata': {'total_flows': matched}}, fmt)
+                elapsed = time.perf_counter() - start
+                print(f"       저장 {fmt:<8}: {elapsed * 1000:8.1f} ms, {os.path.getsize(path) / 1024 / 1024:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
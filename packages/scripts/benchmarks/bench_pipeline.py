@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+수집/변환 파이프라인 단계별 벤치마크
+
+합성 Comtrade 데이터(synthetic_data)로 파이프라인의 각 단계를 실행하고 소요 시간과
+최대 메모리(tracemalloc)를 측정한 뒤 저장된 기준 측정값(baselines/pipeline.json)과 비교합니다.
+API 요청은 합성 응답을 돌려주는 가짜 requests.get으로 대체하고 응답 캐시는 끄므로
+네트워크 없이 실행됩니다.
+
+단계:
+    fetch_final_data   - comtrade_client.fetch_final_data (응답 JSON → 수집 스키마 DataFrame)
+    split_batch        - 배치 응답을 무역 관계별로 분할 (request_planner.split_batch_frame)
+    process_to_geojson - BulkDataCollector.process_to_geojson (좌표 조회/필터링)
+    save_data          - BulkDataCollector.save_data (Parquet 저장소 추가 + GeoJSON 저장)
+    process_trade_data - process_trade_data.process_trade_data (구 버전 응답 전처리 + 좌표 결합)
+
+시간은 반복 측정 중 최소값, 메모리는 별도 1회 실행의 tracemalloc 최대값입니다.
+(pyarrow가 자체 할당자로 잡는 메모리는 tracemalloc에 잡히지 않습니다.)
+
+사용법:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --rows 1000 10000 100000 1000000 --repeat 3
+    python benchmarks/bench_pipeline.py --stages process_to_geojson save_data --fail-on-regression
+    python benchmarks/bench_pipeline.py --save-baseline     # 현재 측정값을 기준으로 저장
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import comtrade_client  # noqa: E402
+from bulk_data_collector import BulkDataCollector, COMMODITY_MAP  # noqa: E402
+from country_centroids import load_centroid_index  # noqa: E402
+from process_trade_data import process_trade_data  # noqa: E402
+from request_planner import split_batch_frame  # noqa: E402
+from synthetic_data import make_legacy_frame, make_trade_frame  # noqa: E402
+
+DEFAULT_ROWS = [1000, 10000, 100000]
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "pipeline.json")
+DEFAULT_TOLERANCE = 1.25
+
+STAGE_NAMES = ['fetch_final_data', 'split_batch', 'process_to_geojson', 'save_data', 'process_trade_data']
+
+# 배치 분할 단계에서 만들 작업(보고국-파트너국) 수
+SPLIT_TASKS = 50
+
+
+class _FakeResponse:
+    """comtrade_client가 읽는 만큼만 흉내 낸 HTTP 응답"""
+
+    status_code = 200
+    headers = {}
+    text = ""
+
+    def __init__(self, records: List[Dict]):
+        self._payload = {'data': records}
+
+    def json(self):
+        return self._payload
+
+
+@contextmanager
+def offline_api(records: List[Dict]):
+    """API 요청이 항상 records를 돌려주도록 하고 응답 캐시를 끔"""
+    comtrade_client.configure_cache(enabled=False)
+    with mock.patch.object(comtrade_client.requests, 'get', return_value=_FakeResponse(records)):
+        yield
+
+
+def _silent(func: Callable) -> Callable:
+    # 수집기의 진행 메시지가 측정 결과 사이에 섞이지 않도록 stdout을 버림
+    def run(*args):
+        with open(os.devnull, 'w') as devnull, mock.patch('sys.stdout', devnull):
+            return func(*args)
+    return run
+
+
+class PipelineStages:
+    """행 수 하나에 대한 단계별 (준비, 실행) 함수 모음
+
+    준비 함수는 측정 전에 호출되어 실행 함수의 인자를 만들고, 실행 함수만 측정합니다.
+    """
+
+    def __init__(self, rows: int, work_dir: str, seed: int = 0):
+        self.rows = rows
+        self.work_dir = work_dir
+        self.frame = make_trade_frame(rows, seed=seed, cmd_code=COMMODITY_MAP['copper'])
+        self.mixed_frame = make_trade_frame(rows, seed=seed)
+        self.legacy_frame = make_legacy_frame(rows, seed=seed)
+        self.records = self.frame.to_dict('records')
+        self.centroid_table = load_centroid_index().to_code_table()
+        self.collector = _silent(self._make_collector)()
+        self._runs = 0
+
+    def _make_collector(self) -> BulkDataCollector:
+        collector = BulkDataCollector(os.path.join(self.work_dir, "output"),
+                                      store_path=os.path.join(self.work_dir, "store"), publish_dir=None,
+                                      catalog_path=None)
+        collector.load_country_coordinates()
+        return collector
+
+    def stages(self) -> Dict[str, Tuple[Callable, Callable]]:
+        return {
+            'fetch_final_data': (self._prepare_fetch, self._run_fetch),
+            'split_batch': (self._prepare_split, split_batch_frame),
+            'process_to_geojson': (self._prepare_geojson, _silent(self.collector.process_to_geojson)),
+            'save_data': (self._prepare_save, _silent(self.collector.save_data)),
+            'process_trade_data': (self._prepare_process, _silent(process_trade_data))
+        }
+
+    def _prepare_fetch(self):
+        return ()
+
+    def _run_fetch(self):
+        with offline_api(self.records):
+            return comtrade_client.fetch_final_data('2023', '842', COMMODITY_MAP['copper'], '156',
+                                                    max_records=self.rows)
+
+    def _prepare_split(self):
+        # 응답에 실제로 있는 (보고국, 파트너국, HS Code) 조합으로 작업 목록 생성
+        items = {code: item for item, code in COMMODITY_MAP.items()}
+        keys = self.mixed_frame[['reporterCode', 'partnerCode', 'cmdCode']].drop_duplicates().head(SPLIT_TASKS)
+        tasks = [{'reporter_code': str(reporter), 'partner_code': str(partner), 'item': items[cmd]}
+                 for reporter, partner, cmd in keys.itertuples(index=False)]
+        return self.mixed_frame, {'tasks': tasks}, COMMODITY_MAP
+
+    def _prepare_geojson(self):
+        return self.frame, 'copper', 2023, 'USA', 'China'
+
+    def _prepare_save(self):
+        # 반복마다 다른 파일에 저장 (Feature 이터레이터는 한 번만 읽을 수 있으므로 매번 새로 생성)
+        self._runs += 1
+        result = {'data': self.frame, 'item': 'copper', 'year': 2023 + self._runs,
+                  'reporter_code': '842', 'partner_code': str(self._runs),
+                  'reporter_name': 'USA', 'partner_name': 'China'}
+        geojson = _silent(self.collector.process_to_geojson)(self.frame, 'copper', 2023, 'USA', 'China')
+        return result, geojson
+
+    def _prepare_process(self):
+        return self.legacy_frame, self.centroid_table
+
+
+def measure(prepare: Callable, run: Callable, repeat: int, memory: bool = True) -> Dict:
+    """단계 하나의 최소 소요 시간(초)과 최대 메모리(MB)"""
+    timings = []
+    for _ in range(repeat):
+        args = prepare()
+        started = time.perf_counter()
+        run(*args)
+        timings.append(time.perf_counter() - started)
+
+    result = {'seconds': min(timings)}
+    if memory:
+        args = prepare()
+        tracemalloc.start()
+        try:
+            run(*args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result['peak_mb'] = peak / 1024 / 1024
+    return result
+
+
+def load_baseline(path: str) -> Dict:
+    """기준 측정값 읽기 (없으면 빈 dict)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('results', {})
+
+
+def save_baseline(path: str, results: Dict, repeat: int):
+    """측정값을 기준으로 저장 (기존 기준에 없는 단계/행 수는 유지)"""
+    merged = load_baseline(path)
+    merged.update(results)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'repeat': repeat,
+            'results': dict(sorted(merged.items()))
+        }, f, indent=2, ensure_ascii=False)
+
+
+def compare(result: Dict, baseline: Optional[Dict], tolerance: float) -> Tuple[str, bool]:
+    """기준 대비 비율 문자열과 성능 저하 여부"""
+    if not baseline:
+        return "기준 없음", False
+    ratio = result['seconds'] / baseline['seconds'] if baseline['seconds'] else float('inf')
+    text = f"시간 x{ratio:.2f}"
+    regressed = ratio > tolerance
+    if 'peak_mb' in result and baseline.get('peak_mb'):
+        memory_ratio = result['peak_mb'] / baseline['peak_mb']
+        text += f", 메모리 x{memory_ratio:.2f}"
+        regressed = regressed or memory_ratio > tolerance
+    return (f"{text} ⚠️" if regressed else text), regressed
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(
+        description="수집/변환 파이프라인 단계별 벤치마크 (오프라인)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python benchmarks/bench_pipeline.py
+  python benchmarks/bench_pipeline.py --rows 1000 10000 100000 1000000
+  python benchmarks/bench_pipeline.py --stages save_data --repeat 5
+  python benchmarks/bench_pipeline.py --save-baseline
+  python benchmarks/bench_pipeline.py --fail-on-regression --tolerance 1.5
+        """
+    )
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS,
+                       help="측정할 행 수 목록 (기본값: 1000 10000 100000, 최대 1000000 권장)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (기본값: 3, 최소값 사용)")
+    parser.add_argument("--stages", nargs="+", choices=STAGE_NAMES, default=STAGE_NAMES,
+                       help="측정할 단계 (기본값: 전체)")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 메모리 측정 생략")
+    parser.add_argument("--baseline", type=str, default=DEFAULT_BASELINE_PATH,
+                       help="기준 측정값 파일 (기본값: benchmarks/baselines/pipeline.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 측정값을 기준으로 저장")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                       help=f"기준 대비 이 배수를 넘으면 성능 저하로 표시 (기본값: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                       help="성능 저하가 있으면 종료 코드 1로 끝냄")
+
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    results = {}
+    regressions = []
+
+    print("📊 파이프라인 벤치마크 (오프라인)")
+    for rows in args.rows:
+        print(f"\n   {rows:,}행")
+        with tempfile.TemporaryDirectory() as work_dir:
+            stages = PipelineStages(rows, work_dir).stages()
+            for name in args.stages:
+                prepare, run = stages[name]
+                result = measure(prepare, run, args.repeat, memory=not args.no_memory)
+                key = f"{name}/{rows}"
+                results[key] = result
+
+                text, regressed = compare(result, baseline.get(key), args.tolerance)
+                if regressed:
+                    regressions.append(key)
+                memory_text = f", 최대 {result['peak_mb']:7.1f} MB" if 'peak_mb' in result else ""
+                print(f"   - {name:<19}: {result['seconds'] * 1000:9.1f} ms "
+                      f"({rows / result['seconds']:>12,.0f} 행/초{memory_text}) [{text}]")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results, args.repeat)
+        print(f"\n💾 기준 측정값 저장: {args.baseline}")
+
+    if regressions:
+        print(f"\n⚠️  기준 대비 {args.tolerance}배를 넘은 단계: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+벤치마크용 Comtrade 형식 합성 데이터
+
+중심점 인덱스에 있는 국가들로 API 응답과 같은 컬럼의 DataFrame을 만듭니다.
+같은 seed로 만들면 항상 같은 데이터가 나오므로 기준 측정값과 비교할 수 있습니다.
+
+    make_trade_frame   - 최종 데이터 API(v1) 응답 형식 (reporterDesc, partnerISO, primaryValue, netWgt ...)
+    make_legacy_frame  - 구 버전 공개 API 응답 형식 (rtTitle, ptTitle, TradeValue, PartnerCodeIsoAlpha3 ...)
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from country_centroids import load_centroid_index  # noqa: E402
+
+# 합성 데이터에 섞어 넣을 HS Code (수집 품목)
+CMD_CODES = np.array(['8541', '8542', '2709', '7403', '3901', '3902', '3903'])
+
+
+def _choose_countries(rows: int, rng: np.random.Generator):
+    index = load_centroid_index()
+    valid = np.flatnonzero(index.m49 >= 0)
+    return index, rng.choice(valid, rows), rng.choice(valid, rows)
+
+
+def _sparse_values(rows: int, rng: np.random.Generator, missing: float = 0.1) -> np.ndarray:
+    # 중량/수량은 실제 응답처럼 일부 행이 비어 있음
+    return np.where(rng.random(rows) < missing, np.nan, rng.uniform(1, 1e6, rows).round(1))
+
+
+def make_trade_frame(rows: int, seed: int = 0, cmd_code: str = None, year: int = 2023) -> pd.DataFrame:
+    """최종 데이터 API 응답 형식의 DataFrame 생성 (cmd_code를 주지 않으면 수집 품목 코드를 섞음)"""
+    rng = np.random.default_rng(seed)
+    index, reporters, partners = _choose_countries(rows, rng)
+    primary_value = rng.uniform(1e3, 1e9, rows).round(2)
+
+    return pd.DataFrame({
+        'typeCode': 'C',
+        'freqCode': 'A',
+        'period': year,
+        'reporterCode': index.m49[reporters],
+        'reporterISO': index.iso3[reporters],
+        'reporterDesc': index.names[reporters],
+        'flowCode': 'M',
+        'partnerCode': index.m49[partners],
+        'partnerISO': index.iso3[partners],
+        'partnerDesc': index.names[partners],
+        'cmdCode': cmd_code or rng.choice(CMD_CODES, rows),
+        'qtyUnitAbbr': 'kg',
+        'qty': _sparse_values(rows, rng),
+        'netWgt': _sparse_values(rows, rng),
+        'cifvalue': primary_value,
+        'fobvalue': np.nan,
+        'primaryValue': primary_value
+    })
+
+
+def make_legacy_frame(rows: int, seed: int = 0, cmd_code: str = '7403', year: int = 2023) -> pd.DataFrame:
+    """구 버전 공개 API(public/v1/get) 응답 형식의 DataFrame 생성 (process_trade_data 입력)"""
+    rng = np.random.default_rng(seed)
+    index, reporters, partners = _choose_countries(rows, rng)
+
+    return pd.DataFrame({
+        'yr': year,
+        'rgCode': 1,
+        'rtCode': index.m49[reporters],
+        'rtTitle': index.names[reporters],
+        'ReporterCodeIsoAlpha3': index.iso3[reporters],
+        'ptCode': index.m49[partners],
+        'ptTitle': index.names[partners],
+        'PartnerCodeIsoAlpha3': index.iso3[partners],
+        'cmdCode': cmd_code,
+        'TradeQuantity': _sparse_values(rows, rng),
+        'NetWeight': _sparse_values(rows, rng),
+        'TradeValue': rng.uniform(1e3, 1e9, rows).round(2)
+    })
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+국가 중심점 인덱스 빌드 스크립트
+
+Natural Earth 국가 경계(geopandas naturalearth_lowres)에서 국가별 중심점을 계산해
+M49 숫자 코드, ISO3 코드, 국가명(UN Comtrade 표기 포함)으로 조회할 수 있는
+압축 numpy 파일(data/reference/country_centroids.npz)로 저장합니다.
+
+수집기들은 실행할 때마다 shapefile을 읽는 대신 이 파일을 country_centroids.py로 불러오므로
+geopandas는 이 빌드 단계에서만 필요합니다.
+
+사용법:
+    python build_centroid_index.py
+    python build_centroid_index.py --output data/reference/country_centroids.npz
+"""
+
+import argparse
+import os
+import sys
+import warnings
+
+import numpy as np
+
+DEFAULT_INDEX_PATH = "./data/reference/country_centroids.npz"
+
+# ISO3 → M49 숫자 코드 (UN Comtrade 기준)
+# 대부분 ISO 3166-1 숫자 코드와 같지만 Comtrade는 일부 국가에 별도 코드를 사용함
+# (미국 842, 프랑스 251, 인도 699, 노르웨이 579, 스위스 757, 대만 490 "Other Asia, nes")
+ISO3_TO_M49 = {
+    "AFG": 4, "AGO": 24, "ALB": 8, "ARE": 784, "ARG": 32, "ARM": 51, "ATA": 10, "ATF": 260,
+    "AUS": 36, "AUT": 40, "AZE": 31, "BDI": 108, "BEL": 56, "BEN": 204, "BFA": 854, "BGD": 50,
+    "BGR": 100, "BHS": 44, "BIH": 70, "BLR": 112, "BLZ": 84, "BOL": 68, "BRA": 76, "BRN": 96,
+    "BTN": 64, "BWA": 72, "CAF": 140, "CAN": 124, "CHE": 757, "CHL": 152, "CHN": 156, "CIV": 384,
+    "CMR": 120, "COD": 180, "COG": 178, "COL": 170, "CRI": 188, "CUB": 192, "CYP": 196, "CZE": 203,
+    "DEU": 276, "DJI": 262, "DNK": 208, "DOM": 214, "DZA": 12, "ECU": 218, "EGY": 818, "ERI": 232,
+    "ESH": 732, "ESP": 724, "EST": 233, "ETH": 231, "FIN": 246, "FJI": 242, "FLK": 238, "FRA": 251,
+    "GAB": 266, "GBR": 826, "GEO": 268, "GHA": 288, "GIN": 324, "GMB": 270, "GNB": 624, "GNQ": 226,
+    "GRC": 300, "GRL": 304, "GTM": 320, "GUY": 328, "HKG": 344, "HND": 340, "HRV": 191, "HTI": 332,
+    "HUN": 348, "IDN": 360, "IND": 699, "IRL": 372, "IRN": 364, "IRQ": 368, "ISL": 352, "ISR": 376,
+    "ITA": 380, "JAM": 388, "JOR": 400, "JPN": 392, "KAZ": 398, "KEN": 404, "KGZ": 417, "KHM": 116,
+    "KOR": 410, "KWT": 414, "LAO": 418, "LBN": 422, "LBR": 430, "LBY": 434, "LKA": 144, "LSO": 426,
+    "LTU": 440, "LUX": 442, "LVA": 428, "MAC": 446, "MAR": 504, "MDA": 498, "MDG": 450, "MEX": 484,
+    "MKD": 807, "MLI": 466, "MMR": 104, "MNE": 499, "MNG": 496, "MOZ": 508, "MRT": 478, "MWI": 454,
+    "MYS": 458, "NAM": 516, "NCL": 540, "NER": 562, "NGA": 566, "NIC": 558, "NLD": 528, "NOR": 579,
+    "NPL": 524, "NZL": 554, "OMN": 512, "PAK": 586, "PAN": 591, "PER": 604, "PHL": 608, "PNG": 598,
+    "POL": 616, "PRI": 630, "PRK": 408, "PRT": 620, "PRY": 600, "PSE": 275, "QAT": 634, "ROU": 642,
+    "RUS": 643, "RWA": 646, "SAU": 682, "SDN": 729, "SEN": 686, "SGP": 702, "SLB": 90, "SLE": 694,
+    "SLV": 222, "SOM": 706, "SRB": 688, "SSD": 728, "SUR": 740, "SVK": 703, "SVN": 705, "SWE": 752,
+    "SWZ": 748, "SYR": 760, "TCD": 148, "TGO": 768, "THA": 764, "TJK": 762, "TKM": 795, "TLS": 626,
+    "TTO": 780, "TUN": 788, "TUR": 792, "TWN": 490, "TZA": 834, "UGA": 800, "UKR": 804, "URY": 858,
+    "USA": 842, "UZB": 860, "VEN": 862, "VNM": 704, "VUT": 548, "YEM": 887, "ZAF": 710, "ZMB": 894,
+    "ZWE": 716
+}
+
+# naturalearth_lowres에 없는 주요 교역 경제권 (ISO3, 이름, 경도, 위도)
+EXTRA_LOCATIONS = [
+    ("HKG", "Hong Kong", 114.17, 22.32),
+    ("MAC", "Macao", 113.55, 22.19),
+    ("SGP", "Singapore", 103.82, 1.35)
+]
+
+# UN Comtrade 표기 국가명 → Natural Earth 국가명
+COMTRADE_NAME_ALIASES = {
+    'Rep. of Korea': 'South Korea',
+    'China, Hong Kong SAR': 'Hong Kong',
+    'China, Macao SAR': 'Macao',
+    'USA': 'United States of America',
+    'Russian Federation': 'Russia',
+    'Viet Nam': 'Vietnam',
+    'Iran (Islamic Rep. of)': 'Iran',
+    'Venezuela (Boliv. Rep. of)': 'Venezuela',
+    'Bolivia (Plurin. State of)': 'Bolivia',
+    'Tanzania (United Rep. of)': 'Tanzania',
+    'United Rep. of Tanzania': 'Tanzania',
+    'Rep. of Moldova': 'Moldova',
+    'Moldova (Rep. of)': 'Moldova',
+    'Macedonia (North)': 'North Macedonia',
+    'Czech Rep.': 'Czechia',
+    'Türkiye': 'Turkey',
+    "Dem. People's Rep. of Korea": 'North Korea',
+    "Lao People's Dem. Rep.": 'Laos',
+    'Other Asia, nes': 'Taiwan',
+    'Syrian Arab Rep.': 'Syria',
+    'Dem. Rep. of the Congo': 'Dem. Rep. Congo',
+    'Bosnia Herzegovina': 'Bosnia and Herz.',
+    'Eswatini': 'eSwatini',
+    'Solomon Isds': 'Solomon Is.',
+    'Falkland Isds (Malvinas)': 'Falkland Is.',
+    'State of Palestine': 'Palestine',
+    'Equatorial Guinea': 'Eq. Guinea',
+    'South Sudan': 'S. Sudan',
+    'Western Sahara': 'W. Sahara',
+    'Fr. South Antarctic Terr.': 'Fr. S. Antarctic Lands'
+}
+
+
+def build_centroid_table():
+    """Natural Earth에서 국가별 중심점 표 생성 (geopandas 필요)
+
+    Returns:
+        (m49, iso3, names, lon, lat) 리스트 튜플
+    """
+    import geopandas as gpd
+
+    with warnings.catch_warnings():
+        # naturalearth_lowres 사용 중단 예고 경고 무시
+        warnings.simplefilter("ignore")
+        world = gpd.read_file(gpd.datasets.get_path('naturalearth_lowres'))
+        centroids = world.geometry.centroid
+
+    m49, iso3, names, lon, lat = [], [], [], [], []
+    for code, name, point in zip(world['iso_a3'], world['name'], centroids):
+        code = code if isinstance(code, str) and code in ISO3_TO_M49 else ''
+        m49.append(ISO3_TO_M49.get(code, -1))
+        iso3.append(code)
+        names.append(name)
+        lon.append(point.x)
+        lat.append(point.y)
+
+    for code, name, x, y in EXTRA_LOCATIONS:
+        if code not in iso3:
+            m49.append(ISO3_TO_M49[code])
+            iso3.append(code)
+            names.append(name)
+            lon.append(x)
+            lat.append(y)
+
+    return m49, iso3, names, lon, lat
+
+
+def write_centroid_index(path: str = DEFAULT_INDEX_PATH) -> str:
+    """중심점 인덱스를 압축 numpy 파일로 저장"""
+    m49, iso3, names, lon, lat = build_centroid_table()
+
+    name_to_row = {name: i for i, name in enumerate(names)}
+    alias_names, alias_index = [], []
+    for alias, name in COMTRADE_NAME_ALIASES.items():
+        if name in name_to_row and alias not in name_to_row:
+            alias_names.append(alias)
+            alias_index.append(name_to_row[name])
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    np.savez_compressed(
+        path,
+        m49=np.array(m49, dtype=np.int16),
+        iso3=np.array(iso3, dtype='<U3'),
+        name=np.array(names, dtype=str),
+        lon=np.array(lon, dtype=np.float64),
+        lat=np.array(lat, dtype=np.float64),
+        alias_name=np.array(alias_names, dtype=str),
+        alias_index=np.array(alias_index, dtype=np.int16)
+    )
+    return path
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="국가 중심점 인덱스(npz) 빌드")
+    parser.add_argument("--output", type=str, default=DEFAULT_INDEX_PATH,
+                       help=f"출력 파일 경로 (기본값: {DEFAULT_INDEX_PATH})")
+
+    args = parser.parse_args()
+
+    try:
+        path = write_centroid_index(args.output)
+    except ImportError:
+        print("❌ 인덱스 빌드에는 geopandas가 필요합니다: pip install geopandas")
+        sys.exit(1)
+
+    print(f"✅ 국가 중심점 인덱스 저장: {path} ({os.path.getsize(path):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,19 +8,59 @@
 사용법:
     python bulk_data_collector.py --start-year 2018 --end-year 2024
     python bulk_data_collector.py --start-year 2020 --end-year 2022 --items semiconductor oil
+    python bulk_data_collector.py --start-year 2018 --end-year 2024 --concurrency 4 --rate 1.0
+    python bulk_data_collector.py --start-year 2018 --end-year 2024 --adaptive --max-concurrency 8
+    python bulk_data_collector.py --start-year 2018 --end-year 2024 --no-batch
+
+증분 갱신 (데이터 공개 정보의 마지막 공개 시각이 카탈로그의 수집 시각보다 늦은 칸만 다시 수집):
+    python bulk_data_collector.py --start-year 2018 --end-year 2024 --refresh
+
+여러 프로세스/호스트로 나눠 수집 (공유 작업 대기열):
+    python bulk_data_collector.py --start-year 2018 --end-year 2024 --enqueue
+    python bulk_data_collector.py --worker --concurrency 2 --rate 1.0    # 프로세스/호스트마다 실행
+
+단계별 소요 시간(p50/p95/p99)과 처리량은 실행 중 Prometheus textfile(collector_metrics.prom)로
+주기적으로 갱신되고, 실행이 끝나면 collection_metrics_*.json 보고서로 저장됩니다.
 """
 
-import comtradeapicall
 import pandas as pd
-import geopandas as gpd
-from shapely.geometry import LineString
+import asyncio
 import json
 import os
+import socket
 import sys
 import argparse
+import heapq
 import time
-from datetime import datetime
-from typing import List, Dict, Tuple
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import List, Dict, Optional, Tuple
+
+from comtrade_client import (fetch_final_data, fetch_data_availability, configure_cache, configure_api, configure_ingest,
+                             configure_splitting, cache_stats, invalidate_cached_data, set_rate_limiter,
+                             classify_error, ComtradeAPIError, API_BASE_URL, API_BASE_URL_ENV, AVAILABILITY_MAX_PERIODS)
+from country_centroids import load_centroid_index
+from geojson_builder import iter_trade_flow_features
+from geojson_writer import write_geojson, geojson_extension, GEOJSON_FORMATS, DEFAULT_GEOJSON_FORMAT
+from rate_limiter import TokenBucket, SharedTokenBucket, DEFAULT_RATE_PER_SECOND
+from adaptive_concurrency import AIMDController, signal_for, SIGNAL_SKIPPED, DEFAULT_MAX_LIMIT
+from collection_summary import CollectionSummary
+from coverage_catalog import (CoverageCatalog, DEFAULT_CATALOG_PATH, DEFAULT_MONTHLY_CATALOG_PATH, CELL_DONE,
+                              CELL_NO_DATA, source_hash)
+from collection_journal import (CollectionJournal, LeaseHeartbeat, JOURNAL_FILENAME, STATUS_PENDING, STATUS_DONE,
+                                STATUS_NO_DATA, STATUS_FAILED, DEFAULT_LEASE_SECONDS, IDLE_POLL_SECONDS, make_task_id,
+                                verify_outputs)
+from request_planner import plan_batches, split_batch_frame, BATCH_MAX_RECORDS, DEFAULT_MAX_CMD_CODES
+from response_cache import DEFAULT_CACHE_PATH
+from trade_store import TradeStore, DEFAULT_STORE_PATH, DEFAULT_HS6_STORE_PATH, DEFAULT_MONTHLY_STORE_PATH
+from hs_nomenclature import leaf_commodity_map, leaf_parent_items
+from hs_rollup import HSRollup
+from publish_artifacts import publish, publish_monthly, artifact_item, DEFAULT_PUBLISH_DIR
+from retry_policy import RetryPolicy, ERROR_EMPTY, DEFAULT_MAX_ATTEMPTS, DEFAULT_BASE_DELAY
+from run_logger import RunLogger
+from ingest_schema import INGEST_SCHEMAS, DEFAULT_INGEST_SCHEMA
+from metrics import get_metrics
 
 # 품목별 HS Code 정의 (GUIDE.md 기준) - 개별 코드로 분리
 COMMODITY_MAP = {
@@ -41,6 +81,14 @@ COMMODITY_GROUPS = {
     "plastic": ["plastic_3901", "plastic_3902", "plastic_3903"]
 }
 
+# 수집 주기 (freqCode): 연간 / 월별
+FREQ_ANNUAL = "A"
+FREQ_MONTHLY = "M"
+DEFAULT_MONTHLY_OUTPUT_DIR = "./data/output/monthly"
+
+# 실행 중 Prometheus textfile 갱신 간격 (초)
+METRICS_EXPORT_INTERVAL = 15.0
+
 # 주요 무역 관계 (보고국-파트너국 조합)
 MAJOR_TRADE_PAIRS = [
     ("842", "156", "USA", "China"),      # 미국 ← 중국
@@ -55,81 +103,118 @@ MAJOR_TRADE_PAIRS = [
     ("156", "842", "China", "USA"),      # 중국 ← 미국 (역방향)
 ]
 
+def last_published_month(year: int, today: Optional[date] = None) -> int:
+    """연도에서 요청할 마지막 월 (지난 연도는 12, 올해는 지난달까지, 미래 연도는 0)"""
+    today = today or date.today()
+    if year < today.year:
+        return 12
+    return today.month - 1 if year == today.year else 0
+
+
+def parse_release_time(value) -> Optional[datetime]:
+    """데이터 공개 정보의 시각 (시간대가 있으면 카탈로그 수집 시각과 같은 로컬 시각으로 변환)"""
+    if not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return moment.astimezone().replace(tzinfo=None) if moment.tzinfo else moment
+
+
+def cell_recorded_at(cell: Optional[Dict]) -> Optional[datetime]:
+    """카탈로그 칸을 API가 마지막으로 확인한 시각 (수집한 칸/데이터 없음 칸의 fetched_at, 그 외 None)
+
+    응답 캐시에서 읽은 칸은 캐시에 저장된 시각이 기록되므로 그 뒤에 다시 공개되었으면 다시 수집합니다.
+    """
+    if not cell:
+        return None
+    if cell['status'] == CELL_DONE:
+        return datetime.fromisoformat(cell['fetched_at']) if cell['fetched_at'] else None
+    if cell['status'] == CELL_NO_DATA:
+        # fetched_at이 없는 예전 칸은 기록 시각
+        return datetime.fromisoformat(cell['fetched_at'] or cell['updated_at'])
+    return None
+
+
+def result_fetched_at(result: Dict) -> Optional[datetime]:
+    """결과의 응답을 API에서 받은 시각 (응답 캐시에서 읽었으면 캐시에 저장된 시각, 새로 받았으면 None)"""
+    cached_at = result.get('cached_at')
+    return datetime.fromtimestamp(cached_at) if cached_at is not None else None
+
+
+def _task_fields(result: Dict) -> Dict:
+    """요약/재시도용으로 남길 작업 결과 (DataFrame 제외)"""
+    return {key: value for key, value in result.items() if key != 'data'}
+
+
 class BulkDataCollector:
-    def __init__(self, output_dir="./data/output"):
+    def __init__(self, output_dir="./data/output", geojson_format=DEFAULT_GEOJSON_FORMAT,
+                 store_path=DEFAULT_STORE_PATH, write_csv=False, publish_dir=DEFAULT_PUBLISH_DIR,
+                 retry_policy: Optional[RetryPolicy] = None, worker_id: Optional[str] = None,
+                 metrics_textfile: Optional[str] = None, catalog_path: Optional[str] = DEFAULT_CATALOG_PATH,
+                 hs6: bool = False, freq: str = FREQ_ANNUAL):
         self.output_dir = output_dir
-        self.country_coords = None
-        self.collected_data = []
+        # 월별 수집은 품목/연도/월 파티션 저장소에 저장하고, 작업마다 저장된 마지막 월 다음 달부터 요청
+        self.freq = freq
+        self.next_months = {}
+        self.collected_periods = set()
+        # 다시 요청했더니 데이터가 없어져 저장소에서 레코드를 지운 (품목, 연도) (산출물 다시 배포)
+        self.withdrawn_cells = set()
+        # HS6 모드는 4단위 품목을 6단위 소호 품목으로 나눠 요청하고, 저장소는 4단위 품목으로 파티션
+        self.hs6 = hs6
+        self.commodity_map = leaf_commodity_map(COMMODITY_MAP, list(COMMODITY_MAP)) if hs6 else COMMODITY_MAP
+        self.partition_items = leaf_parent_items(COMMODITY_MAP, list(COMMODITY_MAP)) if hs6 else {}
+        self.geojson_format = geojson_format
+        # 수집 레코드는 품목/연도 파티션 Parquet 저장소에 추가 (무역 관계별 CSV는 선택)
+        self.store = TradeStore(store_path, monthly=freq == FREQ_MONTHLY) if store_path else None
+        self.write_csv = write_csv
+        # 수집 후 API용 (품목 그룹, 연도) 병합 산출물과 manifest 갱신
+        self.publish_dir = publish_dir
+        # 작업 결과는 실행이 끝나도 남는 수집 범위 카탈로그에도 기록
+        self.catalog = CoverageCatalog(catalog_path) if catalog_path else None
+        # 요청 한도 초과/일시적 오류는 백오프 후 대기열에 다시 넣음
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.centroid_index = None
+        # 성공한 작업은 DataFrame 대신 요약 통계만 누적 (프레임은 저장 직후 해제)
+        self.summary = CollectionSummary()
         self.failed_requests = []
+        self.no_data_requests = []
+        self.retry_count = 0
+        # 공유 작업 대기열 워커로 실행할 때의 워커 이름과 프로세스 간 공유 속도 제한기
+        self.worker_id = worker_id
+        self.rate_limiter = None
+        # 단계별 지표 (comtrade_client와 같은 프로세스 공용 지표)와 Prometheus textfile 경로
+        self.metrics = get_metrics()
+        worker_suffix = f"_{worker_id}" if worker_id else ""
+        self.metrics_textfile = metrics_textfile or os.path.join(output_dir, f"collector_metrics{worker_suffix}.prom")
         
         # 출력 디렉터리 생성
         os.makedirs(output_dir, exist_ok=True)
         
-        # 로그 파일 설정
-        self.log_file = os.path.join(output_dir, f"bulk_collection_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
+        self.journal = None
         
-    def log_message(self, message: str, print_console: bool = True):
-        """메시지를 로그 파일과 콘솔에 출력"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}"
+        # 로그 파일 설정 (JSONL 구조화 이벤트, 백그라운드 스레드가 버퍼링해서 기록)
+        self.log_file = os.path.join(output_dir, f"bulk_collection_log_{self.file_suffix()}.jsonl")
+        self.run_log = RunLogger(self.log_file)
         
+    def file_suffix(self) -> str:
+        """로그/요약 파일명 뒷부분 (워커끼리 파일이 겹치지 않도록 워커 이름 포함)"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return f"{timestamp}_{self.worker_id}" if self.worker_id else timestamp
+    
+    def log_message(self, message: str, print_console: bool = True):
+        """메시지를 콘솔에 출력하고 로그에 message 이벤트로 기록"""
         if print_console:
-            print(log_entry)
-        
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(log_entry + "\n")
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
+        self.run_log.log('message', message=message.strip())
     
     def load_country_coordinates(self):
-        """국가별 중심점 데이터 로딩"""
+        """국가별 중심점 데이터 로딩 (미리 빌드한 중심점 인덱스 사용)"""
         try:
             self.log_message("국가별 중심점 데이터 로딩 중...")
-            world = gpd.read_file(gpd.datasets.get_path('naturalearth_lowres'))
-            world['centroid'] = world.geometry.centroid
-            world['centroid_lon'] = world['centroid'].x
-            world['centroid_lat'] = world['centroid'].y
-            
-            # 국가 코드 매핑 딕셔너리 생성
-            country_coords = {}
-            for idx, row in world.iterrows():
-                if pd.notna(row['iso_a3']):
-                    country_coords[row['iso_a3']] = {
-                        'name': row['name'],
-                        'lon': row['centroid_lon'],
-                        'lat': row['centroid_lat']
-                    }
-                if pd.notna(row['name']):
-                    country_coords[row['name']] = {
-                        'name': row['name'],
-                        'lon': row['centroid_lon'],
-                        'lat': row['centroid_lat']
-                    }
-            
-            # UN Comtrade API 특수 국가명 매핑 추가
-            comtrade_mappings = {
-                'Rep. of Korea': country_coords.get('South Korea', country_coords.get('Korea')),
-                'China, Hong Kong SAR': country_coords.get('Hong Kong'),
-                'China, Macao SAR': country_coords.get('Macao'),
-                'United States of America': country_coords.get('United States of America'),
-                'Russian Federation': country_coords.get('Russia'),
-                'United Kingdom': country_coords.get('United Kingdom'),
-                'Viet Nam': country_coords.get('Vietnam'),
-                'Iran (Islamic Rep. of)': country_coords.get('Iran'),
-                'Venezuela (Boliv. Rep. of)': country_coords.get('Venezuela'),
-                'Bolivia (Plurin. State of)': country_coords.get('Bolivia'),
-                'Tanzania (United Rep. of)': country_coords.get('Tanzania'),
-                'Moldova (Rep. of)': country_coords.get('Moldova'),
-                'Macedonia (North)': country_coords.get('North Macedonia'),
-                'Czechia': country_coords.get('Czech Rep.', country_coords.get('Czech Republic')),
-                'Türkiye': country_coords.get('Turkey')
-            }
-            
-            # 매핑 추가 (None이 아닌 경우만)
-            for comtrade_name, coords in comtrade_mappings.items():
-                if coords:
-                    country_coords[comtrade_name] = coords
-            
-            self.country_coords = country_coords
-            self.log_message(f"국가 좌표 데이터 로딩 완료: {len(country_coords)}개 국가 (UN Comtrade 매핑 포함)")
+            self.centroid_index = load_centroid_index()
+            self.log_message(f"국가 좌표 데이터 로딩 완료: {len(self.centroid_index)}개 국가 (UN Comtrade 매핑 포함)")
             return True
             
         except Exception as e:
@@ -139,29 +224,24 @@ class BulkDataCollector:
     def collect_single_data(self, year: int, item: str, reporter_code: str, partner_code: str, 
                            reporter_name: str, partner_name: str) -> Dict:
         """단일 데이터 수집"""
+        started = time.perf_counter()
         try:
-            self.log_message(f"수집 중: {year}년 {item} {reporter_name}←{partner_name}", print_console=False)
-            
-            # API 호출
-            data = comtradeapicall.getFinalData(
-                subscription_key=None,
-                typeCode='C',
-                freqCode='A',
-                clCode='HS',
-                period=str(year),
-                reporterCode=reporter_code,
-                cmdCode=COMMODITY_MAP[item],
-                flowCode='M',  # 수입
-                partnerCode=partner_code,
-                partner2Code='0',
-                customsCode='C00',
-                motCode='0',
-                maxRecords=100,
-                format_output='JSON',
-                includeDesc=True
+            # API 호출 (캐시 우선)
+            task = {'item': item, 'year': year, 'reporter_code': reporter_code, 'partner_code': partner_code}
+            data = fetch_final_data(
+                period=self.request_period(year, [task]),
+                freq_code=self.freq,
+                reporter_code=reporter_code,
+                cmd_code=self.commodity_map[item],
+                flow_code='M',  # 수입
+                partner_code=partner_code,
+                max_records=100
             )
+            latency = time.perf_counter() - started
+            self.log_request(year, [reporter_code], [partner_code], [self.commodity_map[item]], 1, latency,
+                             records=len(data), **self.response_fields(data))
             
-            if data is not None and isinstance(data, pd.DataFrame) and not data.empty:
+            if not data.empty:
                 return {
                     'success': True,
                     'data': data,
@@ -171,99 +251,300 @@ class BulkDataCollector:
                     'partner_code': partner_code,
                     'reporter_name': reporter_name,
                     'partner_name': partner_name,
-                    'records': len(data)
-                }
-            elif data is not None and isinstance(data, list) and data:
-                return {
-                    'success': True,
-                    'data': pd.DataFrame(data),
-                    'year': year,
-                    'item': item,
-                    'reporter_code': reporter_code,
-                    'partner_code': partner_code,
-                    'reporter_name': reporter_name,
-                    'partner_name': partner_name,
-                    'records': len(data)
+                    'records': len(data),
+                    'from_cache': data.attrs.get('from_cache', False),
+                    'cached_at': data.attrs.get('cached_at'),
+                    'latency': latency
                 }
             else:
                 return {
                     'success': False,
                     'error': 'No data returned',
+                    'error_kind': ERROR_EMPTY,
+                    'from_cache': data.attrs.get('from_cache', False),
+                    'cached_at': data.attrs.get('cached_at'),
+                    'latency': latency,
                     'year': year,
                     'item': item,
+                    'reporter_code': reporter_code,
+                    'partner_code': partner_code,
                     'reporter_name': reporter_name,
                     'partner_name': partner_name
                 }
                 
         except Exception as e:
+            latency = time.perf_counter() - started
+            self.log_request(year, [reporter_code], [partner_code], [self.commodity_map[item]], 1, latency,
+                             error=str(e), error_kind=classify_error(e))
             return {
                 'success': False,
                 'error': str(e),
+                'error_kind': classify_error(e),
+                'retry_after': getattr(e, 'retry_after', None),
+                'timed_out': getattr(e, 'timed_out', False),
+                'latency': latency,
                 'year': year,
                 'item': item,
+                'reporter_code': reporter_code,
+                'partner_code': partner_code,
                 'reporter_name': reporter_name,
                 'partner_name': partner_name
             }
     
+    def collect_batch(self, batch: Dict) -> List[Dict]:
+        """배치 요청 하나를 수집하고 작업별 결과로 분할
+        
+        Returns:
+            batch['tasks'] 순서와 같은 collect_single_data 형식의 결과 목록
+        """
+        tasks = batch['tasks']
+        if self.journal:
+            self.journal.mark_running(tasks)
+        if len(tasks) == 1:
+            return [self.collect_single_data(**tasks[0])]
+        
+        year = batch['year']
+        started = time.perf_counter()
+        try:
+            # API 호출 (쉼표로 구분된 보고국/파트너국/HS Code 목록)
+            data = fetch_final_data(
+                period=self.request_period(year, tasks),
+                freq_code=self.freq,
+                reporter_code=','.join(batch['reporter_codes']),
+                cmd_code=','.join(batch['cmd_codes']),
+                flow_code='M',  # 수입
+                partner_code=','.join(batch['partner_codes']),
+                max_records=BATCH_MAX_RECORDS
+            )
+            latency = time.perf_counter() - started
+            with self.metrics.timer('split_batch'):
+                frames = split_batch_frame(data, batch, self.commodity_map)
+            from_cache, cached_at = data.attrs.get('from_cache', False), data.attrs.get('cached_at')
+            # 요청이 성공했는데 행이 없는 작업은 데이터 없음
+            error, error_kind, retry_after, timed_out = 'No data returned', ERROR_EMPTY, None, False
+            self.log_request(year, batch['reporter_codes'], batch['partner_codes'], batch['cmd_codes'],
+                             len(tasks), latency, records=len(data), **self.response_fields(data))
+        except Exception as e:
+            latency = time.perf_counter() - started
+            frames, from_cache, cached_at = {}, False, None
+            error, error_kind, retry_after = str(e), classify_error(e), getattr(e, 'retry_after', None)
+            timed_out = getattr(e, 'timed_out', False)
+            self.log_request(year, batch['reporter_codes'], batch['partner_codes'], batch['cmd_codes'],
+                             len(tasks), latency, error=error, error_kind=error_kind)
+        
+        results = []
+        for i, task in enumerate(tasks):
+            if i in frames:
+                results.append({
+                    'success': True,
+                    'data': frames[i],
+                    **task,
+                    'records': len(frames[i]),
+                    'from_cache': from_cache,
+                    'cached_at': cached_at,
+                    'latency': latency
+                })
+            else:
+                results.append({
+                    'success': False,
+                    'error': error,
+                    'error_kind': error_kind,
+                    'retry_after': retry_after,
+                    'timed_out': timed_out,
+                    'from_cache': from_cache,
+                    'cached_at': cached_at,
+                    'latency': latency,
+                    **task
+                })
+        return results
+    
+    def request_period(self, year: int, tasks: List[Dict]) -> str:
+        """요청 기간 (연간은 연도, 월별은 작업들이 아직 저장하지 않은 첫 달부터 마지막 공개 월까지의 YYYYMM 목록)"""
+        if self.freq != FREQ_MONTHLY:
+            return str(year)
+        first = min(self.next_months.get(make_task_id(task), 1) for task in tasks)
+        return ','.join(f"{year}{month:02d}" for month in range(first, last_published_month(year) + 1))
+    
+    @property
+    def batch_max_rows(self) -> int:
+        """배치 요청 하나의 예상 행 수 상한 (월별은 작업마다 최대 12개월 행)"""
+        return BATCH_MAX_RECORDS // 12 if self.freq == FREQ_MONTHLY else BATCH_MAX_RECORDS
+    
+    def filter_stored_months(self, tasks: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """월별 수집에서 공개된 달까지 모두 저장된 작업을 걸러내고, 나머지는 요청할 첫 달을 기록
+        
+        작업마다 저장소의 마지막 월 다음 달부터 요청하므로 새로 공개된 달만 추가됩니다.
+        (품목, 연도)마다 해당 파티션만 읽습니다.
+        
+        Returns:
+            (수집할 작업, 이미 최신인 작업)
+        """
+        if self.freq != FREQ_MONTHLY or not self.store:
+            return tasks, []
+        
+        remaining, current = [], []
+        latest = {}
+        for task in tasks:
+            key = (task['item'], task['year'])
+            if key not in latest:
+                latest[key] = self.store.latest_months([task['item']], task['year'])
+            stored = latest[key].get((task['item'], int(task['reporter_code']), int(task['partner_code'])), 0)
+            # 증분 갱신에서 다시 공개된 달이 있으면 그 달부터 다시 요청
+            revised = self.next_months.get(make_task_id(task))
+            if stored >= last_published_month(task['year']) and revised is None:
+                current.append(task)
+                continue
+            self.next_months[make_task_id(task)] = min(stored + 1, revised or stored + 1)
+            remaining.append(task)
+        
+        if current:
+            self.log_message(f"⏭️  월별 수집: 공개된 달까지 저장된 작업 {len(current)}개 건너뜀, 남은 작업 {len(remaining)}개")
+        return remaining, current
+    
+    def stored_month_paths(self, task: Dict) -> List[str]:
+        """월별 저장소에서 작업의 (품목, 연도)에 있는 월 파티션 파일 경로"""
+        partition_item = self.partition_items.get(task['item'], task['item'])
+        paths = [self.store.partition_path(partition_item, task['year'], month) for month in range(1, 13)]
+        return [path for path in paths if os.path.isfile(path)]
+    
+    def catalog_status(self, task: Dict) -> Optional[str]:
+        """카탈로그에 기록된 칸 상태 (기록이 없으면 None)"""
+        cell = self.catalog.get(task['item'], task['year'], task['reporter_code'], task['partner_code'])
+        return cell['status'] if cell else None
+    
+    def release_periods(self, year: int) -> List[str]:
+        """데이터 공개 정보를 요청할 기간 (연간은 연도, 월별은 마지막 공개 월까지의 YYYYMM)"""
+        if self.freq != FREQ_MONTHLY:
+            return [str(year)]
+        return [f"{year}{month:02d}" for month in range(1, last_published_month(year) + 1)]
+    
+    def request_availability(self, periods: str, reporter_codes: str) -> List[Dict]:
+        """데이터 공개 정보 요청 (요청 한도 초과/일시적 오류는 재시도 정책대로 다시 요청)"""
+        attempt = 1
+        while True:
+            try:
+                return fetch_data_availability(periods, reporter_codes, freq_code=self.freq)
+            except ComtradeAPIError as e:
+                if not self.retry_policy.should_retry(e.kind, attempt):
+                    raise
+                delay = self.retry_policy.backoff(attempt, e.retry_after)
+                self.retry_count += 1
+                self.metrics.inc('retries', kind=e.kind)
+                self.log_message(f"   ⏳ 데이터 공개 정보: {e} ({delay:.1f}초 후 재시도 {attempt + 1}/"
+                                 f"{self.retry_policy.max_attempts})")
+                time.sleep(delay)
+                attempt += 1
+    
+    def fetch_releases(self, tasks: List[Dict]) -> Dict[Tuple[str, int], Dict[int, datetime]]:
+        """작업들의 (보고국, 연도)별 마지막 공개 시각
+        
+        모든 보고국을 한 요청에 넣고 기간을 AVAILABILITY_MAX_PERIODS개씩 묶으므로
+        연간 수집은 12개 연도마다, 월별 수집은 연도마다 요청 하나입니다.
+        
+        Returns:
+            {(보고국 코드, 연도): {월(연간은 0): lastReleased}} (공개되지 않은 보고국/연도는 없음)
+        
+        Raises:
+            ComtradeAPIError: 재시도 후에도 공개 정보를 받지 못한 경우
+        """
+        reporter_codes = ','.join(sorted({str(task['reporter_code']) for task in tasks}))
+        periods = [period for year in sorted({int(task['year']) for task in tasks})
+                   for period in self.release_periods(year)]
+        releases = {}
+        for start in range(0, len(periods), AVAILABILITY_MAX_PERIODS):
+            for record in self.request_availability(','.join(periods[start:start + AVAILABILITY_MAX_PERIODS]),
+                                                    reporter_codes):
+                released = parse_release_time(record.get('lastReleased') or record.get('firstReleased'))
+                if released is None:
+                    continue
+                period = str(record.get('period'))
+                key = (str(record.get('reporterCode')), int(period[:4]))
+                releases.setdefault(key, {})[int(period[4:6] or 0)] = released
+        return releases
+    
+    def filter_revised_tasks(self, tasks: List[Dict]) -> Optional[List[Dict]]:
+        """증분 갱신: 카탈로그에 기록한 뒤 다시 공개된 칸과 아직 수집하지 않은 칸만 남김
+        
+        (보고국, 기간)별 마지막 공개 시각(lastReleased)을 칸이 마지막으로 확인된 시각과 비교합니다.
+        아직 공개되지 않은 (보고국, 연도)의 칸은 건너뜁니다. 월별 수집은 다시 공개된 첫 달부터
+        요청하도록 기록하고 작업은 그대로 넘기며, 최신인 작업은 filter_stored_months가 거릅니다.
+        
+        Returns:
+            수집할 작업 (공개 정보를 받지 못하면 None)
+        """
+        try:
+            releases = self.fetch_releases(tasks)
+        except ComtradeAPIError as e:
+            self.log_message(f"❌ 데이터 공개 정보를 받지 못했습니다: {e}")
+            return None
+        
+        remaining = []
+        counts = Counter()
+        cells = {}
+        revised_periods = set()
+        for task in tasks:
+            year = int(task['year'])
+            if year not in cells:
+                cells[year] = {(cell['item'], cell['reporter_code'], cell['partner_code']): cell
+                               for cell in self.catalog.cells(year=year)}
+            released = releases.get((str(task['reporter_code']), year))
+            if not released:
+                counts['unreleased'] += 1
+                continue
+            recorded = cell_recorded_at(cells[year].get(
+                (task['item'], str(task['reporter_code']), str(task['partner_code']))
+            ))
+            revised = sorted(month for month, at in released.items() if recorded is not None and at > recorded)
+            if recorded is None:
+                counts['new'] += 1
+            elif revised:
+                counts['revised'] += 1
+                revised_periods.update((str(task['reporter_code']), f"{year}{month:02d}" if month else str(year))
+                                       for month in revised)
+                if self.freq == FREQ_MONTHLY:
+                    self.next_months[make_task_id(task)] = revised[0]
+            else:
+                counts['unchanged'] += 1
+                # 월별 수집은 새로 공개된 달이 있는지 filter_stored_months가 저장소로 확인
+                if self.freq != FREQ_MONTHLY:
+                    continue
+            remaining.append(task)
+        
+        requests = int(self.metrics.counter('availability_requests'))
+        self.log_message(f"🔄 증분 갱신: 공개 정보 요청 {requests}개, 다시 공개된 칸 {counts['revised']}개, "
+                         f"새 칸 {counts['new']}개, 변경 없음 {counts['unchanged']}개, "
+                         f"공개되지 않음 {counts['unreleased']}개")
+        # 이번 갱신이 요청하지 않는 묶음으로 캐시된 예전 응답도 이후 실행에서 읽히지 않도록 삭제
+        invalidated = invalidate_cached_data(revised_periods)
+        if invalidated:
+            self.log_message(f"🗑️  다시 공개된 (보고국, 기간)의 캐시 응답 {invalidated}개 삭제")
+        self.run_log.log('refresh', availability_requests=requests, invalidated_cache_entries=invalidated, **counts)
+        return remaining
+    
+    def response_fields(self, data: pd.DataFrame) -> Dict:
+        """request 이벤트에 남길 응답 정보 (캐시 적중, 상한에 걸려 나눠 보낸 요청 수, 잘림 여부)"""
+        fields = {'from_cache': data.attrs.get('from_cache', False)}
+        if data.attrs.get('requests', 1) > 1:
+            fields['split_requests'] = data.attrs['requests']
+        if data.attrs.get('truncated'):
+            fields['truncated'] = True
+            self.log_message(f"⚠️  maxRecords 상한에 걸렸지만 더 나눌 수 없는 요청이 있습니다 ({len(data)}행)")
+        return fields
+    
+    def log_request(self, year: int, reporter_codes: List[str], partner_codes: List[str], cmd_codes: List[str],
+                    tasks: int, latency: float, **fields):
+        """API 요청 하나를 request 이벤트로 기록"""
+        self.run_log.log('request', year=year, reporter_codes=reporter_codes, partner_codes=partner_codes,
+                         cmd_codes=cmd_codes, tasks=tasks, latency=round(latency, 4), **fields)
+    
     def process_to_geojson(self, df: pd.DataFrame, item_name: str, year: int, 
                           reporter_name: str, partner_name: str) -> Dict:
-        """데이터를 GeoJSON으로 변환"""
+        """데이터를 GeoJSON으로 변환 (features는 저장할 때 하나씩 만들어지는 이터레이터)"""
         try:
-            features = []
-            processed_count = 0
-            
-            for idx, row in df.iterrows():
-                try:
-                    # 국가명 추출
-                    reporter_desc = row.get('reporterDesc', reporter_name)
-                    partner_desc = row.get('partnerDesc', partner_name)
-                    
-                    # 좌표 찾기
-                    reporter_coords = None
-                    partner_coords = None
-                    
-                    # ISO 코드로 찾기
-                    if row.get('reporterCodeIsoAlpha3'):
-                        reporter_coords = self.country_coords.get(row['reporterCodeIsoAlpha3'])
-                    if row.get('PartnerCodeIsoAlpha3'):
-                        partner_coords = self.country_coords.get(row['PartnerCodeIsoAlpha3'])
-                    
-                    # 이름으로 찾기
-                    if not reporter_coords:
-                        reporter_coords = self.country_coords.get(reporter_desc)
-                    if not partner_coords:
-                        partner_coords = self.country_coords.get(partner_desc)
-                    
-                    if reporter_coords and partner_coords:
-                        # LineString 생성 (파트너국 -> 보고국)
-                        line = LineString([
-                            (partner_coords['lon'], partner_coords['lat']),
-                            (reporter_coords['lon'], reporter_coords['lat'])
-                        ])
-                        
-                        # 속성 정보
-                        properties = {
-                            'reporter_name': reporter_desc,
-                            'partner_name': partner_desc,
-                            'trade_value': float(row.get('primaryValue', 0)),
-                            'net_weight': float(row.get('netWgt', 0)) if pd.notna(row.get('netWgt')) else 0,
-                            'quantity': float(row.get('qty', 0)) if pd.notna(row.get('qty')) else 0,
-                            'item': item_name,
-                            'year': year,
-                            'flow_direction': f"{partner_desc} → {reporter_desc}"
-                        }
-                        
-                        feature = {
-                            'type': 'Feature',
-                            'geometry': line.__geo_interface__,
-                            'properties': properties
-                        }
-                        
-                        features.append(feature)
-                        processed_count += 1
-                        
-                except Exception as e:
-                    continue
+            with self.metrics.timer('geojson_prepare'):
+                features, processed_count = iter_trade_flow_features(
+                    df, self.centroid_index, item_name, year, reporter_name, partner_name
+                )
             
             geojson = {
                 'type': 'FeatureCollection',
@@ -273,7 +554,7 @@ class BulkDataCollector:
                     'year': year,
                     'reporter': reporter_name,
                     'partner': partner_name,
-                    'total_flows': len(features),
+                    'total_flows': processed_count,
                     'processed_records': processed_count,
                     'total_records': len(df),
                     'created_at': datetime.now().isoformat()
@@ -286,39 +567,83 @@ class BulkDataCollector:
             self.log_message(f"GeoJSON 변환 오류: {e}")
             return None
     
+    def get_output_paths(self, result: Dict) -> Tuple[str, str]:
+        """작업의 CSV, GeoJSON 출력 경로"""
+        base_filename = f"trade_{result['item']}_{result['year']}_{result['reporter_code']}_{result['partner_code']}"
+        return (os.path.join(self.output_dir, f"{base_filename}.csv"),
+                os.path.join(self.output_dir, f"{base_filename}{geojson_extension(self.geojson_format)}"))
+    
     def save_data(self, result: Dict, geojson: Dict = None):
-        """데이터를 파일로 저장"""
+        """데이터를 파일로 저장 (저장한 경로는 result['output_paths']에 기록)"""
         try:
-            # 파일명 생성
-            base_filename = f"trade_{result['item']}_{result['year']}_{result['reporter_code']}_{result['partner_code']}"
+            csv_path, geojson_path = self.get_output_paths(result)
+            
+            result['output_paths'] = []
+            
+            # 저장소에 추가 (같은 레코드는 교체, store_batch로 이미 추가한 결과는 경로만 기록)
+            if self.store:
+                partition_item = self.partition_items.get(result['item'], result['item'])
+                if 'stored_paths' in result:
+                    result['output_paths'].extend(result.pop('stored_paths'))
+                else:
+                    with self.metrics.timer('store_append'):
+                        result['output_paths'].extend(
+                            self.store.append_partitions(result['data'], partition_item, result['year'])
+                        )
+                if self.freq == FREQ_MONTHLY:
+                    self.collected_periods.update(
+                        (partition_item, str(period)) for period in result['data']['period'].unique()
+                    )
             
             # CSV 저장
-            csv_path = os.path.join(self.output_dir, f"{base_filename}.csv")
-            result['data'].to_csv(csv_path, index=False, encoding='utf-8-sig')
+            if self.write_csv:
+                with self.metrics.timer('csv_write'):
+                    result['data'].to_csv(csv_path, index=False, encoding='utf-8-sig')
+                result['output_paths'].append(csv_path)
+                result['bytes_written'] = result.get('bytes_written', 0) + os.path.getsize(csv_path)
             
-            # GeoJSON 저장
+            # GeoJSON 저장 (Feature를 하나씩 직렬화)
             if geojson:
-                geojson_path = os.path.join(self.output_dir, f"{base_filename}.geojson")
-                with open(geojson_path, 'w', encoding='utf-8') as f:
-                    json.dump(geojson, f, indent=2, ensure_ascii=False)
+                with self.metrics.timer('geojson_write'):
+                    write_geojson(geojson_path, geojson, self.geojson_format)
+                result['output_paths'].append(geojson_path)
+                result['bytes_written'] = result.get('bytes_written', 0) + os.path.getsize(geojson_path)
             
+            self.metrics.inc('bytes_written', result.get('bytes_written', 0))
             return True
             
         except Exception as e:
             self.log_message(f"파일 저장 오류: {e}")
             return False
     
-    def collect_bulk_data(self, start_year: int, end_year: int, items: List[str] = None, 
-                         trade_pairs: List[Tuple] = None, delay_seconds: float = 1.0):
-        """대량 데이터 수집"""
+    def store_batch(self, results: List[Dict]):
+        """배치 요청의 성공 결과를 저장소 파티션마다 한 번에 추가
         
-        # 기본값 설정 및 품목 그룹 확장
-        if items is None:
-            items = list(COMMODITY_GROUPS.keys())
-        if trade_pairs is None:
-            trade_pairs = MAJOR_TRADE_PAIRS
-        
-        # 품목 그룹을 개별 품목으로 확장
+        파티션 추가는 파티션 파일 전체를 읽고 다시 쓰므로 작업마다 추가하지 않고 묶어서 추가합니다.
+        추가한 결과에는 result['stored_paths']를 기록하고, save_data는 저장소 추가를 건너뜁니다.
+        (추가에 실패한 묶음은 save_data가 작업마다 다시 시도)
+        """
+        if not self.store:
+            return
+        groups = {}
+        for result in results:
+            if result['success']:
+                key = (self.partition_items.get(result['item'], result['item']), result['year'])
+                groups.setdefault(key, []).append(result)
+        for (item, year), group in groups.items():
+            try:
+                with self.metrics.timer('store_append'):
+                    paths = self.store.append_partitions(
+                        pd.concat([result['data'] for result in group], ignore_index=True), item, year
+                    )
+            except Exception as e:
+                self.log_message(f"저장소 추가 오류: {e}")
+                continue
+            for result in group:
+                result['stored_paths'] = paths
+    
+    def expand_items(self, items: List[str]) -> List[str]:
+        """품목 그룹을 개별 품목으로 확장 (HS6 모드에서는 6단위 소호 품목까지 확장)"""
         expanded_items = []
         for item in items:
             if item in COMMODITY_GROUPS:
@@ -327,13 +652,188 @@ class BulkDataCollector:
                 expanded_items.append(item)
             else:
                 self.log_message(f"⚠️  알 수 없는 품목: {item}")
+        if self.hs6:
+            return list(leaf_commodity_map(COMMODITY_MAP, expanded_items))
+        return expanded_items
+    
+    @staticmethod
+    def build_tasks(start_year: int, end_year: int, items: List[str],
+                    trade_pairs: List[Tuple]) -> List[Dict]:
+        """연도 × 품목 × 무역 관계 작업 목록 생성"""
+        tasks = []
+        for year in range(start_year, end_year + 1):
+            for item in items:
+                for reporter_code, partner_code, reporter_name, partner_name in trade_pairs:
+                    tasks.append({
+                        'year': year,
+                        'item': item,
+                        'reporter_code': reporter_code,
+                        'partner_code': partner_code,
+                        'reporter_name': reporter_name,
+                        'partner_name': partner_name
+                    })
+        return tasks
+    
+    def store_result(self, result: Dict) -> bool:
+        """수집 결과를 GeoJSON으로 변환하고 파일로 저장 (월별 결과는 저장소에만 저장하고 월별 산출물로 배포)"""
+        started = time.perf_counter()
+        geojson = None if self.freq == FREQ_MONTHLY else self.process_to_geojson(
+            result['data'], result['item'], result['year'],
+            result['reporter_name'], result['partner_name']
+        )
+        saved = self.save_data(result, geojson)
+        result['save_seconds'] = time.perf_counter() - started
+        return saved
+    
+    def record_result(self, result: Dict, saved: bool) -> bool:
+        """수집/저장 결과를 집계하고 로그에 task 이벤트로 기록"""
+        try:
+            return self._record_result(result, saved)
+        finally:
+            # 저장이 끝난 DataFrame은 실행이 끝날 때까지 들고 있지 않음
+            result.pop('data', None)
+            self.metrics.maybe_write_prometheus(self.metrics_textfile, METRICS_EXPORT_INTERVAL,
+                                                **self.metrics_labels())
+    
+    def _record_result(self, result: Dict, saved: bool) -> bool:
+        if result['success'] and saved:
+            self.metrics.inc('tasks', status=STATUS_DONE)
+            self.metrics.inc('records', result['records'])
+            stats = self.summary.add(result)
+            if self.journal:
+                self.journal.mark_done(result, result['records'], result.get('output_paths', []))
+            if self.catalog:
+                self.catalog.record_done(result, result['records'], stats['trade_value'],
+                                         source_hash(result['data']), fetched_at=result_fetched_at(result))
+            self.log_task(result, STATUS_DONE, trade_value=stats['trade_value'])
+            return True
+        
+        if not result['success'] and result.get('error_kind') == ERROR_EMPTY:
+            self.no_data_requests.append(_task_fields(result))
+            self.metrics.inc('tasks', status=STATUS_NO_DATA)
+            if self.journal:
+                self.journal.mark_no_data(result)
+            if self.catalog:
+                cell = self.catalog.get(result['item'], result['year'], result['reporter_code'],
+                                        result['partner_code'])
+                # 캐시에서 읽은 예전 응답으로는 저장된 (더 새로울 수 있는) 데이터를 지우지 않음
+                if cell and cell['status'] == CELL_DONE and not result.get('from_cache'):
+                    self.drop_withdrawn_cell(result)
+                else:
+                    self.catalog.record_no_data(result, fetched_at=result_fetched_at(result))
+            self.log_task(result, STATUS_NO_DATA)
+            return False
+        
+        self.failed_requests.append(_task_fields(result))
+        self.metrics.inc('tasks', status=STATUS_FAILED)
+        self.metrics.inc('errors', kind=result.get('error_kind') or 'save')
+        if self.journal:
+            self.journal.mark_failed(result, result.get('error', '파일 저장 오류'))
+        if self.catalog:
+            self.catalog.record_failed(result, result.get('error', '파일 저장 오류'))
+        self.log_task(result, STATUS_FAILED, error=result.get('error', '파일 저장 오류'),
+                      error_kind=result.get('error_kind'))
+        return False
+    
+    def drop_withdrawn_cell(self, result: Dict):
+        """수집했던 칸을 다시 요청하니 (캐시가 아닌 새 응답에) 데이터가 없으면 저장소 레코드를 지우고
+        카탈로그를 데이터 없음으로 기록
+        
+        월별 수집은 요청한 달(저장된 마지막 월 다음 달 또는 다시 공개된 첫 달)부터의 레코드만 지우고,
+        1월부터 요청했을 때만 칸 전체를 데이터 없음으로 바꿉니다.
+        """
+        first_month = self.next_months.get(make_task_id(result), 1) if self.freq == FREQ_MONTHLY else 1
+        if self.store:
+            partition_item = self.partition_items.get(result['item'], result['item'])
+            try:
+                removed = self.store.delete_rows(
+                    partition_item, result['year'], result['reporter_code'], result['partner_code'],
+                    cmd_codes=[self.commodity_map[result['item']]],
+                    months=range(first_month, 13) if self.freq == FREQ_MONTHLY else None
+                )
+            except Exception as e:
+                self.log_message(f"저장소 레코드 삭제 오류: {e}")
+                self.catalog.record_failed(result, f"저장소 레코드 삭제 오류: {e}")
+                return
+            if removed:
+                self.log_message(f"🗑️  데이터가 없어진 칸: {make_task_id(result)} ({len(removed)}개 기간의 레코드 삭제)")
+                self.withdrawn_cells.add((result['item'], int(result['year'])))
+                if self.freq == FREQ_MONTHLY:
+                    self.collected_periods.update((partition_item, period) for period in removed)
+        if first_month == 1:
+            self.catalog.record_no_data(result, replace=True)
+        else:
+            self.catalog.record_no_data(result)
+    
+    def log_task(self, result: Dict, status: str, **fields):
+        """작업 하나의 최종 결과를 task 이벤트로 기록 (요청 지연, 저장 시간, 기록한 바이트, 레코드 수)"""
+        self.run_log.log('task', task_id=make_task_id(result), status=status,
+                         records=result.get('records', 0), latency=round(result.get('latency', 0.0), 4),
+                         save_seconds=round(result.get('save_seconds', 0.0), 4),
+                         bytes=result.get('bytes_written', 0), from_cache=result.get('from_cache', False),
+                         progress=result.get('progress'), **fields)
+    
+    def schedule_retry(self, batch: Dict, results: List[Dict]) -> Optional[float]:
+        """배치 요청이 재시도할 만한 오류로 실패했으면 다음 시도까지 기다릴 시간(초)을 반환
+        
+        요청 자체가 실패하면 배치의 모든 작업이 같은 오류를 가지므로 첫 결과로 판단합니다.
+        재시도하지 않으면 None을 반환하고, 결과는 그대로 집계됩니다.
+        """
+        first = results[0]
+        attempt = batch.get('attempt', 1)
+        if first['success'] or not self.retry_policy.should_retry(first.get('error_kind'), attempt):
+            return None
+        
+        delay = self.retry_policy.backoff(attempt, first.get('retry_after'))
+        batch['attempt'] = attempt + 1
+        self.retry_count += 1
+        self.metrics.inc('retries', kind=first['error_kind'])
+        if self.journal:
+            self.journal.mark_retrying(batch['tasks'], first['error'])
+        self.run_log.log('retry', task_ids=[make_task_id(task) for task in batch['tasks']],
+                         error=first['error'], error_kind=first['error_kind'], attempt=attempt,
+                         max_attempts=self.retry_policy.max_attempts, delay=round(delay, 3))
+        return delay
+    
+    def collect_bulk_data(self, start_year: int, end_year: int, items: List[str] = None, 
+                         trade_pairs: List[Tuple] = None, delay_seconds: float = 1.0,
+                         concurrency: int = 1, rate_per_second: Optional[float] = DEFAULT_RATE_PER_SECOND,
+                         batch_requests: bool = True, max_cmd_codes: int = DEFAULT_MAX_CMD_CODES,
+                         resume: bool = False, adaptive: bool = False, max_concurrency: int = DEFAULT_MAX_LIMIT,
+                         refresh: bool = False):
+        """대량 데이터 수집
+        
+        concurrency가 1이면 기존처럼 요청마다 delay_seconds만큼 대기하며 순차 수집하고,
+        2 이상이면 토큰 버킷(rate_per_second)으로 속도를 제한하는 동시 수집 엔진을 사용합니다.
+        adaptive가 True이면 동시 수집 엔진의 동시 요청 수를 AIMD 제어기가 응답 지연과
+        429/시간 초과에 맞춰 최대 max_concurrency개까지 조절합니다 (delay_seconds/concurrency 무시,
+        rate_per_second가 None이면 고정 속도 상한 없음).
+        batch_requests가 True이면 여러 보고국/파트너국(최대 max_cmd_codes개 HS Code)을
+        하나의 요청으로 묶고 응답을 무역 관계별 결과로 나눕니다.
+        모든 작업 상태는 출력 디렉터리의 작업 저널에 기록되며, resume이 True이면
+        출력 파일이 확인된 완료 작업은 건너뜁니다.
+        refresh가 True이면 데이터 공개 정보로 카탈로그에 기록한 뒤 다시 공개된 칸과
+        아직 수집하지 않은 칸만 수집합니다 (증분 갱신, 카탈로그 필요).
+        """
+        
+        # 기본값 설정 및 품목 그룹 확장
+        if items is None:
+            items = list(COMMODITY_GROUPS.keys())
+        if trade_pairs is None:
+            trade_pairs = MAJOR_TRADE_PAIRS
         
-        items = expanded_items
+        items = self.expand_items(items)
         
         self.log_message("=== 대량 데이터 수집 시작 ===")
         self.log_message(f"연도 범위: {start_year}-{end_year}")
         self.log_message(f"품목: {', '.join(items)}")
         self.log_message(f"무역 관계: {len(trade_pairs)}개")
+        controller = self.make_controller(max_concurrency) if adaptive else None
+        if controller:
+            self.log_message(f"적응형 동시 수집: 동시 요청 최대 {max_concurrency}개까지 자동 조절"
+                             + (f", 초당 {rate_per_second}회 상한" if rate_per_second else ""))
+        elif concurrency > 1:
+            self.log_message(f"동시 수집: 동시 요청 {concurrency}개, 초당 {rate_per_second}회 제한")
         
         # 국가 좌표 로딩
         if not self.load_country_coordinates():
@@ -341,62 +841,70 @@ class BulkDataCollector:
             return False
         
         # 총 작업 수 계산
-        total_tasks = len(range(start_year, end_year + 1)) * len(items) * len(trade_pairs)
-        self.log_message(f"총 {total_tasks}개 작업 예정")
+        tasks = self.build_tasks(start_year, end_year, items, trade_pairs)
         
-        completed_tasks = 0
-        successful_collections = 0
+        # 작업 저널 등록 및 이어하기
+        self.journal = CollectionJournal(os.path.join(self.output_dir, JOURNAL_FILENAME))
+        self.journal.register(tasks, self.partition_items)
+        if resume:
+            tasks = self.filter_completed_tasks(tasks)
+        if refresh:
+            tasks = self.filter_revised_tasks(tasks)
+            if tasks is None:
+                return False
+        tasks, _ = self.filter_stored_months(tasks)
         
-        # 연도별 수집
-        for year in range(start_year, end_year + 1):
-            self.log_message(f"\n📅 {year}년 데이터 수집 시작")
-            
-            # 품목별 수집
-            for item in items:
-                self.log_message(f"  📦 {item} 수집 중...")
-                
-                # 무역 관계별 수집
-                for reporter_code, partner_code, reporter_name, partner_name in trade_pairs:
-                    completed_tasks += 1
-                    
-                    # 진행률 표시
-                    progress = (completed_tasks / total_tasks) * 100
-                    self.log_message(f"    [{completed_tasks}/{total_tasks}] ({progress:.1f}%) {reporter_name}←{partner_name}", print_console=False)
-                    
-                    # 데이터 수집
-                    result = self.collect_single_data(
-                        year, item, reporter_code, partner_code, reporter_name, partner_name
-                    )
-                    
-                    if result['success']:
-                        # GeoJSON 변환
-                        geojson = self.process_to_geojson(
-                            result['data'], item, year, reporter_name, partner_name
-                        )
-                        
-                        # 파일 저장
-                        if self.save_data(result, geojson):
-                            successful_collections += 1
-                            self.collected_data.append(result)
-                            
-                            # 성공 로그
-                            trade_value = result['data']['primaryValue'].sum() if 'primaryValue' in result['data'].columns else 0
-                            self.log_message(f"      ✅ ${trade_value:,.0f} ({result['records']} 레코드)", print_console=False)
-                        else:
-                            self.failed_requests.append(result)
-                    else:
-                        self.failed_requests.append(result)
-                        self.log_message(f"      ❌ {result.get('error', 'Unknown error')}", print_console=False)
-                    
-                    # API 제한을 위한 지연
-                    if delay_seconds > 0:
-                        time.sleep(delay_seconds)
+        total_tasks = len(tasks)
+        if total_tasks == 0:
+            self.log_message("✅ 모든 작업이 이미 완료되었습니다.")
+            return True
+        
+        # 요청 배치 계획
+        if batch_requests:
+            batches = plan_batches(tasks, self.commodity_map, max_cmd_codes=max_cmd_codes,
+                                       max_rows=self.batch_max_rows)
+        else:
+            batches = [{'year': task['year'], 'tasks': [task]} for task in tasks]
+        self.log_message(f"총 {total_tasks}개 작업 예정 (API 요청 {len(batches)}개)")
         
+        if controller or concurrency > 1:
+            successful_collections = asyncio.run(
+                self.collect_concurrent(batches, total_tasks, concurrency, rate_per_second, controller)
+            )
+        else:
+            successful_collections = self.collect_sequential(batches, total_tasks, delay_seconds)
+        
+        self.report_results(total_tasks, successful_collections)
+        
+        # API용 병합 산출물 배포
+        self.publish_collected()
+        
+        return successful_collections > 0
+    
+    @staticmethod
+    def controller_feedback(results: List[Dict]) -> Tuple[Optional[float], str]:
+        """배치 요청 결과를 AIMD 제어기에 알릴 (응답 지연, 신호)로 변환"""
+        if not results:
+            return None, SIGNAL_SKIPPED
+        # 배치의 모든 작업은 같은 요청 결과를 공유하므로 첫 결과로 판단
+        first = results[0]
+        error_kind = None if first['success'] else first.get('error_kind')
+        return first.get('latency'), signal_for(error_kind, first.get('timed_out', False),
+                                                 first.get('from_cache', False))
+    
+    def make_controller(self, max_concurrency: int) -> AIMDController:
+        """동시 요청 수를 조절할 AIMD 제어기 (현재 한도와 초당 요청 수는 지표 게이지로 기록)"""
+        return AIMDController(max_limit=max_concurrency, metrics=self.metrics)
+    
+    def report_results(self, total_tasks: int, successful_collections: int):
+        """최종 결과 요약을 로그에 기록하고 요약 파일 저장"""
         # 최종 결과 요약
         self.log_message(f"\n🎉 대량 수집 완료!")
         self.log_message(f"   - 총 작업: {total_tasks}")
         self.log_message(f"   - 성공: {successful_collections}")
+        self.log_message(f"   - 데이터 없음: {len(self.no_data_requests)}")
         self.log_message(f"   - 실패: {len(self.failed_requests)}")
+        self.log_message(f"   - 재시도: {self.retry_count}회")
         self.log_message(f"   - 성공률: {(successful_collections/total_tasks)*100:.1f}%")
         
         # 실패 요약
@@ -412,36 +920,387 @@ class BulkDataCollector:
             for key, count in failure_summary.items():
                 self.log_message(f"   - {key}: {count}개")
         
+        # 응답 캐시 통계
+        stats = cache_stats()
+        if stats:
+            self.log_message(f"\n💾 응답 캐시: 적중 {stats['hits']}회, 미스 {stats['misses']}회 "
+                             f"(적중률 {stats['hit_rate']*100:.1f}%), 저장 {stats['entries']}개")
+        
+        self.run_log.log('summary', total_tasks=total_tasks, successful=successful_collections,
+                         no_data=len(self.no_data_requests), failed=len(self.failed_requests),
+                         retries=self.retry_count, cache=stats)
+        
         # 수집된 데이터 요약 저장
         self.save_summary()
+        self.save_metrics(total_tasks, successful_collections)
+        self.run_log.flush()
+    
+    def metrics_labels(self) -> Dict[str, str]:
+        """Prometheus 지표에 붙일 공통 레이블"""
+        labels = {'collector': 'bulk'}
+        if self.worker_id:
+            labels['worker'] = self.worker_id
+        return labels
+    
+    def save_metrics(self, total_tasks: int, successful_collections: int):
+        """단계별 지표 요약을 출력하고 Prometheus textfile과 JSON 보고서 저장"""
+        try:
+            self.log_message(f"\n⏱️  단계별 소요 시간:\n{self.metrics.format_summary()}")
+            self.metrics.write_prometheus(self.metrics_textfile, **self.metrics_labels())
+            report_path = os.path.join(self.output_dir, f"collection_metrics_{self.file_suffix()}.json")
+            self.metrics.write_report(report_path, collector='bulk', worker=self.worker_id,
+                                      total_tasks=total_tasks, successful=successful_collections)
+            self.run_log.log('metrics', report=report_path, textfile=self.metrics_textfile)
+            self.log_message(f"📈 지표 보고서 저장: {report_path}")
+        except Exception as e:
+            self.log_message(f"지표 저장 오류: {e}")
+    
+    def enqueue_tasks(self, queue_path: str, start_year: int, end_year: int, items: List[str] = None,
+                      trade_pairs: List[Tuple] = None, resume: bool = False, refresh: bool = False) -> int:
+        """작업을 공유 작업 대기열(작업 저널)에 등록
         
-        return successful_collections > 0
+        resume이 False이면 이미 끝난 작업도 다시 수집하도록 pending으로 되돌리고,
+        True이면 완료/데이터 없음 작업은 그대로 두고 나머지만 되돌립니다.
+        refresh가 True이면 다시 공개된 칸과 아직 수집하지 않은 칸만 등록하고 되돌립니다 (연간 수집만).
+        카탈로그에 데이터 없음으로 기록된 칸은 데이터 없음으로 등록하고, 변경 없는 칸과
+        아직 공개되지 않은 칸은 등록하지 않습니다.
+        
+        Returns:
+            수집 대기 중인 작업 수
+        """
+        items = self.expand_items(items or list(COMMODITY_GROUPS.keys()))
+        tasks = self.build_tasks(start_year, end_year, items, trade_pairs or MAJOR_TRADE_PAIRS)
+        
+        self.journal = CollectionJournal(queue_path, wal=False)
+        if refresh:
+            revised = self.filter_revised_tasks(tasks)
+            if revised is None:
+                return 0
+            kept = {make_task_id(task) for task in revised}
+            # 다시 수집하지 않는 칸 중 데이터 없음 칸만 이어하기가 건너뛰도록 데이터 없음으로 등록
+            no_data = [task for task in tasks
+                       if make_task_id(task) not in kept and self.catalog_status(task) == CELL_NO_DATA]
+            self.journal.register(revised + no_data, self.partition_items)
+            for task in no_data:
+                if self.journal.get(task)['status'] in (STATUS_PENDING, STATUS_FAILED):
+                    self.journal.mark_no_data(task)
+            tasks = revised
+        else:
+            self.journal.register(tasks, self.partition_items)
+            if resume:
+                tasks = self.filter_completed_tasks(tasks)
+        self.journal.reset_tasks(tasks)
+        
+        self.log_message(f"📥 작업 대기열 등록: {len(tasks)}개 작업 → {queue_path}")
+        return len(tasks)
+    
+    def run_worker(self, queue_path: str, delay_seconds: float = 1.0, concurrency: int = 1,
+                   rate_per_second: Optional[float] = DEFAULT_RATE_PER_SECOND,
+                   lease_seconds: float = DEFAULT_LEASE_SECONDS, batch_requests: bool = True,
+                   max_cmd_codes: int = DEFAULT_MAX_CMD_CODES, adaptive: bool = False,
+                   max_concurrency: int = DEFAULT_MAX_LIMIT) -> bool:
+        """공유 작업 대기열에서 (연도, 저장소 파티션 품목) 묶음을 임대해 대기열이 빌 때까지 수집
+        
+        모든 워커는 대기열 파일의 공유 토큰 버킷으로 전체 요청 속도(rate_per_second)를 나눠 쓰므로
+        워커 수를 늘려도 API 할당량을 넘지 않습니다. 다른 워커가 임대 중인 작업이 남아 있으면
+        그 작업이 끝나거나 임대가 만료될 때까지 짧은 간격으로 확인하다가 가져가고,
+        남은 작업이 모두 끝나면 바로 종료합니다.
+        adaptive가 True이면 워커마다 AIMD 제어기로 동시 요청 수를 조절하고, 제어기 상태는
+        임대한 묶음이 바뀌어도 이어집니다. rate_per_second가 None이면 공유 토큰 버킷을 쓰지 않습니다.
+        """
+        worker_id = self.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.log_message(f"=== 수집 워커 시작: {worker_id} ===")
+        
+        if not self.load_country_coordinates():
+            self.log_message("❌ 국가 좌표 데이터 로딩 실패")
+            return False
+        
+        self.journal = CollectionJournal(queue_path, wal=False)
+        if rate_per_second:
+            self.rate_limiter = SharedTokenBucket(queue_path, rate=rate_per_second)
+        previous_limiter = set_rate_limiter(self.rate_limiter)
+        controller = self.make_controller(max_concurrency) if adaptive else None
+        
+        total_tasks = 0
+        successful_collections = 0
+        try:
+            with LeaseHeartbeat(self.journal, worker_id, lease_seconds):
+                while True:
+                    tasks = self.journal.claim(worker_id, lease_seconds)
+                    if not tasks:
+                        expiry = self.journal.next_lease_expiry()
+                        if expiry is None:
+                            break
+                        # 다른 워커가 작업을 끝내면 임대가 바로 풀리므로 만료까지 기다리지 않고 짧게 다시 확인
+                        time.sleep(min(max(expiry - time.time(), 1.0), IDLE_POLL_SECONDS))
+                        continue
+                    
+                    partition_item = self.partition_items.get(tasks[0]['item'], tasks[0]['item'])
+                    self.log_message(f"\n📥 {tasks[0]['year']}년 {partition_item} 임대 ({len(tasks)}개 작업)")
+                    tasks, current = self.filter_stored_months(tasks)
+                    # 공개된 달까지 이미 저장된 작업은 저장소의 월 파티션 파일을 출력으로 기록
+                    for task in current:
+                        self.journal.mark_done(task, 0, self.stored_month_paths(task))
+                    if not tasks:
+                        continue
+                    if batch_requests:
+                        batches = plan_batches(tasks, self.commodity_map, max_cmd_codes=max_cmd_codes,
+                                       max_rows=self.batch_max_rows)
+                    else:
+                        batches = [{'year': task['year'], 'tasks': [task]} for task in tasks]
+                    
+                    total_tasks += len(tasks)
+                    if controller or concurrency > 1:
+                        successful_collections += asyncio.run(
+                            self.collect_concurrent(batches, len(tasks), concurrency, rate_per_second,
+                                                    controller)
+                        )
+                    else:
+                        successful_collections += self.collect_sequential(batches, len(tasks), delay_seconds)
+        except BaseException:
+            # 끝내지 못한 작업은 다른 워커가 바로 가져가도록 반납
+            self.journal.release(worker_id)
+            raise
+        finally:
+            set_rate_limiter(previous_limiter)
+        
+        if total_tasks == 0:
+            self.log_message("✅ 대기열에 남은 작업이 없습니다.")
+            return True
+        
+        self.report_results(total_tasks, successful_collections)
+        return True
+    
+    def publish_collected(self):
+        """이번 실행에서 수집한 (품목 그룹, 연도) 산출물과 manifest 갱신 (HS6 모드는 합계 캐시 갱신)"""
+        if not self.store or not (len(self.summary) or self.withdrawn_cells):
+            return
+        if self.hs6:
+            self.refresh_rollups()
+            return
+        if not self.publish_dir:
+            return
+        if self.freq == FREQ_MONTHLY:
+            self.publish_collected_months()
+            return
+        
+        items = sorted({artifact_item(item) for item in self.summary.items()} |
+                       {artifact_item(item) for item, _ in self.withdrawn_cells})
+        years = sorted(set(self.summary.years()) | {year for _, year in self.withdrawn_cells})
+        try:
+            self.log_message(f"\n📤 API 산출물 배포: {', '.join(items)} ({years[0]}-{years[-1]})")
+            publish(self.store, self.publish_dir, items, years)
+        except Exception as e:
+            self.log_message(f"산출물 배포 오류: {e}")
+    
+    def publish_collected_months(self):
+        """이번 실행에서 저장한 (품목 그룹, 연월) 월별 산출물과 manifest_monthly.json 갱신"""
+        items = sorted({artifact_item(item) for item, _ in self.collected_periods})
+        periods = sorted({period for _, period in self.collected_periods})
+        if not periods:
+            return
+        try:
+            self.log_message(f"\n📤 월별 산출물 배포: {', '.join(items)} ({periods[0]}-{periods[-1]})")
+            publish_monthly(self.store, self.publish_dir, items, periods=periods)
+        except Exception as e:
+            self.log_message(f"산출물 배포 오류: {e}")
+    
+    def refresh_rollups(self):
+        """이번 실행에서 수집하거나 레코드를 지운 연도의 HS4/HS2/품목/품목 그룹 합계 캐시 갱신"""
+        years = sorted(set(self.summary.years()) | {year for _, year in self.withdrawn_cells})
+        try:
+            self.log_message(f"\n🧮 HS 계층 합계 캐시 갱신: {years[0]}-{years[-1]}")
+            HSRollup(self.store).refresh(years)
+        except Exception as e:
+            self.log_message(f"합계 캐시 갱신 오류: {e}")
+    
+    def filter_completed_tasks(self, tasks: List[Dict]) -> List[Dict]:
+        """저널에서 완료된 작업과 데이터 없음 작업을 제외 (출력 파일이 없거나 비어 있으면 다시 수집)"""
+        remaining = []
+        skipped = 0
+        invalid = 0
+        for task in tasks:
+            entry = self.journal.get(task)
+            if entry and entry['status'] == STATUS_NO_DATA:
+                skipped += 1
+                continue
+            if entry and entry['status'] == STATUS_DONE:
+                if verify_outputs(entry['output_paths']):
+                    skipped += 1
+                    continue
+                invalid += 1
+                self.journal.reset(task)
+            remaining.append(task)
+        
+        self.log_message(f"⏭️  이어하기: 완료된 작업 {skipped}개 건너뜀, 남은 작업 {len(remaining)}개")
+        if invalid:
+            self.log_message(f"⚠️  출력 파일이 없거나 비어 있는 완료 작업 {invalid}개를 다시 수집합니다")
+        return remaining
+    
+    def collect_sequential(self, batches: List[Dict], total_tasks: int, delay_seconds: float) -> int:
+        """배치를 하나씩 순서대로 수집 (요청마다 고정 지연)
+        
+        재시도할 배치는 백오프 시간이 지난 뒤 다시 꺼내도록 (준비 시각, 순번) 힙에 넣고,
+        그동안 나머지 배치를 계속 수집합니다.
+        """
+        successful_collections = 0
+        completed_tasks = 0
+        current_year = None
+        
+        queue = [(0.0, seq, batch) for seq, batch in enumerate(batches)]
+        next_seq = len(queue)
+        
+        while queue:
+            ready_at, _, batch = heapq.heappop(queue)
+            wait = ready_at - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            
+            if batch['year'] != current_year:
+                current_year = batch['year']
+                self.log_message(f"\n📅 {current_year}년 데이터 수집 시작")
+            batch_items = list(dict.fromkeys(task['item'] for task in batch['tasks']))
+            self.log_message(f"  📦 {', '.join(batch_items)} 수집 중...")
+            
+            # 데이터 수집
+            results = self.collect_batch(batch)
+            
+            retry_delay = self.schedule_retry(batch, results)
+            if retry_delay is not None:
+                heapq.heappush(queue, (time.monotonic() + retry_delay, next_seq, batch))
+                next_seq += 1
+                continue
+            
+            self.store_batch(results)
+            for result in results:
+                completed_tasks += 1
+                # 진행률 (task 이벤트에 기록)
+                result['progress'] = [completed_tasks, total_tasks]
+                
+                # 저장
+                saved = result['success'] and self.store_result(result)
+                if self.record_result(result, saved):
+                    successful_collections += 1
+            
+            # API 제한을 위한 지연 (캐시 적중은 API를 호출하지 않으므로 생략)
+            if delay_seconds > 0 and not any(result.get('from_cache') for result in results):
+                time.sleep(delay_seconds)
+        
+        return successful_collections
+    
+    async def collect_concurrent(self, batches: List[Dict], total_tasks: int, concurrency: int,
+                                 rate_per_second: Optional[float],
+                                 controller: Optional[AIMDController] = None) -> int:
+        """토큰 버킷으로 속도를 제한하며 여러 요청을 동시에 수집
+        
+        네트워크 요청(수집 워커)과 GeoJSON 변환/파일 저장(저장 워커)을 분리해
+        저장 작업이 다음 요청의 네트워크 대기와 겹쳐 실행되도록 합니다.
+        토큰은 실제 API 호출 직전에만 소비되므로 캐시 적중은 속도 제한을 받지 않습니다.
+        controller가 있으면 수집 워커를 controller.max_limit개 띄우고, 요청마다 제어기의 자리를
+        받아 동시 요청 수를 제어기 한도 안으로 유지하며 요청 결과를 제어기에 알립니다.
+        """
+        if controller:
+            concurrency = controller.max_limit
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=concurrency + 2)
+        limiter = self.rate_limiter or (TokenBucket(rate=rate_per_second) if rate_per_second else None)
+        previous_limiter = set_rate_limiter(limiter)
+        
+        batch_queue = asyncio.Queue()
+        for batch in batches:
+            batch_queue.put_nowait(batch)
+        # 재시도 대기 중인 배치도 끝나야 수집 워커가 종료됨
+        remaining = {'batches': len(batches)}
+        retry_timers = set()
+        # 저장 대기열(배치 단위)이 너무 길어지면 수집 워커가 잠시 멈춤 (메모리 제한)
+        store_queue = asyncio.Queue(maxsize=concurrency * 2)
+        
+        progress = {'completed': 0, 'successful': 0}
+        
+        async def requeue(batch, delay):
+            await asyncio.sleep(delay)
+            batch_queue.put_nowait(batch)
+        
+        async def fetch_worker():
+            while True:
+                batch = await batch_queue.get()
+                if batch is None:
+                    return
+                
+                if controller:
+                    await controller.acquire()
+                    results = []
+                    try:
+                        results = await loop.run_in_executor(executor, self.collect_batch, batch)
+                    finally:
+                        controller.release(*self.controller_feedback(results))
+                else:
+                    results = await loop.run_in_executor(executor, self.collect_batch, batch)
+                
+                retry_delay = self.schedule_retry(batch, results)
+                if retry_delay is not None:
+                    timer = asyncio.create_task(requeue(batch, retry_delay))
+                    retry_timers.add(timer)
+                    timer.add_done_callback(retry_timers.discard)
+                    continue
+                
+                for result in results:
+                    progress['completed'] += 1
+                    result['progress'] = [progress['completed'], total_tasks]
+                await store_queue.put(results)
+                
+                remaining['batches'] -= 1
+                if remaining['batches'] == 0:
+                    for _ in range(concurrency):
+                        batch_queue.put_nowait(None)
+        
+        async def store_worker():
+            while True:
+                results = await store_queue.get()
+                if results is None:
+                    return
+                # 배치 결과는 파티션마다 한 번에 저장소에 추가한 뒤 작업별로 GeoJSON 저장/기록
+                await loop.run_in_executor(executor, self.store_batch, results)
+                for result in results:
+                    saved = False
+                    if result['success']:
+                        saved = await loop.run_in_executor(executor, self.store_result, result)
+                    if self.record_result(result, saved):
+                        progress['successful'] += 1
+        
+        store_workers = [asyncio.create_task(store_worker()) for _ in range(2)]
+        try:
+            await asyncio.gather(*(fetch_worker() for _ in range(concurrency)))
+            for _ in store_workers:
+                await store_queue.put(None)
+            await asyncio.gather(*store_workers)
+        finally:
+            executor.shutdown(wait=True)
+            set_rate_limiter(previous_limiter)
+        
+        return progress['successful']
     
     def save_summary(self):
         """수집 요약 정보 저장"""
         try:
             summary = {
                 'collection_date': datetime.now().isoformat(),
-                'total_successful': len(self.collected_data),
+                'total_successful': self.summary.successful,
+                'total_no_data': len(self.no_data_requests),
                 'total_failed': len(self.failed_requests),
-                'successful_collections': [],
+                'total_retries': self.retry_count,
+                'successful_collections': self.summary.pair_summaries(),
+                'totals': self.summary.totals(),
+                'no_data_requests': [
+                    {key: result[key] for key in ('year', 'item', 'reporter_code', 'partner_code',
+                                                  'reporter_name', 'partner_name')}
+                    for result in self.no_data_requests
+                ],
                 'failed_requests': self.failed_requests
             }
             
-            # 성공한 수집 요약
-            for result in self.collected_data:
-                trade_value = result['data']['primaryValue'].sum() if 'primaryValue' in result['data'].columns else 0
-                summary['successful_collections'].append({
-                    'year': result['year'],
-                    'item': result['item'],
-                    'reporter': result['reporter_name'],
-                    'partner': result['partner_name'],
-                    'records': result['records'],
-                    'trade_value': float(trade_value)
-                })
-            
             # 요약 파일 저장
-            summary_path = os.path.join(self.output_dir, f"collection_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            summary_path = os.path.join(self.output_dir, f"collection_summary_{self.file_suffix()}.json")
             with open(summary_path, 'w', encoding='utf-8') as f:
                 json.dump(summary, f, indent=2, ensure_ascii=False)
             
@@ -460,6 +1319,22 @@ def main():
   python bulk_data_collector.py --start-year 2018 --end-year 2024
   python bulk_data_collector.py --start-year 2020 --end-year 2022 --items semiconductor oil
   python bulk_data_collector.py --start-year 2023 --end-year 2024 --delay 2.0
+  python bulk_data_collector.py --start-year 2018 --end-year 2024 --resume
+  python bulk_data_collector.py --start-year 2018 --end-year 2024 --concurrency 4 --rate 1.0
+  python bulk_data_collector.py --start-year 2018 --end-year 2024 --adaptive --max-concurrency 8
+  python bulk_data_collector.py --start-year 2018 --end-year 2024 --max-attempts 6 --retry-base-delay 5
+  python bulk_data_collector.py --start-year 2022 --end-year 2023 --items semiconductor --hs6
+  python bulk_data_collector.py --start-year 2023 --end-year 2025 --items copper --freq M
+  python bulk_data_collector.py --start-year 2018 --end-year 2024 --refresh          # 야간 증분 갱신
+  python bulk_data_collector.py --start-year 2023 --end-year 2025 --freq M --refresh
+
+공유 작업 대기열 (여러 프로세스/호스트):
+  python bulk_data_collector.py --start-year 2018 --end-year 2024 --enqueue
+  python bulk_data_collector.py --worker --concurrency 2 --rate 1.0
+  python bulk_data_collector.py --worker --adaptive --rate 2.0
+  python bulk_data_collector.py --worker --queue-path /mnt/shared/collection_journal.sqlite
+  python bulk_data_collector.py --start-year 2018 --end-year 2024 --enqueue --refresh
+  python bulk_data_collector.py --worker --refresh --rate 1.0
 
 품목 옵션:
   semiconductor : 반도체 (HS Code: 8541, 8542)
@@ -479,8 +1354,81 @@ def main():
                        default=list(COMMODITY_GROUPS.keys()), help="수집할 품목들")
     parser.add_argument("--delay", type=float, default=1.0, 
                        help="API 요청 간 지연 시간 (초, 기본값: 1.0)")
-    parser.add_argument("--output-dir", type=str, default="./data/output",
-                       help="출력 디렉터리 (기본값: ./data/output)")
+    parser.add_argument("--output-dir", type=str,
+                       help=f"출력 디렉터리 (기본값: ./data/output, --freq M이면 {DEFAULT_MONTHLY_OUTPUT_DIR})")
+    parser.add_argument("--freq", choices=[FREQ_ANNUAL, FREQ_MONTHLY], default=FREQ_ANNUAL,
+                       help=f"수집 주기: A(연간), M(월별, 품목/연도/월 저장소 {DEFAULT_MONTHLY_STORE_PATH}에 "
+                            f"새로 공개된 달만 추가하고 월별 산출물 배포) (기본값: A)")
+    parser.add_argument("--concurrency", type=int, default=1,
+                       help="동시에 진행할 API 요청 수 (기본값: 1, 2 이상이면 동시 수집 모드)")
+    parser.add_argument("--rate", type=float,
+                       help=f"동시 수집 모드의 초당 최대 요청 수 (기본값: {DEFAULT_RATE_PER_SECOND}, "
+                            f"--adaptive에서는 지정한 경우에만 상한으로 사용)")
+    parser.add_argument("--adaptive", action="store_true",
+                       help="응답 지연과 429/시간 초과에 맞춰 동시 요청 수를 자동 조절 (AIMD, --delay/--concurrency 무시)")
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_LIMIT,
+                       help=f"--adaptive의 최대 동시 요청 수 (기본값: {DEFAULT_MAX_LIMIT})")
+    parser.add_argument("--no-batch", action="store_true",
+                       help="무역 관계마다 개별 요청 (기본값: 여러 보고국/파트너국을 한 요청으로 묶음)")
+    parser.add_argument("--max-cmd-codes", type=int, default=DEFAULT_MAX_CMD_CODES,
+                       help=f"배치 요청 하나에 넣을 최대 HS Code 수 (공개 API는 1, 기본값: {DEFAULT_MAX_CMD_CODES})")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                       help=f"요청 한도 초과/일시적 오류 시 요청당 최대 시도 횟수 (기본값: {DEFAULT_MAX_ATTEMPTS})")
+    parser.add_argument("--retry-base-delay", type=float, default=DEFAULT_BASE_DELAY,
+                       help=f"재시도 백오프 기본 대기 시간 (초, 시도마다 2배, 기본값: {DEFAULT_BASE_DELAY})")
+    parser.add_argument("--resume", action="store_true",
+                       help="작업 저널에서 완료된 작업을 건너뛰고 이어서 수집")
+    parser.add_argument("--refresh", action="store_true",
+                       help="증분 갱신: 데이터 공개 정보의 마지막 공개 시각이 카탈로그의 수집 시각보다 늦은 칸과 "
+                            "아직 수집하지 않은 칸만 응답 캐시를 거치지 않고 수집 (--worker는 캐시만 거치지 않음)")
+    parser.add_argument("--enqueue", action="store_true",
+                       help="수집하지 않고 작업을 공유 작업 대기열에 등록만 함 (--worker로 수집)")
+    parser.add_argument("--worker", action="store_true",
+                       help="공유 작업 대기열에서 작업을 가져와 수집 (여러 프로세스/호스트에서 동시에 실행 가능, "
+                            "--rate는 모든 워커가 나눠 쓰는 전체 속도)")
+    parser.add_argument("--queue-path", type=str,
+                       help=f"공유 작업 대기열 파일 (기본값: 출력 디렉터리의 {JOURNAL_FILENAME})")
+    parser.add_argument("--worker-id", type=str,
+                       help="워커 이름 (기본값: 호스트명-PID)")
+    parser.add_argument("--lease-seconds", type=float, default=DEFAULT_LEASE_SECONDS,
+                       help=f"워커 작업 임대 기간 (초, 하트비트가 끊기면 이 시간 뒤 다른 워커가 가져감, "
+                            f"기본값: {DEFAULT_LEASE_SECONDS:.0f})")
+    parser.add_argument("--cache-path", type=str, default=DEFAULT_CACHE_PATH,
+                       help=f"API 응답 캐시 파일 (기본값: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="응답 캐시를 사용하지 않고 항상 API 호출")
+    parser.add_argument("--api-base-url", type=str,
+                       help=f"Comtrade API 주소 (로컬 대역 서버 등, 기본값: 환경 변수 {API_BASE_URL_ENV} 또는 {API_BASE_URL})")
+    parser.add_argument("--ingest-schema", choices=list(INGEST_SCHEMAS), default=DEFAULT_INGEST_SCHEMA,
+                       help=f"응답에서 남길 컬럼: store(저장소 컬럼), minimal(코드/이름/금액/중량/수량), "
+                            f"raw(모든 컬럼) (기본값: {DEFAULT_INGEST_SCHEMA})")
+    parser.add_argument("--no-split", action="store_true",
+                       help="maxRecords 상한에 걸린 응답을 나눠 다시 요청하지 않음")
+    parser.add_argument("--geojson-format", choices=GEOJSON_FORMATS, default=DEFAULT_GEOJSON_FORMAT,
+                       help=f"GeoJSON 저장 형식: compact(한 줄, 좌표 고정 자릿수), pretty(indent=2), "
+                            f"seq(한 줄에 Feature 하나, .geojsonl) (기본값: {DEFAULT_GEOJSON_FORMAT})")
+    parser.add_argument("--hs6", action="store_true",
+                       help="HS 6단위 소호별로 수집해 HS6 저장소에 저장하고 상위 분류 합계 캐시를 갱신 "
+                            "(API용 산출물은 배포하지 않음, hs_rollup.py로 조회)")
+    parser.add_argument("--store-path", type=str,
+                       help=f"파티션 Parquet 저장소 경로 (기본값: {DEFAULT_STORE_PATH}, "
+                            f"--hs6이면 {DEFAULT_HS6_STORE_PATH}, --freq M이면 {DEFAULT_MONTHLY_STORE_PATH})")
+    parser.add_argument("--no-store", action="store_true",
+                       help="파티션 Parquet 저장소에 기록하지 않음")
+    parser.add_argument("--write-csv", action="store_true",
+                       help="무역 관계별 CSV 파일도 저장 (기존 형식)")
+    parser.add_argument("--publish-dir", type=str, default=DEFAULT_PUBLISH_DIR,
+                       help=f"API용 병합 산출물/manifest 디렉터리 (기본값: {DEFAULT_PUBLISH_DIR})")
+    parser.add_argument("--no-publish", action="store_true",
+                       help="수집 후 API용 병합 산출물을 배포하지 않음")
+    parser.add_argument("--metrics-textfile", type=str,
+                       help="단계별 지표 Prometheus textfile 경로 (node_exporter textfile collector용, "
+                            "기본값: 출력 디렉터리의 collector_metrics.prom)")
+    parser.add_argument("--catalog-path", type=str,
+                       help=f"수집 범위 카탈로그 파일 (기본값: {DEFAULT_CATALOG_PATH}, "
+                            f"--freq M이면 {DEFAULT_MONTHLY_CATALOG_PATH})")
+    parser.add_argument("--no-catalog", action="store_true",
+                       help="수집 범위 카탈로그를 갱신하지 않음")
     
     args = parser.parse_args()
     
@@ -489,22 +1437,99 @@ def main():
         print("❌ 시작 연도가 종료 연도보다 클 수 없습니다.")
         sys.exit(1)
     
+    if args.concurrency < 1 or args.max_concurrency < 1 or (args.rate is not None and args.rate <= 0):
+        print("❌ --concurrency/--max-concurrency는 1 이상, --rate는 0보다 커야 합니다.")
+        sys.exit(1)
+    # 적응형 수집은 --rate를 지정한 경우에만 고정 속도 상한을 둠
+    rate = args.rate if args.rate is not None or args.adaptive else DEFAULT_RATE_PER_SECOND
+    
+    if args.max_attempts < 1:
+        print("❌ --max-attempts는 1 이상이어야 합니다.")
+        sys.exit(1)
+    
+    monthly = args.freq == FREQ_MONTHLY
+    if monthly and (args.hs6 or args.no_store):
+        print("❌ --freq M은 --hs6/--no-store와 함께 사용할 수 없습니다.")
+        sys.exit(1)
+    if args.refresh and (args.no_catalog or args.resume):
+        print("❌ --refresh는 수집 범위 카탈로그가 필요하며 --no-catalog/--resume과 함께 사용할 수 없습니다.")
+        sys.exit(1)
+    if args.refresh and args.enqueue and monthly:
+        print("❌ --freq M의 증분 갱신은 --enqueue 없이 실행하세요 (다시 공개된 달은 대기열에 기록되지 않음).")
+        sys.exit(1)
+    output_dir = args.output_dir or (DEFAULT_MONTHLY_OUTPUT_DIR if monthly else "./data/output")
+    if args.hs6:
+        default_store_path = DEFAULT_HS6_STORE_PATH
+    else:
+        default_store_path = DEFAULT_MONTHLY_STORE_PATH if monthly else DEFAULT_STORE_PATH
+    
     if args.end_year > 2024:
         print("⚠️  2024년 이후 데이터는 아직 제공되지 않을 수 있습니다.")
     
-    # 대량 수집기 실행
-    collector = BulkDataCollector(args.output_dir)
+    configure_cache(path=args.cache_path, enabled=not args.no_cache, refresh=args.refresh)
+    configure_api(base_url=args.api_base_url)
+    configure_ingest(args.ingest_schema)
+    configure_splitting(enabled=not args.no_split)
     
-    success = collector.collect_bulk_data(
-        start_year=args.start_year,
-        end_year=args.end_year,
-        items=args.items,
-        delay_seconds=args.delay
+    # 대량 수집기 실행
+    collector = BulkDataCollector(
+        output_dir,
+        geojson_format=args.geojson_format,
+        store_path=None if args.no_store else (args.store_path or default_store_path),
+        write_csv=args.write_csv,
+        publish_dir=None if args.no_publish else args.publish_dir,
+        retry_policy=RetryPolicy(max_attempts=args.max_attempts, base_delay=args.retry_base_delay),
+        worker_id=args.worker_id,
+        metrics_textfile=args.metrics_textfile,
+        catalog_path=None if args.no_catalog else (
+            args.catalog_path or (DEFAULT_MONTHLY_CATALOG_PATH if monthly else DEFAULT_CATALOG_PATH)
+        ),
+        hs6=args.hs6,
+        freq=args.freq
     )
+    queue_path = args.queue_path or os.path.join(output_dir, JOURNAL_FILENAME)
+    
+    if args.enqueue:
+        collector.enqueue_tasks(queue_path, args.start_year, args.end_year, args.items, resume=args.resume,
+                                refresh=args.refresh)
+        sys.exit(0)
+    
+    try:
+        if args.worker:
+            success = collector.run_worker(
+                queue_path,
+                delay_seconds=args.delay,
+                concurrency=args.concurrency,
+                rate_per_second=rate,
+                lease_seconds=args.lease_seconds,
+                batch_requests=not args.no_batch,
+                max_cmd_codes=args.max_cmd_codes,
+                adaptive=args.adaptive,
+                max_concurrency=args.max_concurrency
+            )
+        else:
+            success = collector.collect_bulk_data(
+                start_year=args.start_year,
+                end_year=args.end_year,
+                items=args.items,
+                delay_seconds=args.delay,
+                concurrency=args.concurrency,
+                rate_per_second=rate,
+                batch_requests=not args.no_batch,
+                max_cmd_codes=args.max_cmd_codes,
+                resume=args.resume,
+                adaptive=args.adaptive,
+                max_concurrency=args.max_concurrency,
+                refresh=args.refresh
+            )
+    except KeyboardInterrupt:
+        print(f"\n⏹️  수집이 중단되었습니다. 완료된 작업은 작업 저널에 기록되어 있습니다.")
+        print(f"   같은 옵션에 --resume을 추가해 실행하면 이어서 수집합니다.")
+        sys.exit(130)
     
     if success:
         print(f"\n🎉 대량 데이터 수집이 완료되었습니다!")
-        print(f"📁 결과 파일: {args.output_dir}")
+        print(f"📁 결과 파일: {output_dir}")
         print(f"📋 로그 파일: {collector.log_file}")
         sys.exit(0)
     else:
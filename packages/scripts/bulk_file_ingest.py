@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Comtrade 최종 데이터 대량 파일 수집 (스트리밍 필터링)
+
+무역 관계마다 getFinalData를 호출하는 대신 보고국/기간마다 하나씩 제공되는 최종 데이터 대량 파일
+(탭으로 구분된 텍스트, gzip 압축)을 받아 한 줄씩 압축을 풀며 추적 중인 HS Code와 파트너국 행만 골라
+파티션 Parquet 저장소(trade_store)에 추가합니다. 파일 전체를 메모리에 올리지 않고, 골라낸 행도
+chunk_rows개가 모이면 바로 저장소에 기록합니다.
+
+- 파일은 API에서 내려받거나(--start-year/--end-year, 구독 키 필요) 이미 받은 파일(--input)을 읽습니다
+- 운송수단/세관 절차/2차 파트너국별 세부 행은 건너뛰고 합계 행(motCode 0, customsCode C00, partner2Code 0)만
+  저장하므로 getFinalData로 수집한 레코드와 같은 키를 가집니다 (같은 레코드는 저장소에서 교체)
+- 대량 파일에는 국가명/ISO3가 없으므로 국가 중심점 인덱스의 값으로 채웁니다
+- 파일 하나를 다 읽으면 해당 보고국의 (품목, 연도, 파트너국) 칸을 수집 범위 카탈로그에 기록하고,
+  추적 중인 무역 관계인데 파일에 행이 없으면 데이터 없음으로 기록합니다
+
+테스트용 파일은 mock_comtrade_server.py --write-bulk-fixture로 만들 수 있고,
+대역 서버는 대량 파일 목록/다운로드 API도 흉내 냅니다.
+
+사용법:
+    python bulk_file_ingest.py --input data/bulk
+    python bulk_file_ingest.py --start-year 2020 --end-year 2023 --reporters 842 410
+    python bulk_file_ingest.py --input data/bulk --items semiconductor --all-partners
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import os
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from comtrade_client import (list_bulk_files, download_bulk_file, configure_api, set_rate_limiter,
+                             ComtradeAPIError, API_BASE_URL, API_BASE_URL_ENV)
+from country_centroids import load_centroid_index
+from coverage_catalog import CoverageCatalog, DEFAULT_CATALOG_PATH
+from ingest_schema import get_ingest_schema
+from metrics import get_metrics
+from rate_limiter import TokenBucket, DEFAULT_RATE_PER_SECOND
+from retry_policy import RetryPolicy, DEFAULT_MAX_ATTEMPTS
+from trade_store import TradeStore, DEFAULT_STORE_PATH
+
+DEFAULT_BULK_DIR = "./data/bulk"
+DEFAULT_CHUNK_ROWS = 50000
+SUBSCRIPTION_KEY_ENV = "COMTRADE_SUBSCRIPTION_KEY"
+BULK_FILE_SUFFIXES = ('.txt.gz', '.tsv.gz', '.gz', '.txt', '.tsv')
+
+# 대량 파일 컬럼 (첫 줄 헤더, 탭 구분)
+BULK_COLUMNS = [
+    'typeCode', 'freqCode', 'refPeriodId', 'refYear', 'refMonth', 'period', 'reporterCode', 'flowCode',
+    'partnerCode', 'partner2Code', 'classificationCode', 'cmdCode', 'customsCode', 'mosCode', 'motCode',
+    'qtyUnitCode', 'qty', 'isQtyEstimated', 'altQtyUnitCode', 'altQty', 'netWgt', 'grossWgt',
+    'cifvalue', 'fobvalue', 'primaryValue', 'legacyEstimationFlag', 'isReported', 'isAggregate'
+]
+
+# 필터링에 꼭 필요한 컬럼
+REQUIRED_COLUMNS = ('period', 'reporterCode', 'flowCode', 'partnerCode', 'cmdCode')
+
+# 파트너국 '세계' (모든 파트너국 모드에서도 국가별 행만 남김)
+WORLD_PARTNER_CODE = '0'
+
+# 합계 행 조건 (getFinalData 기본 파라미터와 같음, 파일에 없는 컬럼은 검사하지 않음)
+TOTAL_ROW_VALUES = {'partner2Code': '0', 'customsCode': 'C00', 'motCode': '0'}
+
+
+def bulk_filename(reporter_code: str, period: str, type_code: str = 'C', freq_code: str = 'A',
+                  cl_code: str = 'HS') -> str:
+    """내려받은 대량 파일의 로컬 파일명"""
+    return f"comtrade_{type_code}{freq_code}_{cl_code}_{reporter_code}_{period}.txt.gz"
+
+
+def open_bulk_file(path: str) -> io.TextIOBase:
+    """대량 파일을 텍스트 스트림으로 열기 (.gz는 읽는 만큼만 압축 해제)"""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8-sig', newline='')
+    return open(path, 'r', encoding='utf-8-sig', newline='')
+
+
+def find_bulk_files(paths: Iterable[str]) -> List[str]:
+    """파일/디렉터리 목록에서 대량 파일 경로 (디렉터리는 한 단계만, 이름순)"""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                         if name.endswith(BULK_FILE_SUFFIXES))
+        elif os.path.exists(path):
+            found.append(path)
+    return found
+
+
+class BulkRowFilter:
+    """대량 파일 행 중 추적 중인 (HS Code, 무역흐름, 보고국-파트너국) 행 고르기
+
+    Args:
+        cmd_items: HS Code → 품목명
+        pairs: (보고국 코드, 파트너국 코드) → (보고국명, 파트너국명). None이면 모든 파트너국
+        flows: 남길 무역흐름 코드
+    """
+
+    def __init__(self, cmd_items: Dict[str, str], pairs: Optional[Dict[Tuple[str, str], Tuple[str, str]]] = None,
+                 flows: Iterable[str] = ('M',)):
+        self.cmd_items = dict(cmd_items)
+        self.pairs = pairs
+        self.flows = frozenset(flows)
+
+    @property
+    def items(self) -> List[str]:
+        return sorted(set(self.cmd_items.values()))
+
+    def tracked_partners(self, reporter_code: str) -> Dict[str, Tuple[str, str]]:
+        """보고국의 추적 중인 파트너국 → (보고국명, 파트너국명) (모든 파트너국 모드면 빈 dict)"""
+        if self.pairs is None:
+            return {}
+        return {partner: names for (reporter, partner), names in self.pairs.items() if reporter == reporter_code}
+
+    def matcher(self, header: List[str]) -> Callable[[List[str]], Optional[str]]:
+        """헤더에 맞춰 행(문자열 목록)을 검사하는 함수 (남길 행이면 품목명, 아니면 None)
+
+        Raises:
+            ValueError: 필요한 컬럼이 헤더에 없는 경우
+        """
+        position = {name: i for i, name in enumerate(header)}
+        missing = [name for name in REQUIRED_COLUMNS if name not in position]
+        if missing:
+            raise ValueError(f"대량 파일에 필요한 컬럼이 없습니다: {', '.join(missing)}")
+
+        cmd_i, flow_i = position['cmdCode'], position['flowCode']
+        reporter_i, partner_i = position['reporterCode'], position['partnerCode']
+        totals = [(position[name], value) for name, value in TOTAL_ROW_VALUES.items() if name in position]
+        cmd_items, flows, pairs = self.cmd_items, self.flows, self.pairs
+
+        def match(row: List[str]) -> Optional[str]:
+            # 대부분의 행은 HS Code에서 걸러지므로 가장 먼저 비교
+            item = cmd_items.get(row[cmd_i])
+            if item is None or row[flow_i] not in flows:
+                return None
+            for i, value in totals:
+                if row[i] != value:
+                    return None
+            if pairs is None:
+                return item if row[partner_i] != WORLD_PARTNER_CODE else None
+            return item if (row[reporter_i], row[partner_i]) in pairs else None
+
+        return match
+
+
+class BulkFileIngester:
+    """대량 파일을 한 줄씩 읽어 골라낸 행을 저장소에 추가"""
+
+    def __init__(self, store: TradeStore, row_filter: BulkRowFilter, catalog: Optional[CoverageCatalog] = None,
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.store = store
+        self.row_filter = row_filter
+        self.catalog = catalog
+        self.chunk_rows = max(1, chunk_rows)
+        self.schema = get_ingest_schema('store')
+        self.metrics = get_metrics()
+        self._index = load_centroid_index()
+        self._countries = {}
+
+    def _country(self, code: str) -> Tuple[Optional[str], Optional[str]]:
+        # 국가 코드 → (ISO3, 국가명), 파일마다 같은 코드가 반복되므로 한 번만 조회
+        if code not in self._countries:
+            row = self._index.row_of(code)
+            self._countries[code] = (None, None) if row is None else (str(self._index.iso3[row]) or None,
+                                                                       str(self._index.names[row]))
+        return self._countries[code]
+
+    def _flush(self, buffers: Dict[Tuple[str, int], List[Dict]]) -> int:
+        written = 0
+        for (item, year), records in buffers.items():
+            if not records:
+                continue
+            with self.metrics.timer('dataframe'):
+                df = self.schema.frame_from_records(records)
+            with self.metrics.timer('store_append'):
+                self.store.append(df, item, year)
+            written += len(records)
+        buffers.clear()
+        return written
+
+    def ingest_file(self, path: str) -> Dict:
+        """대량 파일 하나를 읽어 골라낸 행을 저장소에 추가
+
+        Returns:
+            rows(읽은 행), records(저장한 행), partitions, reporters, years, cells(카탈로그 칸) 통계
+        """
+        stats = {'path': path, 'rows': 0, 'records': 0, 'partitions': set(), 'reporters': set(), 'years': set()}
+        buffers = {}
+        buffered = 0
+
+        with self.metrics.timer('bulk_parse'), open_bulk_file(path) as f:
+            reader = csv.reader(f, delimiter='\t')
+            header = next(reader, None)
+            if header is None:
+                return self._finish(stats)
+            match = self.row_filter.matcher(header)
+            period_i, reporter_i = header.index('period'), header.index('reporterCode')
+            partner_i = header.index('partnerCode')
+
+            for row in reader:
+                if len(row) < len(header):
+                    continue
+                stats['rows'] += 1
+                item = match(row)
+                if item is None:
+                    continue
+                year = int(row[period_i][:4])
+                record = dict(zip(header, row))
+                record['reporterISO'], record['reporterDesc'] = self._country(row[reporter_i])
+                record['partnerISO'], record['partnerDesc'] = self._country(row[partner_i])
+                buffers.setdefault((item, year), []).append(record)
+                stats['partitions'].add((item, year))
+                stats['reporters'].add(row[reporter_i])
+                stats['years'].add(year)
+                buffered += 1
+                if buffered >= self.chunk_rows:
+                    stats['records'] += self._flush(buffers)
+                    buffered = 0
+
+            # 골라낸 행이 없어도 파일의 보고국/연도는 데이터 없음 기록에 필요
+            if not stats['reporters'] and stats['rows']:
+                stats['reporters'].add(row[reporter_i])
+                stats['years'].add(int(row[period_i][:4]))
+            stats['records'] += self._flush(buffers)
+
+        self.metrics.inc('bulk_rows', stats['rows'])
+        self.metrics.inc('records', stats['records'])
+        return self._finish(stats)
+
+    def _finish(self, stats: Dict) -> Dict:
+        stats['cells'] = self.update_catalog(stats['reporters'], stats['years']) if self.catalog else 0
+        for key in ('partitions', 'reporters', 'years'):
+            stats[key] = sorted(stats[key])
+        return stats
+
+    def update_catalog(self, reporters: Set[str], years: Set[int]) -> int:
+        """파일에서 읽은 보고국/연도의 칸을 저장소 기준으로 카탈로그에 기록
+
+        저장소에서 다시 읽으므로 여러 번 나눠 기록한 무역 관계도 전체 레코드 수로 기록됩니다.
+        추적 중인 무역 관계 중 저장소에 행이 없는 칸은 데이터 없음으로 기록합니다.
+        """
+        cells = 0
+        for item in self.row_filter.items:
+            for year in years:
+                df = self.store.scan(items=[item], years=[year], reporter_codes=sorted(reporters))
+                cells += self.catalog.record_frame(df, item, year)
+                found = set(zip(df['reporterCode'].astype(str), df['partnerCode'].astype(str))) if len(df) else set()
+                for reporter in reporters:
+                    for partner, (reporter_name, partner_name) in self.row_filter.tracked_partners(reporter).items():
+                        if (reporter, partner) not in found:
+                            self.catalog.record_no_data({
+                                'item': item, 'year': year, 'reporter_code': reporter, 'partner_code': partner,
+                                'reporter_name': reporter_name, 'partner_name': partner_name
+                            })
+                            cells += 1
+        return cells
+
+
+def _with_retry(func: Callable, policy: RetryPolicy, description: str):
+    attempt = 1
+    while True:
+        try:
+            return func()
+        except ComtradeAPIError as e:
+            if not policy.should_retry(e.kind, attempt):
+                raise
+            delay = policy.backoff(attempt, e.retry_after)
+            print(f"   ⏳ {description}: {e} ({delay:.1f}초 후 재시도 {attempt + 1}/{policy.max_attempts})")
+            time.sleep(delay)
+            attempt += 1
+
+
+def download_files(reporters: List[str], years: List[int], download_dir: str,
+                   subscription_key: Optional[str] = None, policy: Optional[RetryPolicy] = None) -> List[str]:
+    """(보고국, 연도)별 대량 파일을 내려받고 로컬 경로 목록을 반환
+
+    이미 받은 파일은 크기가 목록의 fileSize와 같으면(또는 크기를 알 수 없으면) 다시 받지 않습니다.
+    파일이 없는 (보고국, 연도)는 건너뜁니다.
+    """
+    policy = policy or RetryPolicy()
+    os.makedirs(download_dir, exist_ok=True)
+    paths = []
+    for reporter in reporters:
+        for year in years:
+            files = _with_retry(lambda: list_bulk_files(reporter, str(year), subscription_key=subscription_key),
+                                policy, f"{reporter} {year} 파일 목록")
+            if not files:
+                print(f"   - {reporter} {year}: 대량 파일 없음")
+                continue
+            for info in files:
+                path = os.path.join(download_dir, bulk_filename(str(info.get('reporterCode', reporter)),
+                                                                str(info.get('period', year))))
+                size = info.get('fileSize')
+                if os.path.exists(path) and (not size or os.path.getsize(path) == int(size)):
+                    print(f"   - {os.path.basename(path)}: 이미 받음")
+                else:
+                    written = _with_retry(lambda: download_bulk_file(info['fileUrl'], path, subscription_key),
+                                          policy, os.path.basename(path))
+                    print(f"   - {os.path.basename(path)}: {written / 1024:.1f} KB")
+                paths.append(path)
+    return paths
+
+
+def build_row_filter(items: List[str], all_partners: bool = False, flows: Iterable[str] = ('M',)) -> BulkRowFilter:
+    """수집기 품목/주요 무역 관계 정의로 행 필터 생성"""
+    from bulk_data_collector import COMMODITY_GROUPS, COMMODITY_MAP, MAJOR_TRADE_PAIRS
+
+    expanded = []
+    for item in items:
+        expanded.extend(COMMODITY_GROUPS.get(item, [item]))
+    cmd_items = {COMMODITY_MAP[item]: item for item in expanded}
+    pairs = None if all_partners else {
+        (reporter, partner): (reporter_name, partner_name)
+        for reporter, partner, reporter_name, partner_name in MAJOR_TRADE_PAIRS
+    }
+    return BulkRowFilter(cmd_items, pairs, flows)
+
+
+def main():
+    """메인 함수"""
+    from bulk_data_collector import COMMODITY_GROUPS, MAJOR_TRADE_PAIRS
+
+    parser = argparse.ArgumentParser(
+        description="Comtrade 최종 데이터 대량 파일을 스트리밍으로 걸러 저장소에 추가",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""
+사용 예시:
+  python bulk_file_ingest.py --input data/bulk                       # 이미 받은 파일
+  python bulk_file_ingest.py --start-year 2020 --end-year 2023       # 주요 무역 관계의 보고국 파일 다운로드
+  python bulk_file_ingest.py --start-year 2023 --end-year 2023 --reporters 842 410 --items semiconductor
+  python bulk_file_ingest.py --input data/bulk --all-partners --flows M X
+
+구독 키는 --subscription-key 또는 환경 변수 {SUBSCRIPTION_KEY_ENV}로 지정합니다.
+테스트 파일: python mock_comtrade_server.py --write-bulk-fixture data/bulk
+        """
+    )
+    parser.add_argument("--input", nargs="+", help="이미 받은 대량 파일 또는 디렉터리 (지정하면 다운로드하지 않음)")
+    parser.add_argument("--start-year", type=int, default=2018, help="다운로드 시작 연도 (기본값: 2018)")
+    parser.add_argument("--end-year", type=int, default=2024, help="다운로드 종료 연도 (기본값: 2024)")
+    parser.add_argument("--reporters", nargs="+",
+                       help="다운로드할 보고국 코드 (기본값: 주요 무역 관계의 보고국)")
+    parser.add_argument("--items", nargs="+", choices=list(COMMODITY_GROUPS.keys()),
+                       default=list(COMMODITY_GROUPS.keys()), help="남길 품목 (기본값: 전체)")
+    parser.add_argument("--all-partners", action="store_true",
+                       help="주요 무역 관계의 파트너국만이 아니라 모든 파트너국 행을 남김")
+    parser.add_argument("--flows", nargs="+", default=['M'], help="남길 무역흐름 코드 (기본값: M)")
+    parser.add_argument("--download-dir", type=str, default=DEFAULT_BULK_DIR,
+                       help=f"대량 파일 다운로드 디렉터리 (기본값: {DEFAULT_BULK_DIR})")
+    parser.add_argument("--subscription-key", type=str, default=os.environ.get(SUBSCRIPTION_KEY_ENV),
+                       help=f"Comtrade 구독 키 (기본값: 환경 변수 {SUBSCRIPTION_KEY_ENV})")
+    parser.add_argument("--api-base-url", type=str,
+                       help=f"Comtrade API 주소 (기본값: 환경 변수 {API_BASE_URL_ENV} 또는 {API_BASE_URL})")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE_PER_SECOND,
+                       help=f"목록/다운로드 초당 최대 요청 수 (기본값: {DEFAULT_RATE_PER_SECOND})")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                       help=f"요청 한도 초과/일시적 오류 시 최대 시도 횟수 (기본값: {DEFAULT_MAX_ATTEMPTS})")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                       help=f"이 행 수만큼 모이면 저장소에 기록 (기본값: {DEFAULT_CHUNK_ROWS:,})")
+    parser.add_argument("--store-path", type=str, default=DEFAULT_STORE_PATH,
+                       help=f"파티션 Parquet 저장소 경로 (기본값: {DEFAULT_STORE_PATH})")
+    parser.add_argument("--catalog-path", type=str, default=DEFAULT_CATALOG_PATH,
+                       help=f"수집 범위 카탈로그 파일 (기본값: {DEFAULT_CATALOG_PATH})")
+    parser.add_argument("--no-catalog", action="store_true", help="수집 범위 카탈로그를 갱신하지 않음")
+
+    args = parser.parse_args()
+
+    if args.start_year > args.end_year:
+        print("❌ 시작 연도가 종료 연도보다 클 수 없습니다.")
+        sys.exit(1)
+
+    if args.input:
+        paths = find_bulk_files(args.input)
+        if not paths:
+            print(f"❌ 대량 파일을 찾을 수 없습니다: {', '.join(args.input)}")
+            sys.exit(1)
+    else:
+        configure_api(base_url=args.api_base_url)
+        reporters = args.reporters or sorted({pair[0] for pair in MAJOR_TRADE_PAIRS})
+        years = list(range(args.start_year, args.end_year + 1))
+        print(f"📥 대량 파일 다운로드: 보고국 {', '.join(reporters)}, {args.start_year}-{args.end_year}년 → {args.download_dir}")
+        previous_limiter = set_rate_limiter(TokenBucket(rate=args.rate))
+        try:
+            paths = download_files(reporters, years, args.download_dir, args.subscription_key,
+                                   RetryPolicy(max_attempts=args.max_attempts))
+        except ComtradeAPIError as e:
+            print(f"❌ 다운로드 실패: {e}")
+            sys.exit(1)
+        finally:
+            set_rate_limiter(previous_limiter)
+
+    row_filter = build_row_filter(args.items, args.all_partners, args.flows)
+    ingester = BulkFileIngester(TradeStore(args.store_path), row_filter,
+                                catalog=None if args.no_catalog else CoverageCatalog(args.catalog_path),
+                                chunk_rows=args.chunk_rows)
+
+    print(f"\n🗜️  대량 파일 {len(paths)}개 처리 (HS Code {', '.join(sorted(row_filter.cmd_items))}, "
+          f"{'모든 파트너국' if args.all_partners else '주요 무역 관계'})")
+    totals = {'rows': 0, 'records': 0, 'cells': 0, 'failed': 0}
+    for path in paths:
+        try:
+            stats = ingester.ingest_file(path)
+        except (OSError, EOFError, ValueError, csv.Error) as e:
+            print(f"   ⚠️  {os.path.basename(path)}: 읽을 수 없는 파일 ({e})")
+            totals['failed'] += 1
+            continue
+        for key in ('rows', 'records', 'cells'):
+            totals[key] += stats[key]
+        print(f"   - {os.path.basename(path)}: {stats['rows']:,}행 중 {stats['records']:,}행 저장 "
+              f"({len(stats['partitions'])}개 파티션)")
+
+    print(f"\n✅ 대량 파일 수집 완료")
+    print(f"   - 읽은 행: {totals['rows']:,}개, 저장한 행: {totals['records']:,}개")
+    if not args.no_catalog:
+        print(f"   - 카탈로그 칸: {totals['cells']}개")
+    if totals['failed']:
+        print(f"   - 읽지 못한 파일: {totals['failed']}개")
+    print(f"\n⏱️  단계별 소요 시간:\n{get_metrics().format_summary()}")
+    sys.exit(1 if totals['failed'] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+대량 수집 작업 저널
+
+(연도, 품목, 보고국-파트너국) 작업마다 상태를 SQLite에 바로 기록합니다.
+수집이 Ctrl+C, 네트워크 끊김, 프로세스 종료 등으로 중단되어도 완료된 작업은 남아 있으므로
+`bulk_data_collector.py --resume`으로 이어서 실행하면 끝난 작업을 다시 요청하지 않습니다.
+
+같은 저널을 여러 수집 프로세스(공유 파일시스템이면 여러 호스트)가 작업 대기열로 함께 쓸 수 있습니다.
+워커는 (연도, 저장소 파티션 품목) 묶음 단위로 작업을 임대(lease)하고, 수집하는 동안 하트비트로 임대 기간을 늘립니다.
+워커가 죽어 하트비트가 끊기면 임대가 만료되어 다른 워커가 그 작업을 가져갑니다.
+
+작업 상태:
+    pending  - 등록만 되었거나 이전 실행에서 끝나지 않은 작업
+    running  - 현재 요청 중인 작업
+    done     - 수집과 파일 저장까지 완료된 작업
+    no_data  - 요청은 성공했지만 데이터가 없는 작업 (--resume 시 건너뜀)
+    failed   - 재시도 후에도 실패한 작업 (--resume 시 다시 시도)
+
+사용법:
+    python collection_journal.py --journal data/output/collection_journal.sqlite
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+JOURNAL_FILENAME = "collection_journal.sqlite"
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_NO_DATA = "no_data"
+STATUS_FAILED = "failed"
+
+DEFAULT_LEASE_SECONDS = 120.0
+# 가져갈 작업이 없을 때 다른 워커의 작업이 끝났는지 다시 확인하는 간격 (초)
+IDLE_POLL_SECONDS = 5.0
+
+# 끝난 작업은 임대를 해제
+_RELEASE_LEASE = {'lease_owner': None, 'lease_expires': None}
+
+# 임대 가능한 작업: 대기 중이거나, 실행 중이지만 임대가 없거나 만료된 작업
+_CLAIMABLE = "status IN (?, ?) AND (lease_expires IS NULL OR lease_expires < ?)"
+# 임대 묶음의 저장소 파티션 품목 (파티션 품목이 없던 예전 저널은 품목)
+_PARTITION = "COALESCE(partition_item, item)"
+
+
+def make_task_id(task: Dict) -> str:
+    """작업 식별자 (출력 파일명과 같은 규칙)"""
+    return f"{task['item']}_{task['year']}_{task['reporter_code']}_{task['partner_code']}"
+
+
+class CollectionJournal:
+    """SQLite 기반 작업 상태 저널 (스레드 안전)
+
+    wal=False이면 WAL 대신 롤백 저널을 사용합니다. WAL은 같은 호스트의 공유 메모리가
+    필요하므로, 여러 호스트가 공유 파일시스템의 저널을 작업 대기열로 쓸 때는 False로 엽니다.
+    """
+
+    def __init__(self, path: str, wal: bool = True):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute(f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                task_id TEXT PRIMARY KEY,
+                year INTEGER NOT NULL,
+                item TEXT NOT NULL,
+                reporter_code TEXT NOT NULL,
+                partner_code TEXT NOT NULL,
+                reporter_name TEXT,
+                partner_name TEXT,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                records INTEGER,
+                error TEXT,
+                output_paths TEXT,
+                updated_at TEXT NOT NULL,
+                lease_owner TEXT,
+                lease_expires REAL,
+                partition_item TEXT
+            )
+        """)
+        # 임대/파티션 컬럼이 없던 예전 저널
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        for column, column_type in (('lease_owner', 'TEXT'), ('lease_expires', 'REAL'), ('partition_item', 'TEXT')):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE tasks ADD COLUMN {column} {column_type}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status)")
+        self._conn.commit()
+
+    def register(self, tasks: List[Dict], partition_items: Optional[Dict[str, str]] = None):
+        """작업 등록 (이미 있는 작업의 상태는 유지)
+
+        Args:
+            partition_items: 품목 → 저장소 파티션 품목 (HS6 품목은 4단위 품목 파티션에 저장되므로
+                같은 파티션의 품목은 한 묶음으로 임대, 없는 품목은 자기 자신)
+        """
+        partition_items = partition_items or {}
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO tasks (task_id, year, item, reporter_code, partner_code, reporter_name, partner_name, "
+                "status, updated_at, partition_item) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (task_id) DO UPDATE SET partition_item = excluded.partition_item",
+                [(make_task_id(t), t['year'], t['item'], t['reporter_code'], t['partner_code'],
+                  t.get('reporter_name'), t.get('partner_name'), STATUS_PENDING, now,
+                  partition_items.get(t['item'], t['item'])) for t in tasks]
+            )
+            self._conn.commit()
+
+    def mark_running(self, tasks: List[Dict]):
+        """요청 시작 기록 (시도 횟수 증가)"""
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE tasks SET status = ?, attempts = attempts + 1, updated_at = ? WHERE task_id = ?",
+                [(STATUS_RUNNING, now, make_task_id(t)) for t in tasks]
+            )
+            self._conn.commit()
+
+    def mark_done(self, task: Dict, records: int, output_paths: List[str]):
+        """수집 및 저장 완료 기록"""
+        self._update(task, STATUS_DONE, records=records, error=None,
+                     output_paths=json.dumps(output_paths, ensure_ascii=False), **_RELEASE_LEASE)
+
+    def mark_no_data(self, task: Dict):
+        """데이터 없음 기록 (다시 요청하지 않음)"""
+        self._update(task, STATUS_NO_DATA, records=0, error=None, **_RELEASE_LEASE)
+
+    def mark_retrying(self, tasks: List[Dict], error: str):
+        """재시도 대기 기록 (백오프 후 다시 요청, 임대는 유지)"""
+        for task in tasks:
+            self._update(task, STATUS_PENDING, error=error)
+
+    def mark_failed(self, task: Dict, error: str):
+        """실패 기록"""
+        self._update(task, STATUS_FAILED, error=error, **_RELEASE_LEASE)
+
+    def _update(self, task: Dict, status: str, **fields):
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        values = list(fields.values())
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE tasks SET status = ?, updated_at = ?{', ' + columns if columns else ''} WHERE task_id = ?",
+                [status, datetime.now().isoformat()] + values + [make_task_id(task)]
+            )
+            self._conn.commit()
+
+    def get(self, task: Dict) -> Optional[Dict]:
+        """작업 상태 조회"""
+        with self._lock:
+            cursor = self._conn.execute("SELECT * FROM tasks WHERE task_id = ?", (make_task_id(task),))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return dict(zip([column[0] for column in cursor.description], row))
+
+    def reset(self, task: Dict):
+        """작업을 다시 수집하도록 pending으로 되돌림"""
+        self._update(task, STATUS_PENDING, **_RELEASE_LEASE)
+
+    def reset_tasks(self, tasks: List[Dict]) -> int:
+        """작업들을 pending으로 되돌림 (다른 워커가 임대 중인 작업은 그대로 둠)
+
+        Returns:
+            되돌린 작업 수
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.executemany(
+                "UPDATE tasks SET status = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE task_id = ? AND (lease_expires IS NULL OR lease_expires < ?)",
+                [(STATUS_PENDING, datetime.now().isoformat(), make_task_id(t), now) for t in tasks]
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def claim(self, owner: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> List[Dict]:
+        """임대 가능한 작업 중 첫 (연도, 저장소 파티션 품목) 묶음을 owner에게 임대
+
+        한 묶음은 같은 저장소 파티션(품목/연도)에 기록되므로 파티션마다 쓰는 워커는 하나입니다.
+        (HS6 품목처럼 여러 품목이 한 파티션에 저장되면 그 품목들을 함께 임대)
+
+        Returns:
+            year, item, reporter_code, partner_code, reporter_name, partner_name을 가진 작업 목록
+            (임대할 작업이 없으면 빈 목록)
+        """
+        now = time.time()
+        claimable = (STATUS_PENDING, STATUS_RUNNING, now)
+        with self._lock:
+            # 다른 프로세스가 같은 묶음을 동시에 가져가지 않도록 쓰기 잠금을 먼저 잡음
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    f"SELECT year, {_PARTITION} FROM tasks WHERE {_CLAIMABLE} ORDER BY year, {_PARTITION} LIMIT 1",
+                    claimable
+                ).fetchone()
+                if row is None:
+                    self._conn.commit()
+                    return []
+
+                cursor = self._conn.execute(
+                    "SELECT task_id, year, item, reporter_code, partner_code, reporter_name, partner_name "
+                    f"FROM tasks WHERE year = ? AND {_PARTITION} = ? AND {_CLAIMABLE} ORDER BY task_id",
+                    row + claimable
+                )
+                names = [column[0] for column in cursor.description]
+                claimed = [dict(zip(names, values)) for values in cursor.fetchall()]
+                self._conn.executemany(
+                    "UPDATE tasks SET status = ?, lease_owner = ?, lease_expires = ?, updated_at = ? WHERE task_id = ?",
+                    [(STATUS_PENDING, owner, now + lease_seconds, datetime.now().isoformat(), task['task_id'])
+                     for task in claimed]
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+
+        for task in claimed:
+            del task['task_id']
+        return claimed
+
+    def renew(self, owner: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> int:
+        """owner가 임대 중인 작업의 임대 기간 연장 (하트비트)"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE lease_owner = ? AND status IN (?, ?)",
+                (time.time() + lease_seconds, owner, STATUS_PENDING, STATUS_RUNNING)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def release(self, owner: str) -> int:
+        """owner가 임대 중인 끝나지 않은 작업을 반납 (다른 워커가 바로 가져갈 수 있음)"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET status = ?, lease_owner = NULL, lease_expires = NULL "
+                "WHERE lease_owner = ? AND status IN (?, ?)",
+                (STATUS_PENDING, owner, STATUS_PENDING, STATUS_RUNNING)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def next_lease_expiry(self) -> Optional[float]:
+        """다른 워커가 임대 중인 작업 중 가장 빨리 만료되는 시각 (없으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(lease_expires) FROM tasks WHERE status IN (?, ?) AND lease_expires IS NOT NULL",
+                (STATUS_PENDING, STATUS_RUNNING)
+            ).fetchone()
+        return row[0]
+
+    def status_counts(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        return dict(rows)
+
+
+class LeaseHeartbeat:
+    """워커가 임대한 작업의 임대 기간을 주기적으로 늘리는 백그라운드 스레드"""
+
+    def __init__(self, journal: CollectionJournal, owner: str, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        self.journal = journal
+        self.owner = owner
+        self.lease_seconds = lease_seconds
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"lease-heartbeat-{owner}", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.lease_seconds / 3):
+            try:
+                self.journal.renew(self.owner, self.lease_seconds)
+            except sqlite3.Error:
+                # 잠금 대기 시간 초과 등은 다음 하트비트에서 다시 시도
+                pass
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+
+def verify_outputs(output_paths: Optional[str]) -> bool:
+    """저널에 기록된 출력 파일이 모두 존재하고 비어 있지 않은지 확인"""
+    if not output_paths:
+        return False
+    paths = json.loads(output_paths)
+    return bool(paths) and all(os.path.isfile(path) and os.path.getsize(path) > 0 for path in paths)
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="대량 수집 작업 저널 상태 확인")
+    parser.add_argument("--journal", type=str, default=os.path.join("./data/output", JOURNAL_FILENAME),
+                       help="저널 파일 경로 (기본값: ./data/output/collection_journal.sqlite)")
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.journal):
+        print(f"❌ 저널 파일을 찾을 수 없습니다: {args.journal}")
+        return
+
+    journal = CollectionJournal(args.journal)
+    counts = journal.status_counts()
+    print(f"📒 작업 저널: {args.journal}")
+    for status in (STATUS_DONE, STATUS_NO_DATA, STATUS_FAILED, STATUS_RUNNING, STATUS_PENDING):
+        print(f"   - {status}: {counts.get(status, 0)}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+수집 결과 요약 누적기
+
+수집기는 성공한 작업의 DataFrame을 실행이 끝날 때까지 들고 있지 않고, 저장이 끝나면
+바로 이 누적기에 작업별 통계(레코드 수, 무역 금액 합계/최소/최대)만 더한 뒤 프레임을 놓습니다.
+작업 하나당 작은 dict 하나만 남으므로 실행이 길어져도 메모리 사용량이 늘지 않습니다.
+
+    summary = CollectionSummary()
+    summary.add(result)              # result['data']의 primaryValue로 통계 계산
+    summary.pair_summaries()         # 무역 관계별 요약 (collection_summary_*.json의 successful_collections)
+    summary.totals()                 # (품목, 연도)별 합계
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# 작업 키 (같은 키를 다시 수집하면 저장소처럼 나중 결과로 교체)
+PAIR_KEY = ('item', 'year', 'reporter_code', 'partner_code')
+
+
+def trade_value_stats(df: Optional[pd.DataFrame]) -> Dict:
+    """DataFrame의 레코드 수와 무역 금액(primaryValue) 합계/최소/최대 (float32 컬럼도 float64로 계산)"""
+    records = 0 if df is None else len(df)
+    if df is None or 'primaryValue' not in df.columns:
+        return {'records': records, 'trade_value': 0.0, 'min_value': None, 'max_value': None}
+
+    values = pd.to_numeric(df['primaryValue'], errors='coerce').to_numpy(dtype=np.float64)
+    values = values[~np.isnan(values)]
+    return {
+        'records': records,
+        'trade_value': float(values.sum()),
+        'min_value': float(values.min()) if values.size else None,
+        'max_value': float(values.max()) if values.size else None
+    }
+
+
+def _merge_extreme(current: Optional[float], value: Optional[float], pick) -> Optional[float]:
+    if value is None:
+        return current
+    return value if current is None else pick(current, value)
+
+
+class CollectionSummary:
+    """성공한 작업의 요약 통계 누적 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pairs = {}
+        # 성공 처리한 작업 결과 수 (같은 작업을 다시 수집해도 각각 셈)
+        self.successful = 0
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def add(self, result: Dict) -> Dict:
+        """성공한 작업 결과 하나의 통계를 더함
+
+        Returns:
+            이 작업의 통계 (records, trade_value, min_value, max_value)
+        """
+        stats = trade_value_stats(result.get('data'))
+        entry = {
+            'year': result['year'],
+            'item': result['item'],
+            'reporter': result.get('reporter_name'),
+            'partner': result.get('partner_name'),
+            **stats
+        }
+        with self._lock:
+            self._pairs[tuple(result[key] for key in PAIR_KEY)] = entry
+            self.successful += 1
+        return stats
+
+    def pair_summaries(self) -> List[Dict]:
+        """무역 관계별 요약 (연도, 품목, 보고국, 파트너국 순)"""
+        with self._lock:
+            entries = list(self._pairs.values())
+        return sorted(entries, key=lambda e: (e['year'], e['item'], str(e['reporter']), str(e['partner'])))
+
+    def totals(self) -> List[Dict]:
+        """(품목, 연도)별 무역 관계 수, 레코드 수, 무역 금액 합계/최소/최대"""
+        groups = {}
+        for entry in self.pair_summaries():
+            total = groups.setdefault((entry['item'], entry['year']), {
+                'item': entry['item'], 'year': entry['year'], 'pairs': 0, 'records': 0,
+                'trade_value': 0.0, 'min_value': None, 'max_value': None
+            })
+            total['pairs'] += 1
+            total['records'] += entry['records']
+            total['trade_value'] += entry['trade_value']
+            total['min_value'] = _merge_extreme(total['min_value'], entry['min_value'], min)
+            total['max_value'] = _merge_extreme(total['max_value'], entry['max_value'], max)
+        return [groups[key] for key in sorted(groups)]
+
+    def items(self) -> List[str]:
+        """요약에 있는 품목"""
+        with self._lock:
+            return sorted({key[0] for key in self._pairs})
+
+    def years(self) -> List[int]:
+        """요약에 있는 연도"""
+        with self._lock:
+            return sorted({key[1] for key in self._pairs})
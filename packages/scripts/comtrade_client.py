@@ -0,0 +1,573 @@
+#!/usr/bin/env python3
+"""
+UN Comtrade API 호출 공통 모듈
+
+bulk_data_collector, working_data_collector, process_trade_data의 모든 API 호출이
+이 모듈을 거칩니다. 응답은 response_cache의 디스크 캐시에 저장되므로,
+같은 요청은 실행이 중단된 뒤 다시 돌리거나 코드를 고친 뒤 재실행해도 API를 호출하지 않습니다.
+
+속도 제한기(set_rate_limiter)는 실제 네트워크 요청 직전에만 토큰을 소비하므로
+캐시 적중은 API 할당량을 사용하지 않습니다.
+
+최종 데이터 요청은 comtradeapicall.getFinalData와 같은 URL/파라미터로 직접 보냅니다.
+getFinalData는 HTTP 오류를 출력만 하고 None을 반환해 429(요청 한도 초과)와
+잘못된 요청을 구분할 수 없기 때문입니다. 실패는 종류(retry_policy의 오류 분류)를 담은
+ComtradeAPIError로 올라가고, classify_error로 어떤 예외든 분류할 수 있습니다.
+
+응답 행 수가 maxRecords 상한에 닿으면 결과가 잘렸을 수 있으므로, 요청을 파트너국/보고국/HS Code/
+무역흐름 목록으로 나눈 하위 요청을 동시에 보내 합칩니다 (query_splitter, configure_splitting).
+
+대량 파일 모드(bulk_file_ingest.py)는 list_bulk_files로 (보고국, 기간)별 최종 데이터 파일 목록을 받고
+download_bulk_file로 파일을 메모리에 올리지 않고 디스크에 내려받습니다.
+
+fetch_data_availability는 (보고국, 기간)별 데이터 공개 정보(getFinalDataAvailability)를 받습니다.
+증분 갱신(bulk_data_collector --refresh)이 마지막 공개 시각을 카탈로그의 수집 시각과 비교해
+바뀐 칸만 다시 수집할 때 사용합니다.
+
+API 주소는 configure_api(또는 환경 변수 COMTRADE_API_BASE_URL)로 바꿀 수 있어
+mock_comtrade_server.py 같은 로컬 대역 서버로 수집기를 실행할 수 있습니다.
+
+응답은 수집 스키마(ingest_schema, configure_ingest)에 따라 필요한 컬럼만 골라 타입을 줄인
+DataFrame으로 만들어집니다. 캐시에는 원래 응답 레코드를 저장하므로 스키마를 바꿔도 다시 요청하지 않습니다.
+
+요청 수, 캐시 적중/미스, 토큰 대기·네트워크 요청·DataFrame 변환 시간은
+metrics의 프로세스 공용 지표에 기록됩니다.
+"""
+
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+import requests
+
+from ingest_schema import IngestSchema, get_ingest_schema, DEFAULT_INGEST_SCHEMA
+from metrics import get_metrics
+from query_splitter import (fetch_with_splitting, FINAL_DATA_DIMENSIONS, FINAL_DATA_KEY, LEGACY_DIMENSIONS,
+                            LEGACY_KEY, DEFAULT_SPLIT_WORKERS)
+from response_cache import ResponseCache, DEFAULT_CACHE_PATH, DEFAULT_TTL_SECONDS, DEFAULT_MAX_BYTES
+from retry_policy import ERROR_RATE_LIMITED, ERROR_TRANSIENT, ERROR_PERMANENT
+
+# 최종 데이터 API (구독 키가 있으면 data/v1/get, 없으면 공개 preview)
+API_BASE_URL = "https://comtradeapi.un.org"
+FINAL_DATA_PATH = "/data/v1/get"
+PREVIEW_DATA_PATH = "/public/v1/preview"
+DEFAULT_TIMEOUT = 120
+# 시간 초과로 보는 HTTP 상태 (Request Timeout, Gateway Timeout)
+TIMEOUT_STATUSES = (408, 504)
+
+# 최종 데이터 대량 파일 API (보고국/기간마다 압축 파일 하나, 구독 키 필요)
+BULK_DATA_PATH = "/bulk/v1/get"
+BULK_FILE_PATH = "/bulk/v1/file"
+BULK_CHUNK_BYTES = 1024 * 1024
+
+# 데이터 공개 정보 API (보고국/기간별 마지막 공개 시각, 구독 키가 없으면 공개 버전)
+DATA_AVAILABILITY_PATH = "/data/v1/getDA"
+PUBLIC_AVAILABILITY_PATH = "/public/v1/getDA"
+# 공개 정보 요청 하나에 넣을 기간 수
+AVAILABILITY_MAX_PERIODS = 12
+
+# 구 버전 공개 API (process_trade_data.py에서 사용)
+LEGACY_DATA_PATH = "/public/v1/get"
+LEGACY_API_ENDPOINT = f"{API_BASE_URL}{LEGACY_DATA_PATH}"
+
+# API 주소를 바꿀 때 사용하는 환경 변수 (하위 프로세스로 실행되는 워커에도 전달됨)
+API_BASE_URL_ENV = "COMTRADE_API_BASE_URL"
+
+# 구 버전 API 파라미터 → 캐시 키에 사용하는 표준 이름
+LEGACY_PARAM_NAMES = {
+    "r": "reporterCode",
+    "p": "partnerCode",
+    "freq": "freqCode",
+    "ps": "period",
+    "px": "clCode",
+    "cc": "cmdCode",
+    "rg": "flowCode",
+    "type": "typeCode",
+    "fmt": "format"
+}
+
+_cache = None
+# 동시 수집 스레드와 나눠 보내는 요청 스레드가 캐시 인스턴스를 하나만 만들도록 보호
+_cache_lock = threading.Lock()
+_cache_enabled = True
+_cache_refresh = False
+_rate_limiter = None
+_cache_settings = {
+    'path': DEFAULT_CACHE_PATH,
+    'ttl_seconds': DEFAULT_TTL_SECONDS,
+    'max_bytes': DEFAULT_MAX_BYTES
+}
+_api_settings = {
+    'base_url': os.environ.get(API_BASE_URL_ENV) or API_BASE_URL,
+    'timeout': DEFAULT_TIMEOUT
+}
+_ingest_settings = {
+    'schema': get_ingest_schema(DEFAULT_INGEST_SCHEMA)
+}
+_split_settings = {
+    'enabled': True,
+    'workers': DEFAULT_SPLIT_WORKERS
+}
+
+
+class ComtradeAPIError(Exception):
+    """분류된 API 요청 실패
+
+    Attributes:
+        kind: 오류 종류 (rate_limited, transient, permanent)
+        status: HTTP 상태 코드 (네트워크 오류면 None)
+        retry_after: 서버가 알려 준 재시도 대기 시간(초)
+        timed_out: 응답 시간 초과(연결/읽기 시간 초과, HTTP 408/504) 여부
+    """
+
+    def __init__(self, message: str, kind: str, status: Optional[int] = None,
+                 retry_after: Optional[float] = None, timed_out: bool = False):
+        super().__init__(message)
+        self.kind = kind
+        self.status = status
+        self.retry_after = retry_after
+        self.timed_out = timed_out
+
+
+def _status_kind(status: int) -> str:
+    if status == 429:
+        return ERROR_RATE_LIMITED
+    if status >= 500 or status == 408:
+        return ERROR_TRANSIENT
+    return ERROR_PERMANENT
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(error: BaseException) -> str:
+    """예외를 오류 종류로 분류 (rate_limited, transient, permanent)"""
+    if isinstance(error, ComtradeAPIError):
+        return error.kind
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return _status_kind(error.response.status_code)
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                          requests.exceptions.ChunkedEncodingError)):
+        return ERROR_TRANSIENT
+    # 응답이 중간에 잘려 JSON을 읽지 못한 경우
+    if isinstance(error, ValueError):
+        return ERROR_TRANSIENT
+    return ERROR_PERMANENT
+
+
+def configure_cache(path: str = DEFAULT_CACHE_PATH, ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+                    max_bytes: int = DEFAULT_MAX_BYTES, enabled: bool = True, refresh: bool = False):
+    """응답 캐시 설정 (첫 API 호출 전에 호출)
+
+    refresh가 True이면 최종 데이터 응답을 캐시에서 읽지 않고 새로 받은 응답으로 덮어씁니다.
+    (증분 갱신처럼 다시 공개된 데이터를 받아야 할 때)
+    """
+    global _cache, _cache_enabled, _cache_refresh
+    with _cache_lock:
+        _cache = None
+        _cache_enabled = enabled
+        _cache_refresh = refresh
+        _cache_settings.update(path=path, ttl_seconds=ttl_seconds, max_bytes=max_bytes)
+
+
+def configure_api(base_url: Optional[str] = None, timeout: Optional[float] = None):
+    """API 주소와 기본 요청 시간 제한 설정 (None이면 기존 값 유지)
+
+    로컬 대역 서버를 가리킬 때 사용합니다. 다른 주소의 응답은 캐시 키가 달라지므로
+    실제 API 응답 캐시와 섞이지 않습니다.
+    """
+    if base_url:
+        _api_settings['base_url'] = base_url.rstrip('/')
+    if timeout:
+        _api_settings['timeout'] = timeout
+
+
+def configure_ingest(schema):
+    """최종 데이터 응답의 수집 스키마 설정 (스키마 이름 또는 IngestSchema)"""
+    _ingest_settings['schema'] = get_ingest_schema(schema) if isinstance(schema, str) else schema
+
+
+def configure_splitting(enabled: bool = True, workers: int = DEFAULT_SPLIT_WORKERS):
+    """maxRecords 상한에 걸린 요청을 나눠 다시 보낼지와 하위 요청 동시 실행 수 설정"""
+    _split_settings.update(enabled=enabled, workers=max(1, workers))
+
+
+def ingest_schema() -> IngestSchema:
+    """현재 수집 스키마"""
+    return _ingest_settings['schema']
+
+
+def api_base_url() -> str:
+    """현재 API 주소"""
+    return _api_settings['base_url']
+
+
+def _cache_endpoint(endpoint: str) -> str:
+    # 실제 API가 아닌 주소의 응답은 주소를 붙인 별도 키로 캐시
+    base_url = api_base_url()
+    return endpoint if base_url == API_BASE_URL else f"{base_url}|{endpoint}"
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """공유 응답 캐시 (비활성화된 경우 None)"""
+    global _cache
+    if not _cache_enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(**_cache_settings)
+    return _cache
+
+
+def set_rate_limiter(limiter):
+    """네트워크 요청 전에 토큰을 받을 속도 제한기 설정 (None이면 제한 없음)
+
+    Returns:
+        이전에 설정되어 있던 속도 제한기
+    """
+    global _rate_limiter
+    previous = _rate_limiter
+    _rate_limiter = limiter
+    return previous
+
+
+def _wait_for_rate_limit():
+    if _rate_limiter is not None:
+        with get_metrics().timer('rate_limit_wait'):
+            _rate_limiter.acquire_blocking()
+
+
+def cache_stats() -> Optional[Dict]:
+    """현재 프로세스의 캐시 적중/미스 통계"""
+    cache = get_cache()
+    return cache.stats() if cache else None
+
+
+def fetch_final_data(period: str, reporter_code: str, cmd_code: str, partner_code: str,
+                     flow_code: str = 'M', type_code: str = 'C', freq_code: str = 'A',
+                     cl_code: str = 'HS', partner2_code: str = '0', customs_code: str = 'C00',
+                     mot_code: str = '0', max_records: int = 100, include_desc: bool = True,
+                     subscription_key: Optional[str] = None, timeout: Optional[float] = None,
+                     schema: Optional[IngestSchema] = None) -> pd.DataFrame:
+    """최종 데이터 요청 (캐시 우선, comtradeapicall.getFinalData와 같은 요청)
+
+    응답이 max_records 상한에 닿으면 요청을 나눠 다시 보내고 합칩니다 (configure_splitting).
+
+    Args:
+        schema: 응답 컬럼 선택/타입 축소 스키마 (기본값: configure_ingest로 설정한 스키마)
+
+    Returns:
+        스키마를 적용한 응답 DataFrame (데이터가 없으면 빈 DataFrame).
+        모든 응답을 캐시에서 읽은 경우 df.attrs['from_cache']가 True입니다.
+        df.attrs['cached_at']은 캐시에서 읽은 응답 중 가장 오래된 응답을 받은 시각(epoch 초,
+        캐시에서 읽은 응답이 없으면 None)입니다.
+        df.attrs['requests']는 나눠 보낸 요청을 포함한 요청 수, df.attrs['truncated']는
+        더 나눌 수 없는데도 상한에 걸린 요청이 있었는지입니다.
+
+    Raises:
+        ComtradeAPIError: HTTP 오류, 네트워크 오류, 읽을 수 없는 응답 (kind로 분류)
+    """
+    params = {
+        'typeCode': type_code,
+        'freqCode': freq_code,
+        'clCode': cl_code,
+        'period': period,
+        'reporterCode': reporter_code,
+        'cmdCode': cmd_code,
+        'flowCode': flow_code,
+        'partnerCode': partner_code,
+        'partner2Code': partner2_code,
+        'customsCode': customs_code,
+        'motCode': mot_code,
+        'includeDesc': include_desc
+    }
+
+    schema = schema or ingest_schema()
+    timeout = timeout or _api_settings['timeout']
+    cached_times = []
+
+    def fetch(query: Dict) -> List[Dict]:
+        records, cached_at = _fetch_final_records(query, max_records, subscription_key, timeout)
+        cached_times.append(cached_at)
+        return records
+
+    if _split_settings['enabled']:
+        records, split = fetch_with_splitting(fetch, params, max_records, FINAL_DATA_DIMENSIONS, FINAL_DATA_KEY,
+                                              _split_settings['workers'])
+    else:
+        records, split = fetch(params), {'requests': 1, 'truncated': 0}
+
+    with get_metrics().timer('dataframe'):
+        df = schema.frame_from_records(records)
+    df.attrs['from_cache'] = all(cached_at is not None for cached_at in cached_times)
+    hits = [cached_at for cached_at in cached_times if cached_at is not None]
+    df.attrs['cached_at'] = min(hits) if hits else None
+    df.attrs['requests'] = split['requests']
+    df.attrs['truncated'] = split['truncated'] > 0
+    return df
+
+
+def _fetch_final_records(params: Dict, max_records: int, subscription_key: Optional[str],
+                         timeout: float) -> Tuple[List[Dict], Optional[float]]:
+    """최종 데이터 요청 하나 (캐시 우선)
+
+    Returns:
+        (응답 레코드, 캐시에서 읽었으면 캐시에 저장된 시각 아니면 None)
+    """
+    metrics = get_metrics()
+    cache = get_cache()
+    if cache and not _cache_refresh:
+        entry = cache.get_entry(_cache_endpoint('getFinalData'), params, max_records)
+        if entry is not None:
+            metrics.inc('cache_hits')
+            return entry
+        metrics.inc('cache_misses')
+
+    _wait_for_rate_limit()
+    records = _request_final_data(params, max_records, subscription_key, timeout)
+
+    # 빈 응답은 일시적인 오류일 수 있으므로 캐시하지 않음
+    if cache and records:
+        cache.put(_cache_endpoint('getFinalData'), params, records, max_records)
+    return records, None
+
+
+def invalidate_cached_data(reporter_periods: Iterable[Tuple[str, str]]) -> int:
+    """(보고국, 기간) 중 하나라도 포함한 캐시된 최종 데이터/구 버전 API 응답 삭제
+
+    다시 공개된 데이터를 예전에 다른 묶음으로 요청한 응답이 캐시에 남아
+    이후 실행에서 다시 읽히지 않도록 합니다.
+
+    Returns:
+        삭제한 캐시 항목 수
+    """
+    cache = get_cache()
+    targets = {(str(reporter), str(period)) for reporter, period in reporter_periods}
+    if not cache or not targets:
+        return 0
+
+    def match(params: Dict[str, str]) -> bool:
+        reporters = params.get('reporterCode', '').split(',')
+        periods = params.get('period', '').split(',')
+        return any((reporter, period) in targets for reporter in reporters for period in periods)
+
+    return sum(cache.invalidate(_cache_endpoint(endpoint), match) for endpoint in ('getFinalData', 'public/v1/get'))
+
+
+def _request_final_data(params: Dict, max_records: int, subscription_key: Optional[str],
+                        timeout: float) -> List[Dict]:
+    """최종 데이터 API 호출 (comtradeapicall.getPreviewData와 같은 URL/파라미터)
+
+    Returns:
+        응답 레코드 목록 (캐시에 그대로 저장)
+    """
+    path = FINAL_DATA_PATH if subscription_key else PREVIEW_DATA_PATH
+    url = f"{api_base_url()}{path}/{params['typeCode']}/{params['freqCode']}/{params['clCode']}"
+    fields = {
+        'reportercode': params['reporterCode'],
+        'flowCode': params['flowCode'],
+        'period': str(params['period']),
+        'cmdCode': params['cmdCode'],
+        'partnerCode': params['partnerCode'],
+        'partner2Code': params['partner2Code'],
+        'motCode': params['motCode'],
+        'customsCode': params['customsCode'],
+        'maxRecords': max_records,
+        'format': 'JSON',
+        'includeDesc': params['includeDesc'],
+        'subscription-key': subscription_key
+    }
+    fields = {key: value for key, value in fields.items() if value is not None}
+
+    metrics = get_metrics()
+    metrics.inc('requests')
+    with metrics.timer('api_request'):
+        try:
+            response = requests.get(url, params=fields, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            raise ComtradeAPIError(f"요청 실패: {e}", classify_error(e),
+                                   timed_out=isinstance(e, requests.exceptions.Timeout)) from e
+
+        _raise_for_status(response)
+
+        try:
+            records = response.json().get('data') or []
+        except ValueError as e:
+            raise ComtradeAPIError(f"응답을 읽을 수 없습니다: {e}", ERROR_TRANSIENT, response.status_code) from e
+
+    return records
+
+
+def fetch_legacy_data(params: Dict, timeout: Optional[float] = 30) -> List[Dict]:
+    """구 버전 공개 API(public/v1/get) 호출 (캐시 우선, max 상한에 걸리면 나눠서 다시 요청)
+
+    Raises:
+        requests.exceptions.RequestException: 네트워크/HTTP 오류
+    """
+    max_records = int(params['max']) if params.get('max') else None
+
+    def fetch(query: Dict) -> List[Dict]:
+        return _fetch_legacy_records(query, max_records, timeout)
+
+    if not _split_settings['enabled']:
+        return fetch(params)
+    records, _ = fetch_with_splitting(fetch, params, max_records, LEGACY_DIMENSIONS, LEGACY_KEY,
+                                      _split_settings['workers'])
+    return records
+
+
+def _fetch_legacy_records(params: Dict, max_records: Optional[int], timeout: Optional[float]) -> List[Dict]:
+    key_params = {LEGACY_PARAM_NAMES.get(k, k): v for k, v in params.items() if k != 'max'}
+
+    metrics = get_metrics()
+    cache = get_cache()
+    if cache:
+        records = cache.get(_cache_endpoint('public/v1/get'), key_params, max_records)
+        if records is not None:
+            metrics.inc('cache_hits')
+            return records
+        metrics.inc('cache_misses')
+
+    _wait_for_rate_limit()
+    metrics.inc('requests')
+    with metrics.timer('api_request'):
+        response = requests.get(f"{api_base_url()}{LEGACY_DATA_PATH}", params=params,
+                                timeout=timeout or _api_settings['timeout'])
+        response.raise_for_status()
+        records = response.json().get('data') or []
+    if cache and records:
+        cache.put(_cache_endpoint('public/v1/get'), key_params, records, max_records)
+
+    return records
+
+
+def _raise_for_status(response: requests.Response):
+    if response.status_code != 200:
+        raise ComtradeAPIError(
+            f"HTTP {response.status_code}: {response.text[:200]}",
+            _status_kind(response.status_code), response.status_code, _retry_after(response),
+            timed_out=response.status_code in TIMEOUT_STATUSES
+        )
+
+
+def _bulk_headers(subscription_key: Optional[str]) -> Dict[str, str]:
+    return {'Ocp-Apim-Subscription-Key': subscription_key} if subscription_key else {}
+
+
+def list_bulk_files(reporter_code: str, period: str, type_code: str = 'C', freq_code: str = 'A',
+                    cl_code: str = 'HS', subscription_key: Optional[str] = None,
+                    timeout: Optional[float] = None) -> List[Dict]:
+    """(보고국, 기간)의 최종 데이터 대량 파일 목록 (comtradeapicall.bulkDownloadFinalFile과 같은 요청)
+
+    Returns:
+        파일 정보 목록 (fileUrl, reporterCode, period, fileSize, timestamp 등)
+
+    Raises:
+        ComtradeAPIError: HTTP 오류, 네트워크 오류, 읽을 수 없는 응답 (kind로 분류)
+    """
+    url = f"{api_base_url()}{BULK_DATA_PATH}/{type_code}/{freq_code}/{cl_code}"
+    fields = {'reporterCode': reporter_code, 'period': period}
+
+    _wait_for_rate_limit()
+    metrics = get_metrics()
+    metrics.inc('requests')
+    with metrics.timer('api_request'):
+        try:
+            response = requests.get(url, params=fields, headers=_bulk_headers(subscription_key),
+                                    timeout=timeout or _api_settings['timeout'])
+        except requests.exceptions.RequestException as e:
+            raise ComtradeAPIError(f"요청 실패: {e}", classify_error(e),
+                                   timed_out=isinstance(e, requests.exceptions.Timeout)) from e
+        _raise_for_status(response)
+        try:
+            return response.json().get('data') or []
+        except ValueError as e:
+            raise ComtradeAPIError(f"응답을 읽을 수 없습니다: {e}", ERROR_TRANSIENT, response.status_code) from e
+
+
+def fetch_data_availability(period: str, reporter_code: Optional[str] = None, type_code: str = 'C',
+                            freq_code: str = 'A', cl_code: str = 'HS', subscription_key: Optional[str] = None,
+                            timeout: Optional[float] = None) -> List[Dict]:
+    """(보고국, 기간)별 최종 데이터 공개 정보 (comtradeapicall.getFinalDataAvailability와 같은 요청, 캐시 안 함)
+
+    Args:
+        period: 기간 (쉼표로 여러 개, 최대 AVAILABILITY_MAX_PERIODS개)
+        reporter_code: 보고국 M49 코드 (쉼표로 여러 개, None이면 전체)
+
+    Returns:
+        공개 정보 목록 (reporterCode, period, totalRecords, datasetChecksum, firstReleased, lastReleased 등).
+        아직 공개되지 않은 (보고국, 기간)은 목록에 없습니다.
+
+    Raises:
+        ComtradeAPIError: HTTP 오류, 네트워크 오류, 읽을 수 없는 응답 (kind로 분류)
+    """
+    path = DATA_AVAILABILITY_PATH if subscription_key else PUBLIC_AVAILABILITY_PATH
+    url = f"{api_base_url()}{path}/{type_code}/{freq_code}/{cl_code}"
+    fields = {'reporterCode': reporter_code, 'period': period}
+    fields = {key: value for key, value in fields.items() if value is not None}
+
+    _wait_for_rate_limit()
+    metrics = get_metrics()
+    metrics.inc('requests')
+    metrics.inc('availability_requests')
+    with metrics.timer('api_request'):
+        try:
+            response = requests.get(url, params=fields, headers=_bulk_headers(subscription_key),
+                                    timeout=timeout or _api_settings['timeout'])
+        except requests.exceptions.RequestException as e:
+            raise ComtradeAPIError(f"요청 실패: {e}", classify_error(e),
+                                   timed_out=isinstance(e, requests.exceptions.Timeout)) from e
+        _raise_for_status(response)
+        try:
+            return response.json().get('data') or []
+        except ValueError as e:
+            raise ComtradeAPIError(f"응답을 읽을 수 없습니다: {e}", ERROR_TRANSIENT, response.status_code) from e
+
+
+def download_bulk_file(file_url: str, path: str, subscription_key: Optional[str] = None,
+                       timeout: Optional[float] = None) -> int:
+    """대량 파일을 BULK_CHUNK_BYTES씩 받아 path에 저장 (압축된 그대로, 받는 중에는 .part 파일)
+
+    Returns:
+        저장한 바이트 수
+
+    Raises:
+        ComtradeAPIError: HTTP 오류, 네트워크 오류, 중간에 끊긴 응답 (kind로 분류)
+    """
+    partial = f"{path}.part"
+    written = 0
+
+    _wait_for_rate_limit()
+    metrics = get_metrics()
+    metrics.inc('requests')
+    with metrics.timer('bulk_download'):
+        try:
+            with requests.get(file_url, headers=_bulk_headers(subscription_key), stream=True,
+                              timeout=timeout or _api_settings['timeout']) as response:
+                _raise_for_status(response)
+                with open(partial, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=BULK_CHUNK_BYTES):
+                        f.write(chunk)
+                        written += len(chunk)
+                # 전송 압축(Content-Encoding)이 있으면 Content-Length는 압축된 크기이므로 비교하지 않음
+                expected = response.headers.get('Content-Length')
+                if expected and response.headers.get('Content-Encoding') is None and int(expected) != written:
+                    raise ComtradeAPIError(f"파일이 중간에 끊겼습니다 ({written}/{expected} 바이트)",
+                                           ERROR_TRANSIENT, response.status_code)
+        except BaseException as e:
+            if os.path.exists(partial):
+                os.remove(partial)
+            if isinstance(e, requests.exceptions.RequestException):
+                raise ComtradeAPIError(f"요청 실패: {e}", classify_error(e),
+                                       timed_out=isinstance(e, requests.exceptions.Timeout)) from e
+            raise
+
+    os.replace(partial, path)
+    metrics.inc('bytes_downloaded', written)
+    return written
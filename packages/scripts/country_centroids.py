@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+국가 중심점 인덱스 로더
+
+build_centroid_index.py가 만든 data/reference/country_centroids.npz를 읽어
+M49 숫자 코드, ISO3 코드, 국가명(UN Comtrade 표기 포함)으로 중심점 좌표를 조회합니다.
+프로세스당 한 번만 읽고(메모이즈) geopandas 없이 동작합니다.
+
+사용법:
+    from country_centroids import load_centroid_index
+    index = load_centroid_index()
+    index.lookup('KOR')          # {'name': 'South Korea', 'lon': ..., 'lat': ..., ...}
+    index.lookup(410)            # M49 코드로 조회
+    index.to_coord_dict()        # 기존 {키: {'name', 'lon', 'lat'}} 형식
+"""
+
+import functools
+import os
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from build_centroid_index import DEFAULT_INDEX_PATH
+
+# 스크립트를 다른 디렉터리에서 실행해도 찾을 수 있도록 모듈 위치 기준 경로도 확인
+_MODULE_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "reference",
+                                  "country_centroids.npz")
+
+
+class CentroidIndex:
+    """국가 중심점 조회 테이블"""
+
+    def __init__(self, m49: np.ndarray, iso3: np.ndarray, names: np.ndarray,
+                 lon: np.ndarray, lat: np.ndarray, alias_names: np.ndarray, alias_index: np.ndarray):
+        self.m49 = m49
+        self.iso3 = iso3
+        self.names = names
+        self.lon = lon
+        self.lat = lat
+
+        # 문자열 키(ISO3, Natural Earth 국가명, Comtrade 국가명) → 행 번호
+        self.key_to_row = {}
+        for row, code in enumerate(iso3.tolist()):
+            if code:
+                self.key_to_row[code] = row
+        for row, name in enumerate(names.tolist()):
+            self.key_to_row.setdefault(name, row)
+        for alias, row in zip(alias_names.tolist(), alias_index.tolist()):
+            self.key_to_row.setdefault(alias, int(row))
+
+        self.m49_to_row = {int(code): row for row, code in enumerate(m49.tolist()) if code >= 0}
+
+    def __len__(self):
+        return len(self.names)
+
+    def row_of(self, key: Union[str, int]) -> Optional[int]:
+        """M49 코드(정수 또는 숫자 문자열), ISO3 코드 또는 국가명으로 행 번호 조회"""
+        if key is None:
+            return None
+        if isinstance(key, (int, np.integer)):
+            return self.m49_to_row.get(int(key))
+        key = str(key)
+        if key.isdigit():
+            return self.m49_to_row.get(int(key))
+        return self.key_to_row.get(key)
+
+    def lookup(self, key: Union[str, int]) -> Optional[Dict]:
+        """중심점 정보 조회 (없으면 None)"""
+        row = self.row_of(key)
+        if row is None:
+            return None
+        return {
+            'name': str(self.names[row]),
+            'iso3': str(self.iso3[row]),
+            'm49': int(self.m49[row]),
+            'lon': float(self.lon[row]),
+            'lat': float(self.lat[row])
+        }
+
+    def to_coord_dict(self) -> Dict[str, Dict]:
+        """기존 수집기 형식의 좌표 딕셔너리 {ISO3/국가명: {'name', 'lon', 'lat'}}"""
+        coords = {}
+        for key, row in self.key_to_row.items():
+            coords[key] = {
+                'name': str(self.names[row]),
+                'lon': float(self.lon[row]),
+                'lat': float(self.lat[row])
+            }
+        return coords
+
+    def to_code_table(self) -> pd.DataFrame:
+        """M49 코드로 인덱싱한 국가별 중심점 테이블 (코드 기반 결합용, 코드가 없는 국가는 제외)
+
+        국가명/ISO3는 범주형(category), 인덱스는 int32이므로 Index.get_indexer로
+        수십만 행의 코드도 한 번에 행 위치로 바꿀 수 있습니다.
+        """
+        valid = self.m49 >= 0
+        return pd.DataFrame({
+            'iso_a3': pd.Categorical(self.iso3[valid]),
+            'name': pd.Categorical(self.names[valid]),
+            'centroid_lon': self.lon[valid],
+            'centroid_lat': self.lat[valid]
+        }, index=pd.Index(self.m49[valid].astype(np.int32), name='m49'))
+
+    def to_frame(self) -> pd.DataFrame:
+        """국가별 한 행의 DataFrame (m49, iso_a3, name, centroid_lon, centroid_lat)"""
+        return pd.DataFrame({
+            'm49': self.m49,
+            'iso_a3': self.iso3,
+            'name': self.names,
+            'centroid_lon': self.lon,
+            'centroid_lat': self.lat
+        })
+
+
+def _resolve_index_path(path: Optional[str]) -> str:
+    if path:
+        return path
+    if os.path.exists(DEFAULT_INDEX_PATH):
+        return DEFAULT_INDEX_PATH
+    return _MODULE_INDEX_PATH
+
+
+@functools.lru_cache(maxsize=None)
+def load_centroid_index(path: Optional[str] = None) -> CentroidIndex:
+    """중심점 인덱스 로딩 (경로별로 한 번만 읽음)
+
+    Raises:
+        FileNotFoundError: 인덱스 파일이 없는 경우 (build_centroid_index.py로 생성)
+    """
+    path = _resolve_index_path(path)
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"국가 중심점 인덱스가 없습니다: {path} (python build_centroid_index.py로 생성하세요)"
+        )
+
+    with np.load(path, allow_pickle=False) as data:
+        return CentroidIndex(
+            m49=data['m49'],
+            iso3=data['iso3'],
+            names=data['name'],
+            lon=data['lon'],
+            lat=data['lat'],
+            alias_names=data['alias_name'],
+            alias_index=data['alias_index']
+        )
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+수집 범위 카탈로그
+
+(품목, 연도, 보고국, 파트너국) 칸마다 수집 상태, 레코드 수, 무역 금액 합계, 수집 시각,
+데이터 해시를 SQLite에 기록합니다. 작업 저널(collection_journal)이 실행 하나의 작업 대기열이라면
+카탈로그는 모든 수집 실행(bulk_data_collector, working_data_collector, retry_failed_collection)이
+함께 갱신하는 영구 기록이므로, 무엇이 수집되었는지 알기 위해 출력 파일명을 해석하거나
+collection_summary_*.json을 읽을 필요가 없습니다.
+
+칸 상태:
+    done     - 데이터를 수집해 저장함
+    no_data  - 요청은 성공했지만 데이터가 없음
+    failed   - 재시도 후에도 실패함 (이미 done인 칸은 done을 유지하고 last_error만 기록)
+
+fetched_at은 칸의 상태를 API가 마지막으로 확인한 시각입니다. 응답 캐시에서 읽은 결과는 캐시에
+저장된 시각을 기록하므로, 증분 갱신이 그 뒤에 다시 공개된 칸을 찾을 수 있습니다.
+
+사용법:
+    python coverage_catalog.py --stats
+    python coverage_catalog.py --missing --year 2022
+    python coverage_catalog.py --items-with-data --year 2024
+    python coverage_catalog.py --years-with-data --item copper --json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from trade_store import normalize_frame
+
+DEFAULT_CATALOG_PATH = "./data/catalog/coverage.sqlite"
+# 월별 수집(--freq M)의 카탈로그 (셀 키가 같으므로 연간 카탈로그와 분리)
+DEFAULT_MONTHLY_CATALOG_PATH = "./data/catalog/coverage_monthly.sqlite"
+
+CELL_DONE = "done"
+CELL_NO_DATA = "no_data"
+CELL_FAILED = "failed"
+# 카탈로그에 없는 칸 (missing_cells 결과에만 나타남)
+CELL_MISSING = "missing"
+
+# 더 수집할 필요가 없는 칸
+_COMPLETE = (CELL_DONE, CELL_NO_DATA)
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """행마다의 내용 해시 (저장소 컬럼/타입으로 정리한 뒤 계산하므로 수집 스키마와 무관)"""
+    return pd.util.hash_pandas_object(normalize_frame(df), index=False).to_numpy()
+
+
+def _digest(hashes: np.ndarray) -> str:
+    return hashlib.sha256(np.ascontiguousarray(hashes).tobytes()).hexdigest()[:16]
+
+
+def source_hash(df: pd.DataFrame) -> str:
+    """수집한 레코드의 내용 해시"""
+    return _digest(row_hashes(df))
+
+
+def _cell_key(task: Dict) -> Tuple:
+    return (task['item'], int(task['year']), str(task['reporter_code']), str(task['partner_code']))
+
+
+class CoverageCatalog:
+    """SQLite 기반 수집 범위 카탈로그 (스레드 안전, 여러 프로세스가 함께 써도 됨)"""
+
+    def __init__(self, path: str = DEFAULT_CATALOG_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS coverage (
+                item TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                reporter_code TEXT NOT NULL,
+                partner_code TEXT NOT NULL,
+                reporter_name TEXT,
+                partner_name TEXT,
+                status TEXT NOT NULL,
+                records INTEGER NOT NULL DEFAULT 0,
+                trade_value REAL,
+                fetched_at TEXT,
+                source_hash TEXT,
+                last_error TEXT,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY (item, year, reporter_code, partner_code)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_coverage_year_status ON coverage(year, status)")
+        self._conn.commit()
+
+    def close(self):
+        """연결 닫기"""
+        with self._lock:
+            self._conn.close()
+
+    def _query(self, sql: str, params: Sequence = ()) -> List[Dict]:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            names = [column[0] for column in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def record_done(self, task: Dict, records: int, trade_value: float, content_hash: Optional[str] = None,
+                    fetched_at: Optional[datetime] = None):
+        """데이터를 수집해 저장한 칸 기록 (fetched_at: 응답을 받은 시각, None이면 지금)"""
+        self._upsert_done([(task, records, trade_value, content_hash)], fetched_at)
+
+    def record_frame(self, df: pd.DataFrame, item: str, year: int) -> int:
+        """응답 DataFrame을 (보고국, 파트너국)별로 나눠 칸마다 기록 (reporter=all 같은 수집용)
+
+        Returns:
+            기록한 칸 수
+        """
+        if df.empty:
+            return 0
+        # 정리/해시와 금액 변환은 전체 프레임에 한 번만 하고, 칸마다 행 위치로 나눔
+        # (reporter=all × partner=all 응답은 칸이 수만 개)
+        hashes = row_hashes(df)
+        values = (pd.to_numeric(df['primaryValue'], errors='coerce').to_numpy(dtype=np.float64)
+                  if 'primaryValue' in df.columns else np.zeros(len(df)))
+        reporter_names = df['reporterDesc'].to_numpy() if 'reporterDesc' in df.columns else None
+        partner_names = df['partnerDesc'].to_numpy() if 'partnerDesc' in df.columns else None
+        cells = []
+        groups = df.groupby(['reporterCode', 'partnerCode'], observed=True, sort=False).indices
+        for (reporter_code, partner_code), positions in groups.items():
+            first = positions[0]
+            task = {
+                'item': item, 'year': year, 'reporter_code': reporter_code, 'partner_code': partner_code,
+                'reporter_name': reporter_names[first] if reporter_names is not None else None,
+                'partner_name': partner_names[first] if partner_names is not None else None
+            }
+            cells.append((task, len(positions), float(np.nansum(values[positions])),
+                          _digest(hashes[positions])))
+        self._upsert_done(cells)
+        return len(cells)
+
+    def _upsert_done(self, cells: List[Tuple], fetched_at: Optional[datetime] = None):
+        now = datetime.now().isoformat()
+        fetched = fetched_at.isoformat() if fetched_at else now
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO coverage (item, year, reporter_code, partner_code, reporter_name, partner_name, "
+                "status, records, trade_value, fetched_at, source_hash, last_error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, ?) "
+                "ON CONFLICT (item, year, reporter_code, partner_code) DO UPDATE SET "
+                "reporter_name = excluded.reporter_name, partner_name = excluded.partner_name, "
+                "status = excluded.status, records = excluded.records, trade_value = excluded.trade_value, "
+                "fetched_at = excluded.fetched_at, source_hash = excluded.source_hash, last_error = NULL, "
+                "updated_at = excluded.updated_at",
+                [_cell_key(task) + (task.get('reporter_name'), task.get('partner_name'), CELL_DONE,
+                                    int(records), float(trade_value), fetched, content_hash, now)
+                 for task, records, trade_value, content_hash in cells]
+            )
+            self._conn.commit()
+
+    def record_no_data(self, task: Dict, replace: bool = False, fetched_at: Optional[datetime] = None):
+        """데이터가 없는 칸 기록 (이미 데이터가 있는 칸은 그대로 둠, fetched_at: 응답을 받은 시각, None이면 지금)
+
+        replace가 True이면 데이터가 있던 칸도 no_data로 바꿉니다 (다시 공개된 데이터에서 빠진 칸).
+        """
+        confirmed = (fetched_at or datetime.now()).isoformat()
+        if not replace:
+            self._record_status(task, CELL_NO_DATA, None, confirmed)
+            return
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO coverage (item, year, reporter_code, partner_code, reporter_name, partner_name, "
+                "status, fetched_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (item, year, reporter_code, partner_code) DO UPDATE SET "
+                "status = excluded.status, records = 0, trade_value = NULL, fetched_at = excluded.fetched_at, "
+                "source_hash = NULL, last_error = NULL, updated_at = excluded.updated_at",
+                _cell_key(task) + (task.get('reporter_name'), task.get('partner_name'), CELL_NO_DATA, confirmed,
+                                   now)
+            )
+            self._conn.commit()
+
+    def record_failed(self, task: Dict, error: str):
+        """실패한 칸 기록 (이미 데이터가 있는 칸은 done을 유지하고 오류만 기록)"""
+        self._record_status(task, CELL_FAILED, error)
+
+    def _record_status(self, task: Dict, status: str, error: Optional[str], fetched_at: Optional[str] = None):
+        # done을 유지하는 칸은 저장된 데이터가 그대로이므로 확인 시각을 앞당기지 않음
+        now = datetime.now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO coverage (item, year, reporter_code, partner_code, reporter_name, partner_name, "
+                "status, fetched_at, last_error, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (item, year, reporter_code, partner_code) DO UPDATE SET "
+                "status = CASE WHEN coverage.status = ? THEN coverage.status ELSE excluded.status END, "
+                "fetched_at = CASE WHEN excluded.fetched_at IS NULL THEN coverage.fetched_at "
+                "WHEN coverage.status = ? THEN MAX(COALESCE(coverage.fetched_at, ''), excluded.fetched_at) "
+                "ELSE excluded.fetched_at END, "
+                "last_error = excluded.last_error, updated_at = excluded.updated_at",
+                _cell_key(task) + (task.get('reporter_name'), task.get('partner_name'), status, fetched_at, error,
+                                   now, CELL_DONE, CELL_DONE)
+            )
+            self._conn.commit()
+
+    def get(self, item: str, year: int, reporter_code: str, partner_code: str) -> Optional[Dict]:
+        """칸 하나 조회"""
+        rows = self._query(
+            "SELECT * FROM coverage WHERE item = ? AND year = ? AND reporter_code = ? AND partner_code = ?",
+            (item, int(year), str(reporter_code), str(partner_code))
+        )
+        return rows[0] if rows else None
+
+    def cells(self, year: Optional[int] = None, item: Optional[str] = None,
+              status: Optional[str] = None) -> List[Dict]:
+        """조건에 맞는 칸 목록"""
+        conditions, params = [], []
+        for column, value in (('year', year), ('item', item), ('status', status)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self._query(f"SELECT * FROM coverage{where} ORDER BY year, item, reporter_code, partner_code", params)
+
+    def items_with_data(self, year: Optional[int] = None) -> List[str]:
+        """레코드가 있는 품목 (year를 주면 그 연도만)"""
+        where, params = ("AND year = ?", (CELL_DONE, int(year))) if year is not None else ("", (CELL_DONE,))
+        rows = self._query(f"SELECT DISTINCT item FROM coverage WHERE status = ? AND records > 0 {where} "
+                           "ORDER BY item", params)
+        return [row['item'] for row in rows]
+
+    def years_with_data(self, item: Optional[str] = None) -> List[int]:
+        """레코드가 있는 연도 (item을 주면 그 품목만)"""
+        where, params = ("AND item = ?", (CELL_DONE, item)) if item is not None else ("", (CELL_DONE,))
+        rows = self._query(f"SELECT DISTINCT year FROM coverage WHERE status = ? AND records > 0 {where} "
+                           "ORDER BY year", params)
+        return [row['year'] for row in rows]
+
+    def missing_cells(self, year: int, items: Optional[List[str]] = None,
+                      pairs: Optional[List[Tuple[str, str]]] = None) -> List[Dict]:
+        """연도 하나에서 아직 수집이 끝나지 않은 칸 (카탈로그에 없거나 실패한 칸)
+
+        Args:
+            items: 확인할 품목 (기본값: 카탈로그에 한 번이라도 나온 품목)
+            pairs: 확인할 (보고국 코드, 파트너국 코드) (기본값: 카탈로그에 한 번이라도 나온 무역 관계)
+
+        Returns:
+            item, year, reporter_code, partner_code, status(missing 또는 failed), last_error 목록
+        """
+        if items is None:
+            items = [row['item'] for row in self._query("SELECT DISTINCT item FROM coverage ORDER BY item")]
+        if pairs is None:
+            pairs = [(row['reporter_code'], row['partner_code']) for row in self._query(
+                "SELECT DISTINCT reporter_code, partner_code FROM coverage ORDER BY reporter_code, partner_code"
+            )]
+
+        known = {(row['item'], row['reporter_code'], row['partner_code']): row for row in self.cells(year=year)}
+        missing = []
+        for item in items:
+            for reporter_code, partner_code in pairs:
+                row = known.get((item, str(reporter_code), str(partner_code)))
+                if row and row['status'] in _COMPLETE:
+                    continue
+                missing.append({
+                    'item': item, 'year': int(year),
+                    'reporter_code': str(reporter_code), 'partner_code': str(partner_code),
+                    'status': row['status'] if row else CELL_MISSING,
+                    'last_error': row['last_error'] if row else None
+                })
+        return missing
+
+    def stats(self) -> Dict:
+        """상태별 칸 수와 품목/연도 목록"""
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM coverage GROUP BY status").fetchall())
+            records, = self._conn.execute("SELECT COALESCE(SUM(records), 0) FROM coverage").fetchone()
+        return {
+            'cells': sum(counts.values()),
+            'status': counts,
+            'records': records,
+            'items': self.items_with_data(),
+            'years': self.years_with_data()
+        }
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(
+        description="수집 범위 카탈로그 조회",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python coverage_catalog.py --stats
+  python coverage_catalog.py --missing --year 2022
+  python coverage_catalog.py --missing --year 2022 --item copper oil
+  python coverage_catalog.py --items-with-data --year 2024
+  python coverage_catalog.py --years-with-data --item semiconductor_8541 --json
+        """
+    )
+    parser.add_argument("--catalog-path", type=str, default=DEFAULT_CATALOG_PATH,
+                       help=f"카탈로그 파일 (기본값: {DEFAULT_CATALOG_PATH})")
+    parser.add_argument("--stats", action="store_true", help="상태별 칸 수")
+    parser.add_argument("--missing", action="store_true", help="--year에서 수집이 끝나지 않은 칸")
+    parser.add_argument("--items-with-data", action="store_true", help="데이터가 있는 품목 (--year로 제한)")
+    parser.add_argument("--years-with-data", action="store_true", help="데이터가 있는 연도 (--item으로 제한)")
+    parser.add_argument("--year", type=int, help="연도")
+    parser.add_argument("--item", nargs="+", help="품목 (예: copper semiconductor_8541)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력 (스케줄러/API용)")
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.catalog_path):
+        print(f"❌ 카탈로그 파일을 찾을 수 없습니다: {args.catalog_path}")
+        return
+
+    catalog = CoverageCatalog(args.catalog_path)
+    item = args.item[0] if args.item else None
+
+    if args.missing:
+        if args.year is None:
+            parser.error("--missing에는 --year가 필요합니다")
+        result = catalog.missing_cells(args.year, items=args.item)
+    elif args.items_with_data:
+        result = catalog.items_with_data(args.year)
+    elif args.years_with_data:
+        result = catalog.years_with_data(item)
+    else:
+        result = catalog.stats()
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    elif args.missing:
+        print(f"🔍 {args.year}년 수집되지 않은 칸: {len(result)}개")
+        for cell in result:
+            error = f" ({cell['last_error']})" if cell['last_error'] else ""
+            print(f"   - {cell['item']} {cell['reporter_code']}←{cell['partner_code']}: {cell['status']}{error}")
+    elif args.items_with_data:
+        print(f"📦 데이터가 있는 품목{f' ({args.year}년)' if args.year else ''}: {', '.join(result) or '없음'}")
+    elif args.years_with_data:
+        print(f"📅 데이터가 있는 연도{f' ({item})' if item else ''}: "
+              f"{', '.join(str(year) for year in result) or '없음'}")
+    else:
+        print(f"🗂️  수집 범위 카탈로그: {args.catalog_path}")
+        print(f"   - 칸: {result['cells']}개, 레코드: {result['records']:,}개")
+        for status in (CELL_DONE, CELL_NO_DATA, CELL_FAILED):
+            print(f"   - {status}: {result['status'].get(status, 0)}개")
+        print(f"   - 품목: {', '.join(result['items']) or '없음'}")
+        print(f"   - 연도: {', '.join(str(year) for year in result['years']) or '없음'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+무역 흐름 GeoJSON 생성 공통 모듈
+
+bulk_data_collector, working_data_collector, process_trade_data가 함께 사용하는
+열(column) 단위 GeoJSON 생성기입니다. 행마다 iterrows로 좌표를 찾고 shapely LineString을
+만드는 대신, 보고국/파트너국 좌표를 중심점 인덱스에서 한 번에 조회(벡터 연산)하고
+배열에서 바로 Feature를 만듭니다.
+
+사용법:
+    from geojson_builder import build_trade_flow_features
+    features, matched = build_trade_flow_features(df, load_centroid_index(), 'copper', 2023)
+"""
+
+import gc
+from contextlib import contextmanager
+from itertools import repeat
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from country_centroids import CentroidIndex
+
+# Comtrade 응답의 보고국/파트너국 컬럼 (M49 코드, ISO3 후보, 국가명)
+REPORTER_COLUMNS = ('reporterCode', ('reporterISO', 'reporterCodeIsoAlpha3'), 'reporterDesc')
+PARTNER_COLUMNS = ('partnerCode', ('partnerISO', 'PartnerCodeIsoAlpha3'), 'partnerDesc')
+
+
+def resolve_rows(index: CentroidIndex, codes: Optional[pd.Series] = None,
+                 isos: Optional[pd.Series] = None, names: Optional[pd.Series] = None) -> np.ndarray:
+    """국가별 중심점 인덱스의 행 번호를 한 번에 조회 (없으면 -1)
+
+    M49 코드 → ISO3 코드 → 국가명 순서로, 앞 단계에서 찾지 못한 행만 다음 단계에서 찾습니다.
+    """
+    series = next(s for s in (codes, isos, names) if s is not None)
+    rows = np.full(len(series), -1, dtype=np.int64)
+
+    if codes is not None:
+        numeric = pd.to_numeric(codes, errors='coerce')
+        rows = numeric.map(index.m49_to_row).fillna(-1).to_numpy(dtype=np.int64)
+
+    for keys in (isos, names):
+        missing = rows < 0
+        if keys is None or not missing.any():
+            continue
+        # 사전 인코딩(category) 컬럼은 map 결과도 category일 수 있으므로 실수로 바꾼 뒤 채움
+        found = keys[missing].map(index.key_to_row).astype(np.float64).fillna(-1).to_numpy(dtype=np.int64)
+        rows[missing] = found
+
+    return rows
+
+
+def iter_line_features(p_lon: np.ndarray, p_lat: np.ndarray, r_lon: np.ndarray, r_lat: np.ndarray,
+                       properties: Dict, optional_properties: Optional[Dict] = None) -> Iterator[Dict]:
+    """좌표/속성 배열에서 LineString Feature를 차례로 생성 (파트너국 → 보고국)
+
+    Args:
+        properties: 속성명 → 배열 또는 스칼라 (스칼라는 모든 Feature에 같은 값)
+        optional_properties: 속성명 → 배열 (NaN인 값은 해당 Feature에서 생략)
+    """
+    def column(values):
+        if isinstance(values, (pd.Series, pd.Index, np.ndarray, list)):
+            return values.tolist() if hasattr(values, 'tolist') else values
+        return repeat(values)
+
+    names = list(properties)
+    columns = [column(values) for values in properties.values()]
+    optional_names = list(optional_properties or {})
+    optional_columns = [column(values) for values in (optional_properties or {}).values()]
+    coordinates = zip(p_lon.tolist(), p_lat.tolist(), r_lon.tolist(), r_lat.tolist())
+
+    if not optional_columns:
+        for (plon, plat, rlon, rlat), values in zip(coordinates, zip(*columns)):
+            yield {
+                'type': 'Feature',
+                'geometry': {'type': 'LineString', 'coordinates': [[plon, plat], [rlon, rlat]]},
+                'properties': dict(zip(names, values))
+            }
+        return
+
+    for (plon, plat, rlon, rlat), values, optional in zip(coordinates, zip(*columns), zip(*optional_columns)):
+        props = dict(zip(names, values))
+        for name, value in zip(optional_names, optional):
+            if value == value:  # NaN 제외
+                props[name] = value
+        yield {
+            'type': 'Feature',
+            'geometry': {'type': 'LineString', 'coordinates': [[plon, plat], [rlon, rlat]]},
+            'properties': props
+        }
+
+
+@contextmanager
+def _gc_paused():
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _country_columns(df: pd.DataFrame, columns: Tuple, fallback_name: Optional[str]):
+    code_column, iso_columns, name_column = columns
+    codes = df[code_column] if code_column in df.columns else None
+    iso_column = next((c for c in iso_columns if c in df.columns), None)
+    isos = df[iso_column] if iso_column else None
+    if name_column in df.columns:
+        names = df[name_column]
+    else:
+        names = pd.Series(fallback_name if fallback_name is not None else 'Unknown', index=df.index)
+    return codes, isos, names
+
+
+def _numeric(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df.columns:
+        return pd.Series(0.0, index=df.index)
+    return pd.to_numeric(df[column], errors='coerce').fillna(0).astype(float)
+
+
+def prepare_trade_flows(df: pd.DataFrame, index: CentroidIndex,
+                        reporter_name: Optional[str] = None,
+                        partner_name: Optional[str] = None) -> pd.DataFrame:
+    """Comtrade 응답에 보고국/파트너국 좌표를 붙이고 좌표가 있는 행만 반환
+
+    Returns:
+        reporter_name, partner_name, trade_value, net_weight, quantity,
+        reporter_lon, reporter_lat, partner_lon, partner_lat 컬럼의 DataFrame
+    """
+    r_codes, r_isos, r_names = _country_columns(df, REPORTER_COLUMNS, reporter_name)
+    p_codes, p_isos, p_names = _country_columns(df, PARTNER_COLUMNS, partner_name)
+
+    r_rows = resolve_rows(index, r_codes, r_isos, r_names)
+    p_rows = resolve_rows(index, p_codes, p_isos, p_names)
+    matched = (r_rows >= 0) & (p_rows >= 0)
+    r_rows, p_rows = r_rows[matched], p_rows[matched]
+
+    return pd.DataFrame({
+        'reporter_name': r_names.to_numpy()[matched],
+        'partner_name': p_names.to_numpy()[matched],
+        'trade_value': _numeric(df, 'primaryValue').to_numpy()[matched],
+        'net_weight': _numeric(df, 'netWgt').to_numpy()[matched],
+        'quantity': _numeric(df, 'qty').to_numpy()[matched],
+        'reporter_lon': index.lon[r_rows],
+        'reporter_lat': index.lat[r_rows],
+        'partner_lon': index.lon[p_rows],
+        'partner_lat': index.lat[p_rows]
+    })
+
+
+def iter_trade_flow_features(df: pd.DataFrame, index: CentroidIndex, item_name: str, year: int,
+                             reporter_name: Optional[str] = None,
+                             partner_name: Optional[str] = None,
+                             period: Optional[str] = None) -> Tuple[Iterator[Dict], int]:
+    """Comtrade 응답 DataFrame을 무역 흐름 Feature 이터레이터로 변환
+
+    좌표 조회는 바로 끝내고 Feature는 순회할 때 하나씩 만들어지므로,
+    geojson_writer로 바로 저장하면 전체 Feature 목록을 메모리에 두지 않습니다.
+    period(YYYYMM)를 주면 월별 Feature에 period 속성을 추가합니다.
+
+    Returns:
+        (Feature 이터레이터, 좌표를 찾은 레코드 수 = Feature 수)
+    """
+    flows = prepare_trade_flows(df, index, reporter_name, partner_name)
+    features = iter_line_features(
+        flows['partner_lon'].to_numpy(), flows['partner_lat'].to_numpy(),
+        flows['reporter_lon'].to_numpy(), flows['reporter_lat'].to_numpy(),
+        properties={
+            'reporter_name': flows['reporter_name'],
+            'partner_name': flows['partner_name'],
+            'trade_value': flows['trade_value'],
+            'net_weight': flows['net_weight'],
+            'quantity': flows['quantity'],
+            'item': item_name,
+            'year': year,
+            'flow_direction': flows['partner_name'].astype(str) + " → " + flows['reporter_name'].astype(str),
+            **({'period': period} if period else {})
+        }
+    )
+    return features, len(flows)
+
+
+def build_trade_flow_features(df: pd.DataFrame, index: CentroidIndex, item_name: str, year: int,
+                              reporter_name: Optional[str] = None,
+                              partner_name: Optional[str] = None) -> Tuple[List[Dict], int]:
+    """Comtrade 응답 DataFrame을 무역 흐름 Feature 목록으로 변환
+
+    Returns:
+        (Feature 목록, 좌표를 찾은 레코드 수)
+    """
+    features, matched = iter_trade_flow_features(df, index, item_name, year, reporter_name, partner_name)
+    with _gc_paused():
+        return list(features), matched
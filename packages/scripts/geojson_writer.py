@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+스트리밍 GeoJSON 저장 모듈
+
+FeatureCollection 전체를 메모리에 만든 뒤 json.dump(indent=2)로 쓰는 대신,
+Feature를 만들어지는 대로 한 개씩 직렬화해 파일에 씁니다.
+reporter=all 같은 대용량 수집도 Feature 하나 분량의 메모리로 저장할 수 있습니다.
+
+저장 형식:
+    compact - 들여쓰기 없는 FeatureCollection, 좌표는 소수점 고정 자릿수 (기본값)
+    pretty  - 기존과 같은 indent=2 FeatureCollection
+    seq     - 한 줄에 Feature 하나인 GeoJSONSeq (.geojsonl, 컬렉션 metadata 없음)
+
+사용법:
+    from geojson_writer import write_geojson
+    write_geojson(path, geojson, fmt='compact')
+
+    with GeoJSONWriter(path, fmt='seq') as writer:
+        for feature in features:
+            writer.write_feature(feature)
+"""
+
+import json
+import os
+import textwrap
+from typing import Dict, Iterable, Optional
+
+FORMAT_COMPACT = "compact"
+FORMAT_PRETTY = "pretty"
+FORMAT_SEQ = "seq"
+GEOJSON_FORMATS = (FORMAT_COMPACT, FORMAT_PRETTY, FORMAT_SEQ)
+DEFAULT_GEOJSON_FORMAT = FORMAT_COMPACT
+
+# 소수점 6자리 ≈ 0.1m (국가 중심점 표시에 충분)
+DEFAULT_COORD_PRECISION = 6
+
+
+def geojson_extension(fmt: str) -> str:
+    """저장 형식별 파일 확장자"""
+    return ".geojsonl" if fmt == FORMAT_SEQ else ".geojson"
+
+
+def _round_coordinates(coordinates, precision: int):
+    if not isinstance(coordinates, (list, tuple)):
+        return round(coordinates, precision)
+    # LineString / MultiPoint처럼 좌표 쌍의 목록인 경우 (무역 흐름 Feature)
+    if coordinates and isinstance(coordinates[0], (list, tuple)) and not isinstance(coordinates[0][0], (list, tuple)):
+        return [[round(value, precision) for value in point] for point in coordinates]
+    return [_round_coordinates(c, precision) for c in coordinates]
+
+
+class GeoJSONWriter:
+    """Feature를 하나씩 파일에 쓰는 GeoJSON 저장기
+
+    임시 파일에 쓴 뒤 close()에서 대상 경로로 교체하므로,
+    중간에 중단되어도 잘린 파일이 남지 않습니다.
+    """
+
+    def __init__(self, path: str, fmt: str = DEFAULT_GEOJSON_FORMAT,
+                 precision: Optional[int] = DEFAULT_COORD_PRECISION):
+        if fmt not in GEOJSON_FORMATS:
+            raise ValueError(f"지원하지 않는 GeoJSON 형식: {fmt} ({', '.join(GEOJSON_FORMATS)})")
+
+        self.path = path
+        self.fmt = fmt
+        # pretty 형식은 기존 출력과 같도록 좌표를 반올림하지 않음
+        self.precision = None if fmt == FORMAT_PRETTY else precision
+        self.count = 0
+        self._closed = False
+        # 매 호출마다 인코더를 새로 만들지 않도록 재사용
+        if fmt == FORMAT_PRETTY:
+            self._encode = json.JSONEncoder(indent=2, ensure_ascii=False).encode
+        else:
+            self._encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+
+        self._tmp_path = f"{path}.tmp"
+        self._file = open(self._tmp_path, 'w', encoding='utf-8')
+        if fmt == FORMAT_COMPACT:
+            self._file.write('{"type":"FeatureCollection","features":[')
+        elif fmt == FORMAT_PRETTY:
+            self._file.write('{\n  "type": "FeatureCollection",\n  "features": [')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._closed:
+            return False
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def write_feature(self, feature: Dict):
+        """Feature 하나 기록"""
+        if self.precision is not None:
+            geometry = feature['geometry']
+            feature = {
+                **feature,
+                'geometry': {**geometry, 'coordinates': _round_coordinates(geometry['coordinates'], self.precision)}
+            }
+
+        if self.fmt == FORMAT_SEQ:
+            self._file.write(self._encode(feature) + '\n')
+        elif self.fmt == FORMAT_COMPACT:
+            self._file.write(',' + self._encode(feature) if self.count else self._encode(feature))
+        else:
+            self._file.write(',\n' if self.count else '\n')
+            self._file.write(textwrap.indent(self._encode(feature), '    '))
+        self.count += 1
+
+    def write_features(self, features: Iterable[Dict]) -> int:
+        """여러 Feature 기록 (이터레이터도 가능)"""
+        for feature in features:
+            self.write_feature(feature)
+        return self.count
+
+    def close(self, metadata: Optional[Dict] = None) -> str:
+        """컬렉션을 닫고 파일을 확정 (seq 형식은 metadata를 기록하지 않음)
+
+        Returns:
+            저장된 파일 경로
+        """
+        if self.fmt == FORMAT_COMPACT:
+            self._file.write(']')
+            if metadata is not None:
+                self._file.write(',"metadata":' + self._encode(metadata))
+            self._file.write('}')
+        elif self.fmt == FORMAT_PRETTY:
+            self._file.write('\n  ]' if self.count else ']')
+            if metadata is not None:
+                body = self._encode(metadata)
+                self._file.write(',\n  "metadata": ' + textwrap.indent(body, '  ')[2:])
+            self._file.write('\n}')
+
+        self._file.close()
+        self._closed = True
+        os.replace(self._tmp_path, self.path)
+        return self.path
+
+    def abort(self):
+        """기록 중단 (임시 파일 삭제)"""
+        self._file.close()
+        self._closed = True
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+
+def write_geojson(path: str, geojson: Dict, fmt: str = DEFAULT_GEOJSON_FORMAT,
+                  precision: Optional[int] = DEFAULT_COORD_PRECISION) -> int:
+    """FeatureCollection 딕셔너리 저장
+
+    geojson['features']는 리스트뿐 아니라 이터레이터여도 되며, 하나씩 직렬화됩니다.
+
+    Returns:
+        기록한 Feature 수
+    """
+    with GeoJSONWriter(path, fmt, precision) as writer:
+        writer.write_features(geojson.get('features', []))
+        writer.close(geojson.get('metadata'))
+    return writer.count
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+추적 중인 HS 4단위 품목의 HS 6단위 세부 코드
+
+bulk_data_collector의 COMMODITY_MAP은 4단위 호(8541, 8542, 2709, 7403, 3901~3903)만 다루므로,
+--hs6 수집 모드는 여기 정의된 6단위 소호를 하나씩 요청합니다. (공개 API는 요청당 HS Code 1개)
+
+- 코드는 HS 2022(H6) 기준이며, 2022년 이전 자료에 남아 있는 HS 2017 소호(854140, 854150)도 함께 요청합니다
+  (해당 버전으로 보고되지 않은 연도는 데이터 없음으로 기록됨)
+- HS6 품목명은 "{품목 그룹}_{HS6 코드}" 형식입니다 (예: semiconductor_854231)
+- 상위 분류 합계는 코드 앞자리로 계산하므로(hs_rollup) 목록에 없는 코드가 저장되어 있어도 합계에 포함됩니다
+"""
+
+from typing import Dict, List
+
+# HS 4단위 호 → {HS 6단위 소호: 설명}
+HS6_SUBHEADINGS = {
+    "8541": {
+        "854110": "다이오드 (감광성/발광 다이오드 제외)",
+        "854121": "트랜지스터 (소비전력 1W 미만)",
+        "854129": "기타 트랜지스터",
+        "854130": "사이리스터, 다이액, 트라이액",
+        "854140": "감광성 반도체, 태양전지, 발광 다이오드 (HS 2017)",
+        "854141": "발광 다이오드 (LED)",
+        "854142": "태양전지 (모듈/패널로 조립되지 않은 것)",
+        "854143": "태양전지 (모듈/패널로 조립된 것)",
+        "854149": "기타 감광성 반도체 디바이스",
+        "854150": "기타 반도체 디바이스 (HS 2017)",
+        "854151": "반도체 기반 변환기(트랜스듀서)",
+        "854159": "기타 반도체 디바이스",
+        "854160": "장착된 압전 결정소자",
+        "854190": "부분품"
+    },
+    "8542": {
+        "854231": "프로세서, 컨트롤러",
+        "854232": "메모리",
+        "854233": "증폭기",
+        "854239": "기타 집적회로",
+        "854290": "부분품"
+    },
+    "2709": {
+        "270900": "석유 및 역청유 (원유)"
+    },
+    "7403": {
+        "740311": "음극 및 음극 절단품",
+        "740312": "와이어바",
+        "740313": "빌릿",
+        "740319": "기타 정제 구리",
+        "740321": "구리-아연 합금 (황동)",
+        "740322": "구리-주석 합금 (청동)",
+        "740329": "기타 구리 합금"
+    },
+    "3901": {
+        "390110": "폴리에틸렌 (비중 0.94 미만)",
+        "390120": "폴리에틸렌 (비중 0.94 이상)",
+        "390130": "에틸렌-초산비닐 공중합체",
+        "390140": "에틸렌-알파올레핀 공중합체 (비중 0.94 미만)",
+        "390190": "기타 에틸렌 중합체"
+    },
+    "3902": {
+        "390210": "폴리프로필렌",
+        "390220": "폴리이소부틸렌",
+        "390230": "프로필렌 공중합체",
+        "390290": "기타 프로필렌 중합체"
+    },
+    "3903": {
+        "390311": "발포성 폴리스티렌",
+        "390319": "기타 폴리스티렌",
+        "390320": "스티렌-아크릴로니트릴(SAN) 공중합체",
+        "390330": "아크릴로니트릴-부타디엔-스티렌(ABS) 공중합체",
+        "390390": "기타 스티렌 중합체"
+    }
+}
+
+
+def hs6_codes(heading: str) -> List[str]:
+    """HS 4단위 호의 6단위 소호 목록 (정의되지 않은 호는 빈 목록)"""
+    return list(HS6_SUBHEADINGS.get(str(heading)[:4], {}))
+
+
+def hs_description(code: str) -> str:
+    """HS 6단위 소호 설명 (없으면 빈 문자열)"""
+    return HS6_SUBHEADINGS.get(str(code)[:4], {}).get(str(code), "")
+
+
+def item_group_name(item: str) -> str:
+    """품목명의 그룹 부분 (semiconductor_8542 → semiconductor, copper → copper)"""
+    return item.split('_')[0]
+
+
+def leaf_commodity_map(commodity_map: Dict[str, str], items: List[str]) -> Dict[str, str]:
+    """4단위 품목들의 HS6 품목명 → HS6 코드 (예: semiconductor_8542 → semiconductor_854231: 854231)"""
+    leaves = {}
+    for item in items:
+        for code in hs6_codes(commodity_map[item]):
+            leaves[f"{item_group_name(item)}_{code}"] = code
+    return leaves
+
+
+def leaf_parent_items(commodity_map: Dict[str, str], items: List[str]) -> Dict[str, str]:
+    """HS6 품목명 → 4단위 품목명 (HS6 저장소는 4단위 품목으로 파티션)"""
+    return {leaf: item for item in items for leaf in leaf_commodity_map(commodity_map, [item])}
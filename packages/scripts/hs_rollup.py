@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+HS6 리프 무역 흐름의 계층 합계 (HS4 / HS2 / 품목 / 품목 그룹)
+
+--hs6 모드로 수집한 HS 6단위 레코드는 HS6 저장소(trade_store.DEFAULT_HS6_STORE_PATH)에 한 번만
+저장하고, 상위 분류 합계는 여기서 벡터화된 groupby로 계산합니다.
+
+    hs6   - HS 6단위 소호 (리프)
+    hs4   - HS 4단위 호 (cmdCode 앞 4자리)      ← hs6 합계에서 계산
+    hs2   - HS 2단위 류 (cmdCode 앞 2자리)      ← hs4 합계에서 계산
+    item  - 수집 품목 (semiconductor_8542 등)   ← hs4 합계에서 계산
+    group - 품목 그룹 (semiconductor, plastic 등) ← item 합계에서 계산
+
+- 각 수준은 바로 아래 수준의 합계에서 계산하므로 리프 레코드는 연도마다 한 번만 읽습니다
+- 합계 행은 (기간, 무역흐름, 보고국, 파트너국, 분류 코드)마다 하나이며, 무역 금액(primaryValue,
+  cifvalue, fobvalue)과 순중량(netWgt)의 합과 포함된 리프 레코드 수(leafCount)를 가집니다.
+  수량(qty)은 소호마다 단위가 달라 합산하지 않습니다
+- 합계는 (연도, 수준)마다 저장소 옆 rollups/level=<수준>/year=<연도>.parquet에 캐시합니다.
+  해당 연도 저장소 파티션 파일의 크기/수정 시각이 바뀌면 다시 계산합니다
+
+사용법:
+    python hs_rollup.py --year 2023 --level hs4
+    python hs_rollup.py --year 2023 --level hs6 --code 8542 --reporter 842
+    python hs_rollup.py --year 2023 --compare-year 2022 --level hs6 --code 8542
+    python hs_rollup.py --refresh
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from hs_nomenclature import hs_description, item_group_name
+from metrics import get_metrics
+from trade_store import TradeStore, DEFAULT_HS6_STORE_PATH
+
+ROLLUP_DIRNAME = "rollups"
+
+LEVELS = ('hs6', 'hs4', 'hs2', 'item', 'group')
+HS_DIGITS = {'hs6': 6, 'hs4': 4, 'hs2': 2}
+# 각 수준을 계산할 바로 아래 수준 (hs6은 리프 레코드에서 계산)
+PARENT_LEVEL = {'hs6': None, 'hs4': 'hs6', 'hs2': 'hs4', 'item': 'hs4', 'group': 'item'}
+# 수준별 분류 코드 컬럼
+CODE_COLUMN = {'hs6': 'cmdCode', 'hs4': 'cmdCode', 'hs2': 'cmdCode', 'item': 'item', 'group': 'group'}
+
+FLOW_KEYS = ['period', 'flowCode', 'reporterCode', 'partnerCode']
+NAME_COLUMNS = ['reporterISO', 'reporterDesc', 'partnerISO', 'partnerDesc']
+VALUE_COLUMNS = ['primaryValue', 'cifvalue', 'fobvalue', 'netWgt']
+LEAF_COUNT = 'leafCount'
+LEAF_COLUMNS = ['item'] + FLOW_KEYS + ['cmdCode'] + NAME_COLUMNS + VALUE_COLUMNS
+
+FINGERPRINT_KEY = b'source_fingerprint'
+# 메모리에 들고 있을 (연도, 수준) 합계 수
+MEMO_SIZE = 16
+
+
+def _factorized(labels: Sequence, codes: np.ndarray) -> pd.Categorical:
+    # 범주(고유값)마다 한 번만 계산한 라벨을 행 코드로 펼침 (코드 -1 = 값 없음)
+    inverse, uniques = pd.factorize(pd.Index(labels))
+    mapped = np.where(codes >= 0, inverse[np.maximum(codes, 0)], -1)
+    return pd.Categorical.from_codes(mapped, categories=uniques)
+
+
+def level_codes(df: pd.DataFrame, level: str) -> pd.Categorical:
+    """행마다의 수준별 분류 코드 (HS 앞자리, 품목명, 품목 그룹명)"""
+    if level in HS_DIGITS:
+        cmd = df['cmdCode'].astype('category')
+        prefixes = cmd.cat.categories.astype(str).str[:HS_DIGITS[level]]
+        return _factorized(prefixes, cmd.cat.codes.to_numpy())
+    items = df['item'].astype('category')
+    if level == 'item':
+        return items.array
+    return _factorized([item_group_name(str(item)) for item in items.cat.categories], items.cat.codes.to_numpy())
+
+
+def rollup_frame(source: pd.DataFrame, level: str) -> pd.DataFrame:
+    """리프 레코드 또는 아래 수준 합계를 level 수준으로 합산
+
+    hs6/hs4 합계는 item 컬럼도 키로 유지합니다 (호 하나는 품목 하나에 속함).
+    """
+    if level not in LEVELS:
+        raise ValueError(f"알 수 없는 합계 수준: {level} (가능: {', '.join(LEVELS)})")
+
+    columns = {column: source[column] for column in FLOW_KEYS}
+    columns[CODE_COLUMN[level]] = level_codes(source, level)
+    if level in ('hs6', 'hs4'):
+        columns['item'] = source['item'].astype('category')
+    keys = list(columns)
+    for column in NAME_COLUMNS + VALUE_COLUMNS:
+        columns[column] = source[column] if column in source.columns else np.nan
+    columns[LEAF_COUNT] = source[LEAF_COUNT] if LEAF_COUNT in source.columns else 1
+    frame = pd.DataFrame(columns)
+
+    grouped = frame.groupby(keys, observed=True, sort=False, dropna=False)
+    result = pd.concat([
+        grouped[VALUE_COLUMNS].sum(min_count=1),
+        grouped[NAME_COLUMNS].first(),
+        grouped[LEAF_COUNT].sum()
+    ], axis=1).reset_index()
+    result[LEAF_COUNT] = result[LEAF_COUNT].astype(np.int64)
+    return result
+
+
+class HSRollup:
+    """HS6 저장소의 (연도, 수준)별 합계 계산과 캐시 (프로세스 내 스레드 안전)"""
+
+    def __init__(self, store: TradeStore, cache_dir: Optional[str] = None):
+        self.store = store
+        # 기본 캐시 위치는 저장소와 같은 상위 디렉터리 (./data/store/rollups)
+        self.cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(store.root)), ROLLUP_DIRNAME)
+        self.metrics = get_metrics()
+        self._memo = OrderedDict()
+        self._lock = threading.RLock()
+
+    def cache_path(self, year: int, level: str) -> str:
+        """(연도, 수준) 합계 캐시 파일 경로"""
+        return os.path.join(self.cache_dir, f"level={level}", f"year={int(year)}.parquet")
+
+    def years(self) -> List[int]:
+        """저장소에 있는 연도"""
+        return sorted({year for _, year in self.store.partitions()})
+
+    def fingerprint(self, year: int) -> str:
+        """연도 파티션 파일들의 크기/수정 시각 해시 (저장소에 추가하면 바뀜)"""
+        parts = []
+        for item, part_year in self.store.partitions():
+            if part_year == int(year):
+                stat = os.stat(self.store.partition_path(item, part_year))
+                parts.append(f"{item}:{stat.st_size}:{stat.st_mtime_ns}")
+        return hashlib.sha256('|'.join(parts).encode()).hexdigest()[:16]
+
+    def rollup(self, year: int, level: str) -> pd.DataFrame:
+        """(연도, 수준) 합계 (캐시가 최신이면 캐시에서 읽음)"""
+        if level not in LEVELS:
+            raise ValueError(f"알 수 없는 합계 수준: {level} (가능: {', '.join(LEVELS)})")
+        with self._lock:
+            return self._rollup(int(year), level, self.fingerprint(year))
+
+    def refresh(self, years: Optional[Sequence[int]] = None, levels: Sequence[str] = LEVELS) -> int:
+        """연도별 합계를 미리 계산해 캐시 (기본값: 저장소의 모든 연도)
+
+        Returns:
+            새로 계산하거나 확인한 (연도, 수준) 합계 수
+        """
+        count = 0
+        with self._lock:
+            for year in (years or self.years()):
+                fingerprint = self.fingerprint(year)
+                for level in levels:
+                    self._rollup(int(year), level, fingerprint)
+                    count += 1
+        return count
+
+    def _rollup(self, year: int, level: str, fingerprint: str) -> pd.DataFrame:
+        key = (year, level)
+        cached = self._memo.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            self._memo.move_to_end(key)
+            self.metrics.inc('rollup_cache_hits', level=level)
+            return cached[1]
+
+        df = self._read_cache(year, level, fingerprint)
+        if df is not None:
+            self.metrics.inc('rollup_cache_hits', level=level)
+        else:
+            self.metrics.inc('rollup_cache_misses', level=level)
+            parent = PARENT_LEVEL[level]
+            source = (self.store.scan(years=[year], columns=LEAF_COLUMNS) if parent is None
+                      else self._rollup(year, parent, fingerprint))
+            with self.metrics.timer('rollup_compute'):
+                df = rollup_frame(source, level)
+            self._write_cache(year, level, fingerprint, df)
+
+        self._memo[key] = (fingerprint, df)
+        while len(self._memo) > MEMO_SIZE:
+            self._memo.popitem(last=False)
+        return df
+
+    def _read_cache(self, year: int, level: str, fingerprint: str) -> Optional[pd.DataFrame]:
+        path = self.cache_path(year, level)
+        if not os.path.exists(path):
+            return None
+        # 원본이 바뀐 캐시는 본문을 읽지 않고 스키마 메타데이터만 보고 버림
+        metadata = pq.read_schema(path).metadata or {}
+        if metadata.get(FINGERPRINT_KEY) != fingerprint.encode():
+            return None
+        return pq.read_table(path).to_pandas()
+
+    def _write_cache(self, year: int, level: str, fingerprint: str, df: pd.DataFrame):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                               FINGERPRINT_KEY: fingerprint.encode()})
+        path = self.cache_path(year, level)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+
+    def query(self, years: Sequence[int], level: str, codes: Optional[List[str]] = None,
+              reporter_codes: Optional[List] = None, partner_codes: Optional[List] = None,
+              flow_codes: Optional[List[str]] = None) -> pd.DataFrame:
+        """여러 연도의 합계를 조건으로 걸러 하나로 합침 (year 컬럼 추가)
+
+        codes는 hs 수준에서는 HS 코드 앞자리(예: 8542), item/group 수준에서는 품목/그룹명입니다.
+        """
+        frames = []
+        for year in years:
+            df = self.rollup(year, level)
+            mask = np.ones(len(df), dtype=bool)
+            if codes:
+                column = df[CODE_COLUMN[level]].astype(str)
+                mask &= (column.str.startswith(tuple(str(c) for c in codes)) if level in HS_DIGITS
+                         else column.isin([str(c) for c in codes])).to_numpy()
+            if reporter_codes:
+                mask &= df['reporterCode'].isin([int(c) for c in reporter_codes]).to_numpy()
+            if partner_codes:
+                mask &= df['partnerCode'].isin([int(c) for c in partner_codes]).to_numpy()
+            if flow_codes:
+                mask &= df['flowCode'].astype(str).isin(flow_codes).to_numpy()
+            frames.append(df[mask].assign(year=int(year)))
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+
+def code_totals(df: pd.DataFrame, level: str) -> pd.DataFrame:
+    """분류 코드별 무역 금액/순중량 합계 (무역 금액 내림차순)"""
+    column = CODE_COLUMN[level]
+    if df.empty:
+        return pd.DataFrame(columns=[column, 'primaryValue', 'netWgt', LEAF_COUNT])
+    totals = df.groupby(df[column].astype(str))[['primaryValue', 'netWgt', LEAF_COUNT]].sum(min_count=1)
+    return totals.sort_values('primaryValue', ascending=False).reset_index()
+
+
+def compare_totals(current: pd.DataFrame, previous: pd.DataFrame, level: str) -> pd.DataFrame:
+    """두 연도의 코드별 무역 금액과 변화량, 전체 변화 중 비중 (변화량 절댓값 내림차순)"""
+    column = CODE_COLUMN[level]
+    merged = code_totals(current, level)[[column, 'primaryValue']].merge(
+        code_totals(previous, level)[[column, 'primaryValue']], on=column, how='outer',
+        suffixes=('', '_previous')
+    ).fillna(0.0)
+    merged['change'] = merged['primaryValue'] - merged['primaryValue_previous']
+    total_change = merged['change'].abs().sum()
+    merged['change_share'] = merged['change'].abs() / total_change if total_change else 0.0
+    return merged.reindex(merged['change'].abs().sort_values(ascending=False).index).reset_index(drop=True)
+
+
+def _label(code: str, level: str) -> str:
+    description = hs_description(code) if level == 'hs6' else ""
+    return f"{code} {description}".strip()
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(
+        description="HS6 리프 무역 흐름의 HS4/HS2/품목/품목 그룹 합계 조회",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python hs_rollup.py --year 2023 --level hs4
+  python hs_rollup.py --year 2023 --level hs6 --code 8542 --reporter 842
+  python hs_rollup.py --year 2023 --compare-year 2022 --level hs6 --code 8542
+  python hs_rollup.py --year 2022 2023 --level group --csv group_totals.csv
+  python hs_rollup.py --refresh
+
+HS6 레코드 수집:
+  python bulk_data_collector.py --start-year 2022 --end-year 2023 --items semiconductor --hs6
+        """
+    )
+    parser.add_argument("--store-path", type=str, default=DEFAULT_HS6_STORE_PATH,
+                       help=f"HS6 저장소 경로 (기본값: {DEFAULT_HS6_STORE_PATH})")
+    parser.add_argument("--cache-dir", type=str,
+                       help=f"합계 캐시 디렉터리 (기본값: 저장소 옆 {ROLLUP_DIRNAME} 디렉터리)")
+    parser.add_argument("--year", type=int, nargs="+", help="연도 (기본값: 저장소의 모든 연도)")
+    parser.add_argument("--level", choices=LEVELS, default='hs4', help="합계 수준 (기본값: hs4)")
+    parser.add_argument("--code", nargs="+", help="HS 코드 앞자리 또는 품목/그룹명")
+    parser.add_argument("--reporter", nargs="+", help="보고국 M49 코드")
+    parser.add_argument("--partner", nargs="+", help="파트너국 M49 코드")
+    parser.add_argument("--flow", nargs="+", help="무역흐름 코드 (M, X)")
+    parser.add_argument("--compare-year", type=int, help="비교 연도 (코드별 변화량과 비중 출력)")
+    parser.add_argument("--top", type=int, default=20, help="출력할 코드 수 (기본값: 20)")
+    parser.add_argument("--csv", type=str, help="조건에 맞는 합계 행을 CSV로 저장")
+    parser.add_argument("--refresh", action="store_true", help="모든 수준의 합계를 미리 계산해 캐시")
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.store_path):
+        print(f"❌ 저장소를 찾을 수 없습니다: {args.store_path}")
+        sys.exit(1)
+
+    rollup = HSRollup(TradeStore(args.store_path), args.cache_dir)
+    years = args.year or rollup.years()
+    if not years:
+        print("❌ 저장소에 데이터가 없습니다.")
+        sys.exit(1)
+
+    if args.refresh:
+        count = rollup.refresh(years)
+        print(f"🧮 합계 캐시 갱신: {len(years)}개 연도 × {len(LEVELS)}개 수준 ({count}개) → {rollup.cache_dir}")
+        return
+
+    filters = dict(codes=args.code, reporter_codes=args.reporter, partner_codes=args.partner,
+                   flow_codes=args.flow)
+    df = rollup.query(years, args.level, **filters)
+    print(f"🧮 {args.level} 합계: {', '.join(map(str, years))}년, {len(df):,}행")
+
+    if args.csv:
+        df.to_csv(args.csv, index=False, encoding='utf-8-sig')
+        print(f"💾 CSV 저장: {args.csv}")
+
+    column = CODE_COLUMN[args.level]
+    if args.compare_year:
+        previous = rollup.query([args.compare_year], args.level, **filters)
+        changes = compare_totals(df, previous, args.level).head(args.top)
+        print(f"\n📈 {args.compare_year}년 대비 변화 (변화량 순)")
+        for row in changes.itertuples(index=False):
+            label = _label(getattr(row, column), args.level)
+            print(f"   - {label:<40} ${row.primaryValue_previous:>18,.0f} → ${row.primaryValue:>18,.0f} "
+                  f"({row.change:+,.0f}, 변화의 {row.change_share:.1%})")
+        return
+
+    totals = code_totals(df, args.level)
+    grand_total = totals['primaryValue'].sum()
+    print()
+    for row in totals.head(args.top).itertuples(index=False):
+        share = row.primaryValue / grand_total if grand_total else 0.0
+        print(f"   - {_label(getattr(row, column), args.level):<40} ${row.primaryValue:>18,.0f} "
+              f"({share:.1%}, 리프 {int(row.leafCount):,}개)")
+
+
+if __name__ == "__main__":
+    main()
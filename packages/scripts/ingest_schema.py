@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Comtrade 응답 수집 스키마 (컬럼 선택과 타입 축소)
+
+최종 데이터 API 응답에는 40개가 넘는 컬럼이 있지만 파이프라인이 쓰는 것은 보고국/파트너국 코드와
+이름, 무역 금액, 중량, 수량 정도입니다. 응답을 받은 직후 필요한 컬럼만 골라 DataFrame을 만들고
+타입을 줄이면 수집 중 메모리와 CSV 출력 크기가 함께 줄어듭니다.
+
+컬럼 종류:
+    code     - 국가 코드 → int16 (범위를 넘으면 int32, 결측이 있으면 nullable 정수)
+    value    - 수치 → float32로 바꿔도 값이 그대로인 경우만 float32, 아니면 float64
+    category - 반복되는 문자열 → 사전(dictionary) 인코딩 (pandas category)
+
+스키마:
+    store   - 파티션 Parquet 저장소(trade_store)에 저장하는 컬럼 (기본값)
+    minimal - 지도/요약에 필요한 컬럼만 (코드, 이름, 무역 금액, 중량, 수량)
+    raw     - 응답 컬럼을 모두 그대로 유지 (이전 동작)
+
+사용법:
+    schema = get_ingest_schema('minimal')
+    df = schema.frame_from_records(records)
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+KIND_CODE = 'code'
+KIND_VALUE = 'value'
+KIND_CATEGORY = 'category'
+
+# 저장소 컬럼 (trade_store.STORE_SCHEMA와 같은 순서)
+STORE_COLUMNS = {
+    'freqCode': KIND_CATEGORY,
+    'period': KIND_CATEGORY,
+    'flowCode': KIND_CATEGORY,
+    'cmdCode': KIND_CATEGORY,
+    'reporterCode': KIND_CODE,
+    'reporterISO': KIND_CATEGORY,
+    'reporterDesc': KIND_CATEGORY,
+    'partnerCode': KIND_CODE,
+    'partnerISO': KIND_CATEGORY,
+    'partnerDesc': KIND_CATEGORY,
+    'qtyUnitAbbr': KIND_CATEGORY,
+    'qty': KIND_VALUE,
+    'netWgt': KIND_VALUE,
+    'cifvalue': KIND_VALUE,
+    'fobvalue': KIND_VALUE,
+    'primaryValue': KIND_VALUE
+}
+
+# 레코드 식별(저장소 키)과 배치 분할에 필요한 컬럼은 minimal에도 유지
+MINIMAL_COLUMNS = {
+    name: kind for name, kind in STORE_COLUMNS.items()
+    if name not in ('freqCode', 'qtyUnitAbbr', 'cifvalue', 'fobvalue')
+}
+
+INGEST_SCHEMAS = {
+    'store': STORE_COLUMNS,
+    'minimal': MINIMAL_COLUMNS,
+    'raw': None
+}
+DEFAULT_INGEST_SCHEMA = 'store'
+
+_INT16_RANGE = (np.iinfo(np.int16).min, np.iinfo(np.int16).max)
+
+
+def _code_column(values: pd.Series) -> pd.Series:
+    numeric = pd.to_numeric(values, errors='coerce')
+    if numeric.isna().any():
+        return numeric.astype('Int16' if numeric.between(*_INT16_RANGE).all() else 'Int32')
+    if numeric.empty or (numeric.min() >= _INT16_RANGE[0] and numeric.max() <= _INT16_RANGE[1]):
+        return numeric.astype(np.int16)
+    return numeric.astype(np.int32)
+
+
+def _value_column(values: pd.Series) -> pd.Series:
+    numeric = pd.to_numeric(values, errors='coerce').astype(np.float64)
+    # 무역 금액은 합계를 내므로 float32로 정밀도가 떨어지는 컬럼은 float64로 둠
+    narrowed = numeric.astype(np.float32)
+    if np.array_equal(narrowed.to_numpy(dtype=np.float64), numeric.to_numpy(), equal_nan=True):
+        return narrowed
+    return numeric
+
+
+def _category_column(values: pd.Series) -> pd.Series:
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values
+    return values.astype('category')
+
+
+_CONVERTERS = {
+    KIND_CODE: _code_column,
+    KIND_VALUE: _value_column,
+    KIND_CATEGORY: _category_column
+}
+
+
+class IngestSchema:
+    """응답에서 남길 컬럼과 컬럼별 종류 (columns가 None이면 응답을 그대로 유지)"""
+
+    def __init__(self, name: str, columns: Optional[Dict[str, str]]):
+        self.name = name
+        self.columns = columns
+
+    def __repr__(self) -> str:
+        return f"IngestSchema({self.name!r})"
+
+    @property
+    def projected(self) -> bool:
+        """컬럼을 골라내는 스키마인지"""
+        return self.columns is not None
+
+    def frame_from_records(self, records: List[Dict]) -> pd.DataFrame:
+        """응답 레코드에서 스키마 컬럼만 읽어 DataFrame 생성
+
+        전체 응답 DataFrame을 만든 뒤 고르는 대신 필요한 컬럼만 레코드에서 꺼냅니다.
+        (Comtrade 레코드는 모두 같은 키를 가지므로 첫 레코드로 컬럼 유무를 판단)
+        """
+        if not records:
+            return pd.DataFrame()
+        if not self.projected:
+            return pd.json_normalize(records)
+
+        present = records[0].keys()
+        columns = {
+            name: _CONVERTERS[kind](pd.Series([record.get(name) for record in records]))
+            for name, kind in self.columns.items() if name in present
+        }
+        return pd.DataFrame(columns)
+
+
+def get_ingest_schema(name: str = DEFAULT_INGEST_SCHEMA) -> IngestSchema:
+    """이름으로 수집 스키마 조회
+
+    Raises:
+        ValueError: 알 수 없는 스키마 이름
+    """
+    if name not in INGEST_SCHEMAS:
+        raise ValueError(f"알 수 없는 수집 스키마: {name} (가능: {', '.join(INGEST_SCHEMAS)})")
+    return IngestSchema(name, INGEST_SCHEMAS[name])
+
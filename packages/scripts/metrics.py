@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+수집기 단계별 실행 지표
+
+수집 실행에서 시간이 어디에 쓰이는지 보기 위해 단계별 소요 시간과 처리량을 모읍니다.
+comtrade_client와 수집기들은 프로세스 공용 지표(get_metrics)에 기록하고,
+실행이 끝나면(또는 주기적으로) Prometheus textfile과 JSON 보고서로 내보냅니다.
+
+단계(stage):
+    rate_limit_wait - 속도 제한기 토큰 대기
+    api_request     - 네트워크 요청 (응답 JSON 읽기 포함)
+    dataframe       - 응답 레코드 → DataFrame 변환
+    split_batch     - 배치 응답을 작업별로 분할
+    geojson_prepare - 좌표 조회/필터링 (process_to_geojson)
+    coordinate_join - 국가 좌표 결합 (process_trade_data)
+    geojson_write   - Feature 생성과 GeoJSON 직렬화/파일 쓰기
+    csv_write       - CSV 저장
+    store_append    - Parquet 저장소 추가
+
+카운터: requests, availability_requests, cache_hits, cache_misses, records, bytes_written, retries{kind}, errors{kind}, tasks{status}
+
+Prometheus textfile은 node_exporter의 textfile collector 디렉터리에 두면 수집됩니다:
+
+    comtrade_stage_seconds{stage="api_request",quantile="0.95"} 1.42
+    comtrade_requests_total 490
+    comtrade_requests_per_second 0.98
+
+사용법:
+    metrics = get_metrics()
+    with metrics.timer('api_request'):
+        ...
+    metrics.inc('records', len(df))
+    metrics.write_prometheus("data/output/collector_metrics.prom", collector="bulk")
+    metrics.write_report("data/output/collection_metrics.json")
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+METRIC_PREFIX = "comtrade"
+QUANTILES = (0.5, 0.95, 0.99)
+
+# 초당 처리량으로도 내보낼 카운터
+RATE_COUNTERS = ('requests', 'records', 'bytes_written')
+
+
+def _label_text(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"') for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+
+def _counter_key(name: str, labels: Dict[str, str]) -> Tuple:
+    return (name,) + tuple(sorted(labels.items()))
+
+
+class Metrics:
+    """단계별 소요 시간 분포와 카운터/게이지 모음 (스레드 안전)"""
+
+    def __init__(self):
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._timings = {}
+        self._counters = {}
+        self._gauges = {}
+        self._last_export = 0.0
+
+    def observe(self, stage: str, seconds: float):
+        """단계 소요 시간 하나 기록"""
+        with self._lock:
+            self._timings.setdefault(stage, []).append(seconds)
+
+    @contextmanager
+    def timer(self, stage: str):
+        """with 블록의 소요 시간을 stage에 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - started)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """카운터 증가"""
+        key = _counter_key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """게이지 값 설정"""
+        with self._lock:
+            self._gauges[_counter_key(name, labels)] = value
+
+    def counter(self, name: str, **labels) -> float:
+        """카운터 값 (labels를 주지 않으면 같은 이름의 모든 레이블 합계)"""
+        with self._lock:
+            if labels:
+                return self._counters.get(_counter_key(name, labels), 0)
+            return sum(value for key, value in self._counters.items() if key[0] == name)
+
+    def elapsed(self) -> float:
+        """지표 수집 시작 후 경과 시간(초)"""
+        return max(time.time() - self.started, 1e-9)
+
+    def snapshot(self) -> Dict:
+        """현재 지표 요약
+
+        Returns:
+            elapsed_seconds, stages(단계별 count/sum/mean/p50/p95/p99/max), counters, rates, gauges
+        """
+        with self._lock:
+            timings = {stage: np.asarray(values) for stage, values in self._timings.items()}
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+
+        elapsed = self.elapsed()
+        stages = {}
+        for stage, values in sorted(timings.items()):
+            p50, p95, p99 = np.quantile(values, QUANTILES)
+            stages[stage] = {
+                'count': int(values.size),
+                'sum': float(values.sum()),
+                'mean': float(values.mean()),
+                'p50': float(p50),
+                'p95': float(p95),
+                'p99': float(p99),
+                'max': float(values.max())
+            }
+
+        def flatten(values):
+            flat = {}
+            for key, value in sorted(values.items()):
+                name, labels = key[0], dict(key[1:])
+                flat[name + _label_text(labels)] = value
+            return flat
+
+        totals = {}
+        for key, value in counters.items():
+            totals[key[0]] = totals.get(key[0], 0) + value
+
+        return {
+            'started_at': datetime.fromtimestamp(self.started).isoformat(),
+            'elapsed_seconds': elapsed,
+            'stages': stages,
+            'counters': flatten(counters),
+            'rates': {f"{name}_per_second": totals.get(name, 0) / elapsed for name in RATE_COUNTERS},
+            'gauges': flatten(gauges)
+        }
+
+    def prometheus_text(self, **labels) -> str:
+        """Prometheus 텍스트 형식 (labels는 모든 지표에 붙는 공통 레이블)"""
+        snapshot = self.snapshot()
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+
+        lines = [
+            f"# HELP {METRIC_PREFIX}_stage_seconds Time spent per collection stage.",
+            f"# TYPE {METRIC_PREFIX}_stage_seconds summary"
+        ]
+        for stage, stats in snapshot['stages'].items():
+            stage_labels = {**labels, 'stage': stage}
+            for quantile in QUANTILES:
+                value = stats[f"p{int(round(quantile * 100))}"]
+                lines.append(f"{METRIC_PREFIX}_stage_seconds"
+                             f"{_label_text({**stage_labels, 'quantile': str(quantile)})} {value:.6f}")
+            lines.append(f"{METRIC_PREFIX}_stage_seconds_sum{_label_text(stage_labels)} {stats['sum']:.6f}")
+            lines.append(f"{METRIC_PREFIX}_stage_seconds_count{_label_text(stage_labels)} {stats['count']}")
+
+        for name in sorted({key[0] for key in counters}):
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name}_total counter")
+            for key, value in sorted(counters.items()):
+                if key[0] == name:
+                    lines.append(f"{METRIC_PREFIX}_{name}_total{_label_text({**labels, **dict(key[1:])})} {value:g}")
+
+        for name, value in snapshot['rates'].items():
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} gauge")
+            lines.append(f"{METRIC_PREFIX}_{name}{_label_text(labels)} {value:.6f}")
+
+        for name in sorted({key[0] for key in gauges}):
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} gauge")
+            for key, value in sorted(gauges.items()):
+                if key[0] == name:
+                    lines.append(f"{METRIC_PREFIX}_{name}{_label_text({**labels, **dict(key[1:])})} {value:g}")
+
+        lines.append(f"# TYPE {METRIC_PREFIX}_elapsed_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}_elapsed_seconds{_label_text(labels)} {snapshot['elapsed_seconds']:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, **labels) -> str:
+        """Prometheus textfile 저장 (node_exporter가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text(**labels))
+        os.replace(tmp_path, path)
+        self._last_export = time.monotonic()
+        return path
+
+    def maybe_write_prometheus(self, path: Optional[str], interval: float = 15.0, **labels):
+        """마지막 내보내기 후 interval초가 지났으면 textfile 갱신 (실행 중 모니터링용)"""
+        if path and time.monotonic() - self._last_export >= interval:
+            self.write_prometheus(path, **labels)
+
+    def write_report(self, path: str, **extra) -> str:
+        """최종 JSON 보고서 저장"""
+        report = {'generated_at': datetime.now().isoformat(), **extra, **self.snapshot()}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return path
+
+    def format_summary(self) -> str:
+        """콘솔 출력용 단계별 요약"""
+        snapshot = self.snapshot()
+        lines = []
+        for stage, stats in snapshot['stages'].items():
+            lines.append(f"   - {stage}: {stats['count']}회, 합계 {stats['sum']:.2f}초, "
+                         f"p50 {stats['p50'] * 1000:.1f}ms, p95 {stats['p95'] * 1000:.1f}ms, "
+                         f"p99 {stats['p99'] * 1000:.1f}ms")
+        rates = snapshot['rates']
+        lines.append(f"   - 처리량: 요청 {rates['requests_per_second']:.2f}/s, "
+                     f"레코드 {rates['records_per_second']:.1f}/s, "
+                     f"기록 {rates['bytes_written_per_second'] / 1024:.1f} KB/s")
+        return "\n".join(lines)
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """프로세스 공용 지표"""
+    return _metrics
+
+
+def reset_metrics() -> Metrics:
+    """프로세스 공용 지표를 새로 시작"""
+    global _metrics
+    _metrics = Metrics()
+    return _metrics
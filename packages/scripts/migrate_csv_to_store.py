@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+기존 CSV 파일 → 파티션 Parquet 저장소 마이그레이션
+
+data/output의 trade_{item}_{year}_{reporter}_{partner}.csv 파일들을 읽어
+(품목, 연도) 파티션별로 묶어 trade_store 데이터셋에 한 번씩 기록합니다.
+같은 레코드는 교체되므로 여러 번 실행해도 중복되지 않습니다.
+
+사용법:
+    python migrate_csv_to_store.py
+    python migrate_csv_to_store.py --input-dir data/output --store-path data/store/trade_flows
+    python migrate_csv_to_store.py --delete-csv
+"""
+
+import argparse
+import os
+import re
+import sys
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from trade_store import TradeStore, DEFAULT_STORE_PATH
+
+# 품목명에는 밑줄이 들어갈 수 있음 (예: semiconductor_8541)
+CSV_PATTERN = re.compile(r"^trade_(?P<item>.+)_(?P<year>\d{4})_(?P<reporter>[^_]+)_(?P<partner>[^_]+)\.csv$")
+
+
+def find_csv_files(input_dir: str) -> Dict[Tuple[str, int], List[str]]:
+    """무역 관계별 CSV 파일을 (품목, 연도)별로 분류"""
+    groups = {}
+    for filename in sorted(os.listdir(input_dir)):
+        match = CSV_PATTERN.match(filename)
+        if match:
+            key = (match.group('item'), int(match.group('year')))
+            groups.setdefault(key, []).append(os.path.join(input_dir, filename))
+    return groups
+
+
+def migrate(input_dir: str, store: TradeStore, delete_csv: bool = False) -> Dict:
+    """CSV 파일을 저장소로 옮김
+
+    Returns:
+        files, records, partitions, skipped 통계
+    """
+    groups = find_csv_files(input_dir)
+    stats = {'files': 0, 'records': 0, 'partitions': 0, 'skipped': 0}
+
+    for (item, year), paths in groups.items():
+        frames = []
+        for path in paths:
+            try:
+                df = pd.read_csv(path, encoding='utf-8-sig')
+            except (pd.errors.EmptyDataError, pd.errors.ParserError, UnicodeDecodeError) as e:
+                print(f"⚠️  읽을 수 없는 파일 건너뜀: {path} ({e})")
+                stats['skipped'] += 1
+                continue
+            if df.empty:
+                stats['skipped'] += 1
+                continue
+            frames.append(df)
+
+        if not frames:
+            continue
+
+        store.append_frames(frames, item, year)
+        stats['files'] += len(frames)
+        stats['records'] += sum(len(df) for df in frames)
+        stats['partitions'] += 1
+        print(f"   - {item} {year}: {len(frames)}개 파일, {sum(len(df) for df in frames)}개 레코드")
+
+        if delete_csv:
+            for path in paths:
+                os.remove(path)
+
+    return stats
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(
+        description="무역 관계별 CSV 파일을 파티션 Parquet 저장소로 마이그레이션",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python migrate_csv_to_store.py
+  python migrate_csv_to_store.py --input-dir data/output --store-path data/store/trade_flows
+  python migrate_csv_to_store.py --delete-csv    # 옮긴 뒤 CSV 삭제
+        """
+    )
+    parser.add_argument("--input-dir", type=str, default="./data/output",
+                       help="CSV 파일 디렉터리 (기본값: ./data/output)")
+    parser.add_argument("--store-path", type=str, default=DEFAULT_STORE_PATH,
+                       help=f"저장소 경로 (기본값: {DEFAULT_STORE_PATH})")
+    parser.add_argument("--delete-csv", action="store_true",
+                       help="저장소에 기록한 CSV 파일 삭제")
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.input_dir):
+        print(f"❌ 입력 디렉터리를 찾을 수 없습니다: {args.input_dir}")
+        sys.exit(1)
+
+    store = TradeStore(args.store_path)
+    print(f"🚚 CSV → Parquet 마이그레이션: {args.input_dir} → {args.store_path}")
+    stats = migrate(args.input_dir, store, delete_csv=args.delete_csv)
+
+    store_stats = store.stats()
+    print(f"\n✅ 마이그레이션 완료")
+    print(f"   - 파일: {stats['files']}개 (건너뜀 {stats['skipped']}개)")
+    print(f"   - 레코드: {stats['records']:,}개 → {stats['partitions']}개 파티션")
+    print(f"   - 저장소 크기: {store_stats['bytes'] / 1024:.1f} KB ({store_stats['records']:,}개 레코드)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,699 @@
+#!/usr/bin/env python3
+"""
+로컬 UN Comtrade API 대역 서버 (부하/처리량 테스트용)
+
+수집기가 사용하는 API만 흉내 냅니다:
+    GET /data/v1/get/{type}/{freq}/{cl}       최종 데이터 (구독 키, getFinalData)
+    GET /public/v1/preview/{type}/{freq}/{cl} 최종 데이터 (공개 preview)
+    GET /public/v1/get                        구 버전 공개 API (process_trade_data.py)
+    GET /bulk/v1/get/{type}/{freq}/{cl}       대량 파일 목록 (reporterCode, period)
+    GET /bulk/v1/file/{type}/{freq}/{cl}/{reporter}/{period}  대량 파일 (gzip 압축 탭 구분 텍스트)
+    GET /data/v1/getDA/{type}/{freq}/{cl}     데이터 공개 정보 (구독 키, /public/v1/getDA는 공개 버전)
+    GET /_stats                               요청/응답 종류별 집계 (JSON)
+
+응답 데이터는 --fixture 파일(v1 응답 형식의 CSV/Parquet/JSON)에서 조건에 맞는 행을 고르거나,
+없으면 요청한 (기간, 보고국, 파트너국, HS Code, 무역흐름) 조합마다 결정적으로 생성합니다.
+같은 요청에는 항상 같은 데이터를 돌려주므로 수집 결과를 비교할 수 있습니다.
+데이터 공개 정보의 lastReleased는 기간마다 고정된 과거 시각이고, --revised로 지정한 보고국(또는 보고국:기간)은
+서버를 시작한 시각에 다시 공개된 것으로 응답하며 생성 데이터의 값도 바뀝니다 (증분 갱신 테스트용).
+대량 파일은 보고국/기간마다 모든 파트너국(세계 포함) × BULK_CMD_CODES × 수입/수출 행과
+운송수단별 세부 행을 생성합니다. --write-bulk-fixture로 같은 파일을 디렉터리에 저장할 수 있습니다.
+
+장애 주입 (요청마다 확률로 적용):
+    --latency/--jitter     응답 지연 (밀리초)
+    --rate-limit-prob      429 (Retry-After 포함), --quota-per-minute를 넘어도 429
+    --error-prob           500
+    --timeout-prob         --hang-seconds 동안 응답하지 않음 (클라이언트 시간 초과)
+    --truncate-prob        Content-Length보다 짧은 본문을 보내고 연결 종료 (잘린 응답)
+
+사용법:
+    python mock_comtrade_server.py --port 8765 --latency 50 --rate-limit-prob 0.05
+    python mock_comtrade_server.py --write-bulk-fixture data/bulk --bulk-periods 2022 2023
+    python mock_comtrade_server.py --revised 842 410:2023
+    python bulk_data_collector.py --api-base-url http://127.0.0.1:8765 --no-cache --concurrency 16 --rate 50
+    COMTRADE_API_BASE_URL=http://127.0.0.1:8765 python run_bulk_collection.py --scenario test --no-confirm
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from collections import Counter, deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+from bulk_file_ingest import BULK_COLUMNS, bulk_filename
+from comtrade_client import (FINAL_DATA_PATH, PREVIEW_DATA_PATH, LEGACY_DATA_PATH, BULK_DATA_PATH, BULK_FILE_PATH,
+                             DATA_AVAILABILITY_PATH, PUBLIC_AVAILABILITY_PATH)
+from country_centroids import load_centroid_index
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_RECORDS = 500
+# reporter/partner가 all일 때 응답에 넣을 국가 수
+DEFAULT_ALL_COUNTRIES = 50
+
+# 요청 하나의 처리 결과 (/_stats 집계)
+OUTCOMES = ('ok', 'rate_limited', 'error', 'timeout', 'truncated', 'bad_request', 'not_found')
+
+# 대량 파일에 넣을 HS Code (수집기가 추적하는 코드와 추적하지 않는 코드, 상위 분류 포함)
+BULK_CMD_CODES = ['TOTAL', '27', '2709', '39', '3901', '3902', '3903', '74', '7403',
+                  '84', '8471', '85', '8541', '8542', '87', '8703']
+# 대량 파일 세부 행의 운송수단 코드 (합계 행은 0)
+BULK_BREAKDOWN_MOT_CODE = 2100
+DEFAULT_BULK_REPORTERS = ['842', '276', '392', '410', '156']
+DEFAULT_BULK_PERIODS = ['2022', '2023']
+
+# 구 버전 API 파라미터 → v1 컬럼
+LEGACY_FILTERS = {'r': 'reporterCode', 'p': 'partnerCode', 'ps': 'period', 'cc': 'cmdCode'}
+# 구 버전 API 무역흐름 코드 (1=수입, 2=수출)
+LEGACY_FLOWS = {'1': 'M', '2': 'X'}
+
+
+def _split(value: Optional[str]) -> Optional[List[str]]:
+    """쉼표로 구분된 파라미터 목록 (없거나 all이면 None = 전체)"""
+    if value is None or value.strip().lower() in ('', 'all'):
+        return None
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+class MockDataSource:
+    """요청 조건에 맞는 v1 형식 레코드 (픽스처 또는 결정적 생성)"""
+
+    def __init__(self, fixture: Optional[str] = None, empty_prob: float = 0.1,
+                 all_countries: int = DEFAULT_ALL_COUNTRIES, latest_period: Optional[str] = None,
+                 revised: Optional[List[str]] = None):
+        self.empty_prob = empty_prob
+        # 아직 공개되지 않은 달 (이 연월 이후의 월별 기간은 데이터 없음)
+        self.latest_period = latest_period
+        # 다시 공개된 (보고국, 기간) ("842"는 보고국의 모든 기간, "842:2023"은 그 기간만)
+        self.revised = {tuple(entry.split(':', 1)) if ':' in entry else (entry, None) for entry in revised or []}
+        self.revised_at = datetime.now().isoformat(timespec='seconds')
+        index = load_centroid_index()
+        valid = [row for row in range(len(index)) if index.m49[row] >= 0]
+        self.countries = {str(int(index.m49[row])): (str(index.iso3[row]), str(index.names[row])) for row in valid}
+        self.all_codes = list(self.countries)[:all_countries]
+        self.fixture = self._load_fixture(fixture) if fixture else None
+        self._bulk_files = {}
+        # 조건 비교용 문자열 키 (응답에는 원래 값을 그대로 돌려줌)
+        self.fixture_keys = {} if self.fixture is None else {
+            column: self.fixture[column].astype(str)
+            for column in ('period', 'reporterCode', 'partnerCode', 'cmdCode', 'flowCode')
+            if column in self.fixture.columns
+        }
+
+    @staticmethod
+    def _load_fixture(path: str) -> pd.DataFrame:
+        if path.endswith('.parquet'):
+            df = pd.read_parquet(path)
+        elif path.endswith('.json'):
+            with open(path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+            df = pd.DataFrame(payload.get('data', payload) if isinstance(payload, dict) else payload)
+        else:
+            df = pd.read_csv(path)
+        return df
+
+    def records(self, filters: Dict[str, Optional[List[str]]], type_code: str = 'C',
+                freq_code: str = 'A') -> List[Dict]:
+        """filters: v1 컬럼 → 허용 값 목록 (None이면 전체)"""
+        if self.fixture is not None:
+            return self._fixture_records(filters)
+        return self._generated_records(filters, type_code, freq_code)
+
+    def _fixture_records(self, filters: Dict[str, Optional[List[str]]]) -> List[Dict]:
+        mask = pd.Series(True, index=self.fixture.index)
+        for column, values in filters.items():
+            keys = self.fixture_keys.get(column)
+            if values is not None and keys is not None:
+                mask &= keys.isin(values)
+        rows = self.fixture[mask]
+        return json.loads(rows.to_json(orient='records', force_ascii=False))
+
+    def _generated_records(self, filters: Dict[str, Optional[List[str]]], type_code: str,
+                           freq_code: str) -> List[Dict]:
+        periods = filters.get('period') or ['2023']
+        reporters = filters.get('reporterCode') or self.all_codes
+        # 실제 API와 같이 파트너국 all에는 세계(0) 포함
+        partners = filters.get('partnerCode') or ['0'] + self.all_codes
+        cmd_codes = filters.get('cmdCode') or ['TOTAL']
+        flows = filters.get('flowCode') or ['M']
+
+        periods = self.published(periods)
+
+        records = []
+        for period in periods:
+            for cmd_code in cmd_codes:
+                for flow in flows:
+                    for reporter in reporters:
+                        for partner in partners:
+                            if reporter == partner:
+                                continue
+                            record = self._generate(period, reporter, partner, cmd_code, flow, type_code, freq_code)
+                            if record:
+                                records.append(record)
+        return records
+
+    def _generate(self, period: str, reporter: str, partner: str, cmd_code: str, flow: str,
+                  type_code: str, freq_code: str) -> Optional[Dict]:
+        # 조합마다 고정된 난수 (같은 요청은 항상 같은 응답, 다시 공개된 기간은 다른 값)
+        revision = "|revised" if self.is_revised(reporter, period) else ""
+        rng = random.Random(zlib.crc32(f"{period}|{reporter}|{partner}|{cmd_code}|{flow}{revision}".encode()))
+        if rng.random() < self.empty_prob:
+            return None
+        reporter_iso, reporter_name = self.countries.get(reporter, ('', f"Country {reporter}"))
+        partner_iso, partner_name = self.countries.get(partner, ('', f"Country {partner}"))
+        value = round(rng.uniform(1e4, 1e9), 2)
+        weight = round(value / rng.uniform(1, 50), 1)
+        return {
+            'typeCode': type_code,
+            'freqCode': freq_code,
+            'period': int(period) if period.isdigit() else period,
+            'reporterCode': int(reporter) if reporter.isdigit() else reporter,
+            'reporterISO': reporter_iso,
+            'reporterDesc': reporter_name,
+            'flowCode': flow,
+            'partnerCode': int(partner) if partner.isdigit() else partner,
+            'partnerISO': partner_iso,
+            'partnerDesc': partner_name,
+            'cmdCode': cmd_code,
+            'qtyUnitAbbr': 'kg',
+            'qty': weight,
+            'netWgt': weight,
+            'cifvalue': value if flow == 'M' else None,
+            'fobvalue': value if flow == 'X' else None,
+            'primaryValue': value
+        }
+
+    def published(self, periods: List[str]) -> List[str]:
+        """공개된 기간만 (--latest-period 이후의 월별 기간 제외)"""
+        if not self.latest_period:
+            return periods
+        return [period for period in periods if len(period) != 6 or period <= self.latest_period]
+
+    def is_revised(self, reporter: str, period: str) -> bool:
+        """(보고국, 기간)이 다시 공개되었는지"""
+        return (reporter, None) in self.revised or (reporter, period) in self.revised
+
+    def availability(self, reporters: Optional[List[str]], periods: List[str], type_code: str = 'C',
+                     freq_code: str = 'A', cl_code: str = 'HS') -> List[Dict]:
+        """(보고국, 기간)별 데이터 공개 정보 (reporters가 None이면 전체 보고국)"""
+        records = []
+        for period in self.published(periods):
+            for reporter in reporters or self.all_codes:
+                revised = self.is_revised(reporter, period)
+                first_released = initial_release(period)
+                reporter_iso, reporter_name = self.countries.get(reporter, ('', f"Country {reporter}"))
+                records.append({
+                    'typeCode': type_code,
+                    'freqCode': freq_code,
+                    'classificationCode': cl_code,
+                    'reporterCode': int(reporter) if reporter.isdigit() else reporter,
+                    'reporterISO': reporter_iso,
+                    'reporterDesc': reporter_name,
+                    'period': int(period) if period.isdigit() else period,
+                    'totalRecords': zlib.crc32(f"{reporter}|{period}".encode()) % 50000 + 1000,
+                    'datasetChecksum': zlib.crc32(f"{reporter}|{period}|{revised}".encode()),
+                    'firstReleased': first_released,
+                    'lastReleased': self.revised_at if revised else first_released,
+                    'isOriginalClassification': True
+                })
+        return records
+
+    def bulk_rows(self, reporter: str, period: str, type_code: str = 'C', freq_code: str = 'A') -> Iterator[Dict]:
+        """(보고국, 기간) 대량 파일 행 (세계 포함 모든 파트너국, 합계 행 뒤에 운송수단별 세부 행)"""
+        filters = {
+            'period': [period],
+            'reporterCode': [reporter],
+            'partnerCode': ['0'] + list(self.countries),
+            'cmdCode': BULK_CMD_CODES,
+            'flowCode': ['M', 'X']
+        }
+        for record in self.records(filters, type_code, freq_code):
+            yield to_bulk_row(record)
+            if str(record['partnerCode']) != '0':
+                yield to_bulk_row(record, BULK_BREAKDOWN_MOT_CODE, share=0.6)
+
+    def bulk_file(self, reporter: str, period: str, type_code: str = 'C', freq_code: str = 'A') -> bytes:
+        """(보고국, 기간) 대량 파일 내용 (gzip, 목록의 fileSize와 같도록 한 번 만든 뒤 재사용)"""
+        key = (reporter, period, type_code, freq_code)
+        if key not in self._bulk_files:
+            buffer = io.BytesIO()
+            write_bulk_rows(self.bulk_rows(reporter, period, type_code, freq_code), buffer)
+            self._bulk_files[key] = buffer.getvalue()
+        return self._bulk_files[key]
+
+
+def initial_release(period: str) -> str:
+    """기간의 첫 공개 시각 (연간은 다음 해 7월, 월별은 두 달 뒤 15일)"""
+    year, month = int(period[:4]), int(period[4:6] or 0)
+    if not month:
+        return f"{year + 1}-07-01T00:00:00"
+    year, month = (year + 1, month - 10) if month > 10 else (year, month + 2)
+    return f"{year}-{month:02d}-15T00:00:00"
+
+
+def to_bulk_row(record: Dict, mot_code: int = 0, share: float = 1.0) -> Dict:
+    """v1 레코드 → 대량 파일 행 (국가명/ISO3 없음, share는 세부 행의 금액 비율)"""
+    scale = lambda value: None if value is None else round(value * share, 2)
+    period = str(record['period'])
+    return {
+        'typeCode': record['typeCode'],
+        'freqCode': record['freqCode'],
+        'refPeriodId': f"{period[:4]}{period[4:6] or '01'}01",
+        'refYear': period[:4],
+        'refMonth': int(period[4:6]) if len(period) >= 6 else 52,
+        'period': period,
+        'reporterCode': record['reporterCode'],
+        'flowCode': record['flowCode'],
+        'partnerCode': record['partnerCode'],
+        'partner2Code': 0,
+        'classificationCode': 'H6',
+        'cmdCode': record['cmdCode'],
+        'customsCode': 'C00',
+        'mosCode': 0,
+        'motCode': mot_code,
+        'qtyUnitCode': 8,
+        'qty': scale(record['qty']),
+        'isQtyEstimated': False,
+        'altQtyUnitCode': 8,
+        'altQty': scale(record['qty']),
+        'netWgt': scale(record['netWgt']),
+        'grossWgt': scale(record['netWgt']),
+        'cifvalue': scale(record['cifvalue']),
+        'fobvalue': scale(record['fobvalue']),
+        'primaryValue': scale(record['primaryValue']),
+        'legacyEstimationFlag': 0,
+        'isReported': True,
+        'isAggregate': False
+    }
+
+
+def write_bulk_rows(rows: Iterator[Dict], fileobj) -> int:
+    """대량 파일 행을 gzip 압축 탭 구분 텍스트로 기록
+
+    Returns:
+        기록한 행 수
+    """
+    count = 0
+    with gzip.GzipFile(fileobj=fileobj, mode='wb') as compressed, \
+            io.TextIOWrapper(compressed, encoding='utf-8', newline='') as text:
+        writer = csv.writer(text, delimiter='\t', lineterminator='\n')
+        writer.writerow(BULK_COLUMNS)
+        for row in rows:
+            writer.writerow(['' if row.get(column) is None else row[column] for column in BULK_COLUMNS])
+            count += 1
+    return count
+
+
+def to_legacy_record(record: Dict) -> Dict:
+    """v1 레코드 → 구 버전 공개 API 형식"""
+    return {
+        'yr': record.get('period'),
+        'rgCode': 1 if record.get('flowCode') == 'M' else 2,
+        'rtCode': record.get('reporterCode'),
+        'rtTitle': record.get('reporterDesc'),
+        'rt3ISO': record.get('reporterISO'),
+        'ptCode': record.get('partnerCode'),
+        'ptTitle': record.get('partnerDesc'),
+        'pt3ISO': record.get('partnerISO'),
+        'cmdCode': record.get('cmdCode'),
+        'TradeQuantity': record.get('qty'),
+        'NetWeight': record.get('netWgt'),
+        'TradeValue': record.get('primaryValue')
+    }
+
+
+class FaultInjector:
+    """요청마다 적용할 지연/장애 결정 (스레드 안전)"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, rate_limit_prob: float = 0.0,
+                 error_prob: float = 0.0, timeout_prob: float = 0.0, truncate_prob: float = 0.0,
+                 quota_per_minute: int = 0, retry_after: float = 1.0, hang_seconds: float = 30.0,
+                 seed: Optional[int] = None):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.rate_limit_prob = rate_limit_prob
+        self.error_prob = error_prob
+        self.timeout_prob = timeout_prob
+        self.truncate_prob = truncate_prob
+        self.quota_per_minute = quota_per_minute
+        self.retry_after = retry_after
+        self.hang_seconds = hang_seconds
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recent = deque()
+
+    def delay(self) -> float:
+        with self._lock:
+            return max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+
+    def _over_quota(self) -> bool:
+        # 최근 60초 동안 받은 요청 수가 한도를 넘으면 429
+        if not self.quota_per_minute:
+            return False
+        now = time.monotonic()
+        while self._recent and now - self._recent[0] > 60:
+            self._recent.popleft()
+        if len(self._recent) >= self.quota_per_minute:
+            return True
+        self._recent.append(now)
+        return False
+
+    def choose(self) -> str:
+        """이번 요청의 결과: ok, rate_limited, error, timeout, truncated"""
+        with self._lock:
+            if self._over_quota():
+                return 'rate_limited'
+            roll = self._rng.random()
+        for outcome, prob in (('rate_limited', self.rate_limit_prob), ('error', self.error_prob),
+                              ('timeout', self.timeout_prob), ('truncated', self.truncate_prob)):
+            if roll < prob:
+                return outcome
+            roll -= prob
+        return 'ok'
+
+
+class MockComtradeHandler(BaseHTTPRequestHandler):
+    """Comtrade API 요청 처리 (서버 속성 data_source, faults, stats 사용)"""
+
+    server_version = "MockComtrade/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        if url.path == '/_stats':
+            return self._send_json(200, self.server.stats_snapshot())
+
+        if url.path.startswith(FINAL_DATA_PATH + '/') or url.path.startswith(PREVIEW_DATA_PATH + '/'):
+            handler = self._final_data
+        elif url.path.startswith(DATA_AVAILABILITY_PATH + '/') or url.path.startswith(PUBLIC_AVAILABILITY_PATH + '/'):
+            handler = self._availability
+        elif url.path == LEGACY_DATA_PATH:
+            handler = self._legacy_data
+        elif url.path.startswith(BULK_DATA_PATH + '/'):
+            handler = self._bulk_files
+        elif url.path.startswith(BULK_FILE_PATH + '/'):
+            handler = self._bulk_file
+        else:
+            self.server.count('not_found')
+            return self._send_json(404, {'error': f"Unknown endpoint: {url.path}"})
+
+        time.sleep(self.server.faults.delay())
+        outcome = self.server.faults.choose()
+        if outcome != 'ok':
+            self.server.count(outcome)
+
+        if outcome == 'rate_limited':
+            return self._send_json(429, {'statusCode': 429, 'message': 'Rate limit is exceeded.'},
+                                   {'Retry-After': f"{self.server.faults.retry_after:g}"})
+        if outcome == 'error':
+            return self._send_json(500, {'error': 'Internal server error'})
+        if outcome == 'timeout':
+            time.sleep(self.server.faults.hang_seconds)
+            return self._send_json(504, {'error': 'Gateway timeout'})
+
+        try:
+            body = handler(url.path, query)
+        except ValueError as e:
+            self.server.count('bad_request')
+            return self._send_json(400, {'error': str(e)})
+        if outcome == 'ok':
+            self.server.count('ok')
+        if isinstance(body, bytes):
+            return self._send_body(200, body, 'application/gzip', truncate=outcome == 'truncated')
+        self._send_json(200, body, truncate=outcome == 'truncated')
+
+    def _final_data(self, path: str, query: Dict[str, str]) -> Dict:
+        parts = path.rstrip('/').split('/')
+        type_code, freq_code, cl_code = parts[-3:]
+        filters = {
+            'period': _split(query.get('period')),
+            'reporterCode': _split(query.get('reportercode') or query.get('reporterCode')),
+            'partnerCode': _split(query.get('partnerCode')),
+            'cmdCode': _split(query.get('cmdCode')),
+            'flowCode': _split(query.get('flowCode'))
+        }
+        if filters['period'] is None:
+            raise ValueError("period is required")
+        max_records = int(query.get('maxRecords') or DEFAULT_MAX_RECORDS)
+        records = self.server.data_source.records(filters, type_code, freq_code)[:max_records]
+        self.server.count('records', len(records))
+        return {'elapsedTime': '0 secs', 'count': len(records), 'data': records, 'error': ''}
+
+    def _availability(self, path: str, query: Dict[str, str]) -> Dict:
+        type_code, freq_code, cl_code = path.rstrip('/').split('/')[-3:]
+        periods = _split(query.get('period'))
+        if periods is None:
+            raise ValueError("period is required")
+        records = self.server.data_source.availability(_split(query.get('reporterCode')), periods,
+                                                       type_code, freq_code, cl_code)
+        self.server.count('availability', len(records))
+        return {'elapsedTime': '0 secs', 'count': len(records), 'data': records, 'error': ''}
+
+    def _legacy_data(self, path: str, query: Dict[str, str]) -> Dict:
+        filters = {column: _split(query.get(param)) for param, column in LEGACY_FILTERS.items()}
+        flow = query.get('rg')
+        filters['flowCode'] = [LEGACY_FLOWS.get(flow, flow)] if flow and flow != 'all' else None
+        max_records = int(query.get('max') or DEFAULT_MAX_RECORDS)
+        records = self.server.data_source.records(filters, query.get('type', 'C'), query.get('freq', 'A'))
+        records = [to_legacy_record(record) for record in records[:max_records]]
+        self.server.count('records', len(records))
+        return {'validation': {'status': {'name': 'Ok'}}, 'count': len(records), 'data': records}
+
+    def _bulk_files(self, path: str, query: Dict[str, str]) -> Dict:
+        type_code, freq_code, cl_code = path.rstrip('/').split('/')[-3:]
+        reporters = _split(query.get('reporterCode'))
+        periods = _split(query.get('period'))
+        if reporters is None or periods is None:
+            raise ValueError("reporterCode and period are required")
+        files = []
+        for reporter in reporters:
+            for period in periods:
+                content = self.server.data_source.bulk_file(reporter, period, type_code, freq_code)
+                files.append({
+                    'rowKey': bulk_filename(reporter, period, type_code, freq_code, cl_code),
+                    'typeCode': type_code,
+                    'freqCode': freq_code,
+                    'classificationCode': cl_code,
+                    'reporterCode': int(reporter) if reporter.isdigit() else reporter,
+                    'period': int(period) if period.isdigit() else period,
+                    'fileSize': len(content),
+                    'timestamp': datetime.fromtimestamp(self.server.started_at).isoformat(timespec='seconds'),
+                    'fileUrl': f"{self.server.base_url}{BULK_FILE_PATH}/{type_code}/{freq_code}/{cl_code}/"
+                               f"{reporter}/{period}"
+                })
+        return {'count': len(files), 'data': files, 'error': ''}
+
+    def _bulk_file(self, path: str, query: Dict[str, str]) -> bytes:
+        parts = path.rstrip('/').split('/')
+        if len(parts) < 9:
+            raise ValueError("expected /bulk/v1/file/{type}/{freq}/{cl}/{reporter}/{period}")
+        type_code, freq_code, _, reporter, period = parts[-5:]
+        content = self.server.data_source.bulk_file(reporter, period, type_code, freq_code)
+        self.server.count('bulk_bytes', len(content))
+        return content
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None,
+                   truncate: bool = False):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self._send_body(status, body, 'application/json; charset=utf-8', headers, truncate)
+
+    def _send_body(self, status: int, body: bytes, content_type: str,
+                   headers: Optional[Dict[str, str]] = None, truncate: bool = False):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        try:
+            # 잘린 응답: 본문 절반만 보내고 연결을 닫음
+            self.wfile.write(body[:len(body) // 2] if truncate else body)
+        except (BrokenPipeError, ConnectionResetError):
+            # 클라이언트가 시간 초과로 먼저 연결을 끊은 경우
+            pass
+        if truncate:
+            self.close_connection = True
+
+
+class MockComtradeServer(ThreadingHTTPServer):
+    """대역 서버 (요청마다 스레드 하나)"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, data_source: MockDataSource, faults: FaultInjector, verbose: bool = False):
+        super().__init__(address, MockComtradeHandler)
+        self.data_source = data_source
+        self.faults = faults
+        self.verbose = verbose
+        self.started = time.monotonic()
+        self.started_at = time.time()
+        self._stats = Counter()
+        self._stats_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, name: str, value: int = 1):
+        with self._stats_lock:
+            self._stats[name] += value
+
+    def stats_snapshot(self) -> Dict:
+        """응답 종류별 개수와 분당 요청 수"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        elapsed = time.monotonic() - self.started
+        requests_total = sum(value for key, value in stats.items() if key in OUTCOMES)
+        return {
+            'elapsed_seconds': round(elapsed, 1),
+            'requests': requests_total,
+            'requests_per_minute': round(requests_total / elapsed * 60, 1) if elapsed else 0.0,
+            'outcomes': stats
+        }
+
+
+def start_server(host: str = '127.0.0.1', port: int = 0, **options) -> MockComtradeServer:
+    """백그라운드 스레드에서 대역 서버 시작 (port=0이면 빈 포트 사용, 테스트/스크립트용)
+
+    options는 MockDataSource(fixture, empty_prob, all_countries, latest_period, revised)와
+    FaultInjector(latency_ms, rate_limit_prob ...) 인자입니다.
+    """
+    source_options = {key: options.pop(key) for key in ('fixture', 'empty_prob', 'all_countries', 'latest_period',
+                                                        'revised') if key in options}
+    verbose = options.pop('verbose', False)
+    server = MockComtradeServer((host, port), MockDataSource(**source_options), FaultInjector(**options), verbose)
+    threading.Thread(target=server.serve_forever, name="mock-comtrade", daemon=True).start()
+    return server
+
+
+def write_bulk_fixture(directory: str, reporters: List[str], periods: List[str], **source_options) -> List[str]:
+    """대역 서버가 내려주는 것과 같은 대량 파일을 directory에 저장 (bulk_file_ingest.py --input 테스트용)
+
+    source_options는 MockDataSource(fixture, empty_prob, all_countries) 인자입니다.
+
+    Returns:
+        저장한 파일 경로 목록
+    """
+    source = MockDataSource(**source_options)
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for reporter in reporters:
+        for period in periods:
+            path = os.path.join(directory, bulk_filename(reporter, period))
+            with open(path, 'wb') as f:
+                rows = write_bulk_rows(source.bulk_rows(reporter, period), f)
+            print(f"   💾 {path} ({rows:,}행, {os.path.getsize(path):,} bytes)")
+            paths.append(path)
+    return paths
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(
+        description="로컬 UN Comtrade API 대역 서버 (부하/처리량 테스트)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python mock_comtrade_server.py
+  python mock_comtrade_server.py --latency 200 --jitter 100 --rate-limit-prob 0.05 --error-prob 0.02
+  python mock_comtrade_server.py --quota-per-minute 100 --retry-after 5
+  python mock_comtrade_server.py --fixture data/fixtures/comtrade_sample.csv
+  python mock_comtrade_server.py --latest-period 202406
+  python mock_comtrade_server.py --revised 842 410:2023      # 증분 갱신 테스트 (다시 공개된 데이터)
+  python mock_comtrade_server.py --write-bulk-fixture data/bulk --bulk-reporters 842 410 --bulk-periods 2023
+
+수집기 연결:
+  python bulk_data_collector.py --api-base-url http://127.0.0.1:8765 --no-cache --concurrency 16 --rate 50
+  COMTRADE_API_BASE_URL=http://127.0.0.1:8765 python run_bulk_collection.py --scenario test --no-confirm
+  python bulk_file_ingest.py --api-base-url http://127.0.0.1:8765 --reporters 842 410 --start-year 2023
+  curl http://127.0.0.1:8765/_stats
+        """
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="바인드 주소 (기본값: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"포트 (기본값: {DEFAULT_PORT})")
+    parser.add_argument("--fixture", type=str,
+                       help="응답 데이터 파일 (v1 응답 컬럼의 CSV/Parquet/JSON, 기본값: 요청마다 생성)")
+    parser.add_argument("--empty-prob", type=float, default=0.1,
+                       help="생성 데이터에서 조합마다 데이터가 없을 확률 (기본값: 0.1)")
+    parser.add_argument("--all-countries", type=int, default=DEFAULT_ALL_COUNTRIES,
+                       help=f"보고국/파트너국이 all일 때 포함할 국가 수 (기본값: {DEFAULT_ALL_COUNTRIES})")
+    parser.add_argument("--latest-period", type=str,
+                       help="생성 데이터의 마지막 공개 연월 (YYYYMM, 이후 월별 기간은 데이터 없음)")
+    parser.add_argument("--revised", type=str, nargs="+", metavar="REPORTER[:PERIOD]",
+                       help="서버 시작 시각에 다시 공개된 것으로 응답할 보고국 (보고국:기간이면 그 기간만)")
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연 (밀리초, 기본값: 0)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="응답 지연 편차 (±밀리초, 기본값: 0)")
+    parser.add_argument("--rate-limit-prob", type=float, default=0.0, help="429 응답 확률 (기본값: 0)")
+    parser.add_argument("--quota-per-minute", type=int, default=0,
+                       help="분당 요청 한도, 넘으면 429 (기본값: 0 = 제한 없음)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="429 응답의 Retry-After (초, 기본값: 1)")
+    parser.add_argument("--error-prob", type=float, default=0.0, help="500 응답 확률 (기본값: 0)")
+    parser.add_argument("--timeout-prob", type=float, default=0.0, help="응답하지 않을 확률 (기본값: 0)")
+    parser.add_argument("--hang-seconds", type=float, default=30.0,
+                       help="응답하지 않는 요청이 기다리는 시간 (초, 기본값: 30)")
+    parser.add_argument("--truncate-prob", type=float, default=0.0, help="잘린 응답 확률 (기본값: 0)")
+    parser.add_argument("--seed", type=int, help="장애 주입 난수 시드")
+    parser.add_argument("--verbose", action="store_true", help="요청마다 접근 로그 출력")
+    parser.add_argument("--write-bulk-fixture", type=str, metavar="DIR",
+                       help="서버를 띄우지 않고 대량 파일 픽스처를 DIR에 저장")
+    parser.add_argument("--bulk-reporters", type=str, nargs="+", default=DEFAULT_BULK_REPORTERS,
+                       help=f"대량 파일 픽스처 보고국 M49 코드 (기본값: {' '.join(DEFAULT_BULK_REPORTERS)})")
+    parser.add_argument("--bulk-periods", type=str, nargs="+", default=DEFAULT_BULK_PERIODS,
+                       help=f"대량 파일 픽스처 기간 (기본값: {' '.join(DEFAULT_BULK_PERIODS)})")
+
+    args = parser.parse_args()
+
+    if args.fixture and not os.path.exists(args.fixture):
+        print(f"❌ 픽스처 파일이 없습니다: {args.fixture}")
+        return
+
+    if args.write_bulk_fixture:
+        print(f"🧪 대량 파일 픽스처 생성: {args.write_bulk_fixture}")
+        write_bulk_fixture(args.write_bulk_fixture, args.bulk_reporters, args.bulk_periods,
+                           fixture=args.fixture, empty_prob=args.empty_prob, all_countries=args.all_countries)
+        return
+
+    server = MockComtradeServer(
+        (args.host, args.port),
+        MockDataSource(args.fixture, empty_prob=args.empty_prob, all_countries=args.all_countries,
+                       latest_period=args.latest_period, revised=args.revised),
+        FaultInjector(latency_ms=args.latency, jitter_ms=args.jitter, rate_limit_prob=args.rate_limit_prob,
+                      error_prob=args.error_prob, timeout_prob=args.timeout_prob,
+                      truncate_prob=args.truncate_prob, quota_per_minute=args.quota_per_minute,
+                      retry_after=args.retry_after, hang_seconds=args.hang_seconds, seed=args.seed),
+        verbose=args.verbose
+    )
+    print(f"🧪 Comtrade 대역 서버 실행 중: {server.base_url}")
+    print(f"   데이터: {args.fixture or '요청마다 생성'}")
+    print(f"   수집기 연결: --api-base-url {server.base_url} (또는 COMTRADE_API_BASE_URL)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        stats = server.stats_snapshot()
+        print(f"\n📊 요청 {stats['requests']}개 ({stats['requests_per_minute']}/분): "
+              f"{json.dumps(stats['outcomes'], ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
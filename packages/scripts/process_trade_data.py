@@ -10,17 +10,22 @@ UN Comtrade 데이터를 처리하여 GeoJSON으로 저장하는 스크립트
     python process_trade_data.py --year 2019 --item oil
 """
 
+import numpy as np
 import pandas as pd
 import requests
-import geopandas as gpd
-from shapely.geometry import LineString, Point
-import json
 import time
 import argparse
 import os
 import sys
 from typing import Dict, List, Optional, Tuple
 
+from comtrade_client import (fetch_legacy_data, configure_cache, configure_api, configure_splitting, API_BASE_URL,
+                             API_BASE_URL_ENV)
+from country_centroids import load_centroid_index
+from geojson_builder import iter_line_features
+from geojson_writer import write_geojson, geojson_extension, GEOJSON_FORMATS, DEFAULT_GEOJSON_FORMAT
+from metrics import get_metrics
+
 # --- 품목별 HS Code 정의 ---
 COMMODITY_MAP = {
     "semiconductor": "8541,8542",
@@ -31,25 +36,17 @@ COMMODITY_MAP = {
 
 # --- 설정 ---
 OUTPUT_DIR = "./data/output"
-API_ENDPOINT = "https://comtradeapi.un.org/public/v1/get"
 
 def ensure_output_directory():
     """출력 디렉터리가 존재하는지 확인하고, 없으면 생성"""
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     print(f"출력 디렉터리 확인됨: {OUTPUT_DIR}")
 
-def get_country_centroids() -> gpd.GeoDataFrame:
-    """국가별 중심점 데이터를 준비"""
+def get_country_centroids() -> pd.DataFrame:
+    """국가별 중심점 데이터를 준비 (미리 빌드한 중심점 인덱스를 M49 코드로 인덱싱)"""
     try:
         print("국가별 중심점 데이터 로딩 중...")
-        world = gpd.read_file(gpd.datasets.get_path('naturalearth_lowres'))
-        world['centroid'] = world.geometry.centroid
-        
-        # 좌표 추출
-        world['centroid_lon'] = world['centroid'].x
-        world['centroid_lat'] = world['centroid'].y
-        
-        country_centroids = world[['iso_a3', 'name', 'centroid_lon', 'centroid_lat']].copy()
+        country_centroids = load_centroid_index().to_code_table()
         print(f"총 {len(country_centroids)}개 국가 데이터 로딩 완료")
         return country_centroids
     except Exception as e:
@@ -73,15 +70,14 @@ def fetch_trade_data(year: int, commodity_code: str) -> Optional[pd.DataFrame]:
     
     try:
         print(f"UN Comtrade API 호출 중... (연도: {year}, 상품코드: {commodity_code})")
-        response = requests.get(API_ENDPOINT, params=params, timeout=30)
-        response.raise_for_status()
-        
-        data = response.json()
-        if 'data' not in data or not data['data']:
+        records = fetch_legacy_data(params, timeout=30)
+        if not records:
             print(f"경고: {year}년 상품코드 {commodity_code}에 대한 데이터가 없습니다.")
             return None
             
-        df = pd.DataFrame(data['data'])
+        with get_metrics().timer('dataframe'):
+            df = pd.DataFrame(records)
+        get_metrics().inc('records', len(df))
         print(f"API로부터 {len(df)}개 레코드 수신 완료")
         return df
         
@@ -92,80 +88,111 @@ def fetch_trade_data(year: int, commodity_code: str) -> Optional[pd.DataFrame]:
         print(f"데이터 처리 중 오류: {e}")
         return None
 
-def process_trade_data(df: pd.DataFrame, country_centroids: gpd.GeoDataFrame) -> pd.DataFrame:
-    """무역 데이터 전처리 및 지리 정보 결합"""
+# 구 버전 API 응답 컬럼 → 전처리 결과 컬럼
+COLUMNS_TO_KEEP = {
+    'rtCode': 'reporter_code',
+    'rtTitle': 'reporter_name',
+    'ptCode': 'partner_code',
+    'ptTitle': 'partner_name',
+    'TradeValue': 'trade_value',
+    'NetWeight': 'net_weight',
+    'TradeQuantity': 'trade_quantity'
+}
+
+def _code_table(country_centroids: pd.DataFrame) -> pd.DataFrame:
+    """M49 코드 인덱스 테이블 (to_frame() 형식이 들어오면 m49 컬럼으로 인덱싱)"""
+    if 'm49' in country_centroids.columns:
+        country_centroids = country_centroids[country_centroids['m49'] >= 0].set_index('m49')
+    return country_centroids
+
+def _country_positions(codes: Optional[pd.Series], names: Optional[pd.Categorical], table: pd.DataFrame,
+                       name_positions: Dict[str, int]) -> np.ndarray:
+    """보고국/파트너국의 중심점 테이블 행 위치 (없으면 -1)
+
+    정수 M49 코드로 먼저 찾고, 코드가 없거나 테이블에 없는 행만 국가명(범주형)으로 다시 찾습니다.
+    """
+    series = codes if codes is not None else names
+    positions = np.full(len(series), -1, dtype=np.int64)
+    if codes is not None:
+        if not pd.api.types.is_integer_dtype(codes):
+            codes = pd.to_numeric(codes, errors='coerce').fillna(-1).astype(np.int64)
+        positions = table.index.get_indexer(codes.to_numpy())
+    
+    missing = positions < 0
+    if names is not None and missing.any():
+        # 범주(고유 국가명)마다 한 번만 조회한 뒤 코드로 펼침 (코드 -1 = 값 없음)
+        category_positions = np.array([name_positions.get(name, -1) for name in names.categories] + [-1],
+                                      dtype=np.int64)
+        positions[missing] = category_positions[names.codes[missing]]
+    return positions
+
+def process_trade_data(df: pd.DataFrame, country_centroids: pd.DataFrame) -> pd.DataFrame:
+    """무역 데이터 전처리 및 지리 정보 결합
+
+    국가 좌표는 정수 M49 코드(rtCode/ptCode)로 코드 인덱스 테이블(CentroidIndex.to_code_table)에서
+    한 번에 찾으므로 국가명 표기가 달라도 빠지지 않습니다. 국가명 컬럼은 범주형(category)이고
+    코드는 int32라 reporter=all, partner=all 응답도 적은 메모리로 처리합니다.
+    """
     try:
         print("무역 데이터 전처리 시작...")
         
-        # 필요한 컬럼만 선택하고 이름 변경
-        columns_to_keep = {
-            'rtCode': 'reporter_code',
-            'rtTitle': 'reporter_name', 
-            'ptCode': 'partner_code',
-            'ptTitle': 'partner_name',
-            'TradeValue': 'trade_value',
-            'NetWeight': 'net_weight',
-            'TradeQuantity': 'trade_quantity'
-        }
-        
-        # 컬럼이 존재하는지 확인
-        available_columns = {}
-        for old_col, new_col in columns_to_keep.items():
-            if old_col in df.columns:
-                available_columns[old_col] = new_col
-        
-        if not available_columns:
+        # 컬럼이 존재하는지 확인 (복사하지 않고 원본 컬럼을 그대로 사용)
+        source = {new: df[old] for old, new in COLUMNS_TO_KEEP.items() if old in df.columns}
+        if not source:
             print("필요한 컬럼을 찾을 수 없습니다.")
             return None
-            
-        df_processed = df[list(available_columns.keys())].copy()
-        df_processed = df_processed.rename(columns=available_columns)
         
         # 무효한 데이터 제거
-        if 'trade_value' in df_processed.columns:
-            df_processed = df_processed[df_processed['trade_value'] > 0]
-        
-        # 국가 코드를 문자열로 변환
-        if 'reporter_code' in df_processed.columns:
-            df_processed['reporter_code'] = df_processed['reporter_code'].astype(str)
-        if 'partner_code' in df_processed.columns:
-            df_processed['partner_code'] = df_processed['partner_code'].astype(str)
+        values = {column: pd.to_numeric(source[column], errors='coerce').to_numpy(dtype=float)
+                  for column in ('trade_value', 'net_weight', 'trade_quantity') if column in source}
+        keep = values['trade_value'] > 0 if 'trade_value' in values else np.ones(len(df), dtype=bool)
+        # 국가명은 고유 이름 목록 + 정수 코드(범주형)로 한 번만 변환
+        country_names = {column: pd.Categorical(source[column])
+                         for column in ('reporter_name', 'partner_name') if column in source}
         
-        print(f"전처리 후 {len(df_processed)}개 레코드 남음")
+        print(f"전처리 후 {int(keep.sum())}개 레코드 남음")
         
-        # 국가 중심점 데이터와 결합
+        # 국가 중심점 테이블과 코드로 결합
         print("국가 중심점 데이터와 결합 중...")
+        table = _code_table(country_centroids)
+        name_positions = {name: position for position, name in enumerate(table['name'].astype(str).tolist())}
+        positions = {
+            role: _country_positions(source.get(f'{role}_code'), country_names.get(f'{role}_name'), table,
+                                     name_positions)
+            for role in ('reporter', 'partner')
+        }
         
-        # Reporter 국가 정보 결합
-        df_with_coords = df_processed.merge(
-            country_centroids[['name', 'centroid_lon', 'centroid_lat']], 
-            left_on='reporter_name', 
-            right_on='name', 
-            how='left',
-            suffixes=('', '_reporter')
-        )
-        df_with_coords = df_with_coords.rename(columns={
-            'centroid_lon': 'reporter_lon',
-            'centroid_lat': 'reporter_lat'
-        })
-        df_with_coords = df_with_coords.drop(columns=['name'], errors='ignore')
+        # 좌표가 없는 레코드 제거
+        keep &= (positions['reporter'] >= 0) & (positions['partner'] >= 0)
         
-        # Partner 국가 정보 결합
-        df_with_coords = df_with_coords.merge(
-            country_centroids[['name', 'centroid_lon', 'centroid_lat']], 
-            left_on='partner_name', 
-            right_on='name', 
-            how='left',
-            suffixes=('', '_partner')
-        )
-        df_with_coords = df_with_coords.rename(columns={
-            'centroid_lon': 'partner_lon',
-            'centroid_lat': 'partner_lat'
-        })
-        df_with_coords = df_with_coords.drop(columns=['name'], errors='ignore')
+        codes = table.index.to_numpy(dtype=np.int32)
+        names = table['name'].astype('category').array
+        lon = table['centroid_lon'].to_numpy(dtype=float)
+        lat = table['centroid_lat'].to_numpy(dtype=float)
         
-        # 좌표가 없는 레코드 제거
-        df_final = df_with_coords.dropna(subset=['reporter_lon', 'reporter_lat', 'partner_lon', 'partner_lat'])
+        columns = {}
+        for role in ('reporter', 'partner'):
+            rows = positions[role][keep]
+            name_column = f'{role}_name'
+            columns[f'{role}_code'] = codes[rows]
+            # 응답의 국가명을 유지하고, 없으면 중심점 테이블의 국가명 사용
+            if name_column in country_names:
+                names_in = country_names[name_column]
+                columns[name_column] = pd.Categorical.from_codes(
+                    names_in.codes[keep], names_in.categories).remove_unused_categories()
+            else:
+                columns[name_column] = names.take(rows)
+            positions[role] = rows
+        for column, column_values in values.items():
+            columns[column] = column_values[keep]
+        columns.update({
+            'reporter_lon': lon[positions['reporter']],
+            'reporter_lat': lat[positions['reporter']],
+            'partner_lon': lon[positions['partner']],
+            'partner_lat': lat[positions['partner']]
+        })
+        # 배열을 새로 만들었으므로 DataFrame으로 다시 복사하지 않음
+        df_final = pd.DataFrame(columns, copy=False)
         
         print(f"좌표 결합 후 {len(df_final)}개 레코드 남음")
         return df_final
@@ -179,37 +206,23 @@ def create_geojson(df: pd.DataFrame, item_name: str, year: int) -> Dict:
     try:
         print("GeoJSON 생성 중...")
         
-        features = []
-        
-        for idx, row in df.iterrows():
-            # LineString 생성 (수출국 -> 수입국)
-            line = LineString([
-                (row['partner_lon'], row['partner_lat']),  # 수출국 (partner)
-                (row['reporter_lon'], row['reporter_lat'])  # 수입국 (reporter)
-            ])
-            
-            # 속성 정보
-            properties = {
-                'reporter_name': row.get('reporter_name', 'Unknown'),
-                'partner_name': row.get('partner_name', 'Unknown'),
-                'trade_value': float(row.get('trade_value', 0)),
+        # 좌표/속성 배열에서 Feature 생성 (수출국(partner) -> 수입국(reporter))
+        # Feature는 저장할 때 하나씩 만들어짐 (전체 목록을 메모리에 두지 않음)
+        features = iter_line_features(
+            df['partner_lon'].to_numpy(dtype=float), df['partner_lat'].to_numpy(dtype=float),
+            df['reporter_lon'].to_numpy(dtype=float), df['reporter_lat'].to_numpy(dtype=float),
+            properties={
+                'reporter_name': df['reporter_name'] if 'reporter_name' in df.columns else 'Unknown',
+                'partner_name': df['partner_name'] if 'partner_name' in df.columns else 'Unknown',
+                'trade_value': df['trade_value'].astype(float) if 'trade_value' in df.columns else 0.0,
                 'item': item_name,
                 'year': year
+            },
+            # 추가 속성이 있으면 포함 (값이 없는 행은 생략)
+            optional_properties={
+                name: df[name].astype(float) for name in ('net_weight', 'trade_quantity') if name in df.columns
             }
-            
-            # 추가 속성이 있으면 포함
-            if 'net_weight' in row and pd.notna(row['net_weight']):
-                properties['net_weight'] = float(row['net_weight'])
-            if 'trade_quantity' in row and pd.notna(row['trade_quantity']):
-                properties['trade_quantity'] = float(row['trade_quantity'])
-            
-            feature = {
-                'type': 'Feature',
-                'geometry': line.__geo_interface__,
-                'properties': properties
-            }
-            
-            features.append(feature)
+        )
         
         geojson = {
             'type': 'FeatureCollection',
@@ -217,26 +230,29 @@ def create_geojson(df: pd.DataFrame, item_name: str, year: int) -> Dict:
             'metadata': {
                 'item': item_name,
                 'year': year,
-                'total_flows': len(features),
+                'total_flows': len(df),
                 'created_at': pd.Timestamp.now().isoformat()
             }
         }
         
-        print(f"GeoJSON 생성 완료: {len(features)}개 무역 흐름")
+        print(f"GeoJSON 생성 완료: {len(df)}개 무역 흐름")
         return geojson
         
     except Exception as e:
         print(f"GeoJSON 생성 중 오류: {e}")
         return None
 
-def save_geojson(geojson: Dict, item_name: str, year: int) -> str:
-    """GeoJSON을 파일로 저장"""
+def save_geojson(geojson: Dict, item_name: str, year: int,
+                 geojson_format: str = DEFAULT_GEOJSON_FORMAT) -> str:
+    """GeoJSON을 파일로 저장 (Feature를 하나씩 직렬화)"""
     try:
-        filename = f"trade_flow_{item_name}_{year}.geojson"
+        filename = f"trade_flow_{item_name}_{year}{geojson_extension(geojson_format)}"
         filepath = os.path.join(OUTPUT_DIR, filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(geojson, f, indent=2, ensure_ascii=False)
+        metrics = get_metrics()
+        with metrics.timer('geojson_write'):
+            write_geojson(filepath, geojson, geojson_format)
+        metrics.inc('bytes_written', os.path.getsize(filepath))
         
         print(f"GeoJSON 파일 저장 완료: {filepath}")
         return filepath
@@ -245,7 +261,7 @@ def save_geojson(geojson: Dict, item_name: str, year: int) -> str:
         print(f"파일 저장 중 오류: {e}")
         return None
 
-def fetch_and_process_data(year: int, item_name: str) -> bool:
+def fetch_and_process_data(year: int, item_name: str, geojson_format: str = DEFAULT_GEOJSON_FORMAT) -> bool:
     """메인 처리 함수"""
     print(f"\n{'='*50}")
     print(f"  {year}년 {item_name} 데이터 처리 시작")
@@ -274,7 +290,8 @@ def fetch_and_process_data(year: int, item_name: str) -> bool:
         return False
     
     # 데이터 전처리
-    processed_data = process_trade_data(trade_data, country_centroids)
+    with get_metrics().timer('coordinate_join'):
+        processed_data = process_trade_data(trade_data, country_centroids)
     if processed_data is None or processed_data.empty:
         print("데이터 전처리에 실패했습니다.")
         return False
@@ -286,17 +303,31 @@ def fetch_and_process_data(year: int, item_name: str) -> bool:
         return False
     
     # 파일 저장
-    filepath = save_geojson(geojson, item_name, year)
+    filepath = save_geojson(geojson, item_name, year, geojson_format)
     if filepath is None:
         print("파일 저장에 실패했습니다.")
         return False
     
     print(f"\n✅ 처리 완료!")
     print(f"   - 파일: {filepath}")
-    print(f"   - 무역 흐름 수: {len(geojson['features'])}")
+    print(f"   - 무역 흐름 수: {geojson['metadata']['total_flows']}")
     
     return True
 
+def save_metrics(textfile: Optional[str] = None):
+    """단계별 지표를 출력하고 JSON 보고서(와 지정하면 Prometheus textfile) 저장"""
+    metrics = get_metrics()
+    try:
+        print(f"\n⏱️  단계별 소요 시간:\n{metrics.format_summary()}")
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        report_path = os.path.join(OUTPUT_DIR, f"collection_metrics_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        metrics.write_report(report_path, collector='process_trade_data')
+        print(f"📈 지표 보고서 저장: {report_path}")
+        if textfile:
+            metrics.write_prometheus(textfile, collector='process_trade_data')
+    except Exception as e:
+        print(f"지표 저장 중 오류: {e}")
+
 def main():
     """메인 함수"""
     parser = argparse.ArgumentParser(
@@ -332,10 +363,45 @@ def main():
         help="데이터를 조회할 품목"
     )
     
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="응답 캐시를 사용하지 않고 항상 API 호출"
+    )
+    
+    parser.add_argument(
+        "--no-split",
+        action="store_true",
+        help="max 상한에 걸린 응답을 나눠 다시 요청하지 않음"
+    )
+    
+    parser.add_argument(
+        "--geojson-format",
+        choices=GEOJSON_FORMATS,
+        default=DEFAULT_GEOJSON_FORMAT,
+        help=f"GeoJSON 저장 형식: compact, pretty, seq (기본값: {DEFAULT_GEOJSON_FORMAT})"
+    )
+    
+    parser.add_argument(
+        "--api-base-url",
+        type=str,
+        help=f"Comtrade API 주소 (로컬 대역 서버 등, 기본값: 환경 변수 {API_BASE_URL_ENV} 또는 {API_BASE_URL})"
+    )
+    
+    parser.add_argument(
+        "--metrics-textfile",
+        type=str,
+        help="단계별 지표 Prometheus textfile 경로 (node_exporter textfile collector용)"
+    )
+    
     args = parser.parse_args()
+    configure_cache(enabled=not args.no_cache)
+    configure_api(base_url=args.api_base_url)
+    configure_splitting(enabled=not args.no_split)
     
     # 처리 실행
-    success = fetch_and_process_data(args.year, args.item)
+    success = fetch_and_process_data(args.year, args.item, args.geojson_format)
+    save_metrics(args.metrics_textfile)
     
     if success:
         print(f"\n🎉 성공적으로 완료되었습니다!")
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+API용 무역 흐름 산출물 배포 스크립트
+
+파티션 Parquet 저장소(trade_store)의 레코드로 (품목 그룹, 연도)마다 병합된 GeoJSON 파일
+하나와, 품목·연도·파일 크기·해시를 담은 manifest.json을 data/published에 만듭니다.
+API(TradeDataService)는 manifest로 파일을 찾아 요청마다 파일 하나만 읽습니다.
+
+- semiconductor는 semiconductor_8541, semiconductor_8542를 합친 하나의 산출물로 배포합니다
+- 그 외 품목(copper, oil, plastic_3901 등)은 저장소 품목명 그대로 배포합니다
+- 여러 저장소 품목에 같은 레코드가 있으면(예: semiconductor와 semiconductor_8541) 한 번만 포함합니다
+- 월별 저장소(--monthly)는 (품목 그룹, 연월)마다 산출물을 만들고 manifest_monthly.json에 기록합니다.
+  월 파티션을 하나씩 읽으므로 전체 저장소를 메모리에 올리지 않습니다
+- --totals-csv는 월별 (품목 그룹, 기간, 무역흐름, 보고국, 파트너국) 합계를 월 단위로 이어 씁니다
+
+사용법:
+    python publish_artifacts.py
+    python publish_artifacts.py --item semiconductor copper --year 2023 2024
+    python publish_artifacts.py --monthly --year 2024 --totals-csv data/published/trade_totals_monthly.csv
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from country_centroids import load_centroid_index
+from geojson_builder import iter_trade_flow_features
+from geojson_writer import GeoJSONWriter, FORMAT_COMPACT, FORMAT_PRETTY
+import pandas as pd
+
+from trade_store import TradeStore, DEFAULT_STORE_PATH, DEFAULT_MONTHLY_STORE_PATH, KEY_COLUMNS
+
+DEFAULT_PUBLISH_DIR = "./data/published"
+MANIFEST_FILENAME = "manifest.json"
+MONTHLY_MANIFEST_FILENAME = "manifest_monthly.json"
+MANIFEST_VERSION = 1
+
+# API 품목명 → 합쳐서 배포할 저장소 품목들
+ARTIFACT_ITEM_GROUPS = {
+    "semiconductor": ["semiconductor", "semiconductor_8541", "semiconductor_8542"]
+}
+
+
+def artifact_item(store_item: str) -> str:
+    """저장소 품목이 배포될 API 품목명"""
+    for item, members in ARTIFACT_ITEM_GROUPS.items():
+        if store_item in members:
+            return item
+    return store_item
+
+
+def artifact_filename(item: str, year: int, month: Optional[int] = None) -> str:
+    """산출물 파일명 (월별 산출물은 연월)"""
+    period = f"{year}{int(month):02d}" if month else str(year)
+    return f"trade_flow_{item}_{period}.geojson"
+
+
+def file_sha256(path: str) -> str:
+    """파일 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(publish_dir: str, filename: str = MANIFEST_FILENAME) -> Dict:
+    """manifest.json 읽기 (없으면 빈 manifest)"""
+    path = os.path.join(publish_dir, filename)
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {'version': MANIFEST_VERSION, 'artifacts': {}}
+
+
+def save_manifest(publish_dir: str, manifest: Dict, filename: str = MANIFEST_FILENAME) -> str:
+    """manifest.json 저장 (items/years 목록을 artifacts에서 다시 계산, 월별 manifest는 periods도)"""
+    artifacts = manifest['artifacts']
+    manifest['version'] = MANIFEST_VERSION
+    manifest['generated_at'] = datetime.now().isoformat()
+    manifest['items'] = sorted(artifacts)
+    # 월별 manifest의 키는 연월(YYYYMM)
+    keys = {str(key) for entries in artifacts.values() for key in entries}
+    manifest['years'] = sorted({int(key[:4]) for key in keys}, reverse=True)
+    if filename == MONTHLY_MANIFEST_FILENAME:
+        manifest['periods'] = sorted(keys, reverse=True)
+
+    path = os.path.join(publish_dir, filename)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def artifact_frame(store: TradeStore, item: str, year: int, month: Optional[int] = None) -> pd.DataFrame:
+    """(품목 그룹, 연도[, 월])의 저장소 레코드 (저장소 품목 간 중복 레코드는 세부 HS Code 품목을 우선)"""
+    store_items = ARTIFACT_ITEM_GROUPS.get(item, [item])
+    df = store.scan(items=store_items, years=[year], months=[month] if month else None)
+    if df.empty:
+        return df
+
+    df['_priority'] = df['item'].astype(str).map(lambda name: store_items.index(name))
+    df = df.sort_values('_priority', kind='stable')
+    return df.drop_duplicates(subset=list(KEY_COLUMNS), keep='last').drop(columns='_priority')
+
+
+def publish_artifact(store: TradeStore, item: str, year: int, publish_dir: str,
+                     fmt: str = FORMAT_COMPACT, month: Optional[int] = None) -> Optional[Dict]:
+    """(품목 그룹, 연도) 산출물 하나 생성 (month를 주면 월별 저장소의 그 달 파티션만 읽음)
+
+    Returns:
+        manifest 항목 (레코드가 없으면 None)
+    """
+    df = artifact_frame(store, item, year, month)
+    if df.empty:
+        return None
+
+    index = load_centroid_index()
+    path = os.path.join(publish_dir, artifact_filename(item, year, month))
+    period = f"{year}{int(month):02d}" if month else None
+    source_items, total_flows = [], 0
+
+    with GeoJSONWriter(path, fmt) as writer:
+        for store_item, frame in df.groupby(df['item'].astype(str), sort=True):
+            features, matched = iter_trade_flow_features(frame, index, store_item, year, period=period)
+            writer.write_features(features)
+            source_items.append(store_item)
+            total_flows += matched
+        writer.close({
+            'item': item,
+            'year': year,
+            **({'period': period} if period else {}),
+            'source_items': source_items,
+            'total_flows': total_flows,
+            'total_records': len(df),
+            'created_at': datetime.now().isoformat()
+        })
+
+    return {
+        'file': os.path.basename(path),
+        'bytes': os.path.getsize(path),
+        'sha256': file_sha256(path),
+        'features': total_flows,
+        'records': len(df),
+        'trade_value': float(df['primaryValue'].sum()),
+        'source_items': source_items
+    }
+
+
+def publish(store: TradeStore, publish_dir: str, items: Optional[List[str]] = None,
+            years: Optional[List[int]] = None, fmt: str = FORMAT_COMPACT) -> Dict:
+    """저장소의 (품목 그룹, 연도) 산출물을 만들고 manifest 갱신
+
+    Args:
+        items: 배포할 API 품목명 (None이면 저장소의 모든 품목)
+        years: 배포할 연도 (None이면 저장소의 모든 연도)
+
+    Returns:
+        갱신된 manifest
+    """
+    os.makedirs(publish_dir, exist_ok=True)
+    manifest = load_manifest(publish_dir)
+
+    targets = sorted({
+        (artifact_item(store_item), year) for store_item, year in store.partitions()
+        if (not items or artifact_item(store_item) in items) and (not years or year in years)
+    })
+
+    for item, year in targets:
+        entry = publish_artifact(store, item, year, publish_dir, fmt)
+        entries = manifest['artifacts'].setdefault(item, {})
+        if entry:
+            entries[str(year)] = entry
+            print(f"   - {item} {year}: {entry['features']}개 흐름, {entry['bytes'] / 1024:.1f} KB")
+        else:
+            entries.pop(str(year), None)
+        if not entries:
+            manifest['artifacts'].pop(item)
+
+    save_manifest(publish_dir, manifest)
+    return manifest
+
+
+def monthly_targets(store: TradeStore, items: Optional[List[str]] = None, years: Optional[List[int]] = None,
+                    periods: Optional[List[str]] = None) -> List[Tuple[str, int, int]]:
+    """월별 저장소에서 배포할 (API 품목명, 연도, 월) 목록"""
+    return sorted({
+        (artifact_item(store_item), year, month) for store_item, year, month in store.partitions()
+        if (not items or artifact_item(store_item) in items) and (not years or year in years)
+        and (not periods or f"{year}{month:02d}" in periods)
+    })
+
+
+def publish_monthly(store: TradeStore, publish_dir: str, items: Optional[List[str]] = None,
+                    years: Optional[List[int]] = None, periods: Optional[List[str]] = None,
+                    fmt: str = FORMAT_COMPACT) -> Dict:
+    """월별 저장소의 (품목 그룹, 연월) 산출물을 만들고 manifest_monthly.json 갱신
+
+    Args:
+        periods: 배포할 연월 (YYYYMM, None이면 years의 모든 달)
+
+    Returns:
+        갱신된 월별 manifest
+    """
+    os.makedirs(publish_dir, exist_ok=True)
+    manifest = load_manifest(publish_dir, MONTHLY_MANIFEST_FILENAME)
+
+    for item, year, month in monthly_targets(store, items, years, periods):
+        period = f"{year}{month:02d}"
+        entry = publish_artifact(store, item, year, publish_dir, fmt, month=month)
+        entries = manifest['artifacts'].setdefault(item, {})
+        if entry:
+            entries[period] = entry
+            print(f"   - {item} {period}: {entry['features']}개 흐름, {entry['bytes'] / 1024:.1f} KB")
+        else:
+            entries.pop(period, None)
+        if not entries:
+            manifest['artifacts'].pop(item)
+
+    save_manifest(publish_dir, manifest, MONTHLY_MANIFEST_FILENAME)
+    return manifest
+
+
+# 월별 합계 CSV의 그룹 키
+TOTAL_KEYS = ['period', 'flowCode', 'reporterCode', 'reporterISO', 'partnerCode', 'partnerISO']
+
+
+def export_monthly_totals(store: TradeStore, path: str, items: Optional[List[str]] = None,
+                          years: Optional[List[int]] = None) -> int:
+    """월별 (품목 그룹, 기간, 무역흐름, 보고국, 파트너국) 무역 금액/순중량 합계를 CSV로 저장
+
+    (품목 그룹, 월)마다 그 달 파티션만 읽어 합산한 뒤 바로 이어 쓰므로, 메모리에는 한 달 치만 올라갑니다.
+
+    Returns:
+        기록한 행 수
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    rows = 0
+    with open(tmp_path, 'w', encoding='utf-8-sig', newline='') as f:
+        for item, year, month in monthly_targets(store, items, years):
+            df = artifact_frame(store, item, year, month)
+            if df.empty:
+                continue
+            keys = df[TOTAL_KEYS].astype(str)
+            totals = df.groupby([keys[column] for column in TOTAL_KEYS], sort=True).agg(
+                primaryValue=('primaryValue', 'sum'),
+                netWgt=('netWgt', 'sum'),
+                records=('primaryValue', 'size')
+            ).reset_index()
+            totals.insert(0, 'item', item)
+            totals.to_csv(f, index=False, header=rows == 0)
+            rows += len(totals)
+    os.replace(tmp_path, path)
+    return rows
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(
+        description="저장소 데이터로 API용 (품목, 연도)별 GeoJSON과 manifest.json 배포",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python publish_artifacts.py
+  python publish_artifacts.py --item semiconductor copper --year 2023 2024
+  python publish_artifacts.py --output-dir ../api/data --format pretty
+  python publish_artifacts.py --monthly --item copper --period 202401 202402
+  python publish_artifacts.py --monthly --year 2024 --totals-csv data/published/trade_totals_monthly.csv
+        """
+    )
+    parser.add_argument("--store-path", type=str,
+                       help=f"파티션 Parquet 저장소 경로 (기본값: {DEFAULT_STORE_PATH}, "
+                            f"--monthly이면 {DEFAULT_MONTHLY_STORE_PATH})")
+    parser.add_argument("--monthly", action="store_true",
+                       help="월별 저장소의 (품목, 연월)별 산출물과 manifest_monthly.json 배포")
+    parser.add_argument("--period", nargs="+", help="배포할 연월 (YYYYMM, --monthly)")
+    parser.add_argument("--totals-csv", type=str,
+                       help="월별 (품목, 기간, 무역흐름, 보고국, 파트너국) 합계 CSV 경로 "
+                            "(--monthly, 지정하면 산출물 대신 합계만 저장)")
+    parser.add_argument("--output-dir", type=str, default=DEFAULT_PUBLISH_DIR,
+                       help=f"배포 디렉터리 (기본값: {DEFAULT_PUBLISH_DIR})")
+    parser.add_argument("--item", nargs="+", help="배포할 품목 (예: semiconductor copper plastic_3901)")
+    parser.add_argument("--year", type=int, nargs="+", help="배포할 연도")
+    parser.add_argument("--format", choices=[FORMAT_COMPACT, FORMAT_PRETTY], default=FORMAT_COMPACT,
+                       help="GeoJSON 저장 형식 (기본값: compact)")
+
+    args = parser.parse_args()
+    store_path = args.store_path or (DEFAULT_MONTHLY_STORE_PATH if args.monthly else DEFAULT_STORE_PATH)
+
+    if not os.path.isdir(store_path):
+        print(f"❌ 저장소를 찾을 수 없습니다: {store_path}")
+        print("   python migrate_csv_to_store.py로 기존 CSV를 먼저 옮기세요.")
+        sys.exit(1)
+
+    if (args.period or args.totals_csv) and not args.monthly:
+        print("❌ --period/--totals-csv는 --monthly와 함께 사용하세요.")
+        sys.exit(1)
+
+    store = TradeStore(store_path, monthly=args.monthly)
+    if args.totals_csv:
+        rows = export_monthly_totals(store, args.totals_csv, args.item, args.year)
+        print(f"📊 월별 합계 저장: {args.totals_csv} ({rows:,}행)")
+        return
+
+    print(f"📤 산출물 배포: {store_path} → {args.output_dir}")
+    if args.monthly:
+        manifest = publish_monthly(store, args.output_dir, args.item, args.year, args.period, args.format)
+        filename = MONTHLY_MANIFEST_FILENAME
+    else:
+        manifest = publish(store, args.output_dir, args.item, args.year, args.format)
+        filename = MANIFEST_FILENAME
+    print(f"\n✅ manifest 저장: {os.path.join(args.output_dir, filename)}")
+    print(f"   - 품목: {', '.join(manifest['items'])}")
+    print(f"   - 연도: {manifest['years']}")
+    if args.monthly and manifest['periods']:
+        print(f"   - 기간: {manifest['periods'][-1]}-{manifest['periods'][0]} ({len(manifest['periods'])}개월)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+maxRecords 상한에 걸린 요청 분할
+
+응답 행 수가 maxRecords와 같으면 결과가 잘렸을 수 있습니다. 이런 응답은 성공으로 세지 않고
+요청을 파트너국 목록 → 보고국 목록 → HS Code 목록 → 무역흐름 → 기간(월별 요청) 순으로 첫 번째로 나눌 수 있는
+값 목록을 반으로 나눈 하위 요청 두 개로 다시 보냅니다. 하위 요청도 상한에 걸리면 같은 방식으로
+다시 나누며, 같은 단계의 하위 요청은 스레드 풀에서 동시에 보냅니다. 모든 응답을 합친 뒤
+레코드 키가 같은 행은 하나만 남깁니다.
+
+- 넓은 요청이 상한 안에 들어오면 요청 1개로 끝나고, 넘을 때만 필요한 만큼 나눕니다
+- 'all'(또는 값 없음)인 보고국/파트너국은 국가 중심점 인덱스의 M49 코드 목록으로 펼쳐서 나눕니다
+  (파트너국은 세계(0) 포함)
+- 값이 하나뿐인 HS Code는 나누지 않습니다. 상위 분류를 하위 코드로 바꾸면 응답의 cmdCode가
+  달라지기 때문입니다. 더 나눌 수 없는데도 상한에 걸린 요청은 잘린 응답(truncated)으로 표시합니다
+- 하위 요청은 각각 응답 캐시와 속도 제한기를 거치므로, 일부가 실패해도 다시 실행하면
+  성공한 하위 요청은 캐시에서 읽습니다
+
+사용법:
+    records, stats = fetch_with_splitting(fetch, params, max_records, FINAL_DATA_DIMENSIONS, FINAL_DATA_KEY)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from metrics import get_metrics
+
+DEFAULT_SPLIT_WORKERS = 4
+
+# 파트너국 '세계' M49 코드
+WORLD_CODE = '0'
+
+
+@lru_cache(maxsize=1)
+def _country_codes() -> Tuple[str, ...]:
+    # 보고국/파트너국이 all일 때 펼칠 M49 코드 (국가 중심점 인덱스 기준)
+    from country_centroids import load_centroid_index
+    index = load_centroid_index()
+    return tuple(str(int(code)) for code in index.m49 if code >= 0)
+
+
+def reporter_universe() -> List[str]:
+    """보고국 all을 펼친 M49 코드 목록"""
+    return list(_country_codes())
+
+
+def partner_universe() -> List[str]:
+    """파트너국 all을 펼친 M49 코드 목록 (세계 포함)"""
+    return [WORLD_CODE] + [code for code in _country_codes() if code != WORLD_CODE]
+
+
+# (파라미터 이름, all일 때 값 목록) - 앞에 있는 차원부터 나눔 (None이면 all은 나누지 않음)
+FINAL_DATA_DIMENSIONS = (
+    ('partnerCode', partner_universe),
+    ('reporterCode', reporter_universe),
+    ('cmdCode', None),
+    ('flowCode', lambda: ['M', 'X']),
+    ('period', None)
+)
+LEGACY_DIMENSIONS = (
+    ('p', partner_universe),
+    ('r', reporter_universe),
+    ('cc', None),
+    ('rg', lambda: ['1', '2']),
+    ('ps', None)
+)
+
+# 중복 제거에 사용하는 레코드 키
+FINAL_DATA_KEY = ('period', 'reporterCode', 'partnerCode', 'partner2Code', 'cmdCode', 'flowCode',
+                  'customsCode', 'motCode')
+LEGACY_KEY = ('yr', 'rtCode', 'ptCode', 'cmdCode', 'rgCode')
+
+
+def is_truncated(records: Sequence, max_records: Optional[int]) -> bool:
+    """응답 행 수가 maxRecords 상한에 닿았는지 (잘렸을 수 있음)"""
+    return bool(max_records) and len(records) >= max_records
+
+
+def _values(value, expand: Optional[Callable[[], List[str]]]) -> List[str]:
+    if value is None or str(value).strip().lower() in ('', 'all'):
+        return expand() if expand else []
+    return [part.strip() for part in str(value).split(',') if part.strip()]
+
+
+def split_query(params: Dict, dimensions: Iterable[Tuple[str, Optional[Callable]]]) -> Optional[List[Dict]]:
+    """첫 번째로 나눌 수 있는 차원의 값 목록을 반으로 나눈 하위 요청 두 개 (나눌 수 없으면 None)"""
+    for name, expand in dimensions:
+        values = _values(params.get(name), expand)
+        if len(values) > 1:
+            half = (len(values) + 1) // 2
+            return [{**params, name: ','.join(values[:half])}, {**params, name: ','.join(values[half:])}]
+    return None
+
+
+def dedupe_records(records: List[Dict], key_fields: Sequence[str]) -> List[Dict]:
+    """레코드 키가 같은 행은 처음 것만 남김 (키 값은 문자열로 비교)"""
+    seen = set()
+    unique = []
+    for record in records:
+        key = tuple(str(record.get(field)) for field in key_fields)
+        if key not in seen:
+            seen.add(key)
+            unique.append(record)
+    return unique
+
+
+def fetch_with_splitting(fetch: Callable[[Dict], List[Dict]], params: Dict, max_records: Optional[int],
+                         dimensions, key_fields: Sequence[str],
+                         workers: int = DEFAULT_SPLIT_WORKERS) -> Tuple[List[Dict], Dict]:
+    """요청을 보내고 상한에 걸린 응답은 나눠서 다시 보낸 뒤 합침
+
+    Args:
+        fetch: 파라미터 dict를 받아 응답 레코드 목록을 돌려주는 함수 (캐시/속도 제한 포함)
+        params: 요청 파라미터
+        max_records: 요청 하나의 maxRecords (None이면 나누지 않음)
+        dimensions: 나눌 차원 (FINAL_DATA_DIMENSIONS, LEGACY_DIMENSIONS)
+        key_fields: 중복 제거용 레코드 키
+        workers: 하위 요청을 동시에 보낼 스레드 수
+
+    Returns:
+        (합친 레코드, {'requests': 보낸 요청 수, 'splits': 나눈 횟수, 'truncated': 더 나눌 수 없이 잘린 요청 수})
+
+    Raises:
+        fetch가 올린 예외 (하위 요청 하나라도 실패하면 전체 실패)
+    """
+    records = fetch(params)
+    stats = {'requests': 1, 'splits': 0, 'truncated': 0}
+    if not is_truncated(records, max_records):
+        return records, stats
+
+    metrics = get_metrics()
+    merged = []
+    pending = [(params, records)]
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="query-split") as executor:
+        while pending:
+            queries = []
+            for query, result in pending:
+                if not is_truncated(result, max_records):
+                    merged.extend(result)
+                    continue
+                parts = split_query(query, dimensions)
+                if parts is None:
+                    # 더 나눌 수 없음 - 받은 만큼 쓰고 잘린 응답으로 표시
+                    stats['truncated'] += 1
+                    metrics.inc('truncated_responses')
+                    merged.extend(result)
+                    continue
+                stats['splits'] += 1
+                metrics.inc('query_splits')
+                queries.extend(parts)
+            # 같은 단계의 하위 요청은 동시에 보냄
+            pending = list(zip(queries, executor.map(fetch, queries)))
+            stats['requests'] += len(queries)
+
+    # 응답 하나뿐이면(나누지 못함) 중복이 생길 수 없음
+    return (dedupe_records(merged, key_fields) if stats['splits'] else merged), stats
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+UN Comtrade API 요청 속도 제한기
+
+고정된 요청 후 대기(time.sleep) 대신 토큰 버킷 방식으로 API 할당량을 지킵니다.
+버킷은 초당 `rate`개의 토큰을 채우고 최대 `capacity`개까지 쌓아 둘 수 있으므로,
+여러 요청이 동시에 진행되더라도 전체 요청 속도는 할당량을 넘지 않습니다.
+
+여러 수집 프로세스(또는 공유 파일시스템을 쓰는 여러 호스트)가 하나의 할당량을 나눠 쓸 때는
+SQLite 파일에 버킷 상태를 두는 SharedTokenBucket을 사용합니다.
+
+사용법:
+    limiter = TokenBucket(rate=1.0, capacity=1)
+    await limiter.acquire()          # asyncio 코드에서
+    limiter.acquire_blocking()       # 일반(동기) 코드에서
+
+    limiter = SharedTokenBucket("data/output/collection_journal.sqlite", rate=1.0)
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+# UN Comtrade 공개 API 권장 속도 (초당 요청 수)
+DEFAULT_RATE_PER_SECOND = 1.0
+DEFAULT_BURST = 1
+
+
+class TokenBucket:
+    """스레드/코루틴 모두에서 공유 가능한 토큰 버킷"""
+
+    def __init__(self, rate: float = DEFAULT_RATE_PER_SECOND, capacity: int = DEFAULT_BURST):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+        self.rate = rate
+        self.capacity = max(1, int(capacity))
+        self._tokens = float(self.capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+
+    def try_acquire(self) -> float:
+        """토큰을 하나 가져오면 0을, 아니면 다음 토큰까지 기다려야 할 시간(초)을 반환"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire_blocking(self):
+        """토큰을 얻을 때까지 현재 스레드를 대기"""
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    async def acquire(self):
+        """토큰을 얻을 때까지 이벤트 루프를 막지 않고 대기"""
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+class SharedTokenBucket(TokenBucket):
+    """SQLite 파일 하나로 여러 프로세스/호스트가 공유하는 토큰 버킷
+
+    토큰 수와 마지막 충전 시각을 rate_budget 테이블에 두고, 쓰기 잠금(BEGIN IMMEDIATE) 안에서
+    충전과 소비를 함께 처리하므로 전체 요청 속도가 rate를 넘지 않습니다.
+    충전 시각은 벽시계(time.time)를 쓰므로 여러 호스트의 시계가 맞춰져 있어야 합니다.
+    마지막으로 연 프로세스의 rate/capacity가 버킷 설정이 됩니다.
+    """
+
+    def __init__(self, path: str, rate: float = DEFAULT_RATE_PER_SECOND, capacity: int = DEFAULT_BURST,
+                 name: str = "comtrade"):
+        super().__init__(rate, capacity)
+        self.path = path
+        self.name = name
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_budget (
+                    name TEXT PRIMARY KEY,
+                    rate REAL NOT NULL,
+                    capacity INTEGER NOT NULL,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "INSERT INTO rate_budget (name, rate, capacity, tokens, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET rate = excluded.rate, capacity = excluded.capacity",
+                (name, self.rate, self.capacity, float(self.capacity), time.time())
+            )
+            self._conn.commit()
+
+    def try_acquire(self) -> float:
+        """토큰을 하나 가져오면 0을, 아니면 다음 토큰까지 기다려야 할 시간(초)을 반환"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rate, capacity, tokens, updated_at = self._conn.execute(
+                    "SELECT rate, capacity, tokens, updated_at FROM rate_budget WHERE name = ?", (self.name,)
+                ).fetchone()
+                # 다른 호스트의 시계가 조금 앞서 있어도 토큰이 두 번 충전되지 않도록 함
+                now = max(time.time(), updated_at)
+                tokens = min(capacity, tokens + (now - updated_at) * rate)
+                if tokens >= 1:
+                    tokens -= 1
+                    wait = 0.0
+                else:
+                    wait = (1 - tokens) / rate
+                self._conn.execute(
+                    "UPDATE rate_budget SET tokens = ?, updated_at = ? WHERE name = ?",
+                    (tokens, now, self.name)
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+            return wait
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+UN Comtrade 요청 배치 계획
+
+(연도, 품목, 보고국-파트너국) 작업 목록을 쉼표로 구분된 reporterCode / partnerCode /
+cmdCode 목록을 사용하는 소수의 getFinalData 요청으로 묶고, 응답 DataFrame을
+다시 작업별(보고국-파트너국-품목) 결과로 나눕니다.
+
+- 같은 연도·HS Code 묶음의 보고국들을 하나의 요청으로 합치고, 파트너국은 그 보고국들의
+  파트너 합집합을 요청합니다. 요청하지 않은 조합의 행은 분할 시 버립니다.
+- 예상 행 수(보고국 수 × 파트너국 수 × HS Code 수)가 max_rows를 넘지 않도록 나눕니다.
+- 공개 API는 요청당 HS Code 1개만 허용하므로("Maximum number of commodity codes is 1")
+  max_cmd_codes 기본값은 1입니다. 구독 키가 있으면 늘릴 수 있습니다.
+"""
+
+from typing import Dict, List
+
+import pandas as pd
+
+# 공개 API(preview)의 maxRecords 상한
+BATCH_MAX_RECORDS = 500
+DEFAULT_MAX_CMD_CODES = 1
+
+
+def plan_batches(tasks: List[Dict], commodity_map: Dict[str, str],
+                 max_cmd_codes: int = DEFAULT_MAX_CMD_CODES,
+                 max_rows: int = BATCH_MAX_RECORDS) -> List[Dict]:
+    """작업 목록을 배치 요청 목록으로 묶음
+
+    Args:
+        tasks: year, item, reporter_code, partner_code, reporter_name, partner_name을 가진 작업들
+        commodity_map: 품목 → HS Code
+        max_cmd_codes: 요청 하나에 넣을 최대 HS Code 수
+        max_rows: 요청 하나의 최대 예상 행 수
+
+    Returns:
+        year, reporter_codes, partner_codes, cmd_codes, tasks를 가진 배치 목록
+    """
+    batches = []
+
+    # 연도별로 HS Code를 max_cmd_codes개씩 묶음
+    by_year = {}
+    for task in tasks:
+        by_year.setdefault(task['year'], []).append(task)
+
+    for year, year_tasks in by_year.items():
+        cmd_codes = list(dict.fromkeys(commodity_map[task['item']] for task in year_tasks))
+        step = max(1, max_cmd_codes)
+        for start in range(0, len(cmd_codes), step):
+            cmd_chunk = cmd_codes[start:start + step]
+            chunk_tasks = [task for task in year_tasks if commodity_map[task['item']] in cmd_chunk]
+
+            # 보고국별 파트너국 집합
+            partners_by_reporter = {}
+            for task in chunk_tasks:
+                partners_by_reporter.setdefault(task['reporter_code'], set()).add(task['partner_code'])
+
+            # 예상 행 수가 max_rows를 넘지 않는 범위에서 보고국을 합침
+            batch_reporters, batch_partners = [], set()
+            groups = []
+            for reporter_code, partners in partners_by_reporter.items():
+                merged = batch_partners | partners
+                if batch_reporters and (len(batch_reporters) + 1) * len(merged) * len(cmd_chunk) > max_rows:
+                    groups.append((batch_reporters, batch_partners))
+                    batch_reporters, merged = [], set(partners)
+                batch_reporters.append(reporter_code)
+                batch_partners = merged
+            if batch_reporters:
+                groups.append((batch_reporters, batch_partners))
+
+            for reporters, partners in groups:
+                batches.append({
+                    'year': year,
+                    'reporter_codes': reporters,
+                    'partner_codes': sorted(partners, key=int),
+                    'cmd_codes': cmd_chunk,
+                    'tasks': [task for task in chunk_tasks if task['reporter_code'] in reporters]
+                })
+
+    return batches
+
+
+def split_batch_frame(df: pd.DataFrame, batch: Dict, commodity_map: Dict[str, str]) -> Dict[int, pd.DataFrame]:
+    """배치 응답을 작업별 DataFrame으로 분할
+
+    Returns:
+        batch['tasks']의 인덱스 → 해당 보고국-파트너국-HS Code 행 (행이 없는 작업은 제외)
+    """
+    if df is None or df.empty:
+        return {}
+
+    # 응답의 코드 컬럼은 정수/문자열이 섞여 있으므로 문자열로 비교
+    keys = pd.Series(
+        list(zip(df['reporterCode'].astype(str), df['partnerCode'].astype(str), df['cmdCode'].astype(str))),
+        index=df.index
+    )
+    groups = {key: idx for key, idx in keys.groupby(keys).groups.items()}
+
+    frames = {}
+    for i, task in enumerate(batch['tasks']):
+        key = (str(task['reporter_code']), str(task['partner_code']), commodity_map[task['item']])
+        if key in groups:
+            frames[i] = df.loc[groups[key]].reset_index(drop=True)
+    return frames
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+UN Comtrade API 응답 디스크 캐시
+
+정규화된 요청 파라미터의 해시(SHA-256)를 키로 응답 레코드를 압축 저장합니다.
+같은 (기간, 보고국, 파트너국, 상품코드, 무역흐름) 요청은 이전 실행이나
+retry_failed_collection.py에서 받은 응답을 재사용하므로 API를 다시 호출하지 않습니다.
+
+- 저장소: SQLite 파일 하나 (기본값: ./data/cache/comtrade_responses.sqlite)
+- 압축: zlib으로 압축한 JSON 레코드
+- 만료: TTL(초)이 지난 항목은 조회 시 무시하고 삭제
+- 용량 제한: 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 삭제(LRU)
+
+사용법:
+    python response_cache.py --stats
+    python response_cache.py --clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+DEFAULT_CACHE_PATH = "./data/cache/comtrade_responses.sqlite"
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600      # 30일 (Comtrade 데이터 수정 주기 고려)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024     # 512MB
+
+
+def normalize_params(params: Dict) -> Dict[str, str]:
+    """캐시 키 계산을 위해 요청 파라미터를 정규화
+
+    None 값은 제외하고, 모든 값을 문자열로 바꾸며,
+    쉼표로 구분된 목록(예: "8542,8541")은 정렬해 순서 차이를 없앱니다.
+    """
+    normalized = {}
+    for key, value in params.items():
+        if value is None:
+            continue
+        text = str(value).strip()
+        if ',' in text:
+            text = ','.join(sorted({part.strip() for part in text.split(',') if part.strip()}))
+        normalized[key] = text
+    return normalized
+
+
+def make_cache_key(endpoint: str, params: Dict) -> str:
+    """엔드포인트와 정규화된 파라미터로 캐시 키(SHA-256) 생성"""
+    canonical = json.dumps({'endpoint': endpoint, 'params': normalize_params(params)},
+                           sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """압축 JSON 레코드를 저장하는 TTL + LRU 디스크 캐시"""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl_seconds: Optional[float] = DEFAULT_TTL_SECONDS,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 동시 수집 모드의 여러 스레드가 같은 연결을 공유
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                params TEXT NOT NULL,
+                max_records INTEGER,
+                row_count INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL,
+                payload BLOB NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+        self._conn.commit()
+
+    def get(self, endpoint: str, params: Dict, max_records: Optional[int] = None) -> Optional[List[Dict]]:
+        """캐시된 레코드 목록을 반환 (없거나 만료되었거나 잘린 응답이면 None)
+
+        max_records는 키에 포함하지 않습니다. 대신 저장된 응답이 잘리지 않았거나
+        (row_count < 저장 당시 max_records) 요청한 max_records 이상으로 받은 경우에만 재사용합니다.
+        """
+        entry = self.get_entry(endpoint, params, max_records)
+        return entry[0] if entry else None
+
+    def get_entry(self, endpoint: str, params: Dict,
+                  max_records: Optional[int] = None) -> Optional[Tuple[List[Dict], float]]:
+        """get과 같지만 (레코드 목록, 응답을 받아 저장한 시각(epoch 초))을 반환"""
+        key = make_cache_key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at, max_records, row_count, payload FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            created_at, cached_max, row_count, payload = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            truncated = cached_max is not None and row_count >= cached_max
+            if truncated and (max_records is None or cached_max < max_records):
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(zlib.decompress(payload).decode('utf-8')), created_at
+
+    def put(self, endpoint: str, params: Dict, records: List[Dict], max_records: Optional[int] = None):
+        """응답 레코드를 압축해 저장하고 필요하면 오래된 항목을 제거"""
+        key = make_cache_key(endpoint, params)
+        payload = zlib.compress(json.dumps(records, ensure_ascii=False).encode('utf-8'), 6)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, endpoint, params, max_records, row_count, created_at, last_access, size, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, json.dumps(normalize_params(params), sort_keys=True), max_records,
+                 len(records), now, now, len(payload), payload)
+            )
+            self._conn.commit()
+            self.stores += 1
+            self._evict()
+
+    def _evict(self):
+        """전체 크기가 max_bytes를 넘으면 최근에 사용하지 않은 항목부터 삭제 (잠금 보유 상태에서 호출)"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # 매번 경계에서 삭제가 반복되지 않도록 90%까지 줄임
+        target = self.max_bytes * 0.9
+        for key, size in self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access ASC").fetchall():
+            if total <= target:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+        self._conn.commit()
+
+    def invalidate(self, endpoint: str, match: Callable[[Dict[str, str]], bool]) -> int:
+        """엔드포인트의 항목 중 정규화된 요청 파라미터가 match에 맞는 항목 삭제
+
+        Returns:
+            삭제한 항목 수
+        """
+        with self._lock:
+            keys = [(key,) for key, params in self._conn.execute(
+                "SELECT key, params FROM responses WHERE endpoint = ?", (endpoint,)).fetchall()
+                    if match(json.loads(params))]
+            if keys:
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", keys)
+                self._conn.commit()
+        return len(keys)
+
+    def clear(self):
+        """모든 캐시 항목 삭제"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+
+    def stats(self) -> Dict:
+        """캐시 적중/미스 통계와 현재 크기"""
+        with self._lock:
+            entries, total_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            'expired': self.expired,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': total_bytes
+        }
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="UN Comtrade 응답 캐시 관리")
+    parser.add_argument("--cache-path", type=str, default=DEFAULT_CACHE_PATH,
+                       help=f"캐시 파일 경로 (기본값: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--stats", action="store_true", help="캐시 항목 수와 크기 출력")
+    parser.add_argument("--clear", action="store_true", help="캐시 전체 삭제")
+
+    args = parser.parse_args()
+
+    cache = ResponseCache(args.cache_path)
+    if args.clear:
+        cache.clear()
+        print(f"🗑️  캐시를 비웠습니다: {args.cache_path}")
+
+    stats = cache.stats()
+    print(f"📦 캐시: {args.cache_path}")
+    print(f"   - 항목 수: {stats['entries']:,}개")
+    print(f"   - 크기: {stats['bytes'] / 1024 / 1024:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
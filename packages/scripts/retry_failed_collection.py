@@ -3,6 +3,12 @@
 """
 실패한 데이터 수집 재시도 스크립트
 
+수집기는 요청 한도 초과/일시적 오류를 수집 중에 바로 재시도하므로, 이 스크립트는
+그 재시도까지 모두 실패한 요청을 나중에 다시 돌릴 때 사용합니다.
+요청 간격은 retry_policy의 지수 백오프 + 지터를 따르고, 데이터가 없는 요청이나
+잘못된 요청(permanent)은 더 시도하지 않습니다. 성공한 요청은 저장소/GeoJSON으로 저장하고
+최종 결과를 수집 범위 카탈로그(coverage_catalog)에 기록합니다.
+
 사용법:
     python retry_failed_collection.py --summary-file collection_summary_20250911_141654.json
     python retry_failed_collection.py --summary-file collection_summary_20250911_141654.json --items oil
@@ -17,9 +23,15 @@ from datetime import datetime
 import time
 from pathlib import Path
 
+from retry_policy import RetryPolicy, ERROR_EMPTY
+from collection_summary import trade_value_stats
+from coverage_catalog import DEFAULT_CATALOG_PATH
+from comtrade_client import configure_api, configure_ingest, API_BASE_URL, API_BASE_URL_ENV
+from ingest_schema import INGEST_SCHEMAS, DEFAULT_INGEST_SCHEMA
+
 # bulk_data_collector에서 클래스 가져오기
 try:
-    from bulk_data_collector import BulkDataCollector
+    from bulk_data_collector import BulkDataCollector, MAJOR_TRADE_PAIRS
 except ImportError:
     print("❌ bulk_data_collector.py를 찾을 수 없습니다.")
     sys.exit(1)
@@ -63,8 +75,25 @@ def filter_failed_requests(failed_requests, target_items=None):
     return [req for req in failed_requests if req.get('item') in expanded_items]
 
 
-def retry_failed_collection(failed_requests, max_retries=2, delay=2.0):
-    """실패한 요청들을 재시도"""
+def find_country_codes(failed_req):
+    """실패 기록의 보고국/파트너국 코드 (예전 요약 파일처럼 코드가 없으면 MAJOR_TRADE_PAIRS에서 이름으로 검색)"""
+    reporter_code = failed_req.get('reporter_code')
+    partner_code = failed_req.get('partner_code')
+    if reporter_code and partner_code:
+        return str(reporter_code), str(partner_code)
+    
+    names = {}
+    for rep_code, part_code, rep_name, part_name in MAJOR_TRADE_PAIRS:
+        names.setdefault(rep_name, rep_code)
+        names.setdefault(part_name, part_code)
+    return names.get(failed_req.get('reporter_name')), names.get(failed_req.get('partner_name'))
+
+
+def retry_failed_collection(failed_requests, max_retries=2, delay=2.0, catalog_path=DEFAULT_CATALOG_PATH):
+    """실패한 요청들을 재시도 (요청마다 최대 max_retries번 시도, delay는 백오프 기본 대기 시간)
+
+    성공한 요청은 저장소/GeoJSON으로 저장하고, 최종 결과는 수집 범위 카탈로그에 기록합니다.
+    """
     if not failed_requests:
         print("📝 재시도할 실패 요청이 없습니다.")
         return
@@ -72,13 +101,16 @@ def retry_failed_collection(failed_requests, max_retries=2, delay=2.0):
     print(f"🔄 {len(failed_requests)}개의 실패한 요청을 재시도합니다...")
     
     # BulkDataCollector 인스턴스 생성
-    collector = BulkDataCollector()
+    collector = BulkDataCollector(catalog_path=catalog_path)
+    collector.load_country_coordinates()
+    policy = RetryPolicy(max_attempts=max(1, max_retries), base_delay=delay)
     
     # 결과 저장
     retry_results = {
         'retry_date': datetime.now().isoformat(),
         'original_failures': len(failed_requests),
         'successful_retries': [],
+        'no_data': [],
         'still_failed': [],
         'max_retries': max_retries
     }
@@ -91,21 +123,7 @@ def retry_failed_collection(failed_requests, max_retries=2, delay=2.0):
         
         print(f"\n[{i}/{len(failed_requests)}] 재시도: {year}년 {item} {reporter_name}→{partner_name}")
         
-        # 국가 코드 찾기 (MAJOR_TRADE_PAIRS에서 검색)
-        from bulk_data_collector import MAJOR_TRADE_PAIRS
-        
-        reporter_code = None
-        partner_code = None
-        
-        for rep_code, part_code, rep_name, part_name in MAJOR_TRADE_PAIRS:
-            if rep_name == reporter_name:
-                reporter_code = rep_code
-            if rep_name == partner_name:
-                partner_code = rep_code
-            if part_name == reporter_name:
-                reporter_code = part_code
-            if part_name == partner_name:
-                partner_code = part_code
+        reporter_code, partner_code = find_country_codes(failed_req)
         
         if not reporter_code or not partner_code:
             print(f"   ❌ 국가 코드를 찾을 수 없습니다: {reporter_name}, {partner_name}")
@@ -114,44 +132,54 @@ def retry_failed_collection(failed_requests, max_retries=2, delay=2.0):
         
         # 재시도 로직
         success = False
-        for attempt in range(max_retries):
-            try:
-                print(f"   🔄 시도 {attempt + 1}/{max_retries}...")
-                
-                # 데이터 수집 시도
-                result = collector.collect_single_data(
-                    year=year,
-                    item=item,
-                    reporter_code=reporter_code,
-                    partner_code=partner_code,
-                    reporter_name=reporter_name,
-                    partner_name=partner_name
-                )
-                
-                if result['success']:
-                    print(f"   ✅ 성공! 레코드: {result.get('records', 0)}")
-                    retry_results['successful_retries'].append({
-                        'year': year,
-                        'item': item,
-                        'reporter_name': reporter_name,
-                        'partner_name': partner_name,
-                        'records': result.get('records', 0),
-                        'trade_value': result.get('trade_value', 0),
-                        'attempt': attempt + 1
-                    })
-                    success = True
-                    break
-                else:
-                    print(f"   ⚠️  시도 {attempt + 1} 실패: {result.get('error', 'Unknown error')}")
-                    
-            except Exception as e:
-                print(f"   ❌ 시도 {attempt + 1} 예외 발생: {str(e)}")
+        for attempt in range(1, policy.max_attempts + 1):
+            print(f"   🔄 시도 {attempt}/{policy.max_attempts}...")
+            
+            # 데이터 수집 시도
+            result = collector.collect_single_data(
+                year=year,
+                item=item,
+                reporter_code=reporter_code,
+                partner_code=partner_code,
+                reporter_name=reporter_name,
+                partner_name=partner_name
+            )
+            
+            if result['success']:
+                print(f"   ✅ 성공! 레코드: {result.get('records', 0)}")
+                # 저장소/GeoJSON 저장 후 수집 범위 카탈로그 갱신 (record_result가 DataFrame을 해제하므로 먼저 집계)
+                trade_value = trade_value_stats(result['data'])['trade_value']
+                collector.record_result(result, collector.store_result(result))
+                retry_results['successful_retries'].append({
+                    'year': year,
+                    'item': item,
+                    'reporter_name': reporter_name,
+                    'partner_name': partner_name,
+                    'records': result.get('records', 0),
+                    'trade_value': trade_value,
+                    'attempt': attempt
+                })
+                success = True
+                break
             
-            # 재시도 전 대기
-            if attempt < max_retries - 1:
-                time.sleep(delay)
+            kind = result.get('error_kind')
+            print(f"   ⚠️  시도 {attempt} 실패 ({kind}): {result.get('error', 'Unknown error')}")
+            if kind == ERROR_EMPTY:
+                break
+            
+            # 재시도 전 대기 (지수 백오프 + 지터)
+            if not policy.should_retry(kind, attempt):
+                break
+            time.sleep(policy.backoff(attempt, result.get('retry_after')))
         
+        # 최종 실패/데이터 없음도 카탈로그에 기록
         if not success:
+            collector.record_result(result, False)
+        
+        if not success and result.get('error_kind') == ERROR_EMPTY:
+            print(f"   ∅ 데이터 없음 (더 이상 재시도하지 않음)")
+            retry_results['no_data'].append(failed_req)
+        elif not success:
             print(f"   ❌ 모든 재시도 실패")
             retry_results['still_failed'].append(failed_req)
         
@@ -168,12 +196,14 @@ def retry_failed_collection(failed_requests, max_retries=2, delay=2.0):
     
     # 결과 요약
     successful = len(retry_results['successful_retries'])
+    no_data = len(retry_results['no_data'])
     still_failed = len(retry_results['still_failed'])
     
     print(f"\n🎉 재시도 완료!")
     print(f"   ✅ 성공: {successful}개")
+    print(f"   ∅ 데이터 없음: {no_data}개")
     print(f"   ❌ 여전히 실패: {still_failed}개")
-    print(f"   📊 성공률: {successful/(successful+still_failed)*100:.1f}%")
+    print(f"   📊 성공률: {successful/len(failed_requests)*100:.1f}%")
     print(f"   📁 결과 파일: {result_file}")
     
     return retry_results
@@ -187,11 +217,21 @@ def main():
                        choices=['semiconductor', 'oil', 'copper', 'plastic'],
                        help="재시도할 품목들 (기본값: 모든 품목)")
     parser.add_argument("--max-retries", type=int, default=2,
-                       help="최대 재시도 횟수 (기본값: 2)")
+                       help="요청당 최대 시도 횟수 (기본값: 2)")
     parser.add_argument("--delay", type=float, default=2.0,
-                       help="요청 간 대기 시간 (초, 기본값: 2.0)")
+                       help="요청 간 대기 시간이자 재시도 백오프 기본 대기 시간 (초, 기본값: 2.0)")
+    parser.add_argument("--api-base-url", type=str,
+                       help=f"Comtrade API 주소 (로컬 대역 서버 등, 기본값: 환경 변수 {API_BASE_URL_ENV} 또는 {API_BASE_URL})")
+    parser.add_argument("--ingest-schema", choices=list(INGEST_SCHEMAS), default=DEFAULT_INGEST_SCHEMA,
+                       help=f"응답에서 남길 컬럼: store(저장소 컬럼), minimal(코드/이름/금액/중량/수량), "
+                            f"raw(모든 컬럼) (기본값: {DEFAULT_INGEST_SCHEMA})")
+    
+    parser.add_argument("--catalog-path", type=str, default=DEFAULT_CATALOG_PATH,
+                       help=f"수집 범위 카탈로그 파일 (기본값: {DEFAULT_CATALOG_PATH})")
     
     args = parser.parse_args()
+    configure_api(base_url=args.api_base_url)
+    configure_ingest(args.ingest_schema)
     
     # 실패한 요청들 로드
     failed_requests = load_failed_requests(args.summary_file)
@@ -211,7 +251,7 @@ def main():
         return
     
     # 재시도 실행
-    retry_failed_collection(failed_requests, args.max_retries, args.delay)
+    retry_failed_collection(failed_requests, args.max_retries, args.delay, args.catalog_path)
 
 
 if __name__ == "__main__":
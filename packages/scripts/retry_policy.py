@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+API 요청 오류 분류와 재시도 정책
+
+수집 실패를 네 가지로 나누고, 다시 시도할 만한 오류만 지수 백오프(exponential backoff)와
+지터(jitter)를 적용한 시간 뒤에 다시 대기열에 넣습니다.
+
+오류 종류:
+    rate_limited - 요청 한도 초과 (HTTP 429). Retry-After가 있으면 그 시간 이상 대기 후 재시도
+    transient    - 네트워크 끊김, 시간 초과, 5xx 등 일시적인 오류. 백오프 후 재시도
+    empty        - 요청은 성공했지만 데이터가 없음. 재시도하지 않고 'no data'로 기록
+    permanent    - 잘못된 파라미터(4xx) 등 다시 보내도 같은 오류. 재시도하지 않음
+
+사용법:
+    policy = RetryPolicy(max_attempts=4, base_delay=2.0, max_delay=60.0)
+    if policy.should_retry(kind, attempt):
+        time.sleep(policy.backoff(attempt, retry_after))
+"""
+
+import random
+from typing import Optional
+
+ERROR_RATE_LIMITED = "rate_limited"
+ERROR_TRANSIENT = "transient"
+ERROR_EMPTY = "empty"
+ERROR_PERMANENT = "permanent"
+
+RETRYABLE_ERRORS = (ERROR_RATE_LIMITED, ERROR_TRANSIENT)
+
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BASE_DELAY = 2.0
+DEFAULT_MAX_DELAY = 60.0
+
+
+class RetryPolicy:
+    """지수 백오프 + 전체 지터(full jitter) 재시도 정책"""
+
+    def __init__(self, max_attempts: int = DEFAULT_MAX_ATTEMPTS, base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY, rng: Optional[random.Random] = None):
+        if max_attempts < 1:
+            raise ValueError("max_attempts는 1 이상이어야 합니다.")
+        self.max_attempts = max_attempts
+        self.base_delay = max(0.0, base_delay)
+        self.max_delay = max(self.base_delay, max_delay)
+        self._rng = rng or random.Random()
+
+    def should_retry(self, kind: Optional[str], attempt: int) -> bool:
+        """attempt번째 시도가 kind 오류로 실패했을 때 다시 시도할지 여부 (attempt는 1부터)"""
+        return kind in RETRYABLE_ERRORS and attempt < self.max_attempts
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """attempt번째 실패 후 기다릴 시간(초)
+
+        min(max_delay, base_delay * 2^(attempt-1)) 안에서 무작위로 고르므로
+        여러 요청이 동시에 실패해도 같은 시각에 다시 몰리지 않습니다.
+        서버가 Retry-After를 알려 주면 그보다 먼저 재시도하지 않습니다.
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** max(0, attempt - 1)))
+        delay = self._rng.uniform(0, ceiling)
+        if retry_after:
+            delay = max(delay, retry_after)
+        return delay
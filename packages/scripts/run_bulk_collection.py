@@ -9,6 +9,9 @@
     python run_bulk_collection.py
     python run_bulk_collection.py --scenario full
     python run_bulk_collection.py --scenario recent --years 2022-2024
+    python run_bulk_collection.py --scenario full --resume
+    python run_bulk_collection.py --scenario full --refresh
+    python run_bulk_collection.py --scenario full --workers 3
 """
 
 import argparse
@@ -18,41 +21,48 @@ import os
 from datetime import datetime
 
 # 미리 정의된 수집 시나리오
+# 요청 간 지연이나 동시 요청 수를 시나리오마다 정하지 않고, AIMD 제어기(--adaptive)가 응답 지연과
+# 429/시간 초과에 맞춰 최대 max_concurrency개까지 조절합니다. 고정 속도 상한이 필요하면 "rate"를 추가합니다.
 SCENARIOS = {
     "full": {
         "name": "전체 수집 (2018-2024, 모든 품목)",
         "start_year": 2018,
         "end_year": 2024,
         "items": ["semiconductor", "oil", "copper", "plastic"],
-        "delay": 1.5
+        "adaptive": True,
+        "max_concurrency": 8
     },
     "recent": {
         "name": "최근 데이터 (2022-2024, 모든 품목)",
         "start_year": 2022,
         "end_year": 2024,
         "items": ["semiconductor", "oil", "copper", "plastic"],
-        "delay": 1.0
+        "adaptive": True,
+        "max_concurrency": 8
     },
     "semiconductor_focus": {
         "name": "반도체 중심 (2018-2024, 반도체만)",
         "start_year": 2018,
         "end_year": 2024,
         "items": ["semiconductor"],
-        "delay": 0.5
+        "adaptive": True,
+        "max_concurrency": 8
     },
     "energy_materials": {
         "name": "에너지 및 원자재 (2018-2024, 원유+구리)",
         "start_year": 2018,
         "end_year": 2024,
         "items": ["oil", "copper"],
-        "delay": 1.0
+        "adaptive": True,
+        "max_concurrency": 8
     },
     "test": {
         "name": "테스트 수집 (2023-2024, 반도체만)",
         "start_year": 2023,
         "end_year": 2024,
         "items": ["semiconductor"],
-        "delay": 0.5
+        "adaptive": True,
+        "max_concurrency": 8
     }
 }
 
@@ -73,17 +83,36 @@ def print_scenarios():
         items = ", ".join(scenario['items'])
         print(f"  {key:18} : {scenario['name']}")
         print(f"  {'':18}   연도: {years}, 품목: {items}")
-        print(f"  {'':18}   지연: {scenario['delay']}초")
+        if scenario.get('adaptive'):
+            print(f"  {'':18}   동시 요청: 최대 {scenario['max_concurrency']}개까지 자동 조절")
+        elif scenario.get('concurrency', 1) > 1:
+            print(f"  {'':18}   동시 요청: {scenario['concurrency']}개, 초당 {scenario['rate']}회")
+        else:
+            print(f"  {'':18}   지연: {scenario['delay']}초")
         print()
 
 def estimate_collection_time(scenario):
     """수집 예상 시간 계산"""
-    years = scenario['end_year'] - scenario['start_year'] + 1
-    items = len(scenario['items'])
-    trade_pairs = 10  # MAJOR_TRADE_PAIRS 개수
+    # 배치 계획과 같은 방식으로 실제 API 요청 수 계산
+    from bulk_data_collector import BulkDataCollector, COMMODITY_GROUPS, COMMODITY_MAP, MAJOR_TRADE_PAIRS
+    from request_planner import plan_batches
+    from rate_limiter import DEFAULT_RATE_PER_SECOND
+    
+    items = []
+    for group in scenario['items']:
+        items.extend(COMMODITY_GROUPS.get(group, [group]))
+    tasks = BulkDataCollector.build_tasks(scenario['start_year'], scenario['end_year'],
+                                          items, MAJOR_TRADE_PAIRS)
+    total_requests = len(plan_batches(tasks, COMMODITY_MAP))
     
-    total_requests = years * items * trade_pairs
-    total_time_seconds = total_requests * scenario['delay']
+    if scenario.get('adaptive'):
+        # 적응형 수집 속도는 API 상태에 따라 정해지므로 공개 API 권장 속도로 보수적으로 추정
+        total_time_seconds = total_requests / scenario.get('rate', DEFAULT_RATE_PER_SECOND)
+    elif scenario.get('concurrency', 1) > 1:
+        # 동시 수집 모드에서는 토큰 버킷 속도가 하한선
+        total_time_seconds = total_requests / scenario['rate']
+    else:
+        total_time_seconds = total_requests * scenario['delay']
     
     hours = int(total_time_seconds // 3600)
     minutes = int((total_time_seconds % 3600) // 60)
@@ -117,23 +146,49 @@ def confirm_execution(scenario_key, scenario):
         else:
             print("   y(예) 또는 n(아니오)로 답해주세요.")
 
-def run_bulk_collection(scenario):
-    """대량 수집 실행"""
+def get_python_executable():
+    """가상환경이 있으면 가상환경의 Python"""
+    venv_python = os.path.join(os.getcwd(), "venv", "Scripts", "python.exe")
+    return venv_python if os.path.exists(venv_python) else sys.executable
+
+def throttle_args(scenario):
+    """시나리오의 요청 속도 옵션을 bulk_data_collector.py 인자로 변환"""
+    if scenario.get('adaptive'):
+        args = ["--adaptive", "--max-concurrency", str(scenario['max_concurrency'])]
+    else:
+        args = ["--delay", str(scenario['delay'])]
+        if scenario.get('concurrency', 1) > 1:
+            args += ["--concurrency", str(scenario['concurrency'])]
+    if scenario.get('rate'):
+        args += ["--rate", str(scenario['rate'])]
+    return args
+
+def run_bulk_collection(scenario, resume=False, workers=1, refresh=False):
+    """대량 수집 실행 (resume이 True이면 작업 저널에서 완료된 작업은 건너뜀)
+    
+    refresh가 True이면 데이터 공개 정보로 다시 공개된 칸과 아직 수집하지 않은 칸만 수집합니다.
+    
+    workers가 2 이상이면 작업을 공유 작업 대기열에 등록하고 워커 프로세스 여러 개로 나눠 수집합니다.
+    """
+    if workers > 1:
+        return run_worker_pool(scenario, workers, resume, refresh)
+    
     try:
         print(f"\n🚀 대량 데이터 수집 시작...")
         print(f"   시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
         # bulk_data_collector.py 실행 (가상환경의 Python 사용)
-        venv_python = os.path.join(os.getcwd(), "venv", "Scripts", "python.exe")
-        python_executable = venv_python if os.path.exists(venv_python) else sys.executable
+        python_executable = get_python_executable()
         
         cmd = [
             python_executable, "bulk_data_collector.py",
             "--start-year", str(scenario['start_year']),
             "--end-year", str(scenario['end_year']),
-            "--items"] + scenario['items'] + [
-            "--delay", str(scenario['delay'])
-        ]
+            "--items"] + scenario['items'] + throttle_args(scenario)
+        if resume:
+            cmd.append("--resume")
+        if refresh:
+            cmd.append("--refresh")
         
         print(f"   실행 명령어: {' '.join(cmd)}")
         print("-" * 60)
@@ -155,6 +210,63 @@ def run_bulk_collection(scenario):
         print(f"\n❌ 실행 중 오류 발생: {e}")
         return False
 
+def run_worker_pool(scenario, workers, resume=False, refresh=False):
+    """작업을 공유 작업 대기열에 등록하고 워커 프로세스 workers개로 수집한 뒤 산출물 배포
+    
+    시나리오에 초당 요청 수(rate)가 있으면 모든 워커가 대기열 파일의 공유 토큰 버킷으로 나눠 쓰고,
+    적응형 시나리오에서는 워커마다 AIMD 제어기가 429를 받으면 동시 요청 수를 줄입니다.
+    다른 호스트에서도 같은 대기열 파일을 --queue-path로 지정해 워커를 추가할 수 있습니다.
+    """
+    python_executable = get_python_executable()
+    processes = []
+    try:
+        print(f"\n🚀 대량 데이터 수집 시작 (워커 {workers}개)...")
+        print(f"   시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        
+        enqueue_cmd = [
+            python_executable, "bulk_data_collector.py", "--enqueue",
+            "--start-year", str(scenario['start_year']),
+            "--end-year", str(scenario['end_year']),
+            "--items"] + scenario['items']
+        if resume:
+            enqueue_cmd.append("--resume")
+        if refresh:
+            enqueue_cmd.append("--refresh")
+        print(f"   작업 등록: {' '.join(enqueue_cmd)}")
+        if subprocess.run(enqueue_cmd, cwd=os.getcwd()).returncode != 0:
+            print(f"\n❌ 작업 대기열 등록에 실패했습니다.")
+            return False
+        
+        worker_cmd = [python_executable, "bulk_data_collector.py", "--worker"] + throttle_args(scenario)
+        if refresh:
+            worker_cmd.append("--refresh")
+        print(f"   워커 실행: {' '.join(worker_cmd)} (×{workers})")
+        print("-" * 60)
+        
+        for i in range(workers):
+            processes.append(subprocess.Popen(worker_cmd + ["--worker-id", f"worker{i + 1}"], cwd=os.getcwd()))
+        return_codes = [process.wait() for process in processes]
+        
+        # 워커가 모두 끝난 뒤 한 번만 API용 산출물 배포 (manifest 동시 수정 방지)
+        years = [str(year) for year in range(scenario['start_year'], scenario['end_year'] + 1)]
+        subprocess.run([python_executable, "publish_artifacts.py", "--year"] + years, cwd=os.getcwd())
+        
+        if all(code == 0 for code in return_codes):
+            print(f"\n✅ 대량 수집이 성공적으로 완료되었습니다!")
+            return True
+        print(f"\n❌ 일부 워커에서 오류가 발생했습니다. (종료 코드: {return_codes})")
+        return False
+        
+    except KeyboardInterrupt:
+        # 워커도 Ctrl+C를 받아 임대한 작업을 반납하고 종료함
+        for process in processes:
+            process.wait()
+        print(f"\n\n⏹️  사용자에 의해 수집이 중단되었습니다.")
+        return False
+    except Exception as e:
+        print(f"\n❌ 실행 중 오류 발생: {e}")
+        return False
+
 def interactive_mode():
     """대화형 모드"""
     print_banner()
@@ -230,7 +342,7 @@ def interactive_mode():
                     print("❌ 유효한 품목을 선택해주세요.")
                     continue
                 
-                delay = float(input("   API 지연 시간 (초, 권장: 1.0): ") or "1.0")
+                max_concurrency = int(input("   최대 동시 요청 수 (자동 조절, 권장: 8): ") or "8")
                 
                 # 사용자 정의 시나리오 생성
                 custom_scenario = {
@@ -238,7 +350,8 @@ def interactive_mode():
                     "start_year": start_year,
                     "end_year": end_year,
                     "items": items,
-                    "delay": delay
+                    "adaptive": True,
+                    "max_concurrency": max_concurrency
                 }
                 
                 if confirm_execution("custom", custom_scenario):
@@ -271,6 +384,9 @@ def main():
   python run_bulk_collection.py                    # 대화형 모드
   python run_bulk_collection.py --scenario full   # 전체 수집
   python run_bulk_collection.py --scenario test   # 테스트 수집
+  python run_bulk_collection.py --scenario full --resume  # 중단된 전체 수집 이어하기
+  python run_bulk_collection.py --scenario full --workers 3  # 워커 프로세스 3개로 나눠 수집
+  python run_bulk_collection.py --scenario full --refresh --no-confirm  # 야간 증분 갱신 (바뀐 칸만)
 
 시나리오:
   full              : 2018-2024, 모든 품목
@@ -285,6 +401,13 @@ def main():
                        help="실행할 시나리오 선택")
     parser.add_argument("--no-confirm", action="store_true",
                        help="실행 확인 없이 바로 실행")
+    parser.add_argument("--resume", action="store_true",
+                       help="중단된 수집을 이어서 실행 (완료된 작업 건너뜀)")
+    parser.add_argument("--refresh", action="store_true",
+                       help="증분 갱신 (데이터 공개 정보로 다시 공개된 칸과 수집하지 않은 칸만 수집)")
+    parser.add_argument("--workers", type=int, default=1,
+                       help="수집 워커 프로세스 수 (기본값: 1, 2 이상이면 공유 작업 대기열 사용, "
+                            "초당 요청 수는 모든 워커가 나눠 씀)")
     
     args = parser.parse_args()
     
@@ -297,7 +420,7 @@ def main():
                 print("취소되었습니다.")
                 sys.exit(0)
         
-        success = run_bulk_collection(scenario)
+        success = run_bulk_collection(scenario, resume=args.resume, workers=args.workers, refresh=args.refresh)
         sys.exit(0 if success else 1)
     else:
         # 대화형 모드
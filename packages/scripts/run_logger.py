@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+구조화 실행 로그 (JSONL)
+
+메시지마다 로그 파일을 열고 닫는 대신, 파일을 한 번 열어 두고 이벤트를 버퍼에 모아 씁니다.
+background=True이면 직렬화와 파일 쓰기를 백그라운드 스레드가 맡으므로 수집 스레드는
+이벤트를 대기열에 넣기만 합니다. 콘솔 출력은 호출하는 쪽에서 따로 처리합니다.
+
+한 줄에 이벤트 하나를 JSON으로 기록합니다:
+
+    {"ts": "2025-09-11T14:16:54.123", "event": "task", "task_id": "oil_2020_842_156",
+     "status": "done", "records": 1, "latency": 0.84, "bytes": 912}
+
+사용법:
+    run_log = RunLogger("data/output/bulk_collection_log_20250911_141654.jsonl")
+    run_log.log("request", year=2020, latency=0.84, records=12)
+    run_log.close()
+
+    python run_logger.py data/output/bulk_collection_log_20250911_141654.jsonl --event task
+"""
+
+import argparse
+import atexit
+import json
+import queue
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_BUFFER_BYTES = 64 * 1024
+
+_STOP = object()
+
+
+def _json_default(value):
+    # numpy 스칼라(int64, float64 등)는 파이썬 값으로 변환
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+class RunLogger:
+    """버퍼링되는 JSONL 이벤트 로그 (스레드 안전)"""
+
+    def __init__(self, path: str, background: bool = True, flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 buffer_bytes: int = DEFAULT_BUFFER_BYTES):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._file = open(path, 'a', encoding='utf-8', buffering=buffer_bytes)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._queue = None
+        self._thread = None
+        if background:
+            self._queue = queue.SimpleQueue()
+            self._thread = threading.Thread(target=self._run, name="run-logger", daemon=True)
+            self._thread.start()
+        # 프로세스가 끝날 때 버퍼에 남은 이벤트도 기록
+        atexit.register(self.close)
+
+    def log(self, event: str, **fields):
+        """이벤트 기록 (시각은 호출한 시점)"""
+        if self._closed:
+            return
+        record = {'ts': datetime.now().isoformat(timespec='milliseconds'), 'event': event, **fields}
+        if self._queue is not None:
+            self._queue.put(record)
+        else:
+            with self._lock:
+                self._write(record)
+
+    def _write(self, record: Dict):
+        self._file.write(json.dumps(record, ensure_ascii=False, default=_json_default) + "\n")
+
+    def _run(self):
+        while True:
+            try:
+                record = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                # 한동안 이벤트가 없으면 버퍼를 파일로 내보냄
+                with self._lock:
+                    self._file.flush()
+                continue
+            if record is _STOP:
+                return
+            with self._lock:
+                self._write(record)
+
+    def flush(self):
+        """지금까지 쓴 이벤트를 파일로 내보냄 (백그라운드 대기열에 남은 이벤트는 close에서 처리)"""
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        """남은 이벤트를 모두 기록하고 파일 닫기"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+        with self._lock:
+            self._file.close()
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def read_events(path: str, event: Optional[str] = None) -> Iterator[Dict]:
+    """JSONL 로그의 이벤트 읽기 (event를 주면 해당 종류만)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if event is None or record.get('event') == event:
+                yield record
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(
+        description="JSONL 실행 로그 조회",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python run_logger.py data/output/bulk_collection_log_20250911_141654.jsonl
+  python run_logger.py data/output/bulk_collection_log_20250911_141654.jsonl --event task
+        """
+    )
+    parser.add_argument("path", help="JSONL 로그 파일")
+    parser.add_argument("--event", help="출력할 이벤트 종류 (예: request, task, retry, message)")
+
+    args = parser.parse_args()
+
+    if args.event:
+        for record in read_events(args.path, args.event):
+            print(json.dumps(record, ensure_ascii=False))
+        return
+
+    counts = Counter(record['event'] for record in read_events(args.path))
+    print(f"📋 실행 로그: {args.path}")
+    for event, count in counts.most_common():
+        print(f"   - {event}: {count}개")
+
+
+if __name__ == "__main__":
+    main()
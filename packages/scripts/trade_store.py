@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+파티션 Parquet 무역 데이터 저장소
+
+무역 관계마다 CSV 파일을 하나씩 만드는 대신, 수집한 Comtrade 레코드를
+품목/연도로 파티션된 하나의 Parquet 데이터셋에 추가합니다.
+
+    data/store/trade_flows/item=copper/year=2020/part-0.parquet
+
+월별 데이터(freqCode='M')는 별도 저장소에 품목/연도/월로 파티션합니다 (TradeStore(monthly=True)).
+
+    data/store/trade_flows_monthly/item=copper/year=2024/month=03/part-0.parquet
+
+- 국가 코드/이름, 무역흐름, HS Code 등 반복되는 문자열 컬럼은 사전(dictionary) 인코딩으로 저장합니다
+- 같은 레코드(기간, 무역흐름, HS Code, 보고국, 파트너국)를 다시 추가하면 기존 행을 교체하므로
+  같은 작업을 다시 수집해도 중복되지 않습니다
+- 분석/내보내기는 pyarrow dataset으로 한 번에 읽고, 품목·연도·월·국가 조건은
+  파티션/행 그룹 단위로 걸러집니다 (predicate pushdown)
+- 월별 저장소에 새 달의 레코드를 추가하면 그 달의 파티션 파일만 새로 쓰고, 기존 달은 읽지 않습니다
+- 파티션 파일을 다시 쓰는 동안은 같은 디렉터리의 숨김 잠금 파일(.part-0.parquet.lock)을 flock으로 잡으므로
+  워커, bulk_file_ingest.py, migrate_csv_to_store.py 등 여러 프로세스가 같은 저장소에 추가해도 됩니다
+  (임시 파일도 숨김 파일이라 데이터셋을 읽는 쪽에는 보이지 않음)
+
+기존 data/output의 CSV 파일은 migrate_csv_to_store.py로 옮길 수 있습니다.
+
+사용법:
+    python trade_store.py --stats
+    python trade_store.py --scan --item copper --year 2020 2021 --reporter 842
+    python trade_store.py --monthly --scan --item copper --year 2024 --month 1 2 3
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 프로세스 안 잠금만 사용
+    fcntl = None
+
+DEFAULT_STORE_PATH = "./data/store/trade_flows"
+# --hs6 수집 모드의 HS 6단위 레코드 저장소 (파티션은 4단위 품목 기준, hs_rollup이 상위 합계 계산)
+DEFAULT_HS6_STORE_PATH = "./data/store/trade_flows_hs6"
+# 월별 데이터(freqCode='M') 저장소 (품목/연도/월 파티션)
+DEFAULT_MONTHLY_STORE_PATH = "./data/store/trade_flows_monthly"
+PART_FILENAME = "part-0.parquet"
+
+_DICT_STRING = pa.dictionary(pa.int32(), pa.string())
+
+# 저장 컬럼 (Comtrade 응답 컬럼명을 그대로 사용하므로 읽은 결과를 GeoJSON 변환에 바로 넘길 수 있음)
+STORE_SCHEMA = pa.schema([
+    ('freqCode', _DICT_STRING),
+    ('period', pa.string()),
+    ('flowCode', _DICT_STRING),
+    ('cmdCode', _DICT_STRING),
+    ('reporterCode', pa.int32()),
+    ('reporterISO', _DICT_STRING),
+    ('reporterDesc', _DICT_STRING),
+    ('partnerCode', pa.int32()),
+    ('partnerISO', _DICT_STRING),
+    ('partnerDesc', _DICT_STRING),
+    ('qtyUnitAbbr', _DICT_STRING),
+    ('qty', pa.float64()),
+    ('netWgt', pa.float64()),
+    ('cifvalue', pa.float64()),
+    ('fobvalue', pa.float64()),
+    ('primaryValue', pa.float64())
+])
+
+PARTITION_SCHEMA = pa.schema([('item', pa.string()), ('year', pa.int32())])
+MONTHLY_PARTITION_SCHEMA = pa.schema([('item', pa.string()), ('year', pa.int32()), ('month', pa.int8())])
+
+# 레코드 식별 컬럼 (같은 값의 행은 나중에 추가한 행으로 교체)
+KEY_COLUMNS = ('period', 'flowCode', 'cmdCode', 'reporterCode', 'partnerCode')
+
+
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Comtrade 응답 DataFrame을 저장 컬럼/타입으로 정리 (없는 컬럼은 빈 값)"""
+    columns = {}
+    for field in STORE_SCHEMA:
+        values = df[field.name] if field.name in df.columns else pd.Series(None, index=df.index, dtype=object)
+        if pa.types.is_floating(field.type):
+            columns[field.name] = pd.to_numeric(values, errors='coerce').astype('float64')
+        elif pa.types.is_integer(field.type):
+            columns[field.name] = pd.to_numeric(values, errors='coerce').astype('Int32')
+        else:
+            # CSV에서 읽으면 HS Code/기간이 정수가 되므로 문자열로 통일
+            columns[field.name] = values.astype(object).where(values.notna(), None).map(
+                lambda v: v if v is None else str(v)
+            )
+    return pd.DataFrame(columns).reset_index(drop=True)
+
+
+def period_months(periods: pd.Series) -> pd.Series:
+    """월별 기간(YYYYMM)의 월 (연간 기간처럼 월이 없으면 ValueError)"""
+    months = pd.to_numeric(periods.astype(str).str[4:6], errors='coerce')
+    if months.isna().any() or not months.between(1, 12).all():
+        raise ValueError("월별 저장소에는 YYYYMM 기간의 레코드만 추가할 수 있습니다")
+    return months.astype(int)
+
+
+@contextmanager
+def _partition_lock(path: str):
+    """파티션 파일의 프로세스 간 배타 잠금 (같은 디렉터리의 숨김 잠금 파일에 flock)"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(directory, f".{os.path.basename(path)}.lock"), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _write_partition(table: pa.Table, path: str):
+    # 프로세스마다 다른 숨김 임시 파일에 쓰고 교체 (읽는 쪽은 항상 완성된 파일만 봄)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{os.path.basename(path)}.",
+                                    suffix=".tmp")
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _key_index(df: pd.DataFrame) -> pd.MultiIndex:
+    return pd.MultiIndex.from_arrays([df[column].astype(str) for column in KEY_COLUMNS])
+
+
+class TradeStore:
+    """품목/연도(월별 저장소는 품목/연도/월) 파티션 Parquet 데이터셋 (프로세스 내 스레드 안전)"""
+
+    def __init__(self, root: str = DEFAULT_STORE_PATH, monthly: bool = False):
+        self.root = root
+        self.monthly = monthly
+        self.partition_schema = MONTHLY_PARTITION_SCHEMA if monthly else PARTITION_SCHEMA
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def partition_path(self, item: str, year: int, month: Optional[int] = None) -> str:
+        """파티션 파일 경로 (월별 저장소는 month 필요)"""
+        parts = [self.root, f"item={item}", f"year={int(year)}"]
+        if self.monthly:
+            parts.append(f"month={int(month):02d}")
+        return os.path.join(*parts, PART_FILENAME)
+
+    def append_partitions(self, df: pd.DataFrame, item: str, year: int) -> List[str]:
+        """레코드를 파티션에 추가하고 새로 쓴 파티션 파일 경로 목록을 반환
+
+        월별 저장소는 레코드를 기간의 월로 나눠 해당 월 파티션만 다시 씁니다.
+        """
+        if not self.monthly:
+            return [self.append(df, item, year)]
+        # 정리는 한 번만 하고 월별로 나눔
+        rows = normalize_frame(df)
+        months = period_months(rows['period'])
+        return [self._append_rows(frame, self.partition_path(item, year, month))
+                for month, frame in rows.groupby(months.to_numpy(), sort=True)]
+
+    def append(self, df: pd.DataFrame, item: str, year: int) -> str:
+        """레코드를 (품목, 연도) 파티션에 추가 (같은 키의 기존 행은 교체)
+
+        Returns:
+            파티션 파일 경로
+        """
+        return self.append_frames([df], item, year)
+
+    def append_frames(self, frames: Sequence[pd.DataFrame], item: str, year: int) -> str:
+        """여러 DataFrame을 한 번에 같은 파티션에 추가 (파티션 파일은 한 번만 다시 씀)"""
+        if self.monthly:
+            raise ValueError("월별 저장소는 append_partitions로 추가하세요")
+        new_rows = pd.concat([normalize_frame(df) for df in frames], ignore_index=True)
+        return self._append_rows(new_rows, self.partition_path(item, year))
+
+    def _append_rows(self, new_rows: pd.DataFrame, path: str) -> str:
+        # 같은 키가 여러 번 들어오면 마지막 행 유지
+        new_keys = _key_index(new_rows)
+        unique = ~new_keys.duplicated(keep='last')
+        new_rows, new_keys = new_rows[unique], new_keys[unique]
+
+        # 읽기-수정-쓰기 동안 같은 파티션에 쓰는 다른 스레드/프로세스를 막음
+        with self._lock, _partition_lock(path):
+            if os.path.exists(path):
+                # 파티션 파일은 이미 저장 스키마이므로 다시 정리하지 않음
+                existing = pq.read_table(path).to_pandas()
+                kept = existing[~_key_index(existing).isin(new_keys)]
+                new_rows = pd.concat([kept, new_rows], ignore_index=True)
+
+            _write_partition(pa.Table.from_pandas(new_rows, schema=STORE_SCHEMA, preserve_index=False), path)
+        return path
+
+    def delete_rows(self, item: str, year: int, reporter_code, partner_code,
+                    cmd_codes: Optional[List[str]] = None, months: Optional[Sequence[int]] = None) -> List[str]:
+        """(보고국, 파트너국)의 레코드를 파티션에서 삭제 (다시 공개된 데이터에서 빠진 칸)
+
+        Args:
+            cmd_codes: 삭제할 HS Code (None이면 전체, HS6 품목처럼 여러 코드가 한 파티션에 있을 때)
+            months: 월별 저장소에서 삭제할 월 (None이면 모든 월)
+
+        Returns:
+            행을 삭제한 기간 목록
+        """
+        if self.monthly:
+            paths = [self.partition_path(item, year, month) for month in (months or range(1, 13))]
+        else:
+            paths = [self.partition_path(item, year)]
+
+        removed = set()
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            with self._lock, _partition_lock(path):
+                existing = pq.read_table(path).to_pandas()
+                mask = (existing['reporterCode'] == int(reporter_code)) & \
+                       (existing['partnerCode'] == int(partner_code))
+                if cmd_codes is not None:
+                    mask &= existing['cmdCode'].isin([str(code) for code in cmd_codes])
+                if not mask.any():
+                    continue
+                removed.update(existing.loc[mask, 'period'].astype(str))
+                _write_partition(pa.Table.from_pandas(existing[~mask], schema=STORE_SCHEMA, preserve_index=False),
+                                 path)
+        return sorted(removed)
+
+    def dataset(self) -> ds.Dataset:
+        """전체 파티션 데이터셋 (item, year 파티션 컬럼 포함)"""
+        return ds.dataset(
+            self.root, format='parquet',
+            partitioning=ds.partitioning(self.partition_schema, flavor='hive'),
+            exclude_invalid_files=True
+        )
+
+    def scan(self, items: Optional[List[str]] = None, years: Optional[List[int]] = None,
+             reporter_codes: Optional[List] = None, partner_codes: Optional[List] = None,
+             cmd_codes: Optional[List[str]] = None, columns: Optional[List[str]] = None,
+             months: Optional[List[int]] = None) -> pd.DataFrame:
+        """조건에 맞는 레코드 조회 (조건은 파티션/행 그룹 단위로 먼저 걸러짐)
+
+        Returns:
+            Comtrade 컬럼명 + item, year(, month) 컬럼의 DataFrame (데이터가 없으면 빈 DataFrame)
+        """
+        if not self.partitions():
+            return pd.DataFrame(columns=list(columns or (STORE_SCHEMA.names + self.partition_schema.names)))
+        return self.dataset().to_table(
+            columns=columns,
+            filter=self.filter_expression(items, years, reporter_codes, partner_codes, cmd_codes, months)
+        ).to_pandas()
+
+    def filter_expression(self, items: Optional[List[str]] = None, years: Optional[List[int]] = None,
+                          reporter_codes: Optional[List] = None, partner_codes: Optional[List] = None,
+                          cmd_codes: Optional[List[str]] = None,
+                          months: Optional[List[int]] = None) -> Optional[ds.Expression]:
+        """scan 조건의 dataset 필터 식 (조건이 없으면 None)"""
+
+        conditions = []
+        if items:
+            conditions.append(ds.field('item').isin(list(items)))
+        if years:
+            conditions.append(ds.field('year').isin([int(y) for y in years]))
+        if reporter_codes:
+            conditions.append(ds.field('reporterCode').isin([int(c) for c in reporter_codes]))
+        if partner_codes:
+            conditions.append(ds.field('partnerCode').isin([int(c) for c in partner_codes]))
+        if cmd_codes:
+            conditions.append(ds.field('cmdCode').isin([str(c) for c in cmd_codes]))
+        if months and self.monthly:
+            conditions.append(ds.field('month').isin([int(m) for m in months]))
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def latest_months(self, items: List[str], year: int) -> Dict[Tuple[str, int, int], int]:
+        """월별 저장소의 (품목, 보고국, 파트너국)별 저장된 마지막 월 (해당 연도 파티션만 읽음)"""
+        if not self.monthly or not self.partitions():
+            return {}
+        table = self.dataset().to_table(
+            columns=['item', 'reporterCode', 'partnerCode', 'month'],
+            filter=self.filter_expression(items=items, years=[year])
+        )
+        latest = table.group_by(['item', 'reporterCode', 'partnerCode']).aggregate([('month', 'max')])
+        return {
+            (item, int(reporter), int(partner)): int(month)
+            for item, reporter, partner, month in zip(*(latest.column(name).to_pylist() for name in
+                                                        ('item', 'reporterCode', 'partnerCode', 'month_max')))
+        }
+
+    def partitions(self) -> List[Tuple]:
+        """저장된 (품목, 연도) 파티션 목록 (월별 저장소는 (품목, 연도, 월))"""
+        found = []
+        if not os.path.isdir(self.root):
+            return found
+        for item_dir in sorted(os.listdir(self.root)):
+            if not item_dir.startswith("item="):
+                continue
+            for year_dir in sorted(os.listdir(os.path.join(self.root, item_dir))):
+                if not year_dir.startswith("year="):
+                    continue
+                partition = (item_dir[len("item="):], int(year_dir[len("year="):]))
+                year_path = os.path.join(self.root, item_dir, year_dir)
+                if not self.monthly:
+                    if os.path.exists(os.path.join(year_path, PART_FILENAME)):
+                        found.append(partition)
+                    continue
+                for month_dir in sorted(os.listdir(year_path)):
+                    if month_dir.startswith("month=") and os.path.exists(os.path.join(year_path, month_dir, PART_FILENAME)):
+                        found.append(partition + (int(month_dir[len("month="):]),))
+        return found
+
+    def stats(self) -> Dict:
+        """저장소 통계 (파티션 수, 레코드 수, 파일 크기)"""
+        rows, size = 0, 0
+        partitions = self.partitions()
+        for partition in partitions:
+            path = self.partition_path(*partition)
+            rows += pq.ParquetFile(path).metadata.num_rows
+            size += os.path.getsize(path)
+        stats = {
+            'partitions': len(partitions),
+            'items': sorted({partition[0] for partition in partitions}),
+            'years': sorted({partition[1] for partition in partitions}),
+            'records': rows,
+            'bytes': size
+        }
+        if self.monthly:
+            stats['periods'] = sorted({f"{partition[1]}{partition[2]:02d}" for partition in partitions})
+        return stats
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(
+        description="파티션 Parquet 무역 데이터 저장소 조회",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  python trade_store.py --stats
+  python trade_store.py --scan --item copper --year 2020 2021
+  python trade_store.py --scan --item oil --reporter 842 --partner 156
+  python trade_store.py --monthly --scan --item copper --year 2024 --month 1 2 3
+        """
+    )
+    parser.add_argument("--store-path", type=str,
+                       help=f"저장소 경로 (기본값: {DEFAULT_STORE_PATH}, --monthly이면 {DEFAULT_MONTHLY_STORE_PATH})")
+    parser.add_argument("--monthly", action="store_true", help="월별(품목/연도/월 파티션) 저장소")
+    parser.add_argument("--stats", action="store_true", help="저장소 통계 출력")
+    parser.add_argument("--scan", action="store_true", help="조건에 맞는 레코드 출력")
+    parser.add_argument("--item", nargs="+", help="품목 (예: copper semiconductor_8541)")
+    parser.add_argument("--year", type=int, nargs="+", help="연도")
+    parser.add_argument("--reporter", nargs="+", help="보고국 M49 코드")
+    parser.add_argument("--partner", nargs="+", help="파트너국 M49 코드")
+    parser.add_argument("--month", type=int, nargs="+", help="월 (--monthly)")
+
+    args = parser.parse_args()
+    store_path = args.store_path or (DEFAULT_MONTHLY_STORE_PATH if args.monthly else DEFAULT_STORE_PATH)
+
+    if not os.path.isdir(store_path):
+        print(f"❌ 저장소를 찾을 수 없습니다: {store_path}")
+        return
+
+    store = TradeStore(store_path, monthly=args.monthly)
+
+    if args.scan:
+        df = store.scan(items=args.item, years=args.year,
+                        reporter_codes=args.reporter, partner_codes=args.partner, months=args.month)
+        print(f"🔎 {len(df):,}개 레코드")
+        if not df.empty:
+            columns = ['item', 'period' if args.monthly else 'year', 'reporterDesc', 'partnerDesc', 'flowCode',
+                       'cmdCode', 'primaryValue']
+            print(df[columns].to_string(index=False, max_rows=50))
+        return
+
+    stats = store.stats()
+    print(f"📦 무역 데이터 저장소: {store_path}")
+    print(f"   - 파티션: {stats['partitions']}개 (품목 {len(stats['items'])}개, 연도 {stats['years']})")
+    if store.monthly and stats['periods']:
+        print(f"   - 기간: {stats['periods'][0]}-{stats['periods'][-1]} ({len(stats['periods'])}개월)")
+    print(f"   - 레코드: {stats['records']:,}개")
+    print(f"   - 크기: {stats['bytes'] / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
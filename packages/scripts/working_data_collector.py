@@ -10,16 +10,22 @@
     python working_data_collector.py --year 2019 --item semiconductor --reporter all --partner all
 """
 
-import comtradeapicall
 import pandas as pd
-import geopandas as gpd
-from shapely.geometry import LineString
-import json
 import os
 import sys
 import argparse
 from datetime import datetime
 
+from comtrade_client import (fetch_final_data, configure_cache, configure_api, configure_ingest, configure_splitting,
+                             API_BASE_URL, API_BASE_URL_ENV)
+from country_centroids import load_centroid_index
+from geojson_builder import iter_trade_flow_features
+from geojson_writer import write_geojson, geojson_extension, GEOJSON_FORMATS, DEFAULT_GEOJSON_FORMAT
+from trade_store import TradeStore, DEFAULT_STORE_PATH
+from coverage_catalog import CoverageCatalog, DEFAULT_CATALOG_PATH
+from ingest_schema import INGEST_SCHEMAS, DEFAULT_INGEST_SCHEMA
+from metrics import get_metrics
+
 # 품목별 HS Code 정의 (GUIDE.md 기준)
 COMMODITY_MAP = {
     "semiconductor": "8541,8542",      # 다이오드, 트랜지스터, 집적회로
@@ -44,33 +50,12 @@ def log_message(message):
     print(f"[{timestamp}] {message}")
 
 def get_country_centroids():
-    """국가별 중심점 데이터 준비"""
+    """국가별 중심점 데이터 준비 (미리 빌드한 중심점 인덱스 사용)"""
     try:
         log_message("국가별 중심점 데이터 로딩 중...")
-        world = gpd.read_file(gpd.datasets.get_path('naturalearth_lowres'))
-        world['centroid'] = world.geometry.centroid
-        world['centroid_lon'] = world['centroid'].x
-        world['centroid_lat'] = world['centroid'].y
-        
-        # 국가 코드 매핑을 위한 딕셔너리 생성
-        country_coords = {}
-        for idx, row in world.iterrows():
-            # ISO 코드와 이름으로 매핑
-            if pd.notna(row['iso_a3']):
-                country_coords[row['iso_a3']] = {
-                    'name': row['name'],
-                    'lon': row['centroid_lon'],
-                    'lat': row['centroid_lat']
-                }
-            if pd.notna(row['name']):
-                country_coords[row['name']] = {
-                    'name': row['name'],
-                    'lon': row['centroid_lon'],
-                    'lat': row['centroid_lat']
-                }
-        
-        log_message(f"총 {len(country_coords)}개 국가 좌표 준비 완료")
-        return country_coords
+        centroid_index = load_centroid_index()
+        log_message(f"총 {len(centroid_index)}개 국가 좌표 준비 완료")
+        return centroid_index
         
     except Exception as e:
         log_message(f"국가 데이터 로딩 실패: {e}")
@@ -85,26 +70,21 @@ def collect_trade_data(year, item, reporter_code, partner_code):
             log_message(f"오류: 유효하지 않은 품목 '{item}'")
             return None
         
-        # 데이터 요청
-        data = comtradeapicall.getFinalData(
-            subscription_key=None,
-            typeCode='C',               # 상품
-            freqCode='A',               # 연간
-            clCode='HS',                # HS 분류
-            period=str(year),           # 연도
-            reporterCode=reporter_code, # 보고국
-            cmdCode=COMMODITY_MAP[item], # 상품 코드
-            flowCode='M',               # 수입 (Import)
-            partnerCode=partner_code,   # 파트너국
-            partner2Code='0',           # 2차 파트너 없음
-            customsCode='C00',          # 기본 관세 코드
-            motCode='0',                # 운송 모드 없음
-            maxRecords=1000,            # 최대 1000개 레코드
-            format_output='JSON',
-            includeDesc=True
+        # 데이터 요청 (캐시 우선)
+        data = fetch_final_data(
+            period=str(year),            # 연도
+            reporter_code=reporter_code, # 보고국
+            cmd_code=COMMODITY_MAP[item], # 상품 코드
+            flow_code='M',               # 수입 (Import)
+            partner_code=partner_code,   # 파트너국
+            max_records=1000             # 최대 1000개 레코드
         )
         
         if data is not None and isinstance(data, pd.DataFrame) and not data.empty:
+            if data.attrs.get('requests', 1) > 1:
+                log_message(f"maxRecords 상한에 걸려 요청 {data.attrs['requests']}개로 나눠 수집")
+            if data.attrs.get('truncated'):
+                log_message("⚠️  더 나눌 수 없는 요청이 상한에 걸려 일부 레코드가 빠졌을 수 있습니다")
             log_message(f"데이터 수집 성공: {len(data)} 레코드")
             return data
         elif data is not None and isinstance(data, list) and data:
@@ -120,68 +100,14 @@ def collect_trade_data(year, item, reporter_code, partner_code):
         traceback.print_exc()
         return None
 
-def process_to_geojson(df, country_coords, item_name, year):
+def process_to_geojson(df, centroid_index, item_name, year):
     """데이터를 GeoJSON으로 변환"""
     try:
         log_message("GeoJSON 변환 시작...")
         
-        features = []
-        processed_count = 0
-        
-        for idx, row in df.iterrows():
-            try:
-                # 보고국과 파트너국 정보 추출
-                reporter_name = row.get('reporterDesc', 'Unknown')
-                partner_name = row.get('partnerDesc', 'Unknown')
-                
-                # 좌표 찾기 (여러 방법 시도)
-                reporter_coords = None
-                partner_coords = None
-                
-                # ISO 코드로 찾기
-                if row.get('reporterCodeIsoAlpha3'):
-                    reporter_coords = country_coords.get(row['reporterCodeIsoAlpha3'])
-                if row.get('PartnerCodeIsoAlpha3'):
-                    partner_coords = country_coords.get(row['PartnerCodeIsoAlpha3'])
-                
-                # 이름으로 찾기 (ISO 코드가 없을 경우)
-                if not reporter_coords:
-                    reporter_coords = country_coords.get(reporter_name)
-                if not partner_coords:
-                    partner_coords = country_coords.get(partner_name)
-                
-                # 좌표가 모두 있는 경우에만 처리
-                if reporter_coords and partner_coords:
-                    # LineString 생성 (파트너국 -> 보고국, 즉 수출국 -> 수입국)
-                    line = LineString([
-                        (partner_coords['lon'], partner_coords['lat']),    # 수출국
-                        (reporter_coords['lon'], reporter_coords['lat'])   # 수입국
-                    ])
-                    
-                    # 속성 정보
-                    properties = {
-                        'reporter_name': reporter_name,
-                        'partner_name': partner_name,
-                        'trade_value': float(row.get('primaryValue', 0)),
-                        'net_weight': float(row.get('netWgt', 0)) if pd.notna(row.get('netWgt')) else 0,
-                        'quantity': float(row.get('qty', 0)) if pd.notna(row.get('qty')) else 0,
-                        'item': item_name,
-                        'year': year,
-                        'flow_direction': f"{partner_name} → {reporter_name}"
-                    }
-                    
-                    feature = {
-                        'type': 'Feature',
-                        'geometry': line.__geo_interface__,
-                        'properties': properties
-                    }
-                    
-                    features.append(feature)
-                    processed_count += 1
-                    
-            except Exception as e:
-                log_message(f"레코드 처리 오류 (인덱스 {idx}): {e}")
-                continue
+        # Feature는 저장할 때 하나씩 만들어짐 (전체 목록을 메모리에 두지 않음)
+        with get_metrics().timer('geojson_prepare'):
+            features, processed_count = iter_trade_flow_features(df, centroid_index, item_name, year)
         
         geojson = {
             'type': 'FeatureCollection',
@@ -189,14 +115,14 @@ def process_to_geojson(df, country_coords, item_name, year):
             'metadata': {
                 'item': item_name,
                 'year': year,
-                'total_flows': len(features),
+                'total_flows': processed_count,
                 'processed_records': processed_count,
                 'total_records': len(df),
                 'created_at': datetime.now().isoformat()
             }
         }
         
-        log_message(f"GeoJSON 생성 완료: {len(features)}개 무역 흐름")
+        log_message(f"GeoJSON 생성 완료: {processed_count}개 무역 흐름")
         return geojson
         
     except Exception as e:
@@ -205,8 +131,10 @@ def process_to_geojson(df, country_coords, item_name, year):
         traceback.print_exc()
         return None
 
-def save_data(df, geojson, item_name, year, reporter, partner):
+def save_data(df, geojson, item_name, year, reporter, partner, geojson_format=DEFAULT_GEOJSON_FORMAT,
+              store_path=DEFAULT_STORE_PATH, write_csv=False):
     """데이터를 파일로 저장"""
+    metrics = get_metrics()
     try:
         # 출력 디렉터리 확인
         output_dir = "./data/output"
@@ -215,16 +143,26 @@ def save_data(df, geojson, item_name, year, reporter, partner):
         # 파일명 생성
         base_filename = f"trade_{item_name}_{year}_{reporter}_{partner}"
         
+        # 파티션 Parquet 저장소에 추가 (같은 레코드는 교체)
+        if store_path:
+            with metrics.timer('store_append'):
+                partition_path = TradeStore(store_path).append(df, item_name, year)
+            log_message(f"저장소 기록: {partition_path}")
+        
         # CSV 저장
-        csv_path = os.path.join(output_dir, f"{base_filename}.csv")
-        df.to_csv(csv_path, index=False, encoding='utf-8-sig')
-        log_message(f"CSV 파일 저장: {csv_path}")
+        if write_csv:
+            csv_path = os.path.join(output_dir, f"{base_filename}.csv")
+            with metrics.timer('csv_write'):
+                df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+            metrics.inc('bytes_written', os.path.getsize(csv_path))
+            log_message(f"CSV 파일 저장: {csv_path}")
         
         # GeoJSON 저장
         if geojson:
-            geojson_path = os.path.join(output_dir, f"{base_filename}.geojson")
-            with open(geojson_path, 'w', encoding='utf-8') as f:
-                json.dump(geojson, f, indent=2, ensure_ascii=False)
+            geojson_path = os.path.join(output_dir, f"{base_filename}{geojson_extension(geojson_format)}")
+            with metrics.timer('geojson_write'):
+                write_geojson(geojson_path, geojson, geojson_format)
+            metrics.inc('bytes_written', os.path.getsize(geojson_path))
             log_message(f"GeoJSON 파일 저장: {geojson_path}")
         
         return True
@@ -233,6 +171,28 @@ def save_data(df, geojson, item_name, year, reporter, partner):
         log_message(f"파일 저장 오류: {e}")
         return False
 
+def save_metrics(textfile=None):
+    """단계별 지표를 출력하고 JSON 보고서(와 지정하면 Prometheus textfile) 저장"""
+    metrics = get_metrics()
+    try:
+        log_message(f"⏱️  단계별 소요 시간:\n{metrics.format_summary()}")
+        report_path = os.path.join("./data/output",
+                                   f"collection_metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        metrics.write_report(report_path, collector='working')
+        log_message(f"📈 지표 보고서 저장: {report_path}")
+        if textfile:
+            metrics.write_prometheus(textfile, collector='working')
+    except Exception as e:
+        log_message(f"지표 저장 오류: {e}")
+
+def update_catalog(catalog_path, df, item_name, year):
+    """수집한 무역 관계를 수집 범위 카탈로그에 기록"""
+    try:
+        cells = CoverageCatalog(catalog_path).record_frame(df, item_name, year)
+        log_message(f"🗂️  수집 범위 카탈로그 갱신: {cells}개 무역 관계")
+    except Exception as e:
+        log_message(f"카탈로그 갱신 오류: {e}")
+
 def main():
     """메인 함수"""
     parser = argparse.ArgumentParser(
@@ -262,29 +222,67 @@ def main():
                        help="보고국 코드 (예: 842, all)")
     parser.add_argument("--partner", type=str, required=True,
                        help="파트너국 코드 (예: 156, all)")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="응답 캐시를 사용하지 않고 항상 API 호출")
+    parser.add_argument("--api-base-url", type=str,
+                       help=f"Comtrade API 주소 (로컬 대역 서버 등, 기본값: 환경 변수 {API_BASE_URL_ENV} 또는 {API_BASE_URL})")
+    parser.add_argument("--ingest-schema", choices=list(INGEST_SCHEMAS), default=DEFAULT_INGEST_SCHEMA,
+                       help=f"응답에서 남길 컬럼: store(저장소 컬럼), minimal(코드/이름/금액/중량/수량), "
+                            f"raw(모든 컬럼) (기본값: {DEFAULT_INGEST_SCHEMA})")
+    parser.add_argument("--no-split", action="store_true",
+                       help="maxRecords 상한에 걸린 응답을 나눠 다시 요청하지 않음")
+    parser.add_argument("--geojson-format", choices=GEOJSON_FORMATS, default=DEFAULT_GEOJSON_FORMAT,
+                       help=f"GeoJSON 저장 형식: compact, pretty, seq (기본값: {DEFAULT_GEOJSON_FORMAT})")
+    parser.add_argument("--store-path", type=str, default=DEFAULT_STORE_PATH,
+                       help=f"파티션 Parquet 저장소 경로 (기본값: {DEFAULT_STORE_PATH})")
+    parser.add_argument("--no-store", action="store_true",
+                       help="파티션 Parquet 저장소에 기록하지 않음")
+    parser.add_argument("--write-csv", action="store_true",
+                       help="CSV 파일도 저장 (기존 형식)")
+    parser.add_argument("--metrics-textfile", type=str,
+                       help="단계별 지표 Prometheus textfile 경로 (node_exporter textfile collector용)")
+    parser.add_argument("--catalog-path", type=str, default=DEFAULT_CATALOG_PATH,
+                       help=f"수집 범위 카탈로그 파일 (기본값: {DEFAULT_CATALOG_PATH})")
+    parser.add_argument("--no-catalog", action="store_true",
+                       help="수집 범위 카탈로그를 갱신하지 않음")
     
     args = parser.parse_args()
+    configure_cache(enabled=not args.no_cache)
+    configure_api(base_url=args.api_base_url)
+    configure_ingest(args.ingest_schema)
+    configure_splitting(enabled=not args.no_split)
     
     log_message("=== UN Comtrade 데이터 수집 시작 ===")
     log_message(f"연도: {args.year}, 품목: {args.item}, 보고국: {args.reporter}, 파트너: {args.partner}")
     
     # 1. 국가 좌표 데이터 준비
-    country_coords = get_country_centroids()
-    if not country_coords:
+    centroid_index = get_country_centroids()
+    if not centroid_index:
         log_message("❌ 국가 좌표 데이터 로딩 실패")
         sys.exit(1)
     
     # 2. 무역 데이터 수집
     trade_data = collect_trade_data(args.year, args.item, args.reporter, args.partner)
+    if trade_data is not None:
+        get_metrics().inc('records', len(trade_data))
     if trade_data is None or trade_data.empty:
         log_message("❌ 무역 데이터 수집 실패")
         sys.exit(1)
     
     # 3. GeoJSON 변환
-    geojson = process_to_geojson(trade_data, country_coords, args.item, args.year)
+    geojson = process_to_geojson(trade_data, centroid_index, args.item, args.year)
     
     # 4. 데이터 저장
-    success = save_data(trade_data, geojson, args.item, args.year, args.reporter, args.partner)
+    success = save_data(trade_data, geojson, args.item, args.year, args.reporter, args.partner,
+                        args.geojson_format,
+                        store_path=None if args.no_store else args.store_path,
+                        write_csv=args.write_csv)
+    
+    save_metrics(args.metrics_textfile)
+    
+    # 수집 범위 카탈로그 갱신 (reporter/partner=all이면 응답의 무역 관계마다 기록)
+    if success and not args.no_catalog:
+        update_catalog(args.catalog_path, trade_data, args.item, args.year)
     
     if success:
         log_message("✅ 데이터 수집 및 저장 완료!")
@@ -293,7 +291,7 @@ def main():
         log_message(f"📊 요약:")
         log_message(f"   - 총 레코드: {len(trade_data)}")
         if geojson:
-            log_message(f"   - 지도 표시 가능한 무역 흐름: {len(geojson['features'])}")
+            log_message(f"   - 지도 표시 가능한 무역 흐름: {geojson['metadata']['total_flows']}")
         if 'primaryValue' in trade_data.columns:
             total_value = trade_data['primaryValue'].sum()
             log_message(f"   - 총 무역액: ${total_value:,.0f}")